@@ -7,10 +7,14 @@ Extracted from a removed backtesting module during the conditions engine migrati
 
 from __future__ import annotations
 
+from itertools import combinations
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+from signaltrackers.metric_store import read_series
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
@@ -49,16 +53,7 @@ NEUTRAL_THRESHOLD = 0.05  # 5%
 
 def load_csv(metric_key: str) -> pd.Series | None:
     """Load a CSV time series from the data directory. Returns None if missing."""
-    csv_path = DATA_DIR / f'{metric_key}.csv'
-    if not csv_path.exists():
-        return None
-    df = pd.read_csv(csv_path)
-    if df.empty or len(df.columns) < 2:
-        return None
-    df['date'] = pd.to_datetime(df['date'])
-    value_col = df.columns[1]
-    df = df.dropna(subset=[value_col]).set_index('date')
-    return df[value_col].astype(float)
+    return read_series(DATA_DIR / f'{metric_key}.csv')
 
 
 def load_scoring_assets() -> dict[str, pd.Series]:
@@ -121,3 +116,152 @@ def compute_max_drawdown(
     cummax = window_prices.cummax()
     drawdowns = (window_prices - cummax) / cummax
     return round(drawdowns.min(), 6)
+
+
+
+# ---------------------------------------------------------------------------
+# Vectorized kernels
+#
+# The scalar functions above filter the whole price series on every call;
+# a backtest calls them once per asset, window and evaluation date. The
+# kernels below locate every evaluation date with one searchsorted over the
+# price index and compute all dates (and windows) at once. They match the
+# scalar functions exactly, with NaN in place of None, for NaN-free price
+# series sorted by date (as returned by load_csv).
+# ---------------------------------------------------------------------------
+
+def _as_datetime64(dates) -> np.ndarray:
+    return pd.DatetimeIndex(dates).values.astype('datetime64[ns]')
+
+
+def forward_return_matrix(
+    price_series: pd.Series,
+    eval_dates,
+    windows,
+) -> np.ndarray:
+    """
+    Forward returns for every eval date (rows) and window in days (columns).
+
+    Equivalent to compute_forward_return(price_series, d, w) for each pair;
+    NaN where that returns None.
+    """
+    windows = list(windows)
+    dates = _as_datetime64(eval_dates)
+    out = np.full((len(dates), len(windows)), np.nan)
+    if price_series is None or price_series.empty or not len(dates):
+        return out
+
+    index = price_series.index.values.astype('datetime64[ns]')
+    prices = price_series.to_numpy(dtype='float64')
+    n = len(prices)
+
+    start = np.searchsorted(index, dates, side='left')
+    targets = dates[:, None] + np.array(windows, dtype='timedelta64[D]').astype('timedelta64[ns]')
+    end = np.searchsorted(index, targets, side='left')
+
+    valid = (start < n)[:, None] & (end < n)
+    start_price = prices[np.minimum(start, n - 1)][:, None]
+    end_price = prices[np.minimum(end, n - 1)]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.round((end_price - start_price) / start_price, 6)
+    out[valid] = returns[valid]
+    return out
+
+
+def max_drawdown_vector(
+    price_series: pd.Series,
+    eval_dates,
+    window_days: int,
+) -> np.ndarray:
+    """
+    Maximum drawdown within window_days after each eval date.
+
+    Equivalent to compute_max_drawdown(price_series, d, window_days) for
+    each date; NaN where that returns None. Windows are gathered as rows of
+    a strided view over the price array, so the running maximum and the
+    minimum drawdown are computed for all dates in one pass.
+    """
+    dates = _as_datetime64(eval_dates)
+    out = np.full(len(dates), np.nan)
+    if price_series is None or price_series.empty or not len(dates):
+        return out
+
+    index = price_series.index.values.astype('datetime64[ns]')
+    prices = price_series.to_numpy(dtype='float64')
+
+    lo = np.searchsorted(index, dates, side='left')
+    end_dates = dates + np.timedelta64(window_days, 'D').astype('timedelta64[ns]')
+    hi = np.searchsorted(index, end_dates, side='right')
+    lengths = hi - lo
+    rows = np.flatnonzero(lengths >= 2)
+    if not len(rows):
+        return out
+
+    width = int(lengths[rows].max())
+    padded = np.concatenate([prices, np.full(width, np.nan)])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, width)[lo[rows]].copy()
+    windows[np.arange(width)[None, :] >= lengths[rows][:, None]] = np.nan
+
+    running_max = np.fmax.accumulate(windows, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdowns = (windows - running_max) / running_max
+    out[rows] = np.round(np.nanmin(drawdowns, axis=1), 6)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# CPCV — Combinatorial Purged Cross-Validation
+# ---------------------------------------------------------------------------
+
+def cpcv_path_scores(
+    dates,
+    scores,
+    k: int = 6,
+    p: int = 2,
+    purge_months: int = 3,
+    embargo_months: int = 1,
+) -> tuple[list[float], list[float]]:
+    """
+    Out-of-sample and in-sample mean scores for each CPCV path.
+
+    ``dates`` and ``scores`` are aligned and sorted by date. The rows are
+    split into k time-ordered groups (the last takes the remainder) and each
+    of the C(k, p) group combinations is a test set. Training rows within
+    purge_months before the test start, or embargo_months after the test
+    end, are dropped. Paths with no scored test or training rows are skipped.
+    """
+    dates = _as_datetime64(dates)
+    scores = np.asarray(scores, dtype='float64')
+    n = len(dates)
+    if n == 0:
+        return [], []
+
+    group_size = n // k
+    if group_size:
+        group = np.minimum(np.arange(n) // group_size, k - 1)
+    else:
+        group = np.full(n, k - 1)
+    scored = ~np.isnan(scores)
+    purge = np.timedelta64(purge_months * 30, 'D')
+    embargo = np.timedelta64(embargo_months * 30, 'D')
+
+    oos_scores, is_scores = [], []
+    for combo in combinations(range(k), p):
+        test = np.isin(group, combo)
+        if not test.any():
+            continue
+        test_start = dates[test].min()
+        test_end = dates[test].max()
+
+        purged = (dates >= test_start - purge) & (dates < test_start)
+        embargoed = (dates > test_end) & (dates <= test_end + embargo)
+        train = ~test & ~purged & ~embargoed
+
+        oos = scores[test & scored]
+        ins = scores[train & scored]
+        if not len(oos) or not len(ins):
+            continue
+        oos_scores.append(float(oos.mean()))
+        is_scores.append(float(ins.mean()))
+
+    return oos_scores, is_scores
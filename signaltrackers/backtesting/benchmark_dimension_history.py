@@ -0,0 +1,216 @@
+"""
+Benchmark — vectorized risk/policy history vs the original per-date loops
+
+compute_risk_history and compute_policy_history used to walk every date,
+re-aligning the VIX3M, correlation and policy-rate series each time (O(n²)
+over ~9,000 trading days). They now align once and score whole arrays. This
+script keeps the loop implementations as a reference, checks both produce
+identical frames on a synthetic ~35-year data set, and reports the speedup
+along with the cost of a persisted-cache hit (history_cache.py).
+
+Usage:
+    PYTHONPATH=signaltrackers python3 -m signaltrackers.backtesting.benchmark_dimension_history [--days N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from typing import Optional
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import signaltrackers.market_conditions as mc
+
+
+# ---------------------------------------------------------------------------
+# Reference implementations (the original per-date loops)
+# ---------------------------------------------------------------------------
+
+def reference_risk_history(start_date: Optional[str] = None) -> Optional[pd.DataFrame]:
+    vix_series = mc._to_series(mc._load_csv('vix_price'), 'vix_price')
+    if vix_series is None or len(vix_series) == 0:
+        return None
+    vix3m_series = mc._to_series(mc._load_csv('vix_3month'), 'vix_3month')
+    corr_series = mc._compute_stock_bond_correlation(63)
+
+    idx = vix_series.index
+    if start_date:
+        idx = idx[idx >= pd.Timestamp(start_date)]
+
+    records = []
+    for dt in idx:
+        vix_val = float(vix_series.loc[dt])
+        v_score = mc._score_vix_level(vix_val)
+
+        ts_score = 0
+        if vix3m_series is not None and len(vix3m_series) > 0:
+            v3m = vix3m_series.reindex(
+                vix3m_series.index.union(pd.DatetimeIndex([dt]))
+            ).sort_index().ffill()
+            v3m_val = v3m.get(dt)
+            if v3m_val is not None and not np.isnan(v3m_val) and v3m_val > 0:
+                ts_score = mc._score_term_structure(vix_val / v3m_val)
+
+        c_score = 0
+        if corr_series is not None and len(corr_series) > 0:
+            c = corr_series.reindex(
+                corr_series.index.union(pd.DatetimeIndex([dt]))
+            ).sort_index().ffill()
+            c_val = c.get(dt)
+            if c_val is not None and not np.isnan(c_val):
+                c_score = mc._score_stock_bond_corr(float(c_val))
+
+        combined = v_score + ts_score + c_score
+        records.append({
+            'date': dt,
+            'vix_score': v_score,
+            'term_structure_score': ts_score,
+            'correlation_score': c_score,
+            'score': combined,
+            'state': mc._classify_risk(combined),
+        })
+
+    return pd.DataFrame(records)
+
+
+def reference_policy_history(start_date: Optional[str] = None) -> Optional[pd.DataFrame]:
+    pce = mc._to_series(mc._load_csv('core_pce_price_index'), 'core_pce_price_index')
+    if pce is None or len(pce) < 13:
+        return None
+    inflation_pct = ((pce / pce.shift(12)) - 1) * 100
+
+    unrate = mc._to_series(mc._load_csv('unemployment_rate'), 'unemployment_rate')
+    nrou = mc._to_series(mc._load_csv('natural_unemployment_rate'), 'natural_unemployment_rate')
+    if unrate is None or nrou is None:
+        return None
+
+    nrou_monthly = nrou.resample('MS').ffill()
+    common_idx = unrate.index.intersection(nrou_monthly.index)
+    if len(common_idx) == 0:
+        nrou_aligned = mc._align_monthly(nrou_monthly, unrate.index)
+        common_idx = unrate.index[nrou_aligned.notna()]
+        if len(common_idx) == 0:
+            return None
+        unrate_aligned = unrate.reindex(common_idx)
+        nrou_aligned = nrou_aligned.reindex(common_idx)
+    else:
+        unrate_aligned = unrate.reindex(common_idx)
+        nrou_aligned = nrou_monthly.reindex(common_idx)
+
+    output_gap = -2 * (unrate_aligned - nrou_aligned)
+    inf_common = inflation_pct.dropna().index.intersection(output_gap.dropna().index)
+    if len(inf_common) == 0:
+        return None
+
+    taylor_prescribed = mc._compute_taylor_rule(
+        inflation_pct.reindex(inf_common), output_gap.reindex(inf_common))
+    policy_rate = mc._load_policy_rate()
+    if policy_rate is None:
+        return None
+    rate_aligned = mc._align_monthly(policy_rate, inf_common)
+
+    if start_date:
+        inf_common = inf_common[inf_common >= pd.Timestamp(start_date)]
+
+    records = []
+    for dt in inf_common:
+        prescribed = taylor_prescribed.get(dt)
+        rate = rate_aligned.get(dt)
+        if prescribed is None or rate is None or np.isnan(prescribed) or np.isnan(rate):
+            continue
+        gap = float(rate) - float(prescribed)
+
+        rate_before = policy_rate[policy_rate.index <= dt]
+        if len(rate_before) > 63:
+            rate_change = float(rate_before.iloc[-1]) - float(rate_before.iloc[-64])
+        elif len(rate_before) > 3:
+            rate_change = float(rate_before.iloc[-1]) - float(rate_before.iloc[-4])
+        else:
+            rate_change = 0.0
+
+        records.append({
+            'date': dt,
+            'actual_rate': float(rate),
+            'taylor_prescribed': float(prescribed),
+            'taylor_gap': gap,
+            'stance': mc._classify_policy_stance(gap),
+            'direction': mc._classify_policy_direction(rate_change),
+        })
+
+    return pd.DataFrame(records) if records else None
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------------
+
+def write_synthetic_data(data_dir: str, days: int = 9000, seed: int = 7) -> None:
+    """Write random-walk inputs shaped like the real FRED/Yahoo series.
+
+    VIX3M starts a few years after VIX and the upper target after FEDFUNDS,
+    so the pre-history fallbacks are exercised too.
+    """
+    rng = np.random.default_rng(seed)
+    daily = pd.bdate_range('1990-01-02', periods=days)
+    monthly = pd.date_range(daily[0], daily[-1], freq='MS')
+    quarterly = pd.date_range(daily[0], daily[-1], freq='QS')
+
+    def write(name, dates, values):
+        pd.DataFrame({'date': dates.strftime('%Y-%m-%d'), name: values}).to_csv(
+            f'{data_dir}/{name}.csv', index=False)
+
+    vix = np.clip(18 + np.cumsum(rng.normal(0, 0.8, days)) * 0.3, 9, 80)
+    write('vix_price', daily, vix)
+    late = daily[days // 5:]
+    write('vix_3month', late, vix[days // 5:] * rng.uniform(0.9, 1.1, len(late)))
+    write('sp500_price', daily, 300 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, days))))
+    write('treasury_10y', daily, np.clip(5 + np.cumsum(rng.normal(0, 0.04, days)), 0.5, 10))
+
+    n = len(monthly)
+    write('core_pce_price_index', monthly, 60 * np.exp(np.cumsum(rng.normal(0.002, 0.002, n))))
+    write('unemployment_rate', monthly, np.clip(5 + np.cumsum(rng.normal(0, 0.15, n)), 3, 11))
+    write('natural_unemployment_rate', quarterly, np.full(len(quarterly), 4.8))
+    write('fed_funds_rate', monthly, np.clip(4 + np.cumsum(rng.normal(0, 0.2, n)), 0, 9))
+    target_days = daily[days // 2:]
+    write('fed_funds_upper_target', target_days,
+          np.round(np.clip(3 + np.cumsum(rng.normal(0, 0.02, len(target_days))), 0.25, 6) * 4) / 4)
+
+
+def _timed(fn, repeat: int = 1):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--days', type=int, default=9000, help='synthetic trading days')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir, mock.patch.object(mc, 'DATA_DIR', data_dir):
+        write_synthetic_data(data_dir, args.days)
+        for name, build, cached, old in (
+            ('compute_risk_history', mc._build_risk_history, mc.compute_risk_history,
+             reference_risk_history),
+            ('compute_policy_history', mc._build_policy_history, mc.compute_policy_history,
+             reference_policy_history),
+        ):
+            expected, t_old = _timed(old)
+            actual, t_new = _timed(lambda: build(None), repeat=5)
+            pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+            cached()  # populate the persisted history cache
+            _, t_cached = _timed(cached, repeat=5)
+            print(f"{name:<24} rows={len(actual):>6}  loop={t_old:8.3f}s  "
+                  f"vectorized={t_new:7.3f}s  speedup={t_old / t_new:7.1f}x  "
+                  f"cached={t_cached * 1000:6.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
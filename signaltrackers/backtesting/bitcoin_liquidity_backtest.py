@@ -23,18 +23,13 @@ import math
 import sys
 import warnings
 from datetime import datetime
-from itertools import combinations
 from pathlib import Path
 from typing import Optional
 
-import numpy as np
 import pandas as pd
 
-from signaltrackers.backtesting.backtest_utils import (
-    load_csv,
-    compute_forward_return,
-    NEUTRAL_THRESHOLD,
-)
+from signaltrackers.backtesting import engine, significance
+from signaltrackers.backtesting.backtest_utils import load_csv
 from signaltrackers.market_conditions import compute_liquidity_history
 
 warnings.filterwarnings('ignore', category=FutureWarning)
@@ -50,7 +45,7 @@ RESULTS_DIR = Path(__file__).resolve().parent / 'results'
 # ---------------------------------------------------------------------------
 
 FORWARD_WINDOW = 90  # 90-day forward returns (matches M2 lag hypothesis)
-EVAL_FREQUENCY_MONTHS = 1  # Monthly evaluation dates
+EVAL_FREQUENCY_MONTHS = engine.EVAL_FREQUENCY_MONTHS  # Monthly evaluation dates
 
 # Bitcoin data starts Sep 2014; liquidity history starts earlier.
 # Use 2014 as start year for the validation window.
@@ -108,22 +103,7 @@ def generate_folds(
 
     Same methodology as the main conditions backtest.
     """
-    folds = []
-    test_start_year = start_year
-    step_years = test_months // 12
-    fold_num = 1
-
-    while test_start_year < end_year:
-        test_end_year = min(test_start_year + step_years, end_year)
-        folds.append({
-            'fold': fold_num,
-            'test_start': pd.Timestamp(f'{test_start_year}-01-01'),
-            'test_end': pd.Timestamp(f'{test_end_year}-01-01') - pd.Timedelta(days=1),
-        })
-        test_start_year = test_end_year
-        fold_num += 1
-
-    return folds
+    return engine.generate_folds(start_year, end_year, test_months)
 
 
 # ---------------------------------------------------------------------------
@@ -131,23 +111,13 @@ def generate_folds(
 # ---------------------------------------------------------------------------
 
 
-def run_bitcoin_liquidity_backtest(
+def liquidity_study(
     liquidity_history: pd.DataFrame,
     bitcoin_price: pd.Series,
     start_year: int = FOLD_START_YEAR,
     end_year: int = FOLD_END_YEAR,
-) -> pd.DataFrame:
-    """
-    Run the Bitcoin / Liquidity validation over monthly evaluation dates.
-
-    For each evaluation date:
-      1. Get the liquidity state (point-in-time, no lookahead)
-      2. Map to expected Bitcoin direction
-      3. Compute 90-day forward Bitcoin return
-      4. Score directional accuracy
-
-    Returns DataFrame with one row per evaluation date.
-    """
+) -> engine.SignalStudy:
+    """The Bitcoin / Liquidity validation as an engine study."""
     # Need 90 days of forward data
     last_btc_date = bitcoin_price.index[-1]
     end_date = min(
@@ -159,59 +129,57 @@ def run_bitcoin_liquidity_backtest(
     btc_start = bitcoin_price.index[0]
     start_date = max(pd.Timestamp(f'{start_year}-01-01'), btc_start)
 
-    eval_dates = pd.date_range(
-        start=start_date,
-        end=end_date,
-        freq=f'{EVAL_FREQUENCY_MONTHS}ME',
+    return engine.SignalStudy(
+        name='bitcoin_liquidity',
+        history=liquidity_history,
+        state_col='state',
+        carry=('score',),
+        prices={'btc': bitcoin_price},
+        expectations={state: {'btc': direction} for state, direction in LIQUIDITY_EXPECTATIONS.items()},
+        windows=(30, 60, 90),
+        score_window=FORWARD_WINDOW,
+        start_year=start_year,
+        end_year=end_year,
+        test_months=FOLD_TEST_MONTHS,
+        eval_dates=engine.monthly_eval_dates(start_date, end_date),
+        require_returns=True,
+        cpcv={'min_rows': 6, 'include_scores': False},
     )
 
-    rows = []
-    for eval_date in eval_dates:
-        # Get liquidity state at eval_date (no lookahead)
-        mask = liquidity_history['date'] <= eval_date
-        subset = liquidity_history[mask]
-        if subset.empty:
-            continue
-
-        liq_row = subset.iloc[-1]
-        liq_state = liq_row['state']
-        liq_score = liq_row['score']
 
-        # Map to 3-bucket
-        liq_bucket = LIQUIDITY_BUCKETS.get(liq_state, 'Neutral')
-        expected_direction = LIQUIDITY_EXPECTATIONS.get(liq_state, 'neutral')
-
-        # Forward returns at multiple windows for context
-        fwd_90d = compute_forward_return(bitcoin_price, eval_date, 90)
-        fwd_30d = compute_forward_return(bitcoin_price, eval_date, 30)
-        fwd_60d = compute_forward_return(bitcoin_price, eval_date, 60)
-
-        if fwd_90d is None:
-            continue
-
-        # Score directional accuracy
-        if expected_direction == 'positive':
-            correct = 1.0 if fwd_90d > 0 else 0.0
-        elif expected_direction == 'negative':
-            correct = 1.0 if fwd_90d < 0 else 0.0
-        elif expected_direction == 'neutral':
-            correct = 1.0 if abs(fwd_90d) < NEUTRAL_THRESHOLD else 0.5
-        else:
-            correct = 0.5
+def run_bitcoin_liquidity_backtest(
+    liquidity_history: pd.DataFrame,
+    bitcoin_price: pd.Series,
+    start_year: int = FOLD_START_YEAR,
+    end_year: int = FOLD_END_YEAR,
+) -> pd.DataFrame:
+    """
+    Run the Bitcoin / Liquidity validation over monthly evaluation dates.
 
-        rows.append({
-            'date': eval_date.strftime('%Y-%m-%d'),
-            'liquidity_state': liq_state,
-            'liquidity_bucket': liq_bucket,
-            'liquidity_score': round(liq_score, 4),
-            'expected_direction': expected_direction,
-            'btc_fwd_30d': fwd_30d,
-            'btc_fwd_60d': fwd_60d,
-            'btc_fwd_90d': fwd_90d,
-            'correct': correct,
-        })
+    For each evaluation date:
+      1. Get the liquidity state (point-in-time, no lookahead)
+      2. Map to expected Bitcoin direction
+      3. Compute 90-day forward Bitcoin return
+      4. Score directional accuracy
 
-    return pd.DataFrame(rows)
+    Returns DataFrame with one row per evaluation date.
+    """
+    frame = engine.build_frame(
+        liquidity_study(liquidity_history, bitcoin_price, start_year, end_year))
+    if frame.empty:
+        return pd.DataFrame()
+
+    return pd.DataFrame({
+        'date': frame['date'],
+        'liquidity_state': frame['state'],
+        'liquidity_bucket': [LIQUIDITY_BUCKETS.get(s, 'Neutral') for s in frame['state']],
+        'liquidity_score': [round(v, 4) for v in frame['signal_score']],
+        'expected_direction': frame['btc_expected'],
+        'btc_fwd_30d': frame['btc_fwd_30d'],
+        'btc_fwd_60d': frame['btc_fwd_60d'],
+        'btc_fwd_90d': frame['btc_fwd_90d'],
+        'correct': frame['btc_correct'],
+    })
 
 
 # ---------------------------------------------------------------------------
@@ -309,60 +277,7 @@ def score_walk_forward(
     folds: list[dict],
 ) -> dict:
     """Score each walk-forward fold. Same structure as main backtest."""
-    fold_scores = []
-    fold_details = []
-
-    for fold in folds:
-        mask = (
-            (df['date'] >= fold['test_start'].strftime('%Y-%m-%d'))
-            & (df['date'] <= fold['test_end'].strftime('%Y-%m-%d'))
-        )
-        fold_df = df[mask]
-
-        if fold_df.empty:
-            fold_details.append({
-                'fold': fold['fold'],
-                'test_start': fold['test_start'].strftime('%Y-%m-%d'),
-                'test_end': fold['test_end'].strftime('%Y-%m-%d'),
-                'evaluations': 0,
-                'score': None,
-            })
-            continue
-
-        valid_scores = fold_df['correct'].dropna()
-        if valid_scores.empty:
-            continue
-
-        fold_score = float(valid_scores.mean()) * 100
-        fold_scores.append(fold_score)
-
-        # Per-bucket counts
-        bucket_counts = fold_df['liquidity_bucket'].value_counts().to_dict()
-
-        fold_details.append({
-            'fold': fold['fold'],
-            'test_start': fold['test_start'].strftime('%Y-%m-%d'),
-            'test_end': fold['test_end'].strftime('%Y-%m-%d'),
-            'evaluations': int(len(valid_scores)),
-            'score': round(fold_score, 1),
-            'bucket_counts': bucket_counts,
-        })
-
-    if not fold_scores:
-        return {'fold_details': fold_details, 'mean': None, 'std': None, 'sharpe': None}
-
-    mean_score = float(np.mean(fold_scores))
-    std_score = float(np.std(fold_scores, ddof=1)) if len(fold_scores) > 1 else 0.0
-    sharpe = mean_score / std_score if std_score > 0 else float('inf')
-
-    return {
-        'fold_details': fold_details,
-        'fold_scores': [round(s, 1) for s in fold_scores],
-        'mean': round(mean_score, 1),
-        'std': round(std_score, 1),
-        'sharpe': round(sharpe, 2),
-        'n_folds': len(fold_scores),
-    }
+    return engine.score_walk_forward(df, folds, 'correct', 'liquidity_bucket', 'bucket_counts')
 
 
 # ---------------------------------------------------------------------------
@@ -378,84 +293,101 @@ def run_cpcv(
     embargo_months: int = 1,
 ) -> dict:
     """Run CPCV on the Bitcoin/Liquidity validation results."""
-    df_sorted = df.sort_values('date').reset_index(drop=True)
-    dates = pd.to_datetime(df_sorted['date'])
-    n = len(df_sorted)
-
-    if n < k:
-        return {'pbo': None, 'n_paths': 0}
-
-    group_size = n // k
-    groups = []
-    for i in range(k):
-        start_idx = i * group_size
-        end_idx = start_idx + group_size if i < k - 1 else n
-        groups.append(list(range(start_idx, end_idx)))
+    return engine.run_cpcv(
+        df, 'correct', k=k, p=p, purge_months=purge_months, embargo_months=embargo_months,
+        min_rows=k, include_scores=False,
+    )
 
-    test_combos = list(combinations(range(k), p))
 
-    oos_scores = []
-    is_scores = []
+# ---------------------------------------------------------------------------
+# Bootstrap / permutation significance
+# ---------------------------------------------------------------------------
 
-    for combo in test_combos:
-        test_indices = set()
-        for g in combo:
-            test_indices.update(groups[g])
 
-        train_indices = set(range(n)) - test_indices
+def compute_significance(
+    df: pd.DataFrame,
+    n_resamples: int = significance.DEFAULT_RESAMPLES,
+    block_size: int = significance.DEFAULT_BLOCK_SIZE,
+    seed: int = 0,
+    workers: Optional[int] = None,
+) -> dict:
+    """
+    Resampled confidence intervals for the hit rate, overall and per
+    liquidity bucket, and a permutation test of the overall hit rate
+    against liquidity expectations shuffled relative to Bitcoin returns.
+    """
+    df = df.sort_values('date').reset_index(drop=True)
+    return {
+        'bootstrap': significance.bootstrap_ci(
+            df['correct'], df['liquidity_bucket'], ['Expanding', 'Neutral', 'Contracting'],
+            n_resamples=n_resamples, block_size=block_size, seed=seed, workers=workers,
+        ),
+        'permutation': significance.permutation_test(
+            {'btc': df['expected_direction'].to_numpy()},
+            {'btc': df['btc_fwd_90d'].to_numpy(dtype='float64')},
+            n_resamples=n_resamples, block_size=block_size, seed=seed, workers=workers,
+        ),
+    }
 
-        purge_days = purge_months * 30
-        embargo_days = embargo_months * 30
 
-        test_dates = dates.iloc[sorted(test_indices)]
-        if test_dates.empty:
-            continue
+# ---------------------------------------------------------------------------
+# Plausibility checks
+# ---------------------------------------------------------------------------
 
-        test_start = test_dates.min()
-        test_end = test_dates.max()
-
-        purged_train = set()
-        for idx in train_indices:
-            obs_date = dates.iloc[idx]
-            if (test_start - pd.Timedelta(days=purge_days)) <= obs_date < test_start:
-                continue
-            if test_end < obs_date <= (test_end + pd.Timedelta(days=embargo_days)):
-                continue
-            purged_train.add(idx)
-
-        test_df = df_sorted.iloc[sorted(test_indices)]
-        test_scores = test_df['correct'].dropna()
-        if test_scores.empty:
-            continue
-        oos_score = float(test_scores.mean())
 
-        train_df = df_sorted.iloc[sorted(purged_train)]
-        train_scores = train_df['correct'].dropna()
-        if train_scores.empty:
-            continue
-        is_score = float(train_scores.mean())
+def _check_2020_2021_expansion(df: pd.DataFrame) -> dict:
+    # During 2020-2021 expansion, model should predict bullish
+    expansion_period = engine.rows_between(df, '2020-06-01', '2021-12-31')
+    if expansion_period.empty:
+        return {'pass': True, 'note': 'No evaluation dates in range'}
 
-        oos_scores.append(oos_score)
-        is_scores.append(is_score)
+    expanding_evals = expansion_period[
+        expansion_period['liquidity_bucket'] == 'Expanding'
+    ]
+    expanding_pct = len(expanding_evals) / len(expansion_period)
+    return {
+        'pass': bool(expanding_pct > 0.5),
+        'expanding_pct': round(expanding_pct * 100, 1),
+        'expanding_count': int(len(expanding_evals)),
+        'total_count': int(len(expansion_period)),
+        'note': 'Majority of evals should classify as Expanding during 2020-2021 QE',
+    }
 
-    if not oos_scores:
-        return {'pbo': None, 'n_paths': 0}
 
-    n_overfit = sum(1 for oos, ins in zip(oos_scores, is_scores) if oos < ins)
-    pbo = n_overfit / len(oos_scores)
+def _check_2022_contraction(df: pd.DataFrame) -> dict:
+    # During 2022, model should see contraction
+    contraction_period = engine.rows_between(df, '2022-01-01', '2022-12-31')
+    if contraction_period.empty:
+        return {'pass': True, 'note': 'No evaluation dates in range'}
 
+    contracting_evals = contraction_period[
+        contraction_period['liquidity_bucket'] == 'Contracting'
+    ]
+    contracting_pct = len(contracting_evals) / len(contraction_period)
     return {
-        'pbo': round(pbo, 3),
-        'n_paths': len(oos_scores),
-        'oos_mean': round(float(np.mean(oos_scores)) * 100, 1),
-        'oos_std': round(float(np.std(oos_scores)) * 100, 1),
-        'is_mean': round(float(np.mean(is_scores)) * 100, 1),
+        'pass': bool(contracting_pct > 0.3),  # At least 30% contracting
+        'contracting_pct': round(contracting_pct * 100, 1),
+        'contracting_count': int(len(contracting_evals)),
+        'total_count': int(len(contraction_period)),
+        'note': 'Contraction should be present during 2022 QT',
     }
 
 
-# ---------------------------------------------------------------------------
-# Plausibility checks
-# ---------------------------------------------------------------------------
+def _check_expanding_beats_contracting(df: pd.DataFrame) -> Optional[dict]:
+    # Expanding avg return > Contracting avg return
+    expanding_df = df[df['liquidity_bucket'] == 'Expanding']
+    contracting_df = df[df['liquidity_bucket'] == 'Contracting']
+    if expanding_df.empty or contracting_df.empty:
+        return None
+
+    exp_avg = expanding_df['btc_fwd_90d'].dropna().mean()
+    con_avg = contracting_df['btc_fwd_90d'].dropna().mean()
+    return {
+        'pass': bool(exp_avg > con_avg),
+        'expanding_avg_90d': round(float(exp_avg) * 100, 2),
+        'contracting_avg_90d': round(float(con_avg) * 100, 2),
+        'note': 'Expanding liquidity should yield higher Bitcoin returns than Contracting',
+    }
 
 
 def check_plausibility(df: pd.DataFrame) -> dict:
@@ -464,71 +396,13 @@ def check_plausibility(df: pd.DataFrame) -> dict:
 
     1. 2020-2021 liquidity expansion should predict bullish Bitcoin (expected: yes)
     2. 2022 liquidity contraction should predict bearish Bitcoin (expected: yes)
+    3. Expanding should out-return Contracting (when both occur)
     """
-    checks = {}
-
-    # Check 1: During 2020-2021 expansion, model should predict bullish
-    expansion_period = df[
-        (df['date'] >= '2020-06-01') & (df['date'] <= '2021-12-31')
-    ]
-    if not expansion_period.empty:
-        expanding_evals = expansion_period[
-            expansion_period['liquidity_bucket'] == 'Expanding'
-        ]
-        expanding_pct = len(expanding_evals) / len(expansion_period)
-        checks['2020_2021_liquidity_expansion'] = {
-            'pass': bool(expanding_pct > 0.5),
-            'expanding_pct': round(expanding_pct * 100, 1),
-            'expanding_count': int(len(expanding_evals)),
-            'total_count': int(len(expansion_period)),
-            'note': 'Majority of evals should classify as Expanding during 2020-2021 QE',
-        }
-    else:
-        checks['2020_2021_liquidity_expansion'] = {
-            'pass': True,
-            'note': 'No evaluation dates in range',
-        }
-
-    # Check 2: During 2022, model should see contraction
-    contraction_period = df[
-        (df['date'] >= '2022-01-01') & (df['date'] <= '2022-12-31')
-    ]
-    if not contraction_period.empty:
-        contracting_evals = contraction_period[
-            contraction_period['liquidity_bucket'] == 'Contracting'
-        ]
-        contracting_pct = len(contracting_evals) / len(contraction_period)
-        checks['2022_liquidity_contraction'] = {
-            'pass': bool(contracting_pct > 0.3),  # At least 30% contracting
-            'contracting_pct': round(contracting_pct * 100, 1),
-            'contracting_count': int(len(contracting_evals)),
-            'total_count': int(len(contraction_period)),
-            'note': 'Contraction should be present during 2022 QT',
-        }
-    else:
-        checks['2022_liquidity_contraction'] = {
-            'pass': True,
-            'note': 'No evaluation dates in range',
-        }
-
-    # Check 3: Expanding avg return > Contracting avg return
-    expanding_df = df[df['liquidity_bucket'] == 'Expanding']
-    contracting_df = df[df['liquidity_bucket'] == 'Contracting']
-    if not expanding_df.empty and not contracting_df.empty:
-        exp_avg = expanding_df['btc_fwd_90d'].dropna().mean()
-        con_avg = contracting_df['btc_fwd_90d'].dropna().mean()
-        checks['expanding_beats_contracting_returns'] = {
-            'pass': bool(exp_avg > con_avg),
-            'expanding_avg_90d': round(float(exp_avg) * 100, 2),
-            'contracting_avg_90d': round(float(con_avg) * 100, 2),
-            'note': 'Expanding liquidity should yield higher Bitcoin returns than Contracting',
-        }
-
-    all_pass = all(c.get('pass', False) for c in checks.values())
-    return {
-        'all_pass': all_pass,
-        'checks': checks,
-    }
+    return engine.run_checks(df, {
+        '2020_2021_liquidity_expansion': _check_2020_2021_expansion,
+        '2022_liquidity_contraction': _check_2022_contraction,
+        'expanding_beats_contracting_returns': _check_expanding_beats_contracting,
+    })
 
 
 # ---------------------------------------------------------------------------
@@ -543,6 +417,7 @@ def generate_report(
     plausibility: dict,
     cpcv_result: dict,
     baseline_accuracy: float = 34.8,
+    significance_result: Optional[dict] = None,
 ) -> str:
     """Generate comprehensive markdown backtest report for Bitcoin/Liquidity."""
     lines = []
@@ -611,51 +486,12 @@ def generate_report(
         a90 = f'{stats.get("avg_fwd_90d", "—")}%' if 'avg_fwd_90d' in stats else '—'
         lines.append(f'| {state} | {exp} | {count} | {acc} | {a30} | {a60} | {a90} |')
 
-    # === Walk-Forward Results ===
-    lines.append('\n## Walk-Forward Validation')
-    lines.append('')
-    if wf_scores.get('mean') is not None:
-        lines.append(f'- Mean fold score: {wf_scores["mean"]}%')
-        lines.append(f'- Std deviation: {wf_scores["std"]}%')
-        lines.append(f'- Sharpe-like ratio: {wf_scores["sharpe"]}')
-        lines.append(f'- Number of folds: {wf_scores["n_folds"]}')
+    lines.extend(engine.walk_forward_section(wf_scores))
+    lines.extend(engine.cpcv_section(cpcv_result))
+    lines.extend(engine.plausibility_section(plausibility))
 
-    lines.append('')
-    lines.append('| Fold | Period | Evaluations | Score |')
-    lines.append('|------|--------|-------------|-------|')
-    for fd in wf_scores.get('fold_details', []):
-        score_str = f'{fd["score"]}%' if fd.get('score') is not None else '—'
-        lines.append(
-            f'| {fd["fold"]} | {fd["test_start"]} to {fd["test_end"]} | '
-            f'{fd["evaluations"]} | {score_str} |'
-        )
-
-    # === CPCV ===
-    lines.append('\n## Combinatorial Purged Cross-Validation (CPCV)')
-    lines.append('')
-    if cpcv_result.get('pbo') is not None:
-        pbo = cpcv_result['pbo']
-        status = 'PASS' if pbo <= 0.5 else 'FAIL (likely overfit)'
-        lines.append(f'- PBO (Probability of Backtest Overfitting): {pbo} ({status})')
-        lines.append(f'- Number of paths tested: {cpcv_result["n_paths"]}')
-        lines.append(f'- OOS mean accuracy: {cpcv_result["oos_mean"]}%')
-        lines.append(f'- OOS std: {cpcv_result["oos_std"]}%')
-        lines.append(f'- IS mean accuracy: {cpcv_result["is_mean"]}%')
-    else:
-        lines.append('- CPCV could not be computed (insufficient data)')
-
-    # === Economic Plausibility ===
-    lines.append('\n## Economic Plausibility Checks')
-    lines.append('')
-    all_pass = plausibility.get('all_pass', False)
-    lines.append(f'**Overall: {"PASS" if all_pass else "FAIL"}**')
-    lines.append('')
-    for check_name, check_data in plausibility.get('checks', {}).items():
-        status = 'PASS' if check_data.get('pass') else 'FAIL'
-        lines.append(f'- **{check_name}**: {status}')
-        for k, v in check_data.items():
-            if k != 'pass':
-                lines.append(f'  - {k}: {v}')
+    if significance_result is not None:
+        lines.extend(significance.significance_section(significance_result, 'Liquidity State'))
 
     # === Recommendation ===
     lines.append('\n## Recommendation for Phase 11 Crypto Page')
@@ -769,10 +605,19 @@ def main():
     plausibility = check_plausibility(df)
     print(f'  All checks pass: {plausibility["all_pass"]}')
 
-    # Step 7: Generate report
+    # Step 7: Bootstrap CIs and permutation test
+    print(f'\nResampling significance ({significance.DEFAULT_RESAMPLES} resamples)...')
+    significance_result = compute_significance(df)
+    overall_ci = significance_result['bootstrap']['overall']
+    if overall_ci.get('n'):
+        print(f'  Accuracy 95% CI: {overall_ci["ci_low"]}% – {overall_ci["ci_high"]}%')
+    print(f'  Permutation p-value: {significance_result["permutation"].get("p_value")}')
+
+    # Step 8: Generate report
     print('\nGenerating report...')
     report = generate_report(
         df, agg_scores, wf_scores, plausibility, cpcv_result,
+        significance_result=significance_result,
     )
 
     report_path = RESULTS_DIR / 'bitcoin_liquidity_report.md'
@@ -788,6 +633,7 @@ def main():
         'per_bucket': agg_scores.get('per_bucket', {}),
         'plausibility': plausibility,
         'cpcv': cpcv_result,
+        'significance': significance_result,
     }
     json_path = RESULTS_DIR / 'bitcoin_liquidity_scores.json'
     with open(json_path, 'w') as f:
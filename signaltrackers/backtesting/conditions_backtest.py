@@ -24,7 +24,7 @@ import math
 import sys
 import warnings
 from datetime import datetime
-from itertools import combinations
+from functools import partial
 from pathlib import Path
 from typing import Optional
 
@@ -36,9 +36,10 @@ from signaltrackers.backtesting.backtest_utils import (
     NEUTRAL_THRESHOLD,
     load_csv,
     load_scoring_assets,
-    compute_forward_return,
-    compute_max_drawdown,
+    max_drawdown_vector,
 )
+from signaltrackers.backtesting import engine, significance
+from signaltrackers.backtesting.sweep import run_sweep
 
 # Market conditions engine (quadrant-led; no verdict in engine)
 from signaltrackers.market_conditions import (
@@ -61,7 +62,7 @@ RESULTS_DIR = Path(__file__).resolve().parent / 'results'
 # ---------------------------------------------------------------------------
 
 FORWARD_WINDOWS = [30, 60, 90]
-EVAL_FREQUENCY_MONTHS = 1
+EVAL_FREQUENCY_MONTHS = engine.EVAL_FREQUENCY_MONTHS
 
 # Quadrant labels in expected real-return ordering (best → worst)
 QUADRANT_LABELS = ['Goldilocks', 'Deflation Risk', 'Reflation', 'Stagflation']
@@ -337,11 +338,7 @@ def generate_eval_dates(
     end_year: int,
 ) -> list[pd.Timestamp]:
     """Generate monthly evaluation dates for the given range."""
-    return list(pd.date_range(
-        start=f'{start_year}-01-01',
-        end=f'{end_year}-12-31',
-        freq=f'{EVAL_FREQUENCY_MONTHS}ME',
-    ))
+    return list(engine.monthly_eval_dates(f'{start_year}-01-01', f'{end_year}-12-31'))
 
 
 def generate_folds(
@@ -355,102 +352,210 @@ def generate_folds(
     Returns list of dicts with 'fold', 'test_start', 'test_end' keys.
     Training data is everything before test_start (expanding window).
     """
-    folds = []
-    test_start_year = start_year
-    step_years = test_months // 12
-    fold_num = 1
+    return engine.generate_folds(start_year, end_year, test_months)
 
-    while test_start_year < end_year:
-        test_end_year = min(test_start_year + step_years, end_year)
 
-        folds.append({
-            'fold': fold_num,
-            'test_start': pd.Timestamp(f'{test_start_year}-01-01'),
-            'test_end': pd.Timestamp(f'{test_end_year}-01-01') - pd.Timedelta(days=1),
-        })
+# (column in the study history, source history, source column, default)
+_DIMENSION_COLUMNS = [
+    ('quadrant', 'quadrant', 'quadrant', None),
+    ('liquidity_state', 'liquidity', 'state', None),
+    ('risk_state', 'risk', 'state', 'Normal'),
+    ('policy_stance', 'policy', 'stance', 'Neutral'),
+]
 
-        test_start_year = test_end_year
-        fold_num += 1
 
-    return folds
+def _conditions_history(histories: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    The dimension histories merged into one, dated at every date any of
+    them changes.
 
+    Each column holds its dimension's state as of the row's date, so an
+    as-of lookup of the merged history gives every dimension's as-of state.
+    Missing risk and policy states degrade to 'Normal' and 'Neutral'.
+    """
+    frames = [histories[key]['date'] for _, key, _, _ in _DIMENSION_COLUMNS if key in histories]
+    dates = pd.DatetimeIndex(np.unique(np.concatenate([f.to_numpy(dtype='datetime64[ns]') for f in frames]))
+                             if frames else [])
+    merged = {'date': dates}
+    for column, key, source, default in _DIMENSION_COLUMNS:
+        if key in histories:
+            values = engine.asof_values(histories[key], dates, source)
+        else:
+            values = np.full(len(dates), None, dtype=object)
+        if default is not None:
+            values[[v is None for v in values]] = default
+        merged[column] = values
+    return pd.DataFrame(merged)
 
-def run_backtest(
+
+def _override_sp500(
+    directions: dict[str, np.ndarray],
+    risk_states,
+    override_risk_states,
+) -> dict[str, np.ndarray]:
+    """Flip the S&P 500 expectation to negative where the risk state is in override_risk_states."""
+    if 'sp500' not in directions:
+        return directions
+    override = pd.Series(risk_states).isin(list(override_risk_states)).to_numpy()
+    return {**directions, 'sp500': np.where(override, 'negative', directions['sp500']).astype(object)}
+
+
+def _risk_override(
+    frame: pd.DataFrame,
+    directions: dict[str, np.ndarray],
+    override_risk_states=('Stressed',),
+) -> dict[str, np.ndarray]:
+    """Study direction override: risk states in override_risk_states turn the S&P 500 negative."""
+    return _override_sp500(directions, frame['signal_risk_state'], override_risk_states)
+
+
+def _cpi_yoy_at(cpi_series: Optional[pd.Series], dates) -> list[Optional[float]]:
+    """compute_cpi_yoy at every date."""
+    return [compute_cpi_yoy(cpi_series, d) for d in pd.DatetimeIndex(dates)]
+
+
+def _real_returns(nominal: np.ndarray, cpi_yoy: list[Optional[float]]) -> np.ndarray:
+    """90-day real return = nominal - (cpi_yoy / 4); NaN where CPI is unavailable."""
+    quarterly_cpi = np.array([np.nan if c is None else c / 4 for c in cpi_yoy], dtype='float64')
+    return nominal - quarterly_cpi
+
+
+def _real_sp500_returns(
+    dates: pd.DatetimeIndex,
+    returns: dict[str, np.ndarray],
+    cpi_series: Optional[pd.Series] = None,
+) -> dict[str, np.ndarray]:
+    """Study scored-return override: the S&P 500 is scored on its real return where CPI allows."""
+    if 'sp500' not in returns:
+        return {}
+    real = _real_returns(returns['sp500'], _cpi_yoy_at(cpi_series, dates))
+    return {'sp500': np.where(np.isnan(real), returns['sp500'], real)}
+
+
+def quadrant_study(
     histories: dict[str, pd.DataFrame],
     scoring_assets: dict[str, pd.Series],
     cpi_series: Optional[pd.Series] = None,
     start_year: int = FOLD_START_YEAR,
     end_year: int = FOLD_END_YEAR,
-) -> pd.DataFrame:
+    override_risk_states=('Stressed',),
+) -> engine.SignalStudy:
     """
-    Run the conditions backtest over all evaluation dates.
+    The conditions backtest as a study: quadrant expectations scored against
+    90-day forward returns, with the S&P 500 expectation turned negative
+    under override_risk_states and scored on its real return.
 
-    Returns DataFrame with one row per evaluation date including
-    quadrant, dimension states, forward returns (nominal + real), and scores.
+    Unrecognized quadrants fall back to the Goldilocks expectations.
     """
-    # Need 90 days of forward data
-    last_dates = [s.index[-1] for s in scoring_assets.values()]
-    last_data = min(last_dates)
-    end_date = min(pd.Timestamp(f'{end_year}-12-31'), last_data - pd.Timedelta(days=90))
-    start_date = pd.Timestamp(f'{start_year}-01-01')
-
-    eval_dates = pd.date_range(
-        start=start_date,
-        end=end_date,
-        freq=f'{EVAL_FREQUENCY_MONTHS}ME',
+    return engine.SignalStudy(
+        name='market_conditions',
+        history=_conditions_history(histories),
+        state_col='quadrant',
+        prices=dict(scoring_assets),
+        expectations=QUADRANT_EXPECTATIONS,
+        default_directions=QUADRANT_EXPECTATIONS['Goldilocks'],
+        weights={asset_key: SCORING_ASSETS[asset_key]['weight'] if asset_key in SCORING_ASSETS else 0.0
+                 for asset_key in scoring_assets},
+        windows=tuple(FORWARD_WINDOWS),
+        score_window=90,
+        start_year=start_year,
+        end_year=end_year,
+        test_months=FOLD_TEST_MONTHS,
+        carry=('liquidity_state', 'risk_state', 'policy_stance'),
+        direction_override=partial(_risk_override, override_risk_states=tuple(override_risk_states)),
+        scored_returns=partial(_real_sp500_returns, cpi_series=cpi_series),
     )
 
-    rows = []
-    for eval_date in eval_dates:
-        result = classify_conditions(histories, eval_date)
-        if result is None:
-            continue
 
-        row = {
-            'date': eval_date.strftime('%Y-%m-%d'),
-            'quadrant': result['quadrant'],
-            'liquidity_state': result['liquidity_state'],
-            'risk_state': result['risk_state'],
-            'policy_stance': result['policy_stance'],
-        }
+def _add_conditions_columns(
+    frame: pd.DataFrame,
+    scoring_assets: dict[str, pd.Series],
+    cpi_series: Optional[pd.Series],
+) -> pd.DataFrame:
+    """Add the CPI YoY, real S&P 500 return and S&P 500 drawdown columns to a study frame."""
+    frame = frame.copy()
+    dates = pd.to_datetime(frame['date'])
+    cpi_yoy = _cpi_yoy_at(cpi_series, dates)
+    frame['cpi_yoy'] = np.array([np.nan if c is None else c for c in cpi_yoy], dtype='float64')
+    if 'sp500_fwd_90d' in frame.columns:
+        frame['sp500_real_fwd_90d'] = _real_returns(frame['sp500_fwd_90d'].to_numpy(dtype='float64'), cpi_yoy)
+    else:
+        frame['sp500_real_fwd_90d'] = np.nan
+    if 'sp500' in scoring_assets:
+        frame['sp500_max_dd_90d'] = max_drawdown_vector(scoring_assets['sp500'], dates, 90)
+    return frame
 
-        # Forward returns (nominal)
-        asset_returns_90d = {}
-        for asset_key, price_series in scoring_assets.items():
-            for w in FORWARD_WINDOWS:
-                ret = compute_forward_return(price_series, eval_date, w)
-                row[f'{asset_key}_fwd_{w}d'] = ret
-                if w == 90:
-                    asset_returns_90d[asset_key] = ret
-
-        # S&P 500 real return = nominal - (cpi_yoy / 4) for 90-day window
-        sp500_nominal_90d = asset_returns_90d.get('sp500')
-        real_sp500_90d = None
-        cpi_yoy = compute_cpi_yoy(cpi_series, eval_date)
-        row['cpi_yoy'] = cpi_yoy
-
-        if sp500_nominal_90d is not None and cpi_yoy is not None:
-            real_sp500_90d = sp500_nominal_90d - (cpi_yoy / 4)
-        row['sp500_real_fwd_90d'] = real_sp500_90d
-
-        # S&P 500 max drawdown
-        if 'sp500' in scoring_assets:
-            row['sp500_max_dd_90d'] = compute_max_drawdown(
-                scoring_assets['sp500'], eval_date, 90
-            )
 
-        # Score using quadrant expectations + real returns for S&P 500
-        eval_score = score_single_evaluation(
-            result['expectations'], asset_returns_90d,
-            real_sp500_return=real_sp500_90d,
-        )
-        row['multi_asset_score'] = eval_score['weighted_score']
-        for asset_key, score in eval_score['asset_scores'].items():
-            row[f'{asset_key}_correct'] = score
+def _optional_column(values: pd.Series) -> pd.Series:
+    """Float column with None (object dtype) throughout when it has no values."""
+    if values.notna().any():
+        return values
+    return pd.Series([None] * len(values), index=values.index, dtype=object)
+
+
+def _results_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    A conditions study frame in run_backtest's layout: dimension states,
+    forward returns, CPI and drawdown columns, then the multi-asset score
+    and the per-asset scores of scoring assets scored at least once.
+    """
+    if frame.empty:
+        return pd.DataFrame()
+    columns = {
+        'date': frame['date'],
+        'quadrant': frame['state'],
+        'liquidity_state': frame['signal_liquidity_state'],
+        'risk_state': frame['signal_risk_state'],
+        'policy_stance': frame['signal_policy_stance'],
+    }
+    for col in frame.columns:
+        if '_fwd_' in col and col != 'sp500_real_fwd_90d':
+            columns[col] = _optional_column(frame[col])
+    for col in ('cpi_yoy', 'sp500_real_fwd_90d', 'sp500_max_dd_90d'):
+        if col in frame.columns:
+            columns[col] = _optional_column(frame[col])
+    columns['multi_asset_score'] = _optional_column(frame['weighted_score'])
+    for asset_key in SCORING_ASSETS:
+        col = f'{asset_key}_correct'
+        if col in frame.columns and frame[col].notna().any():
+            columns[col] = frame[col]
+    return pd.DataFrame(columns).reset_index(drop=True)
+
+
+def run_backtest(
+    histories: dict[str, pd.DataFrame],
+    scoring_assets: dict[str, pd.Series],
+    cpi_series: Optional[pd.Series] = None,
+    start_year: int = FOLD_START_YEAR,
+    end_year: int = FOLD_END_YEAR,
+) -> pd.DataFrame:
+    """
+    Run the conditions backtest over all evaluation dates.
 
-        rows.append(row)
+    Returns DataFrame with one row per evaluation date including
+    quadrant, dimension states, forward returns (nominal + real), and scores.
+    Built from quadrant_study(); run_conditions_study() returns the same
+    study as a BacktestResult.
+    """
+    study = quadrant_study(histories, scoring_assets, cpi_series, start_year, end_year)
+    frame = _add_conditions_columns(engine.build_frame(study), scoring_assets, cpi_series)
+    return _results_frame(frame)
 
-    return pd.DataFrame(rows)
+
+def run_conditions_study(
+    histories: dict[str, pd.DataFrame],
+    scoring_assets: dict[str, pd.Series],
+    cpi_series: Optional[pd.Series] = None,
+    start_year: int = FOLD_START_YEAR,
+    end_year: int = FOLD_END_YEAR,
+) -> engine.BacktestResult:
+    """
+    Run quadrant_study() through the engine. The result frame is the study
+    frame plus the cpi_yoy, sp500_real_fwd_90d and sp500_max_dd_90d columns.
+    """
+    result = engine.run_study(quadrant_study(histories, scoring_assets, cpi_series, start_year, end_year))
+    result.frame = _add_conditions_columns(result.frame, scoring_assets, cpi_series)
+    return result
 
 
 # ---------------------------------------------------------------------------
@@ -467,60 +572,7 @@ def score_walk_forward(
 
     Returns dict with per-fold scores, overall mean, std, and Sharpe-like ratio.
     """
-    fold_scores = []
-    fold_details = []
-
-    for fold in folds:
-        mask = (
-            (df['date'] >= fold['test_start'].strftime('%Y-%m-%d'))
-            & (df['date'] <= fold['test_end'].strftime('%Y-%m-%d'))
-        )
-        fold_df = df[mask]
-
-        if fold_df.empty:
-            fold_details.append({
-                'fold': fold['fold'],
-                'test_start': fold['test_start'].strftime('%Y-%m-%d'),
-                'test_end': fold['test_end'].strftime('%Y-%m-%d'),
-                'evaluations': 0,
-                'score': None,
-            })
-            continue
-
-        valid_scores = fold_df['multi_asset_score'].dropna()
-        if valid_scores.empty:
-            continue
-
-        fold_score = float(valid_scores.mean()) * 100
-        fold_scores.append(fold_score)
-
-        # Per-quadrant counts in this fold
-        quadrant_counts = fold_df['quadrant'].value_counts().to_dict()
-
-        fold_details.append({
-            'fold': fold['fold'],
-            'test_start': fold['test_start'].strftime('%Y-%m-%d'),
-            'test_end': fold['test_end'].strftime('%Y-%m-%d'),
-            'evaluations': int(len(valid_scores)),
-            'score': round(fold_score, 1),
-            'quadrant_counts': quadrant_counts,
-        })
-
-    if not fold_scores:
-        return {'fold_details': fold_details, 'mean': None, 'std': None, 'sharpe': None}
-
-    mean_score = float(np.mean(fold_scores))
-    std_score = float(np.std(fold_scores, ddof=1)) if len(fold_scores) > 1 else 0.0
-    sharpe = mean_score / std_score if std_score > 0 else float('inf')
-
-    return {
-        'fold_details': fold_details,
-        'fold_scores': [round(s, 1) for s in fold_scores],
-        'mean': round(mean_score, 1),
-        'std': round(std_score, 1),
-        'sharpe': round(sharpe, 2),
-        'n_folds': len(fold_scores),
-    }
+    return engine.score_walk_forward(df, folds, 'multi_asset_score', 'quadrant', 'quadrant_counts')
 
 
 # ---------------------------------------------------------------------------
@@ -668,80 +720,66 @@ def score_results(df: pd.DataFrame) -> dict:
 # ---------------------------------------------------------------------------
 
 
-def check_plausibility(df: pd.DataFrame) -> dict:
-    """
-    Hard-fail plausibility checks.
+def _check_march_2020(df: pd.DataFrame) -> dict:
+    # March 2020 must NOT have Goldilocks as DOMINANT quadrant
+    mar_2020 = engine.rows_between(df, '2020-02-15', '2020-04-15')
+    if mar_2020.empty:
+        return {'pass': True, 'note': 'No evaluation dates in range'}
 
-    Returns dict with pass/fail for each check and details.
-    """
-    checks = {}
-
-    # Check 1: March 2020 must NOT have Goldilocks as DOMINANT quadrant
-    mar_2020 = df[
-        (df['date'] >= '2020-02-15') & (df['date'] <= '2020-04-15')
-    ]
-    if not mar_2020.empty:
-        quad_counts = mar_2020['quadrant'].value_counts()
-        dominant = quad_counts.index[0] if not quad_counts.empty else None
-        checks['march_2020_not_goldilocks'] = {
-            'pass': dominant != 'Goldilocks',
-            'dominant_quadrant': dominant,
-            'quadrants_found': mar_2020['quadrant'].unique().tolist(),
-            'quadrant_distribution': quad_counts.to_dict(),
-        }
-    else:
-        checks['march_2020_not_goldilocks'] = {
-            'pass': True,
-            'note': 'No evaluation dates in range',
-        }
+    quad_counts = mar_2020['quadrant'].value_counts()
+    dominant = quad_counts.index[0] if not quad_counts.empty else None
+    return {
+        'pass': dominant != 'Goldilocks',
+        'dominant_quadrant': dominant,
+        'quadrants_found': mar_2020['quadrant'].unique().tolist(),
+        'quadrant_distribution': quad_counts.to_dict(),
+    }
 
-    # Check 2: 2022 must have Stagflation present
-    year_2022 = df[
-        (df['date'] >= '2022-01-01') & (df['date'] <= '2022-12-31')
-    ]
-    if not year_2022.empty:
-        quad_counts = year_2022['quadrant'].value_counts()
-        quadrants_present = quad_counts.index.tolist()
-        checks['2022_stagflation_present'] = {
-            'pass': 'Stagflation' in quadrants_present,
-            'quadrants_found': quadrants_present,
-            'quadrant_distribution': quad_counts.to_dict(),
-        }
-    else:
-        checks['2022_stagflation_present'] = {
-            'pass': True,
-            'note': 'No evaluation dates in range',
-        }
 
-    # Check 3: Quadrant stability — average duration ≥ 3 months
-    if not df.empty:
-        df_sorted = df.sort_values('date').reset_index(drop=True)
-        durations = []
-        current_quad = df_sorted.iloc[0]['quadrant']
-        current_start = 0
-        for i in range(1, len(df_sorted)):
-            if df_sorted.iloc[i]['quadrant'] != current_quad:
-                durations.append(i - current_start)
-                current_quad = df_sorted.iloc[i]['quadrant']
-                current_start = i
-        durations.append(len(df_sorted) - current_start)
-
-        avg_duration = float(np.mean(durations)) if durations else 0.0
-        checks['quadrant_stability'] = {
-            'pass': avg_duration >= 3.0,
-            'avg_duration_months': round(avg_duration, 1),
-            'total_transitions': len(durations) - 1,
-            'min_duration': int(min(durations)) if durations else 0,
-            'max_duration': int(max(durations)) if durations else 0,
-        }
+def _check_2022_stagflation(df: pd.DataFrame) -> dict:
+    # 2022 must have Stagflation present
+    year_2022 = engine.rows_between(df, '2022-01-01', '2022-12-31')
+    if year_2022.empty:
+        return {'pass': True, 'note': 'No evaluation dates in range'}
+
+    quad_counts = year_2022['quadrant'].value_counts()
+    quadrants_present = quad_counts.index.tolist()
+    return {
+        'pass': 'Stagflation' in quadrants_present,
+        'quadrants_found': quadrants_present,
+        'quadrant_distribution': quad_counts.to_dict(),
+    }
+
 
-    all_pass = all(c.get('pass', False) for c in checks.values())
+def _check_quadrant_stability(df: pd.DataFrame) -> Optional[dict]:
+    # Quadrant stability — average duration ≥ 3 months
+    if df.empty:
+        return None
+
+    durations = engine.run_lengths(df.sort_values('date')['quadrant'])
+    avg_duration = float(np.mean(durations))
     return {
-        'all_pass': all_pass,
-        'checks': checks,
+        'pass': avg_duration >= 3.0,
+        'avg_duration_months': round(avg_duration, 1),
+        'total_transitions': len(durations) - 1,
+        'min_duration': int(durations.min()),
+        'max_duration': int(durations.max()),
     }
 
 
+def check_plausibility(df: pd.DataFrame) -> dict:
+    """
+    Hard-fail plausibility checks.
+
+    Returns dict with pass/fail for each check and details.
+    """
+    return engine.run_checks(df, {
+        'march_2020_not_goldilocks': _check_march_2020,
+        '2022_stagflation_present': _check_2022_stagflation,
+        'quadrant_stability': _check_quadrant_stability,
+    })
+
+
 # ---------------------------------------------------------------------------
 # CPCV — Combinatorial Purged Cross-Validation
 # ---------------------------------------------------------------------------
@@ -764,85 +802,10 @@ def run_cpcv(
     Returns dict with PBO (probability of backtest overfitting) and
     distribution of out-of-sample scores.
     """
-    df_sorted = df.sort_values('date').reset_index(drop=True)
-    dates = pd.to_datetime(df_sorted['date'])
-    n = len(df_sorted)
-
-    # Split into k time-ordered groups
-    group_size = n // k
-    groups = []
-    for i in range(k):
-        start_idx = i * group_size
-        end_idx = start_idx + group_size if i < k - 1 else n
-        groups.append(list(range(start_idx, end_idx)))
-
-    # Generate all C(k,p) combinations of test groups
-    test_combos = list(combinations(range(k), p))
-
-    oos_scores = []  # Out-of-sample scores
-    is_scores = []   # In-sample scores
-
-    for combo in test_combos:
-        test_indices = set()
-        for g in combo:
-            test_indices.update(groups[g])
-
-        train_indices = set(range(n)) - test_indices
-
-        # Purge: remove training observations within purge_months of test boundaries
-        purge_days = purge_months * 30
-        embargo_days = embargo_months * 30
-
-        test_dates = dates.iloc[sorted(test_indices)]
-        if test_dates.empty:
-            continue
-
-        test_start = test_dates.min()
-        test_end = test_dates.max()
-
-        purged_train = set()
-        for idx in train_indices:
-            obs_date = dates.iloc[idx]
-            # Purge if within purge_months before test start
-            if (test_start - pd.Timedelta(days=purge_days)) <= obs_date < test_start:
-                continue
-            # Embargo if within embargo_months after test end
-            if test_end < obs_date <= (test_end + pd.Timedelta(days=embargo_days)):
-                continue
-            purged_train.add(idx)
-
-        # Score test set
-        test_df = df_sorted.iloc[sorted(test_indices)]
-        test_scores = test_df['multi_asset_score'].dropna()
-        if test_scores.empty:
-            continue
-        oos_score = float(test_scores.mean())
-
-        # Score train set
-        train_df = df_sorted.iloc[sorted(purged_train)]
-        train_scores = train_df['multi_asset_score'].dropna()
-        if train_scores.empty:
-            continue
-        is_score = float(train_scores.mean())
-
-        oos_scores.append(oos_score)
-        is_scores.append(is_score)
-
-    if not oos_scores:
-        return {'pbo': None, 'n_paths': 0}
-
-    # PBO = fraction of paths where OOS < IS (overfit)
-    n_overfit = sum(1 for oos, ins in zip(oos_scores, is_scores) if oos < ins)
-    pbo = n_overfit / len(oos_scores)
-
-    return {
-        'pbo': round(pbo, 3),
-        'n_paths': len(oos_scores),
-        'oos_mean': round(float(np.mean(oos_scores)) * 100, 1),
-        'oos_std': round(float(np.std(oos_scores)) * 100, 1),
-        'is_mean': round(float(np.mean(is_scores)) * 100, 1),
-        'oos_scores': [round(s * 100, 1) for s in oos_scores],
-    }
+    return engine.run_cpcv(
+        df, 'multi_asset_score',
+        k=k, p=p, purge_months=purge_months, embargo_months=embargo_months,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -907,12 +870,44 @@ def compute_dsr(
     }
 
 
+# ---------------------------------------------------------------------------
+# Bootstrap / permutation significance
+# ---------------------------------------------------------------------------
+
+
+def compute_significance(
+    df: pd.DataFrame,
+    n_resamples: int = significance.DEFAULT_RESAMPLES,
+    block_size: int = significance.DEFAULT_BLOCK_SIZE,
+    seed: int = 0,
+    workers: Optional[int] = None,
+) -> dict:
+    """
+    Resampled confidence intervals for the multi-asset hit rate, overall and
+    per quadrant, and a permutation test of the overall hit rate against
+    quadrant expectations shuffled relative to realized returns.
+    """
+    df = df.sort_values('date').reset_index(drop=True)
+    weights = {asset_key: config['weight'] for asset_key, config in SCORING_ASSETS.items()}
+    return {
+        'bootstrap': significance.bootstrap_ci(
+            df['multi_asset_score'], df['quadrant'], QUADRANT_LABELS,
+            n_resamples=n_resamples, block_size=block_size, seed=seed, workers=workers,
+        ),
+        'permutation': significance.permutation_test(
+            _expected_directions(df), _scored_returns(df), weights,
+            n_resamples=n_resamples, block_size=block_size, seed=seed, workers=workers,
+        ),
+    }
+
+
 # ---------------------------------------------------------------------------
 # Risk filter sensitivity analysis
 # ---------------------------------------------------------------------------
 
 # Configurations test how Stressed-override affects scoring.
-# Each config defines which risk states receive the Stressed S&P 500 override.
+# Each config defines which risk states receive the Stressed S&P 500 override;
+# 'override_risk_states' may list them explicitly for larger grids.
 RISK_FILTER_CONFIGS = [
     {'label': 'No risk filter (quadrant only)', 'stressed_override': False},
     {'label': 'Stressed override (default)', 'stressed_override': True},
@@ -920,104 +915,145 @@ RISK_FILTER_CONFIGS = [
 ]
 
 
+def _override_risk_states(config: dict) -> tuple[str, ...]:
+    """Risk states whose S&P 500 expectation a sensitivity config flips to negative."""
+    if 'override_risk_states' in config:
+        return tuple(config['override_risk_states'])
+    if not config.get('stressed_override', True):
+        return ()
+    if config.get('elevated_override', False):
+        return ('Stressed', 'Elevated')
+    return ('Stressed',)
+
+
+def _score_sensitivity_config(shared: dict, config: dict) -> dict:
+    """Sweep task: re-score the base backtest under one risk filter config."""
+    df = _rescore_with_overrides(shared['df'], _override_risk_states(config))
+    wf_scores = score_walk_forward(df, shared['folds'])
+    agg_scores = score_results(df)
+    cpcv_result = run_cpcv(df)
+
+    return {
+        'label': config['label'],
+        'composite_score': agg_scores['overall'].get('composite_score'),
+        'multi_asset_accuracy': agg_scores['overall'].get('multi_asset_accuracy'),
+        'wf_mean': wf_scores.get('mean'),
+        'wf_std': wf_scores.get('std'),
+        'wf_sharpe': wf_scores.get('sharpe'),
+        'fold_scores': wf_scores.get('fold_scores', []),
+        'real_return_ordering': agg_scores['overall'].get('real_return_ordering_correct'),
+        'drawdown_ordering': agg_scores['overall'].get('drawdown_ordering_correct'),
+        'cpcv_pbo': cpcv_result.get('pbo'),
+    }
+
+
 def run_risk_filter_sensitivity(
     histories: dict[str, pd.DataFrame],
     scoring_assets: dict[str, pd.Series],
     cpi_series: Optional[pd.Series] = None,
     start_year: int = FOLD_START_YEAR,
     end_year: int = FOLD_END_YEAR,
+    configs: Optional[list[dict]] = None,
+    workers: Optional[int] = None,
 ) -> list[dict]:
     """
     Test how risk-state filtering affects quadrant-led scoring.
 
     Since the quadrant directly determines expectations (no weights to vary),
-    sensitivity analysis focuses on the impact of risk overrides.
+    sensitivity analysis focuses on the impact of risk overrides. The
+    backtest runs once; each config (RISK_FILTER_CONFIGS by default) only
+    re-scores it, fanned across ``workers`` processes. Each result carries
+    the wall time of its task in 'seconds'.
     """
-    folds = generate_folds(start_year, end_year)
-    results = []
+    configs = RISK_FILTER_CONFIGS if configs is None else configs
+    df = run_backtest(histories, scoring_assets, cpi_series, start_year, end_year)
+    if df.empty:
+        return [{'label': config['label'], 'error': 'No results'} for config in configs]
 
-    for config in RISK_FILTER_CONFIGS:
-        label = config['label']
-        print(f'  Testing: {label}...')
+    shared = {'df': df, 'folds': generate_folds(start_year, end_year)}
+    outcomes = run_sweep(_score_sensitivity_config, configs, shared=shared,
+                         workers=workers, label='Risk filter sensitivity')
 
-        df = run_backtest(histories, scoring_assets, cpi_series, start_year, end_year)
-        if df.empty:
-            results.append({'label': label, 'error': 'No results'})
+    results = []
+    for outcome in outcomes:
+        if outcome['error'] is not None:
+            results.append({'label': outcome['task']['label'], 'error': outcome['error']})
             continue
+        results.append({**outcome['result'], 'seconds': round(outcome['seconds'], 3)})
+    return results
 
-        # Apply risk filter variant
-        if not config.get('stressed_override', True):
-            # No override: re-score without Stressed S&P override
-            df = _rescore_without_risk_override(df, cpi_series)
-        elif config.get('elevated_override', False):
-            # Elevated+Stressed: expand override to Elevated risk
-            df = _rescore_with_elevated_override(df, cpi_series)
-
-        wf_scores = score_walk_forward(df, folds)
-        agg_scores = score_results(df)
-
-        results.append({
-            'label': label,
-            'composite_score': agg_scores['overall'].get('composite_score'),
-            'multi_asset_accuracy': agg_scores['overall'].get('multi_asset_accuracy'),
-            'wf_mean': wf_scores.get('mean'),
-            'wf_std': wf_scores.get('std'),
-            'wf_sharpe': wf_scores.get('sharpe'),
-            'fold_scores': wf_scores.get('fold_scores', []),
-            'real_return_ordering': agg_scores['overall'].get('real_return_ordering_correct'),
-            'drawdown_ordering': agg_scores['overall'].get('drawdown_ordering_correct'),
-        })
 
-    return results
+def _expected_directions(df: pd.DataFrame, override_risk_states=('Stressed',)) -> dict[str, np.ndarray]:
+    """
+    Expected direction of every scoring asset on every row, from the row's
+    quadrant, with the S&P 500 flipped to negative for rows whose risk
+    state is in override_risk_states.
+    """
+    quadrants = df['quadrant'].where(df['quadrant'].isin(list(QUADRANT_EXPECTATIONS)), 'Goldilocks')
+    directions = {
+        asset_key: quadrants.map(lambda q: QUADRANT_EXPECTATIONS[q].get(asset_key, 'neutral')).to_numpy()
+        for asset_key in SCORING_ASSETS
+    }
+    if 'risk_state' not in df.columns:
+        return directions
+    return _override_sp500(directions, df['risk_state'], override_risk_states)
 
 
-def _rescore_without_risk_override(df: pd.DataFrame, cpi_series: Optional[pd.Series]) -> pd.DataFrame:
-    """Re-score using pure quadrant expectations (no Stressed override)."""
-    df = df.copy()
-    for idx, row in df.iterrows():
-        quadrant = row['quadrant']
-        expectations = dict(QUADRANT_EXPECTATIONS.get(quadrant, QUADRANT_EXPECTATIONS['Goldilocks']))
-        # No Stressed override applied
+def _scored_returns(df: pd.DataFrame) -> dict[str, np.ndarray]:
+    """90-day return each asset is scored on (real S&P 500 where available); NaN if missing."""
+    n = len(df)
 
-        real_sp500 = row.get('sp500_real_fwd_90d')
-        asset_returns = {}
-        for asset_key in SCORING_ASSETS:
-            col = f'{asset_key}_fwd_90d'
-            if col in df.columns:
-                asset_returns[asset_key] = row[col]
-
-        eval_score = score_single_evaluation(expectations, asset_returns, real_sp500_return=real_sp500)
-        df.at[idx, 'multi_asset_score'] = eval_score['weighted_score']
-        for asset_key, score in eval_score['asset_scores'].items():
-            df.at[idx, f'{asset_key}_correct'] = score
-    return df
+    def returns(col: str) -> np.ndarray:
+        if col not in df.columns:
+            return np.full(n, np.nan)
+        return pd.to_numeric(df[col], errors='coerce').to_numpy(dtype='float64')
 
+    scored = {}
+    for asset_key in SCORING_ASSETS:
+        ret = returns(f'{asset_key}_fwd_90d')
+        if asset_key == 'sp500':
+            real = returns('sp500_real_fwd_90d')
+            ret = np.where(np.isnan(real), ret, real)
+        scored[asset_key] = ret
+    return scored
 
-def _rescore_with_elevated_override(df: pd.DataFrame, cpi_series: Optional[pd.Series]) -> pd.DataFrame:
-    """Re-score with Elevated+Stressed both overriding S&P to negative."""
+
+def _rescore_with_overrides(df: pd.DataFrame, override_risk_states) -> pd.DataFrame:
+    """
+    Re-score every row from its quadrant's expectations, flipping the S&P 500
+    expectation to negative for rows whose risk state is in override_risk_states.
+
+    Same scoring as run_backtest: the real S&P 500 return is used where
+    available, and missing returns are not scored.
+    """
     df = df.copy()
-    for idx, row in df.iterrows():
-        quadrant = row['quadrant']
-        risk_state = row['risk_state']
-        expectations = dict(QUADRANT_EXPECTATIONS.get(quadrant, QUADRANT_EXPECTATIONS['Goldilocks']))
+    n = len(df)
+    directions = _expected_directions(df, override_risk_states)
+    returns = _scored_returns(df)
 
-        if risk_state in ('Stressed', 'Elevated'):
-            expectations['sp500'] = 'negative'
+    asset_scores = {}
+    for asset_key in SCORING_ASSETS:
+        score = engine.directional_scores(directions[asset_key], returns[asset_key])
+        col = f'{asset_key}_correct'
+        previous = df[col].to_numpy(dtype='float64') if col in df.columns else np.full(n, np.nan)
+        df[col] = np.where(np.isnan(score), previous, score)
+        asset_scores[asset_key] = score
 
-        real_sp500 = row.get('sp500_real_fwd_90d')
-        asset_returns = {}
-        for asset_key in SCORING_ASSETS:
-            col = f'{asset_key}_fwd_90d'
-            if col in df.columns:
-                asset_returns[asset_key] = row[col]
-
-        eval_score = score_single_evaluation(expectations, asset_returns, real_sp500_return=real_sp500)
-        df.at[idx, 'multi_asset_score'] = eval_score['weighted_score']
-        for asset_key, score in eval_score['asset_scores'].items():
-            df.at[idx, f'{asset_key}_correct'] = score
+    weights = {asset_key: config['weight'] for asset_key, config in SCORING_ASSETS.items()}
+    df['multi_asset_score'] = engine.weighted_scores(asset_scores, weights)
     return df
 
 
+def _rescore_without_risk_override(df: pd.DataFrame, cpi_series: Optional[pd.Series]) -> pd.DataFrame:
+    """Re-score using pure quadrant expectations (no Stressed override)."""
+    return _rescore_with_overrides(df, ())
+
+
+def _rescore_with_elevated_override(df: pd.DataFrame, cpi_series: Optional[pd.Series]) -> pd.DataFrame:
+    """Re-score with Elevated+Stressed both overriding S&P to negative."""
+    return _rescore_with_overrides(df, ('Stressed', 'Elevated'))
+
+
 # ---------------------------------------------------------------------------
 # Report generation
 # ---------------------------------------------------------------------------
@@ -1032,6 +1068,7 @@ def generate_report(
     dsr_result: dict,
     sensitivity: list[dict],
     baseline_score: float = 52.3,
+    significance_result: Optional[dict] = None,
 ) -> str:
     """Generate comprehensive markdown backtest report."""
     lines = []
@@ -1062,24 +1099,7 @@ def generate_report(
             dd_order = 'PASS' if overall['drawdown_ordering_correct'] else 'FAIL'
             lines.append(f'- Drawdown ordering Goldilocks→Stagflation (25% weight): {dd_order}')
 
-    # === Walk-Forward Results ===
-    lines.append('\n## Walk-Forward Validation')
-    lines.append('')
-    if wf_scores.get('mean') is not None:
-        lines.append(f'- Mean fold score: {wf_scores["mean"]}%')
-        lines.append(f'- Std deviation: {wf_scores["std"]}%')
-        lines.append(f'- Sharpe-like ratio: {wf_scores["sharpe"]}')
-        lines.append(f'- Number of folds: {wf_scores["n_folds"]}')
-
-    lines.append('')
-    lines.append('| Fold | Period | Evaluations | Score |')
-    lines.append('|------|--------|-------------|-------|')
-    for fd in wf_scores.get('fold_details', []):
-        score_str = f'{fd["score"]}%' if fd.get('score') is not None else '—'
-        lines.append(
-            f'| {fd["fold"]} | {fd["test_start"]} to {fd["test_end"]} | '
-            f'{fd["evaluations"]} | {score_str} |'
-        )
+    lines.extend(engine.walk_forward_section(wf_scores))
 
     # === Per-Asset Accuracy ===
     lines.append('\n## Per-Asset Accuracy')
@@ -1138,32 +1158,8 @@ def generate_report(
             returns_str = ', '.join(returns_parts) if returns_parts else '—'
             lines.append(f'- **{config["label"]}** (expect {direction}): accuracy={accuracy}% | {returns_str}')
 
-    # === Economic Plausibility ===
-    lines.append('\n## Economic Plausibility Checks')
-    lines.append('')
-    all_pass = plausibility.get('all_pass', False)
-    lines.append(f'**Overall: {"PASS" if all_pass else "FAIL"}**')
-    lines.append('')
-    for check_name, check_data in plausibility.get('checks', {}).items():
-        status = 'PASS' if check_data.get('pass') else 'FAIL'
-        lines.append(f'- **{check_name}**: {status}')
-        for k, v in check_data.items():
-            if k != 'pass':
-                lines.append(f'  - {k}: {v}')
-
-    # === CPCV ===
-    lines.append('\n## Combinatorial Purged Cross-Validation (CPCV)')
-    lines.append('')
-    if cpcv_result.get('pbo') is not None:
-        pbo = cpcv_result['pbo']
-        status = 'PASS' if pbo <= 0.5 else 'FAIL (likely overfit)'
-        lines.append(f'- PBO (Probability of Backtest Overfitting): {pbo} ({status})')
-        lines.append(f'- Number of paths tested: {cpcv_result["n_paths"]}')
-        lines.append(f'- OOS mean accuracy: {cpcv_result["oos_mean"]}%')
-        lines.append(f'- OOS std: {cpcv_result["oos_std"]}%')
-        lines.append(f'- IS mean accuracy: {cpcv_result["is_mean"]}%')
-    else:
-        lines.append('- CPCV could not be computed (insufficient data)')
+    lines.extend(engine.plausibility_section(plausibility))
+    lines.extend(engine.cpcv_section(cpcv_result))
 
     # === DSR ===
     lines.append('\n## Deflated Sharpe Ratio (DSR)')
@@ -1178,6 +1174,9 @@ def generate_report(
     else:
         lines.append('- DSR could not be computed')
 
+    if significance_result is not None:
+        lines.extend(significance.significance_section(significance_result, 'Quadrant'))
+
     # === Risk Filter Sensitivity ===
     lines.append('\n## Risk Filter Sensitivity Analysis')
     lines.append('')
@@ -1333,11 +1332,20 @@ def main():
     print(f'  DSR z-score: {dsr_result.get("dsr")}')
     print(f'  p-value: {dsr_result.get("p_value")}')
 
-    # Step 9: Generate report
+    # Step 9: Bootstrap CIs and permutation test
+    print(f'\nResampling significance ({significance.DEFAULT_RESAMPLES} resamples)...')
+    significance_result = compute_significance(df)
+    overall_ci = significance_result['bootstrap']['overall']
+    if overall_ci.get('n'):
+        print(f'  Multi-asset accuracy 95% CI: {overall_ci["ci_low"]}% – {overall_ci["ci_high"]}%')
+    print(f'  Permutation p-value: {significance_result["permutation"].get("p_value")}')
+
+    # Step 10: Generate report
     print('\nGenerating report...')
     report = generate_report(
         df, agg_scores, wf_scores, plausibility,
         cpcv_result, dsr_result, sensitivity,
+        significance_result=significance_result,
     )
 
     report_path = RESULTS_DIR / 'conditions_backtest_report.md'
@@ -1354,6 +1362,7 @@ def main():
         'plausibility': plausibility,
         'cpcv': cpcv_result,
         'dsr': dsr_result,
+        'significance': significance_result,
         'sensitivity': sensitivity,
     }
     json_path = RESULTS_DIR / 'conditions_backtest_scores.json'
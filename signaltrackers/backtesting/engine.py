@@ -0,0 +1,551 @@
+"""
+Signal-vs-asset backtest engine.
+
+The building blocks shared by the conditions and Bitcoin/Liquidity
+backtests, in column-wise form:
+
+  - asof_values: point-in-time dimension state for every evaluation date
+    (one searchsorted instead of a history scan per date)
+  - directional_scores / weighted_scores: expectation-vs-return scoring
+  - generate_folds / score_walk_forward: expanding-window fold scoring
+  - run_cpcv: CPCV summary over backtest_utils.cpcv_path_scores
+  - run_checks / run_lengths: plausibility check plumbing
+  - *_section: the report sections both backtests render identically
+
+A new dimension-vs-asset study is a SignalStudy: a dimension history, the
+price series to score against, and the expected direction of each asset in
+each state. run_study() turns it into a BacktestResult; run_studies() runs
+several across a process pool (see sweep.py). Both backtests are studies:
+bitcoin_liquidity_backtest.liquidity_study and
+conditions_backtest.quadrant_study, the latter using the direction and
+scored-return overrides for its risk filter and real S&P 500 returns.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from signaltrackers.backtesting.backtest_utils import (
+    NEUTRAL_THRESHOLD,
+    _as_datetime64,
+    cpcv_path_scores,
+    forward_return_matrix,
+)
+from signaltrackers.backtesting.sweep import run_sweep
+
+EVAL_FREQUENCY_MONTHS = 1
+DEFAULT_TEST_MONTHS = 24  # 2-year test windows
+
+
+# ---------------------------------------------------------------------------
+# Point-in-time lookup
+# ---------------------------------------------------------------------------
+
+
+def monthly_eval_dates(start, end) -> pd.DatetimeIndex:
+    """Month-end evaluation dates between start and end."""
+    return pd.date_range(start=start, end=end, freq=f'{EVAL_FREQUENCY_MONTHS}ME')
+
+
+def asof_values(history: pd.DataFrame, dates, column: str) -> np.ndarray:
+    """
+    ``column`` of the latest history row dated on or before each date.
+
+    Equivalent to taking the last row of history[history['date'] <= d] for
+    every d (no lookahead); None where no row qualifies. Returns an object
+    array aligned with ``dates``.
+    """
+    dates = _as_datetime64(dates)
+    out = np.full(len(dates), None, dtype=object)
+    if history is None or history.empty or not len(dates):
+        return out
+
+    history_dates = _as_datetime64(history['date'])
+    values = history[column].to_numpy(dtype=object)
+    if len(history_dates) > 1 and (np.diff(history_dates) < np.timedelta64(0)).any():
+        order = np.argsort(history_dates, kind='stable')
+        history_dates, values = history_dates[order], values[order]
+
+    position = np.searchsorted(history_dates, dates, side='right') - 1
+    found = position >= 0
+    out[found] = values[position[found]]
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Directional scoring
+# ---------------------------------------------------------------------------
+
+
+def directional_scores(directions, returns) -> np.ndarray:
+    """
+    Score each return against its expected direction.
+
+    'positive' scores 1 for a gain, 'negative' 1 for a loss, 'neutral' 1
+    within NEUTRAL_THRESHOLD and 0.5 outside it; everything else 0. NaN
+    where the return is missing or the direction unknown.
+    """
+    directions = np.asarray(directions, dtype=object)
+    returns = np.asarray(returns, dtype='float64')
+    with np.errstate(invalid='ignore'):
+        score = np.select(
+            [directions == 'positive', directions == 'negative', directions == 'neutral'],
+            [(returns > 0).astype(float), (returns < 0).astype(float),
+             np.where(np.abs(returns) < NEUTRAL_THRESHOLD, 1.0, 0.5)],
+            default=np.nan,
+        )
+    score[np.isnan(returns)] = np.nan
+    return score
+
+
+def weighted_scores(scores: dict[str, np.ndarray], weights: dict[str, float]) -> list[Optional[float]]:
+    """
+    Row-wise weighted mean of per-asset scores over the assets scored in
+    that row, rounded to 4 places; None where no asset was scored.
+    """
+    n = len(next(iter(scores.values()))) if scores else 0
+    weighted_sum = np.zeros(n)
+    weight_sum = np.zeros(n)
+    for asset_key, score in scores.items():
+        scored = ~np.isnan(score)
+        weighted_sum += np.where(scored, score * weights[asset_key], 0.0)
+        weight_sum += np.where(scored, weights[asset_key], 0.0)
+    return [round(ws / w, 4) if w > 0 else None for ws, w in zip(weighted_sum, weight_sum)]
+
+
+# ---------------------------------------------------------------------------
+# Walk-forward validation
+# ---------------------------------------------------------------------------
+
+
+def generate_folds(
+    start_year: int,
+    end_year: int,
+    test_months: int = DEFAULT_TEST_MONTHS,
+) -> list[dict]:
+    """
+    Generate walk-forward expanding window folds.
+
+    Returns list of dicts with 'fold', 'test_start', 'test_end' keys.
+    Training data is everything before test_start (expanding window).
+    """
+    folds = []
+    test_start_year = start_year
+    step_years = test_months // 12
+    fold_num = 1
+
+    while test_start_year < end_year:
+        test_end_year = min(test_start_year + step_years, end_year)
+
+        folds.append({
+            'fold': fold_num,
+            'test_start': pd.Timestamp(f'{test_start_year}-01-01'),
+            'test_end': pd.Timestamp(f'{test_end_year}-01-01') - pd.Timedelta(days=1),
+        })
+
+        test_start_year = test_end_year
+        fold_num += 1
+
+    return folds
+
+
+def _date_keys(dates: pd.Series) -> np.ndarray:
+    """Dates as 'YYYY-MM-DD' strings, the form result frames store them in."""
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates.dt.strftime('%Y-%m-%d').to_numpy(dtype=object)
+    return dates.astype(str).to_numpy(dtype=object)
+
+
+def score_walk_forward(
+    df: pd.DataFrame,
+    folds: list[dict],
+    score_col: str,
+    counts_col: str,
+    counts_key: str,
+) -> dict:
+    """
+    Score each walk-forward fold separately.
+
+    A fold's score is the mean of ``score_col`` over its test window; its
+    details carry the value counts of ``counts_col`` under ``counts_key``.
+    Returns dict with per-fold scores, overall mean, std, and Sharpe-like ratio.
+    """
+    dates = _date_keys(df['date'])
+    scores = pd.to_numeric(df[score_col], errors='coerce').to_numpy(dtype='float64')
+    labels = df[counts_col]
+
+    fold_scores = []
+    fold_details = []
+
+    for fold in folds:
+        test_start = fold['test_start'].strftime('%Y-%m-%d')
+        test_end = fold['test_end'].strftime('%Y-%m-%d')
+        in_fold = (dates >= test_start) & (dates <= test_end)
+
+        if not in_fold.any():
+            fold_details.append({
+                'fold': fold['fold'],
+                'test_start': test_start,
+                'test_end': test_end,
+                'evaluations': 0,
+                'score': None,
+            })
+            continue
+
+        valid_scores = scores[in_fold]
+        valid_scores = valid_scores[~np.isnan(valid_scores)]
+        if not len(valid_scores):
+            continue
+
+        fold_score = float(valid_scores.mean()) * 100
+        fold_scores.append(fold_score)
+
+        fold_details.append({
+            'fold': fold['fold'],
+            'test_start': test_start,
+            'test_end': test_end,
+            'evaluations': int(len(valid_scores)),
+            'score': round(fold_score, 1),
+            counts_key: labels[in_fold].value_counts().to_dict(),
+        })
+
+    if not fold_scores:
+        return {'fold_details': fold_details, 'mean': None, 'std': None, 'sharpe': None}
+
+    mean_score = float(np.mean(fold_scores))
+    std_score = float(np.std(fold_scores, ddof=1)) if len(fold_scores) > 1 else 0.0
+    sharpe = mean_score / std_score if std_score > 0 else float('inf')
+
+    return {
+        'fold_details': fold_details,
+        'fold_scores': [round(s, 1) for s in fold_scores],
+        'mean': round(mean_score, 1),
+        'std': round(std_score, 1),
+        'sharpe': round(sharpe, 2),
+        'n_folds': len(fold_scores),
+    }
+
+
+# ---------------------------------------------------------------------------
+# CPCV — Combinatorial Purged Cross-Validation
+# ---------------------------------------------------------------------------
+
+
+def run_cpcv(
+    df: pd.DataFrame,
+    score_col: str,
+    k: int = 6,
+    p: int = 2,
+    purge_months: int = 3,
+    embargo_months: int = 1,
+    min_rows: int = 0,
+    include_scores: bool = True,
+) -> dict:
+    """
+    Run Combinatorial Purged Cross-Validation on ``score_col``.
+
+    Returns dict with PBO (fraction of paths whose out-of-sample score falls
+    below the in-sample score) and the OOS/IS score distribution, with the
+    per-path OOS scores under 'oos_scores' when ``include_scores``. Frames
+    with fewer than ``min_rows`` rows are not evaluated.
+    """
+    df_sorted = df.sort_values('date').reset_index(drop=True)
+    if len(df_sorted) < min_rows:
+        return {'pbo': None, 'n_paths': 0}
+
+    oos_scores, is_scores = cpcv_path_scores(
+        df_sorted['date'], df_sorted[score_col],
+        k=k, p=p, purge_months=purge_months, embargo_months=embargo_months,
+    )
+
+    if not oos_scores:
+        return {'pbo': None, 'n_paths': 0}
+
+    n_overfit = sum(1 for oos, ins in zip(oos_scores, is_scores) if oos < ins)
+    pbo = n_overfit / len(oos_scores)
+
+    result = {
+        'pbo': round(pbo, 3),
+        'n_paths': len(oos_scores),
+        'oos_mean': round(float(np.mean(oos_scores)) * 100, 1),
+        'oos_std': round(float(np.std(oos_scores)) * 100, 1),
+        'is_mean': round(float(np.mean(is_scores)) * 100, 1),
+    }
+    if include_scores:
+        result['oos_scores'] = [round(s * 100, 1) for s in oos_scores]
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Plausibility checks
+# ---------------------------------------------------------------------------
+
+
+def rows_between(df: pd.DataFrame, start: str, end: str) -> pd.DataFrame:
+    """Rows dated from start to end inclusive ('YYYY-MM-DD')."""
+    return df[(df['date'] >= start) & (df['date'] <= end)]
+
+
+def run_lengths(values) -> np.ndarray:
+    """Lengths of the runs of consecutive equal values."""
+    values = np.asarray(values, dtype=object)
+    if not len(values):
+        return np.zeros(0, dtype=int)
+    changes = np.flatnonzero(values[1:] != values[:-1]) + 1
+    return np.diff(np.r_[0, changes, len(values)])
+
+
+def run_checks(
+    df: pd.DataFrame,
+    checks: dict[str, Callable[[pd.DataFrame], Optional[dict]]],
+) -> dict:
+    """
+    Evaluate named plausibility checks against a result frame.
+
+    Each check returns a dict with a 'pass' entry, or None when it does not
+    apply. The result passes only if every applicable check does.
+    """
+    results = {}
+    for name, check in checks.items():
+        outcome = check(df)
+        if outcome is not None:
+            results[name] = outcome
+
+    all_pass = all(c.get('pass', False) for c in results.values())
+    return {
+        'all_pass': all_pass,
+        'checks': results,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Report sections
+# ---------------------------------------------------------------------------
+
+
+def walk_forward_section(wf_scores: dict) -> list[str]:
+    """Markdown lines for the walk-forward summary and per-fold table."""
+    lines = ['\n## Walk-Forward Validation', '']
+    if wf_scores.get('mean') is not None:
+        lines.append(f'- Mean fold score: {wf_scores["mean"]}%')
+        lines.append(f'- Std deviation: {wf_scores["std"]}%')
+        lines.append(f'- Sharpe-like ratio: {wf_scores["sharpe"]}')
+        lines.append(f'- Number of folds: {wf_scores["n_folds"]}')
+
+    lines.append('')
+    lines.append('| Fold | Period | Evaluations | Score |')
+    lines.append('|------|--------|-------------|-------|')
+    for fd in wf_scores.get('fold_details', []):
+        score_str = f'{fd["score"]}%' if fd.get('score') is not None else '—'
+        lines.append(
+            f'| {fd["fold"]} | {fd["test_start"]} to {fd["test_end"]} | '
+            f'{fd["evaluations"]} | {score_str} |'
+        )
+    return lines
+
+
+def cpcv_section(cpcv_result: dict) -> list[str]:
+    """Markdown lines for the CPCV summary."""
+    lines = ['\n## Combinatorial Purged Cross-Validation (CPCV)', '']
+    if cpcv_result.get('pbo') is not None:
+        pbo = cpcv_result['pbo']
+        status = 'PASS' if pbo <= 0.5 else 'FAIL (likely overfit)'
+        lines.append(f'- PBO (Probability of Backtest Overfitting): {pbo} ({status})')
+        lines.append(f'- Number of paths tested: {cpcv_result["n_paths"]}')
+        lines.append(f'- OOS mean accuracy: {cpcv_result["oos_mean"]}%')
+        lines.append(f'- OOS std: {cpcv_result["oos_std"]}%')
+        lines.append(f'- IS mean accuracy: {cpcv_result["is_mean"]}%')
+    else:
+        lines.append('- CPCV could not be computed (insufficient data)')
+    return lines
+
+
+def plausibility_section(plausibility: dict) -> list[str]:
+    """Markdown lines for the plausibility checks and their details."""
+    lines = ['\n## Economic Plausibility Checks', '']
+    all_pass = plausibility.get('all_pass', False)
+    lines.append(f'**Overall: {"PASS" if all_pass else "FAIL"}**')
+    lines.append('')
+    for check_name, check_data in plausibility.get('checks', {}).items():
+        status = 'PASS' if check_data.get('pass') else 'FAIL'
+        lines.append(f'- **{check_name}**: {status}')
+        for k, v in check_data.items():
+            if k != 'pass':
+                lines.append(f'  - {k}: {v}')
+    return lines
+
+
+# ---------------------------------------------------------------------------
+# Studies
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class SignalStudy:
+    """
+    One dimension-vs-asset backtest.
+
+    Each evaluation date takes the dimension's ``state_col`` as of that date,
+    looks up the expected direction of every asset in ``expectations[state]``
+    (falling back to ``default_directions``, then 'neutral'), and scores it
+    against the asset's ``score_window``-day forward return. The row score is
+    the ``weights``-weighted mean over the assets with a return.
+
+    Two optional hooks adjust the scoring without changing the frame's
+    forward-return columns: ``direction_override`` receives the frame's
+    date, state and carried columns with the expected directions per asset
+    and returns the directions to score; ``scored_returns`` receives the
+    evaluation dates with the score-window returns per asset and returns
+    replacement returns for any assets it covers.
+    """
+
+    name: str
+    history: pd.DataFrame
+    state_col: str
+    prices: dict[str, pd.Series]
+    expectations: dict[str, dict[str, str]]
+    default_directions: dict[str, str] = field(default_factory=dict)
+    weights: Optional[dict[str, float]] = None
+    windows: tuple[int, ...] = (30, 60, 90)
+    score_window: int = 90
+    start_year: int = 2005
+    end_year: int = 2025
+    test_months: int = DEFAULT_TEST_MONTHS
+    # Defaults to month-ends from Jan start_year until score_window days
+    # before the shortest price series ends
+    eval_dates: Optional[Sequence] = None
+    # Extra history columns copied to the frame as signal_<column>
+    carry: tuple[str, ...] = ()
+    # Drop dates where any asset lacks its score-window return
+    require_returns: bool = False
+    cpcv: dict = field(default_factory=dict)
+    direction_override: Optional[
+        Callable[[pd.DataFrame, dict[str, np.ndarray]], dict[str, np.ndarray]]] = None
+    scored_returns: Optional[
+        Callable[[pd.DatetimeIndex, dict[str, np.ndarray]], dict[str, np.ndarray]]] = None
+
+    def default_eval_dates(self) -> pd.DatetimeIndex:
+        last_data = min(s.index[-1] for s in self.prices.values())
+        end_date = min(pd.Timestamp(f'{self.end_year}-12-31'),
+                       last_data - pd.Timedelta(days=self.score_window))
+        return monthly_eval_dates(pd.Timestamp(f'{self.start_year}-01-01'), end_date)
+
+
+@dataclass
+class BacktestResult:
+    """Scored frame and validation summaries of one study."""
+
+    name: str
+    frame: pd.DataFrame
+    walk_forward: dict
+    cpcv: dict
+    accuracy: Optional[float]
+    seconds: float
+
+
+def build_frame(study: SignalStudy) -> pd.DataFrame:
+    """
+    One row per evaluation date with a known state: date, state, carried
+    columns, then per asset its forward returns (<asset>_fwd_<w>d), expected
+    direction (<asset>_expected) and score (<asset>_correct), and the
+    weighted row score ('weighted_score').
+    """
+    eval_dates = pd.DatetimeIndex(
+        study.default_eval_dates() if study.eval_dates is None else study.eval_dates)
+    windows = list(study.windows)
+    if study.score_window not in windows:
+        windows.append(study.score_window)
+    score_idx = windows.index(study.score_window)
+
+    states = asof_values(study.history, eval_dates, study.state_col)
+    keep = np.array([s is not None for s in states], dtype=bool)
+    returns = {
+        asset_key: forward_return_matrix(price, eval_dates, windows)
+        for asset_key, price in study.prices.items()
+    }
+    if study.require_returns:
+        for matrix in returns.values():
+            keep &= ~np.isnan(matrix[:, score_idx])
+
+    states = states[keep]
+    columns = {
+        'date': eval_dates[keep].strftime('%Y-%m-%d'),
+        'state': states,
+    }
+    for col in study.carry:
+        columns[f'signal_{col}'] = asof_values(study.history, eval_dates, col)[keep]
+
+    returns = {asset_key: matrix[keep] for asset_key, matrix in returns.items()}
+    directions = {}
+    for asset_key in returns:
+        fallback = study.default_directions.get(asset_key, 'neutral')
+        directions[asset_key] = np.array(
+            [study.expectations.get(s, {}).get(asset_key, fallback) for s in states],
+            dtype=object,
+        )
+    if study.direction_override is not None:
+        directions = study.direction_override(pd.DataFrame(columns), directions)
+    scored = {asset_key: matrix[:, score_idx] for asset_key, matrix in returns.items()}
+    if study.scored_returns is not None:
+        scored.update(study.scored_returns(eval_dates[keep], scored))
+
+    scores = {}
+    for asset_key, matrix in returns.items():
+        for j, w in enumerate(windows):
+            if w in study.windows:
+                columns[f'{asset_key}_fwd_{w}d'] = matrix[:, j]
+        scores[asset_key] = directional_scores(directions[asset_key], scored[asset_key])
+        columns[f'{asset_key}_expected'] = directions[asset_key]
+        columns[f'{asset_key}_correct'] = scores[asset_key]
+
+    weights = study.weights or {asset_key: 1.0 for asset_key in study.prices}
+    columns['weighted_score'] = np.array(weighted_scores(scores, weights), dtype='float64')
+    return pd.DataFrame(columns)
+
+
+def run_study(study: SignalStudy) -> BacktestResult:
+    """Build the study's frame and score it walk-forward and with CPCV."""
+    started = time.perf_counter()
+    frame = build_frame(study)
+    folds = generate_folds(study.start_year, study.end_year, study.test_months)
+    walk_forward = score_walk_forward(frame, folds, 'weighted_score', 'state', 'state_counts')
+    cpcv = run_cpcv(frame, 'weighted_score', **study.cpcv)
+
+    valid = frame['weighted_score'].dropna()
+    accuracy = round(float(valid.mean()) * 100, 1) if not valid.empty else None
+    return BacktestResult(
+        name=study.name,
+        frame=frame,
+        walk_forward=walk_forward,
+        cpcv=cpcv,
+        accuracy=accuracy,
+        seconds=time.perf_counter() - started,
+    )
+
+
+def _run_study_task(studies: list[SignalStudy], index: int) -> BacktestResult:
+    return run_study(studies[index])
+
+
+def run_studies(
+    studies: Sequence[SignalStudy],
+    workers: Optional[int] = None,
+) -> list[BacktestResult]:
+    """
+    Run several studies across ``workers`` processes; results in study order.
+
+    The studies (and their histories and prices) reach each worker once;
+    raises RuntimeError naming the first study that failed.
+    """
+    studies = list(studies)
+    outcomes = run_sweep(_run_study_task, range(len(studies)), shared=studies,
+                         workers=workers, label='Backtest studies')
+    for outcome in outcomes:
+        if outcome['error'] is not None:
+            raise RuntimeError(f'{studies[outcome["task"]].name}: {outcome["error"]}')
+    return [outcome['result'] for outcome in outcomes]
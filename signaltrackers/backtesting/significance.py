@@ -0,0 +1,323 @@
+"""
+Resampled significance for backtest hit rates.
+
+  - bootstrap_ci: confidence intervals for the mean score overall and per
+    group (quadrant, liquidity bucket) from a circular block bootstrap
+  - permutation_test: p-value for the overall hit rate against a null in
+    which the signal's expected directions are shuffled, block-wise,
+    against the realized returns
+
+Evaluation dates are monthly and 90-day forward returns overlap the next
+two dates, so rows are resampled in contiguous blocks (DEFAULT_BLOCK_SIZE
+months) rather than individually.
+
+Each batch of resamples is one index matrix (resamples x rows); all of its
+scores are computed with array operations. Batches have a fixed size and
+are seeded from one SeedSequence, so results depend only on ``seed`` and
+not on how many processes ``workers`` fans them across (see sweep.py).
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from signaltrackers.backtesting.backtest_utils import NEUTRAL_THRESHOLD
+from signaltrackers.backtesting.sweep import run_sweep
+
+DEFAULT_RESAMPLES = 10_000
+DEFAULT_BLOCK_SIZE = 3  # months
+DEFAULT_CONFIDENCE = 0.95
+BATCH_SIZE = 1_000
+
+# Row order of the per-return outcome table (see _outcome_table)
+DIRECTION_CODES = {'positive': 0, 'negative': 1, 'neutral': 2}
+_UNKNOWN_DIRECTION = len(DIRECTION_CODES)
+
+
+# ---------------------------------------------------------------------------
+# Resample index matrices
+# ---------------------------------------------------------------------------
+
+
+def block_bootstrap_indices(
+    n: int,
+    n_resamples: int,
+    block_size: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Circular block bootstrap: (n_resamples, n) row indices, each row built
+    from blocks of ``block_size`` consecutive rows starting at random
+    positions (wrapping at the end).
+    """
+    block_size = max(1, min(block_size, n))
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n, size=(n_resamples, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block_size)) % n
+    return idx.reshape(n_resamples, -1)[:, :n]
+
+
+def block_permutation_indices(
+    n: int,
+    n_resamples: int,
+    block_size: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Block permutation: (n_resamples, n) row indices, each a random
+    reordering of the consecutive ``block_size``-row blocks of 0..n-1 (the
+    last block may be shorter).
+    """
+    block_size = max(1, min(block_size, n))
+    n_blocks = -(-n // block_size)
+    order = rng.permuted(np.tile(np.arange(n_blocks), (n_resamples, 1)), axis=1)
+    idx = (order[:, :, None] * block_size + np.arange(block_size)).reshape(n_resamples, -1)
+    return idx[idx < n].reshape(n_resamples, n)
+
+
+def _batches(n_resamples: int, seed: int) -> list[tuple]:
+    sizes = [BATCH_SIZE] * (n_resamples // BATCH_SIZE)
+    if n_resamples % BATCH_SIZE:
+        sizes.append(n_resamples % BATCH_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    return list(zip(seeds, sizes))
+
+
+def _run_batches(fn, shared: dict, n_resamples: int, seed: int,
+                 workers: Optional[int], label: str) -> np.ndarray:
+    outcomes = run_sweep(fn, _batches(n_resamples, seed), shared=shared,
+                         workers=workers, label=label)
+    for outcome in outcomes:
+        if outcome['error'] is not None:
+            raise RuntimeError(f'{label} failed: {outcome["error"]}')
+    return np.concatenate([outcome['result'] for outcome in outcomes])
+
+
+# ---------------------------------------------------------------------------
+# Bootstrap confidence intervals
+# ---------------------------------------------------------------------------
+
+
+def _group_means(scores: np.ndarray, codes: np.ndarray, n_groups: int, idx: np.ndarray) -> np.ndarray:
+    """Mean score of each resample (rows of idx): overall, then per group code."""
+    s = scores[idx]
+    valid = ~np.isnan(s)
+    s = np.where(valid, s, 0.0)
+    g = codes[idx]
+
+    out = np.empty((len(idx), n_groups + 1))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out[:, 0] = s.sum(axis=1) / valid.sum(axis=1)
+        for k in range(n_groups):
+            in_group = valid & (g == k)
+            out[:, k + 1] = (s * in_group).sum(axis=1) / in_group.sum(axis=1)
+    return out
+
+
+def _bootstrap_batch(shared: dict, task: tuple) -> np.ndarray:
+    seed, size = task
+    idx = block_bootstrap_indices(len(shared['scores']), size, shared['block_size'],
+                                  np.random.default_rng(seed))
+    return _group_means(shared['scores'], shared['codes'], shared['n_groups'], idx)
+
+
+def _interval(observed: float, resampled: np.ndarray, count: int, confidence: float) -> dict:
+    if count == 0:
+        return {'n': 0}
+    resampled = resampled[~np.isnan(resampled)]
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(resampled, [tail, 100 - tail])
+    return {
+        'n': count,
+        'hit_rate': round(float(observed) * 100, 1),
+        'ci_low': round(float(low) * 100, 1),
+        'ci_high': round(float(high) * 100, 1),
+    }
+
+
+def bootstrap_ci(
+    scores,
+    groups=None,
+    labels: Optional[Sequence[str]] = None,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    confidence: float = DEFAULT_CONFIDENCE,
+    seed: int = 0,
+    workers: Optional[int] = None,
+) -> dict:
+    """
+    Block-bootstrap confidence intervals for the mean of ``scores`` (0-1 hit
+    scores, NaN = unscored), overall and per label of ``groups``.
+
+    ``scores`` and ``groups`` are aligned and in date order. ``labels``
+    fixes which groups are reported, in order (default: every group value
+    in order of appearance). Hit rates and bounds are percentages; a group
+    with no scored rows reports only 'n': 0.
+    """
+    scores = pd.to_numeric(pd.Series(scores), errors='coerce').to_numpy(dtype='float64')
+    if groups is None:
+        groups = np.full(len(scores), None, dtype=object)
+    groups = pd.Series(groups).to_numpy(dtype=object)
+    if labels is None:
+        labels = [g for g in pd.unique(groups) if g is not None]
+    labels = list(labels)
+    codes = np.array([labels.index(g) if g in labels else -1 for g in groups], dtype=np.int64)
+
+    result = {
+        'n_resamples': n_resamples,
+        'block_size': block_size,
+        'confidence': confidence,
+        'overall': {'n': 0},
+        'groups': {label: {'n': 0} for label in labels},
+    }
+    valid = ~np.isnan(scores)
+    if not valid.any() or n_resamples <= 0:
+        return result
+
+    shared = {'scores': scores, 'codes': codes, 'n_groups': len(labels), 'block_size': block_size}
+    observed = _group_means(scores, codes, len(labels), np.arange(len(scores))[None, :])[0]
+    resampled = _run_batches(_bootstrap_batch, shared, n_resamples, seed, workers, 'Bootstrap')
+
+    result['overall'] = _interval(observed[0], resampled[:, 0], int(valid.sum()), confidence)
+    for k, label in enumerate(labels):
+        count = int((valid & (codes == k)).sum())
+        result['groups'][label] = _interval(observed[k + 1], resampled[:, k + 1], count, confidence)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Permutation test
+# ---------------------------------------------------------------------------
+
+
+def _outcome_table(returns: np.ndarray) -> np.ndarray:
+    """
+    Score of each return under each direction code: rows positive, negative,
+    neutral, unknown (NaN); NaN where the return is missing. Same scoring as
+    engine.directional_scores.
+    """
+    table = np.vstack([
+        (returns > 0).astype(float),
+        (returns < 0).astype(float),
+        np.where(np.abs(returns) < NEUTRAL_THRESHOLD, 1.0, 0.5),
+        np.full(len(returns), np.nan),
+    ])
+    table[:, np.isnan(returns)] = np.nan
+    return table
+
+
+def _hit_rates(tables: list, codes: list, weights: list, idx: np.ndarray) -> np.ndarray:
+    """
+    Mean weighted score of each resample, pairing the direction codes of
+    rows idx[r] with the returns of rows 0..n-1.
+    """
+    columns = np.arange(idx.shape[1])
+    weighted_sum = np.zeros(idx.shape)
+    weight_sum = np.zeros(idx.shape)
+    for table, direction_codes, weight in zip(tables, codes, weights):
+        score = table[direction_codes[idx], columns]
+        scored = ~np.isnan(score)
+        weighted_sum += np.where(scored, score * weight, 0.0)
+        weight_sum += np.where(scored, weight, 0.0)
+
+    rows = weight_sum > 0
+    row_scores = np.where(rows, weighted_sum / np.where(rows, weight_sum, 1.0), 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return row_scores.sum(axis=1) / rows.sum(axis=1)
+
+
+def _permutation_batch(shared: dict, task: tuple) -> np.ndarray:
+    seed, size = task
+    idx = block_permutation_indices(shared['n'], size, shared['block_size'],
+                                    np.random.default_rng(seed))
+    return _hit_rates(shared['tables'], shared['codes'], shared['weights'], idx)
+
+
+def permutation_test(
+    directions: dict,
+    returns: dict,
+    weights: Optional[dict] = None,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    seed: int = 0,
+    workers: Optional[int] = None,
+) -> dict:
+    """
+    One-sided permutation test of the overall weighted hit rate.
+
+    ``directions`` and ``returns`` map each asset to aligned, date-ordered
+    arrays of expected direction and realized return. Under the null the
+    signal carries no information about returns: the direction rows are
+    permuted block-wise (keeping the signal's own persistence) and
+    re-scored against the unmoved returns. p_value is the share of
+    permutations scoring at least the observed hit rate (with the usual +1
+    correction).
+    """
+    assets = list(directions)
+    weights = weights or {asset_key: 1.0 for asset_key in assets}
+    tables = [_outcome_table(np.asarray(returns[a], dtype='float64')) for a in assets]
+    codes = [
+        np.array([DIRECTION_CODES.get(d, _UNKNOWN_DIRECTION) for d in directions[a]], dtype=np.int64)
+        for a in assets
+    ]
+    n = len(codes[0]) if codes else 0
+
+    result = {'n_resamples': n_resamples, 'block_size': block_size}
+    observed = _hit_rates(tables, codes, [weights[a] for a in assets], np.arange(n)[None, :])[0] \
+        if n else np.nan
+    if np.isnan(observed) or n_resamples <= 0:
+        return {**result, 'observed': None, 'null_mean': None, 'p_value': None, 'significant': None}
+
+    shared = {'n': n, 'tables': tables, 'codes': codes,
+              'weights': [weights[a] for a in assets], 'block_size': block_size}
+    null = _run_batches(_permutation_batch, shared, n_resamples, seed, workers, 'Permutation test')
+    p_value = (1 + int((null >= observed).sum())) / (1 + len(null))
+
+    return {
+        **result,
+        'observed': round(float(observed) * 100, 1),
+        'null_mean': round(float(null.mean()) * 100, 1),
+        'null_p95': round(float(np.percentile(null, 95)) * 100, 1),
+        'p_value': round(p_value, 4),
+        'significant': bool(p_value <= 0.05),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Report section
+# ---------------------------------------------------------------------------
+
+
+def significance_section(significance: dict, group_title: str) -> list[str]:
+    """Markdown lines for bootstrap CIs (one row per group) and the permutation test."""
+    bootstrap = significance.get('bootstrap', {})
+    permutation = significance.get('permutation', {})
+    confidence = round(bootstrap.get('confidence', DEFAULT_CONFIDENCE) * 100)
+
+    lines = ['\n## Resampled Significance', '']
+    lines.append(f'Block bootstrap: {bootstrap.get("n_resamples")} resamples, '
+                 f'{bootstrap.get("block_size")}-month blocks.')
+    lines.append('')
+    lines.append(f'| {group_title} | Count | Hit Rate | {confidence}% CI |')
+    lines.append(f'|{"-" * (len(group_title) + 2)}|-------|----------|--------|')
+    rows = [('Overall', bootstrap.get('overall', {}))] + list(bootstrap.get('groups', {}).items())
+    for label, stats in rows:
+        if not stats.get('n'):
+            lines.append(f'| {label} | 0 | — | — |')
+            continue
+        lines.append(f'| {label} | {stats["n"]} | {stats["hit_rate"]}% | '
+                     f'{stats["ci_low"]}% – {stats["ci_high"]}% |')
+
+    lines.append('')
+    if permutation.get('p_value') is not None:
+        sig = 'SIGNIFICANT' if permutation['significant'] else 'NOT SIGNIFICANT'
+        lines.append(f'- Permutation test ({permutation["n_resamples"]} block permutations): '
+                     f'observed {permutation["observed"]}% vs null mean {permutation["null_mean"]}% '
+                     f'(95th pct {permutation["null_p95"]}%)')
+        lines.append(f'- p-value: {permutation["p_value"]} ({sig})')
+    else:
+        lines.append('- Permutation test could not be computed')
+    return lines
@@ -0,0 +1,101 @@
+"""
+Process-pool runner for backtest parameter sweeps.
+
+A sweep evaluates one function over many configurations against the same
+inputs (a scored backtest frame, dimension histories, price series). The
+inputs are handed to each worker once, as ``shared``: on platforms with
+``fork`` the workers inherit them from the parent without pickling, so
+large read-only histories are never copied per task. Each task only
+pickles its (small) configuration and result.
+
+Tasks run inline when there is one task or one worker, which keeps tests
+and small sweeps free of pool start-up cost.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Sequence
+
+# Inputs shared by every task in the current worker process
+_shared: Any = None
+
+
+def default_workers() -> int:
+    """Worker count for sweeps: BACKTEST_WORKERS, else the CPU count."""
+    configured = os.environ.get('BACKTEST_WORKERS')
+    if configured:
+        return max(1, int(configured))
+    return os.cpu_count() or 1
+
+
+def _init_worker(shared: Any) -> None:
+    global _shared
+    _shared = shared
+
+
+def _execute(fn: Callable, shared: Any, task: Any) -> dict:
+    started = time.perf_counter()
+    try:
+        result, error = fn(shared, task), None
+    except Exception as exc:
+        result, error = None, f'{type(exc).__name__}: {exc}'
+    return {
+        'result': result,
+        'error': error,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def _run_in_worker(fn: Callable, task: Any) -> dict:
+    return _execute(fn, _shared, task)
+
+
+def _pool_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+
+
+def run_sweep(
+    fn: Callable[[Any, Any], Any],
+    tasks: Sequence,
+    shared: Any = None,
+    workers: Optional[int] = None,
+    label: str = 'Sweep',
+) -> list[dict]:
+    """
+    Evaluate ``fn(shared, task)`` for every task, fanned across processes.
+
+    ``fn`` must be a module-level function. Returns one dict per task, in
+    task order, with 'task', 'result', 'error' (None, or the exception
+    message) and 'seconds' (wall time of that task), and prints a timing
+    summary.
+    """
+    tasks = list(tasks)
+    workers = min(workers or default_workers(), len(tasks)) or 1
+    started = time.perf_counter()
+
+    if workers <= 1:
+        outcomes = [_execute(fn, shared, task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=_pool_context(),
+            initializer=_init_worker,
+            initargs=(shared,),
+        ) as pool:
+            futures = [pool.submit(_run_in_worker, fn, task) for task in tasks]
+            outcomes = [future.result() for future in futures]
+
+    for task, outcome in zip(tasks, outcomes):
+        outcome['task'] = task
+
+    elapsed = time.perf_counter() - started
+    task_seconds = [o['seconds'] for o in outcomes]
+    if task_seconds:
+        print(f'  {label}: {len(tasks)} tasks on {workers} worker(s) in {elapsed:.2f}s '
+              f'(task mean {sum(task_seconds) / len(task_seconds):.3f}s, max {max(task_seconds):.3f}s)')
+    return outcomes
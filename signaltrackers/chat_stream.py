@@ -0,0 +1,150 @@
+"""
+Streaming chat completions relayed to the browser as Server-Sent Events.
+
+The blocking chatbot endpoints hold a gunicorn worker until the whole
+completion, plus every tool-call round, has finished. The helpers here drive
+the same agentic loop against the providers' streaming APIs instead and yield
+events as they arrive:
+
+  ('token', text)   a text delta from the model
+  ('tool', name)    the model requested a tool; it is run server-side before
+                    the next streamed segment (text streamed before a tool
+                    round is superseded by the segment that follows it)
+  ('done', text)    the final segment's full text
+
+Token usage from every round is accumulated into the ``usage`` dict passed in
+by the caller, in the shape services.usage_metering.record_usage expects.
+"""
+
+import json
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from services.usage_metering import accumulate_usage, extract_usage
+
+MAX_ITERATIONS = 5
+
+Event = Tuple[str, object]
+
+
+def sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def stream_anthropic(client, model: str, system_prompt: str, messages: List[dict],
+                     tools: Optional[List[dict]] = None,
+                     execute_tool: Optional[Callable[[str, dict], str]] = None,
+                     usage: Optional[Dict] = None, max_tokens: int = 4096,
+                     cache_system: bool = False,
+                     max_iterations: int = MAX_ITERATIONS) -> Iterator[Event]:
+    """Run the tool loop on Anthropic's Messages streaming API."""
+    usage = {} if usage is None else usage
+    messages = list(messages)
+    system = system_prompt
+    if cache_system:
+        system = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+    kwargs = {'model': model, 'max_tokens': max_tokens, 'system': system}
+    if tools:
+        kwargs['tools'] = tools
+
+    text = ''
+    for iteration in range(1, max_iterations + 1):
+        print(f"[CHATBOT-ANTHROPIC] Streaming iteration {iteration}/{max_iterations}")
+        parts = []
+        with client.messages.stream(messages=messages, **kwargs) as stream:
+            for delta in stream.text_stream:
+                parts.append(delta)
+                yield 'token', delta
+            final = stream.get_final_message()
+
+        accumulate_usage(usage, extract_usage(final, 'anthropic'))
+        text = ''.join(parts)
+        tool_uses = [block for block in final.content if block.type == 'tool_use']
+        if not tool_uses or execute_tool is None:
+            break
+
+        messages.append({'role': 'assistant', 'content': final.content})
+        results = []
+        for tool_use in tool_uses:
+            yield 'tool', tool_use.name
+            result = execute_tool(tool_use.name, tool_use.input or {})
+            print(f"[CHATBOT-ANTHROPIC] {tool_use.name} returned {len(result)} chars")
+            results.append({'type': 'tool_result', 'tool_use_id': tool_use.id, 'content': result})
+        messages.append({'role': 'user', 'content': results})
+        text = ''
+
+    yield 'done', text
+
+
+def stream_openai(client, model: str, system_prompt: str, messages: List[dict],
+                  tools: Optional[List[dict]] = None,
+                  execute_tool: Optional[Callable[[str, dict], str]] = None,
+                  usage: Optional[Dict] = None, max_tokens: int = 4096,
+                  max_iterations: int = MAX_ITERATIONS) -> Iterator[Event]:
+    """Run the tool loop on OpenAI's streaming chat completions API.
+
+    Tool-call arguments arrive as fragments keyed by index and are stitched
+    together before the tools run.
+    """
+    usage = {} if usage is None else usage
+    messages = [{'role': 'system', 'content': system_prompt}] + list(messages)
+    kwargs = {'model': model, 'max_tokens': max_tokens, 'stream': True,
+              'stream_options': {'include_usage': True}}
+    if tools:
+        kwargs.update(tools=tools, tool_choice='auto')
+
+    text = ''
+    for iteration in range(1, max_iterations + 1):
+        print(f"[CHATBOT-OPENAI] Streaming iteration {iteration}/{max_iterations}")
+        parts = []
+        calls: Dict[int, dict] = {}
+        for chunk in client.chat.completions.create(messages=messages, **kwargs):
+            if getattr(chunk, 'usage', None) is not None:
+                accumulate_usage(usage, extract_usage(chunk, 'openai'))
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                parts.append(delta.content)
+                yield 'token', delta.content
+            for fragment in delta.tool_calls or []:
+                call = calls.setdefault(fragment.index, {'id': None, 'name': '', 'arguments': ''})
+                if fragment.id:
+                    call['id'] = fragment.id
+                if fragment.function is not None:
+                    call['name'] += fragment.function.name or ''
+                    call['arguments'] += fragment.function.arguments or ''
+
+        text = ''.join(parts)
+        if not calls or execute_tool is None:
+            break
+
+        ordered = [calls[i] for i in sorted(calls)]
+        messages.append({
+            'role': 'assistant',
+            'content': text or None,
+            'tool_calls': [
+                {'id': c['id'], 'type': 'function',
+                 'function': {'name': c['name'], 'arguments': c['arguments']}}
+                for c in ordered
+            ],
+        })
+        for call in ordered:
+            yield 'tool', call['name']
+            args = json.loads(call['arguments']) if call['arguments'] else {}
+            result = execute_tool(call['name'], args)
+            print(f"[CHATBOT-OPENAI] {call['name']} returned {len(result)} chars")
+            messages.append({'role': 'tool', 'tool_call_id': call['id'],
+                             'name': call['name'], 'content': result})
+        text = ''
+
+    yield 'done', text
+
+
+def stream_chat(client, provider: str, model: str, system_prompt: str, messages: List[dict],
+                **kwargs) -> Iterator[Event]:
+    """Dispatch to the provider's streaming loop (OpenAI is the default)."""
+    if provider == 'anthropic':
+        return stream_anthropic(client, model, system_prompt, messages, **kwargs)
+    kwargs.pop('cache_system', None)
+    return stream_openai(client, model, system_prompt, messages, **kwargs)
@@ -0,0 +1,86 @@
+"""
+In-memory cache for the chatbot's enrichment context.
+
+The enrichment context (full market summary, top movers, today's briefings
+and the cross-market news summary) only changes when the daily refresh,
+briefing generation or the news pipeline runs, so it is assembled once and
+reused by every /api/chatbot request until one of these happens:
+
+  - invalidate_chatbot_context() is called (run_data_collection and
+    run_news_pipeline do this when they finish)
+  - the metric store version changes
+  - one of the watched briefing/news files changes on disk
+  - the cached text is older than MAX_AGE_SECONDS (picks up CSVs updated
+    outside the refresh job)
+
+This module has no dependencies on the rest of the app so writers anywhere
+can call the invalidation hook.
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+try:
+    import metric_store
+except ImportError:
+    from signaltrackers import metric_store
+
+MAX_AGE_SECONDS = 3600
+
+_lock = threading.Lock()
+_build_lock = threading.Lock()
+_generation = 0
+_cached: Optional[tuple] = None  # (key, built_at, text)
+
+
+def invalidate_chatbot_context() -> None:
+    """Drop the cached context; the next chatbot request rebuilds it."""
+    global _generation, _cached
+    with _lock:
+        _generation += 1
+        _cached = None
+
+
+def _file_stamps(paths: Iterable) -> tuple:
+    stamps = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamps.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamps.append(None)
+    return tuple(stamps)
+
+
+def get_chatbot_context(builder: Callable[[], str], watched_files: Iterable = ()) -> str:
+    """Return the cached context, calling ``builder`` only when it is stale.
+
+    Concurrent requests that find the cache stale wait for a single rebuild
+    instead of each running ``builder``.
+    """
+    global _cached
+    watched_files = tuple(watched_files)
+
+    def current_key():
+        return (_generation, metric_store.get_version(), _file_stamps(watched_files))
+
+    def fresh(entry, key):
+        return entry is not None and entry[0] == key and time.monotonic() - entry[1] < MAX_AGE_SECONDS
+
+    key = current_key()
+    entry = _cached
+    if fresh(entry, key):
+        return entry[2]
+
+    with _build_lock:
+        key = current_key()
+        entry = _cached
+        if fresh(entry, key):
+            return entry[2]
+        text = builder()
+        with _lock:
+            if key[0] == _generation:
+                _cached = (key, time.monotonic(), text)
+        return text
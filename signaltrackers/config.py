@@ -44,6 +44,10 @@ class Config:
     RATELIMIT_STORAGE_URI = 'memory://'
     RATELIMIT_DEFAULT = '100 per minute'
 
+    # HTTP caching of data APIs (see http_cache.py)
+    HTTP_CACHE_MAX_AGE = int(os.environ.get('HTTP_CACHE_MAX_AGE', 3600))
+    HTTP_CACHE_RELEASE = os.environ.get('RELEASE_VERSION', '')
+
     # Anonymous session AI limits (lifetime per session)
     ANON_SESSION_LIMIT_CHATBOT = int(os.environ.get('ANON_SESSION_LIMIT_CHATBOT', 5))
     ANON_SESSION_LIMIT_ANALYSIS = int(os.environ.get('ANON_SESSION_LIMIT_ANALYSIS', 2))
@@ -4,7 +4,10 @@ Market Divergence Dashboard
 A comprehensive web dashboard for tracking the historic market divergence.
 """
 
-from flask import Flask, render_template, jsonify, request, redirect, url_for, flash, abort
+from flask import (
+    Flask, Response, render_template, jsonify, request, redirect, url_for, flash, abort,
+    stream_with_context,
+)
 from flask_login import login_user, logout_user, login_required, current_user
 import pandas as pd
 import numpy as np
@@ -61,6 +64,14 @@ from conditions_config import (
 )
 from property_interpretation_config import get_property_interpretation
 from market_conditions import update_market_conditions_cache, get_market_conditions, get_conditions_history, build_implications_matrix
+import metric_store
+from snapshot_store import SnapshotStore
+from http_cache import ResponseCache
+from top_movers import TopMoversEngine
+from metric_series import MetricSeries, MetricSeriesCache, aligned_payload
+import series_wire
+from chatbot_context import get_chatbot_context, invalidate_chatbot_context
+from chat_stream import sse_event, stream_chat
 from services.rate_limiting import anonymous_rate_limit, CATEGORY_CHATBOT, CATEGORY_ANALYSIS
 from billing import init_stripe, is_stripe_configured, get_webhook_secret
 
@@ -91,6 +102,28 @@ reload_status = {
 
 DATA_DIR = Path("data")
 
+# Precomputed API payloads, rebuilt by run_data_collection (see snapshot_store.py)
+snapshots = SnapshotStore(lambda: DATA_DIR, dumps=app.json.dumps)
+# Binary (?format=binary) encodings of the chart payloads (see series_wire.py)
+binary_snapshots = SnapshotStore(lambda: DATA_DIR, dumps=series_wire.encode, suffix='.stw')
+
+# Weekday data refresh schedule; also bounds API cache lifetimes
+DAILY_REFRESH_TRIGGER = CronTrigger(hour=17, minute=30, day_of_week='mon-fri',
+                                    timezone=pytz.timezone('US/Eastern'))
+
+# ETags, Cache-Control and compression for the data APIs (see http_cache.py)
+response_cache = ResponseCache(
+    lambda: DATA_DIR,
+    next_refresh=lambda now: DAILY_REFRESH_TRIGGER.get_next_fire_time(None, now),
+)
+response_cache.init_app(app)
+
+# Vectorized top-movers scoring, cached per data version (see top_movers.py)
+top_movers_engine = TopMoversEngine(lambda: DATA_DIR)
+
+# Chart series arrays and full-range stats, cached per data version (see metric_series.py)
+metric_series_cache = MetricSeriesCache()
+
 # Background scheduler for automatic data refresh
 scheduler = None
 
@@ -233,10 +266,9 @@ def init_scheduler():
     scheduler = init_apscheduler(app)
 
     # Add the data refresh job to the scheduler
-    eastern = pytz.timezone('US/Eastern')
     scheduler.add_job(
         scheduled_data_refresh,
-        CronTrigger(hour=17, minute=30, day_of_week='mon-fri', timezone=eastern),
+        DAILY_REFRESH_TRIGGER,
         id='daily_refresh',
         replace_existing=True,
         name='Daily Data Refresh'
@@ -806,15 +838,10 @@ METRIC_DISPLAY_NAMES = {
 
 
 def load_csv_data(filename):
-    """Load CSV file and return as DataFrame."""
-    filepath = DATA_DIR / filename
-    if filepath.exists():
-        df = pd.read_csv(filepath)
-        # us_recessions.csv has start_date/end_date, not date
-        if filename != 'us_recessions.csv':
-            df['date'] = pd.to_datetime(df['date'])
-        return df
-    return None
+    """Load CSV file and return as DataFrame (served from the shared metric store)."""
+    # us_recessions.csv has start_date/end_date, not date
+    parse_dates = () if filename == 'us_recessions.csv' else ('date',)
+    return metric_store.read_frame(DATA_DIR / filename, parse_dates=parse_dates)
 
 
 def calculate_returns(df, column, periods=[1, 5, 20]):
@@ -837,24 +864,8 @@ def calculate_percentile_rank(series, current_value):
     Uses rolling 20-year history (or full available history if < 20 years).
     Returns a float 0–100, or None if series is empty.
     """
-    import numpy as np
-    if series is None or len(series) == 0:
-        return None
-    if len(series) == 1:
-        return 100.0 if current_value >= series.iloc[0] else 0.0
-
-    # Apply 20-year rolling window where possible
-    cutoff = pd.Timestamp.today() - pd.DateOffset(years=20)
-    # series index expected to be dates; filter if index is datetime-like
-    try:
-        windowed = series[series.index >= cutoff]
-        if len(windowed) < 2:
-            windowed = series
-    except TypeError:
-        windowed = series
-
-    count_below = (windowed < current_value).sum()
-    return float(count_below / len(windowed) * 100)
+    from rolling_percentile import percentile_of
+    return percentile_of(series, current_value, years=20)
 
 
 def _percentile_label(pct):
@@ -874,7 +885,7 @@ def _percentile_label(pct):
     return 'near historical wides'
 
 
-def calculate_top_movers(num_movers=5, period=5):
+def calculate_top_movers(num_movers=5, period=5, as_of=None):
     """
     Calculate top movers based on z-score of N-day changes.
     Returns metrics with most unusual moves relative to their historical volatility.
@@ -882,196 +893,9 @@ def calculate_top_movers(num_movers=5, period=5):
     Args:
         num_movers: Number of top movers to return.
         period: Change period in days (1 for daily, 5 for weekly).
+        as_of: Optional date to score as of (defaults to the latest data).
     """
-    import os
-    import numpy as np
-
-    movers = []
-
-    # Define which metrics use absolute change vs % change for display
-    # Also define friendly names and explorer links
-    metric_config = {
-        # Spreads - use absolute bp change
-        'high_yield_spread': {'display': 'abs', 'unit': 'bp', 'name': 'HY Spread', 'link': '/explorer?metric=high_yield_spread', 'multiplier': 100},
-        'investment_grade_spread': {'display': 'abs', 'unit': 'bp', 'name': 'IG Spread', 'link': '/explorer?metric=investment_grade_spread', 'multiplier': 100},
-        'ccc_spread': {'display': 'abs', 'unit': 'bp', 'name': 'CCC Spread', 'link': '/explorer?metric=ccc_spread', 'multiplier': 100},
-
-        # Prices - use % change
-        'gold_price': {'display': 'pct', 'unit': '%', 'name': 'Gold', 'link': '/explorer?metric=gold_price'},
-        'silver_price': {'display': 'pct', 'unit': '%', 'name': 'Silver', 'link': '/explorer?metric=silver_price'},
-        'bitcoin_price': {'display': 'pct', 'unit': '%', 'name': 'Bitcoin', 'link': '/explorer?metric=bitcoin_price'},
-        'sp500_price': {'display': 'pct', 'unit': '%', 'name': 'S&P 500', 'link': '/explorer?metric=sp500_price'},
-        'nasdaq_price': {'display': 'pct', 'unit': '%', 'name': 'Nasdaq', 'link': '/explorer?metric=nasdaq_price'},
-        'vix_price': {'display': 'pct', 'unit': '%', 'name': 'VIX', 'link': '/explorer?metric=vix_price'},
-        'oil_price': {'display': 'pct', 'unit': '%', 'name': 'Oil', 'link': '/explorer?metric=oil_price'},
-        'commodities_price': {'display': 'pct', 'unit': '%', 'name': 'Commodities', 'link': '/explorer?metric=commodities_price'},
-        'gold_miners_price': {'display': 'pct', 'unit': '%', 'name': 'Gold Miners', 'link': '/explorer?metric=gold_miners_price'},
-        'small_cap_price': {'display': 'pct', 'unit': '%', 'name': 'Small Caps', 'link': '/explorer?metric=small_cap_price'},
-        'tech_sector_price': {'display': 'pct', 'unit': '%', 'name': 'Tech Sector', 'link': '/explorer?metric=tech_sector_price'},
-        'semiconductor_price': {'display': 'pct', 'unit': '%', 'name': 'Semiconductors', 'link': '/explorer?metric=semiconductor_price'},
-        'financials_sector_price': {'display': 'pct', 'unit': '%', 'name': 'Financials', 'link': '/explorer?metric=financials_sector_price'},
-        'energy_sector_price': {'display': 'pct', 'unit': '%', 'name': 'Energy', 'link': '/explorer?metric=energy_sector_price'},
-        'treasury_20yr_price': {'display': 'pct', 'unit': '%', 'name': 'Treasury 20Y', 'link': '/explorer?metric=treasury_20yr_price'},
-        'dollar_index_price': {'display': 'pct', 'unit': '%', 'name': 'Dollar Index', 'link': '/explorer?metric=dollar_index_price'},
-        'usdjpy_price': {'display': 'pct', 'unit': '%', 'name': 'USD/JPY', 'link': '/explorer?metric=usdjpy_price'},
-
-        # Ratios - use % change
-        'gold_silver_ratio': {'display': 'pct', 'unit': '%', 'name': 'Gold/Silver Ratio', 'link': '/explorer?metric=gold_silver_ratio'},
-        'smh_spy_ratio': {'display': 'pct', 'unit': '%', 'name': 'Semiconductor/SPY', 'link': '/explorer?metric=smh_spy_ratio'},
-        'xlk_spy_ratio': {'display': 'pct', 'unit': '%', 'name': 'Tech/SPY', 'link': '/explorer?metric=xlk_spy_ratio'},
-        'growth_value_ratio': {'display': 'pct', 'unit': '%', 'name': 'Growth/Value', 'link': '/explorer?metric=growth_value_ratio'},
-        'iwm_spy_ratio': {'display': 'pct', 'unit': '%', 'name': 'Small/Large Cap', 'link': '/explorer?metric=iwm_spy_ratio'},
-        'market_breadth_ratio': {'display': 'pct', 'unit': '%', 'name': 'Market Breadth', 'link': '/explorer?metric=market_breadth_ratio'},
-
-        # Yields - use absolute change
-        'japan_10y_yield': {'display': 'abs', 'unit': '%', 'name': 'Japan 10Y Yield', 'link': '/explorer?metric=japan_10y_yield', 'multiplier': 1},
-        'real_yield_proxy': {'display': 'pct', 'unit': '%', 'name': 'Real Yield Proxy', 'link': '/explorer?metric=real_yield_proxy'},
-        'treasury_10y': {'display': 'abs', 'unit': '%', 'name': '10Y Treasury', 'link': '/explorer?metric=treasury_10y', 'multiplier': 1},
-
-        # ETF spreads
-        'hyg_treasury_spread': {'display': 'pct', 'unit': '%', 'name': 'HYG-Treasury Spread', 'link': '/explorer?metric=hyg_treasury_spread'},
-        'lqd_treasury_spread': {'display': 'pct', 'unit': '%', 'name': 'LQD-Treasury Spread', 'link': '/explorer?metric=lqd_treasury_spread'},
-
-        # Economic Indicators - use % change
-        'consumer_confidence': {'display': 'pct', 'unit': '%', 'name': 'Consumer Confidence', 'link': '/explorer?metric=consumer_confidence'},
-        'm2_money_supply': {'display': 'pct', 'unit': '%', 'name': 'M2 Money Supply', 'link': '/explorer?metric=m2_money_supply'},
-        'cpi': {'display': 'pct', 'unit': '%', 'name': 'CPI (Inflation)', 'link': '/explorer?metric=cpi'},
-
-        # Yield Curve - use absolute change (spread in %)
-        'yield_curve_10y2y': {'display': 'abs', 'unit': '%', 'name': '10Y-2Y Yield Curve', 'link': '/explorer?metric=yield_curve_10y2y', 'multiplier': 1},
-        'yield_curve_10y3m': {'display': 'abs', 'unit': '%', 'name': '10Y-3M Yield Curve', 'link': '/explorer?metric=yield_curve_10y3m', 'multiplier': 1},
-
-        # Labor Market - use % change
-        'initial_claims': {'display': 'pct', 'unit': '%', 'name': 'Initial Claims', 'link': '/explorer?metric=initial_claims'},
-        'continuing_claims': {'display': 'pct', 'unit': '%', 'name': 'Continuing Claims', 'link': '/explorer?metric=continuing_claims'},
-
-        # Fed Liquidity & Financial Conditions - use % change
-        'fed_balance_sheet': {'display': 'pct', 'unit': '%', 'name': 'Fed Balance Sheet', 'link': '/explorer?metric=fed_balance_sheet'},
-        'reverse_repo': {'display': 'pct', 'unit': '%', 'name': 'Reverse Repo', 'link': '/explorer?metric=reverse_repo'},
-        'nfci': {'display': 'abs', 'unit': 'index', 'name': 'NFCI', 'link': '/explorer?metric=nfci', 'multiplier': 1},
-
-        # Crypto Sentiment
-        'fear_greed_index': {'display': 'abs', 'unit': 'pts', 'name': 'Crypto Fear/Greed', 'link': '/explorer?metric=fear_greed_index', 'multiplier': 1},
-        'btc_gold_ratio': {'display': 'pct', 'unit': '%', 'name': 'BTC/Gold Ratio', 'link': '/explorer?metric=btc_gold_ratio'},
-
-        # Real Yields & Inflation (Gold Drivers)
-        'real_yield_10y': {'display': 'abs', 'unit': '%', 'name': '10Y Real Yield', 'link': '/explorer?metric=real_yield_10y', 'multiplier': 1},
-        'breakeven_inflation_10y': {'display': 'abs', 'unit': '%', 'name': '10Y Breakeven', 'link': '/explorer?metric=breakeven_inflation_10y', 'multiplier': 1},
-        'gdx_gld_ratio': {'display': 'pct', 'unit': '%', 'name': 'GDX/GLD Ratio', 'link': '/explorer?metric=gdx_gld_ratio'},
-    }
-
-    # Process each metric file
-    csv_files = [f for f in os.listdir(DATA_DIR) if f.endswith('.csv') and f != 'us_recessions.csv']
-
-    for filename in csv_files:
-        metric_name = filename.replace('.csv', '')
-        config = metric_config.get(metric_name)
-
-        # Skip metrics not in our config (like etf duplicates)
-        if not config:
-            continue
-
-        df = load_csv_data(filename)
-        if df is None or len(df) < 60:  # Need enough history for z-score
-            continue
-
-        # Check data freshness - only include metrics with data from past 5 days
-        last_date = df['date'].iloc[-1]
-        days_since_update = (pd.Timestamp.now() - pd.Timestamp(last_date)).days
-        if days_since_update > 5:
-            continue
-
-        col = df.columns[1]  # Data column
-        multiplier = config.get('multiplier', 1)
-
-        # Calculate N-day changes for z-score
-        # Rolling window scales with period: 60 for 5d, 30 for 1d
-        rolling_window = max(30, period * 12)
-        min_rows = rolling_window + period + 5
-
-        if config['display'] == 'pct':
-            df['change_nd'] = df[col].pct_change(period) * 100
-        else:
-            df['change_nd'] = (df[col] - df[col].shift(period)) * multiplier
-
-        df['rolling_std'] = df['change_nd'].rolling(rolling_window).std()
-        df['rolling_mean'] = df['change_nd'].rolling(rolling_window).mean()
-
-        if len(df) < min_rows:
-            continue
-
-        current_change = df['change_nd'].iloc[-1]
-        rolling_std = df['rolling_std'].iloc[-1]
-        rolling_mean = df['rolling_mean'].iloc[-1]
-
-        if pd.isna(current_change) or pd.isna(rolling_std) or rolling_std == 0:
-            continue
-
-        z_score = (current_change - rolling_mean) / rolling_std
-
-        # Get current value (apply multiplier for display)
-        raw_value = df[col].iloc[-1]
-        if pd.isna(raw_value):
-            continue
-        current_value = float(raw_value) * multiplier
-
-        change_val = round(float(current_change), 2)
-        mover = {
-            'metric': metric_name,
-            'name': config['name'],
-            'link': config['link'],
-            'change': change_val,
-            f'change_{period}d': change_val,
-            'z_score': round(float(z_score), 2),
-            'unit': config['unit'],
-            'display_type': config['display'],
-            'current_value': round(current_value, 2)
-        }
-        movers.append(mover)
-
-    # Add calculated metrics (divergence gap, CCC/HY ratio)
-    # Divergence Gap
-    gold_df = load_csv_data('gold_price.csv')
-    hy_df = load_csv_data('high_yield_spread.csv')
-
-    if gold_df is not None and hy_df is not None and len(gold_df) > 65 and len(hy_df) > 65:
-        # Calculate divergence gap series
-        merged = pd.merge(gold_df, hy_df, on='date', suffixes=('_gold', '_hy'))
-        merged['gold_price'] = merged[merged.columns[1]] * 10
-        merged['hy_spread'] = merged[merged.columns[2]] * 100
-        merged['gold_implied'] = ((merged['gold_price'] / 2000) ** 1.5) * 400
-        merged['divergence_gap'] = merged['gold_implied'] - merged['hy_spread']
-
-        rolling_window = max(30, period * 12)
-        merged['change_nd'] = merged['divergence_gap'] - merged['divergence_gap'].shift(period)
-        merged['rolling_std'] = merged['change_nd'].rolling(rolling_window).std()
-        merged['rolling_mean'] = merged['change_nd'].rolling(rolling_window).mean()
-
-        if len(merged) > rolling_window + period + 5:
-            current_change = merged['change_nd'].iloc[-1]
-            rolling_std = merged['rolling_std'].iloc[-1]
-            rolling_mean = merged['rolling_mean'].iloc[-1]
-
-            if not pd.isna(current_change) and not pd.isna(rolling_std) and rolling_std > 0:
-                z_score = (current_change - rolling_mean) / rolling_std
-                current_divergence = merged['divergence_gap'].iloc[-1]
-                if not pd.isna(current_divergence):
-                    change_val = int(round(float(current_change), 0))
-                    movers.append({
-                        'metric': 'divergence_gap',
-                        'name': 'Divergence Gap',
-                        'link': '/explorer?metric=divergence_gap',
-                        'change': change_val,
-                        f'change_{period}d': change_val,
-                        'z_score': round(float(z_score), 2),
-                        'unit': 'bp',
-                        'display_type': 'abs',
-                        'current_value': int(round(float(current_divergence), 0))
-                    })
-
-    # Sort by absolute z-score and return top N
-    movers.sort(key=lambda x: abs(x['z_score']), reverse=True)
-    return movers[:num_movers]
+    return top_movers_engine.top(num_movers=num_movers, period=period, as_of=as_of)
 
 
 def calculate_crisis_score():
@@ -2399,16 +2223,41 @@ def unsubscribe_briefing(user_id):
     return render_template('unsubscribe_success.html', email_type='daily briefing')
 
 
+def _snapshot_response(snap, mimetype='application/json'):
+    """Serve a precomputed snapshot under its content ETag (response_cache answers 304s)."""
+    response = app.response_class(snap.body, mimetype=mimetype)
+    response.set_etag(snap.etag)
+    return response
+
+
+def _wants_binary(args):
+    """True for ?format=binary, False for JSON (the default).
+
+    Raises ValueError with a client-facing message on unknown formats.
+    """
+    fmt = args.get('format', 'json')
+    if fmt not in ('json', 'binary'):
+        raise ValueError("format must be 'json' or 'binary'")
+    return fmt == 'binary'
+
+
+def _wire_response(payload):
+    """Serve a chart payload in the series_wire binary format."""
+    return app.response_class(series_wire.encode(payload), mimetype=series_wire.MIMETYPE)
+
+
 @app.route('/api/dashboard')
+@response_cache.cached
 def api_dashboard():
     """API endpoint for dashboard data."""
-    return jsonify(get_dashboard_data())
+    return _snapshot_response(snapshots.get('dashboard', get_dashboard_data))
 
 
-@app.route('/api/chart/<chart_type>')
-def api_chart(chart_type):
-    """API endpoint for chart data."""
+CHART_TYPES = ('divergence_gap', 'credit_spreads', 'gold_bitcoin', 'equity_indices', 'vix')
 
+
+def build_chart_data(chart_type):
+    """Build the payload for /api/chart/<chart_type>, or None if data is missing."""
     if chart_type == 'divergence_gap':
         hy_df = load_csv_data('high_yield_spread.csv')
         gold_df = load_csv_data('gold_price.csv')
@@ -2423,12 +2272,12 @@ def api_chart(chart_type):
             gold_implied = [((g / 2000) ** 1.5) * 400 for g in gold_prices]
             divergence = [impl - actual for impl, actual in zip(gold_implied, hy_spreads)]
 
-            return jsonify({
+            return {
                 'dates': dates,
                 'actual_spread': hy_spreads,
                 'implied_spread': gold_implied,
                 'divergence_gap': divergence
-            })
+            }
 
     elif chart_type == 'credit_spreads':
         hy_df = load_csv_data('high_yield_spread.csv')
@@ -2452,7 +2301,7 @@ def api_chart(chart_type):
                 ccc_data = (ccc_df[ccc_df.columns[1]] * 100).tolist()
                 result['ccc_spread'] = ccc_data
 
-            return jsonify(result)
+            return result
 
     elif chart_type == 'gold_bitcoin':
         gold_df = load_csv_data('gold_price.csv')
@@ -2466,11 +2315,11 @@ def api_chart(chart_type):
             gold_data = (merged[gold_df.columns[1]] * 10).tolist()
             btc_data = merged[btc_df.columns[1]].tolist()
 
-            return jsonify({
+            return {
                 'dates': dates,
                 'gold': gold_data,
                 'bitcoin': btc_data
-            })
+            }
 
     elif chart_type == 'equity_indices':
         spy_df = load_csv_data('sp500_price.csv')
@@ -2489,7 +2338,7 @@ def api_chart(chart_type):
             if iwm_df is not None:
                 result['iwm'] = iwm_df[iwm_df.columns[1]].tolist()
 
-            return jsonify(result)
+            return result
 
     elif chart_type == 'vix':
         vix_df = load_csv_data('vix_price.csv')
@@ -2498,10 +2347,42 @@ def api_chart(chart_type):
             dates = vix_df['date'].dt.strftime('%Y-%m-%d').tolist()
             vix_data = vix_df[vix_df.columns[1]].tolist()
 
-            return jsonify({
+            return {
                 'dates': dates,
                 'vix': vix_data
-            })
+            }
+
+    return None
+
+
+def build_snapshots():
+    """Materialize the dashboard and chart payloads for the current data."""
+    builders = {'dashboard': get_dashboard_data}
+    for chart_type in CHART_TYPES:
+        builders[f'chart_{chart_type}'] = lambda t=chart_type: build_chart_data(t)
+    # Binary variants are rebuilt lazily on their next request
+    binary_snapshots.invalidate()
+    return snapshots.rebuild(builders)
+
+
+@app.route('/api/chart/<chart_type>')
+@response_cache.cached
+def api_chart(chart_type):
+    """API endpoint for chart data (``?format=binary`` for series_wire)."""
+    try:
+        binary = _wants_binary(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if chart_type in CHART_TYPES:
+        if binary:
+            snap = binary_snapshots.get(f'chart_{chart_type}', lambda: build_chart_data(chart_type))
+            if snap is not None:
+                return _snapshot_response(snap, mimetype=series_wire.MIMETYPE)
+        else:
+            snap = snapshots.get(f'chart_{chart_type}', lambda: build_chart_data(chart_type))
+            if snap is not None:
+                return _snapshot_response(snap)
 
     return jsonify({'error': 'Chart type not found'}), 404
 
@@ -2534,6 +2415,7 @@ def explorer():
 
 
 @app.route('/api/metrics/description/<metric_name>')
+@response_cache.cached
 def api_metric_description(metric_name):
     """API endpoint to get description for a specific metric."""
     if metric_name in METRIC_DESCRIPTIONS:
@@ -2542,6 +2424,7 @@ def api_metric_description(metric_name):
 
 
 @app.route('/api/metrics/list')
+@response_cache.cached
 def api_metrics_list():
     """API endpoint to list all available metrics."""
     import os
@@ -2580,11 +2463,11 @@ def api_metrics_list():
 
 
 @app.route('/api/recessions')
+@response_cache.cached
 def api_recessions():
     """API endpoint to get US recession periods for chart shading."""
-    filepath = DATA_DIR / 'us_recessions.csv'
-    if filepath.exists():
-        df = pd.read_csv(filepath)
+    df = load_csv_data('us_recessions.csv')
+    if df is not None:
         recessions = []
         for _, row in df.iterrows():
             recessions.append({
@@ -2597,10 +2480,77 @@ def api_recessions():
     return jsonify([])
 
 
-@app.route('/api/metrics/<metric_name>')
-def api_metric_data(metric_name):
-    """API endpoint to get data for a specific metric."""
+def _parse_series_query(args):
+    """Parse start/end/max_points query args for the series endpoints.
 
+    Raises ValueError with a client-facing message on malformed input.
+    """
+    bounds = []
+    for name in ('start', 'end'):
+        raw = args.get(name)
+        if not raw:
+            bounds.append(None)
+            continue
+        try:
+            bounds.append(pd.Timestamp(raw))
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid {name} date '{raw}' (expected YYYY-MM-DD)")
+
+    max_points = None
+    raw = args.get('max_points')
+    if raw:
+        try:
+            max_points = int(raw)
+        except ValueError:
+            raise ValueError("max_points must be an integer")
+        if max_points < 2:
+            raise ValueError("max_points must be at least 2")
+    return bounds[0], bounds[1], max_points
+
+
+def _build_divergence_gap_series():
+    gold_df = load_csv_data('gold_price.csv')
+    hy_df = load_csv_data('high_yield_spread.csv')
+    if gold_df is None or hy_df is None:
+        return None
+
+    # Merge on date
+    merged = pd.merge(gold_df, hy_df, on='date', how='inner')
+
+    # Calculate gold-implied spread and divergence gap
+    gold_prices = merged['gold_price'].values
+    hy_spreads = merged['high_yield_spread'].values * 100  # Convert to bp
+
+    gold_implied = ((gold_prices / 200) ** 1.5) * 400
+    divergence = gold_implied - hy_spreads
+    return MetricSeries(merged['date'], divergence, 'divergence_gap')
+
+
+def _get_metric_series(metric_name):
+    """Return the cached MetricSeries for a metric (or CSV file) name, or None."""
+    # Special handling for divergence_gap (calculated metric)
+    if metric_name == 'divergence_gap':
+        return metric_series_cache.get(
+            'divergence_gap',
+            [DATA_DIR / 'gold_price.csv', DATA_DIR / 'high_yield_spread.csv'],
+            _build_divergence_gap_series,
+        )
+
+    # Try loading with .csv extension if not present
+    filename = metric_name if metric_name.endswith('.csv') else f"{metric_name}.csv"
+
+    def build():
+        df = load_csv_data(filename)
+        if df is None or len(df) == 0:
+            return None
+        # Get the value column (second column, typically)
+        return MetricSeries.from_frame(df, df.columns[1])
+
+    return metric_series_cache.get(filename, [DATA_DIR / filename], build)
+
+
+def _resolve_metric_name(metric_name):
+    """Map a common/short metric name to its CSV file name."""
     # Metric name aliases - map common/short names to actual CSV file names
     metric_aliases = {
         'cpi_yoy': 'cpi',
@@ -2617,93 +2567,82 @@ def api_metric_data(metric_name):
     }
 
     # Apply alias if one exists
-    metric_name = metric_aliases.get(metric_name, metric_name)
+    return metric_aliases.get(metric_name, metric_name)
 
-    # Special handling for divergence_gap (calculated metric)
-    if metric_name == 'divergence_gap':
-        gold_df = load_csv_data('gold_price.csv')
-        hy_df = load_csv_data('high_yield_spread.csv')
 
-        if gold_df is not None and hy_df is not None:
-            # Merge on date
-            merged = pd.merge(gold_df, hy_df, on='date', how='inner')
+# Upper bound on ids per /api/metrics/batch request
+_METRICS_BATCH_MAX_IDS = 32
 
-            # Calculate gold-implied spread and divergence gap
-            gold_prices = merged['gold_price'].values
-            hy_spreads = merged['high_yield_spread'].values * 100  # Convert to bp
 
-            gold_implied = ((gold_prices / 200) ** 1.5) * 400
-            divergence = gold_implied - hy_spreads
+@app.route('/api/metrics/batch')
+@response_cache.cached
+def api_metrics_batch():
+    """API endpoint to get several metrics in one response.
 
-            dates = merged['date'].dt.strftime('%Y-%m-%d').tolist()
-            values = divergence.tolist()
-
-            # Calculate stats
-            current_value = values[-1] if values else None
-            min_value = min(values) if values else None
-            max_value = max(values) if values else None
-            avg_value = sum(values) / len(values) if values else None
-
-            # Calculate change
-            change_1d = None
-            change_30d = None
-            if len(values) >= 2:
-                change_1d = values[-1] - values[-2]
-            if len(values) >= 30:
-                change_30d = values[-1] - values[-30]
+    Query args: ``ids`` is a comma-separated list of metric names as accepted
+    by /api/metrics/<metric_name>; ``start``/``end``/``max_points`` behave as
+    there. By default ``metrics`` maps each id to that endpoint's payload (or
+    an ``error`` entry). With ``align=1`` the series share one ``dates`` axis
+    and each metric carries only ``values``, ``column_name`` and ``stats``.
+    ``format=binary`` returns the same payload encoded with series_wire.
+    """
+    ids = list(dict.fromkeys(i.strip() for i in request.args.get('ids', '').split(',') if i.strip()))
+    if not ids:
+        return jsonify({'error': 'ids is required'}), 400
+    if len(ids) > _METRICS_BATCH_MAX_IDS:
+        return jsonify({'error': f'At most {_METRICS_BATCH_MAX_IDS} ids per request'}), 400
 
-            return jsonify({
-                'dates': dates,
-                'values': values,
-                'column_name': 'divergence_gap',
-                'stats': {
-                    'current': current_value,
-                    'min': min_value,
-                    'max': max_value,
-                    'average': avg_value,
-                    'change_1d': change_1d,
-                    'change_30d': change_30d
-                }
-            })
+    try:
+        start, end, max_points = _parse_series_query(request.args)
+        binary = _wants_binary(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    found, missing = {}, []
+    for metric_id in ids:
+        series = _get_metric_series(_resolve_metric_name(metric_id))
+        if series is not None and len(series.values) > 0:
+            found[metric_id] = series
+        else:
+            missing.append(metric_id)
+    not_found = {'error': 'Metric not found or no data available'}
 
-    # Try loading with .csv extension if not present
-    filename = metric_name if metric_name.endswith('.csv') else f"{metric_name}.csv"
-    df = load_csv_data(filename)
+    if request.args.get('align', '').lower() in ('1', 'true', 'yes'):
+        result = aligned_payload(found, start=start, end=end, max_points=max_points, arrays=binary)
+        result['metrics'].update((metric_id, not_found) for metric_id in missing)
+    else:
+        result = {'metrics': {
+            metric_id: (found[metric_id].payload(start=start, end=end, max_points=max_points,
+                                                 arrays=binary)
+                        if metric_id in found else not_found)
+            for metric_id in ids
+        }}
+    return _wire_response(result) if binary else jsonify(result)
 
-    if df is not None and len(df) > 0:
-        dates = df['date'].dt.strftime('%Y-%m-%d').tolist()
 
-        # Get the value column (second column, typically)
-        value_column = df.columns[1]
-        values = df[value_column].tolist()
-
-        # Calculate stats
-        current_value = values[-1] if values else None
-        min_value = min(values) if values else None
-        max_value = max(values) if values else None
-        avg_value = sum(values) / len(values) if values else None
-
-        # Calculate change
-        change_1d = None
-        change_30d = None
-        if len(values) >= 2:
-            change_1d = values[-1] - values[-2]
-        if len(values) >= 30:
-            change_30d = values[-1] - values[-30]
+@app.route('/api/metrics/<metric_name>')
+@response_cache.cached
+def api_metric_data(metric_name):
+    """API endpoint to get data for a specific metric.
 
-        return jsonify({
-            'dates': dates,
-            'values': values,
-            'column_name': value_column,
-            'stats': {
-                'current': current_value,
-                'min': min_value,
-                'max': max_value,
-                'average': avg_value,
-                'change_1d': change_1d,
-                'change_30d': change_30d
-            }
-        })
+    Query args (all optional): ``start``/``end`` (YYYY-MM-DD, inclusive) limit
+    the date range and ``max_points`` downsamples it with min/max bucketing.
+    ``stats`` always describe the full history. ``format=binary`` returns the
+    payload encoded with series_wire.
+    """
+    metric_name = _resolve_metric_name(metric_name)
+
+    # Optional range / resolution: ?start=YYYY-MM-DD&end=YYYY-MM-DD&max_points=N
+    try:
+        start, end, max_points = _parse_series_query(request.args)
+        binary = _wants_binary(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    series = _get_metric_series(metric_name)
+    if series is not None and len(series.values) > 0:
+        payload = series.payload(start=start, end=end, max_points=max_points, arrays=binary)
+        return _wire_response(payload) if binary else jsonify(payload)
 
     return jsonify({'error': 'Metric not found or no data available'}), 404
 
@@ -2743,6 +2682,10 @@ def run_data_collection():
         if result2.returncode != 0:
             raise Exception(f"divergence_analysis.py failed: {result2.stderr}")
 
+        # The collectors run in subprocesses, so drop every in-memory series
+        # rather than relying on file timestamps alone
+        metric_store.bump_version()
+
         # Update recession probability panel data (US-146.1)
         reload_status['status'] = 'Updating recession probability data...'
         print("Updating recession probability data...")
@@ -2759,6 +2702,16 @@ def run_data_collection():
         except Exception as conditions_error:
             print(f"Market conditions update error (non-fatal): {conditions_error}")
 
+        # Precompute dashboard/chart API payloads for the new data
+        reload_status['status'] = 'Building dashboard snapshots...'
+        print("Building dashboard snapshots...")
+        try:
+            built = build_snapshots()
+            print(f"Built {sum(built.values())}/{len(built)} dashboard snapshots")
+        except Exception as snapshot_error:
+            print(f"Dashboard snapshot error (non-fatal): {snapshot_error}")
+        response_cache.invalidate()
+
         eastern = pytz.timezone('US/Eastern')
         reload_status['last_reload'] = datetime.now(eastern).strftime('%Y-%m-%d %H:%M:%S')
         print("Data reload completed successfully!")
@@ -2873,11 +2826,19 @@ def run_data_collection():
         # quarterly cron job after each earnings season completes.
         # The context processor reads from the cache file set by that job.
 
+        # Rebuild the chatbot context now so the first chat after a refresh is fast
+        invalidate_chatbot_context()
+        try:
+            get_chatbot_enrichment_context()
+        except Exception as context_error:
+            print(f"Chatbot context warm-up error (non-fatal): {context_error}")
+
         # Mark as successful
         reload_status['success'] = True
         reload_status['status'] = 'Complete!'
 
     except Exception as e:
+        invalidate_chatbot_context()
         reload_status['error'] = str(e)
         reload_status['success'] = False
         reload_status['status'] = 'Error occurred'
@@ -2935,6 +2896,7 @@ def api_scheduler_status():
 
 
 @app.route('/api/ai-summary')
+@response_cache.cached(max_age=0)
 def api_ai_summary():
     """Get the current AI-generated daily summary."""
     summary = get_summary_for_display()
@@ -2975,6 +2937,7 @@ def api_generate_summary():
 
 
 @app.route('/api/crypto-summary')
+@response_cache.cached(max_age=0)
 def api_crypto_summary():
     """Get the current AI-generated crypto/Bitcoin summary."""
     summary = get_crypto_summary_for_display()
@@ -3013,6 +2976,7 @@ def api_generate_crypto_summary():
 
 
 @app.route('/api/equity-summary')
+@response_cache.cached(max_age=0)
 def api_equity_summary():
     """Get the current AI-generated equity markets summary."""
     summary = get_equity_summary_for_display()
@@ -3051,6 +3015,7 @@ def api_generate_equity_summary():
 
 
 @app.route('/api/rates-summary')
+@response_cache.cached(max_age=0)
 def api_rates_summary():
     """Get the current AI-generated rates & yield curve summary."""
     summary = get_rates_summary_for_display()
@@ -3089,6 +3054,7 @@ def api_generate_rates_summary():
 
 
 @app.route('/api/dollar-summary')
+@response_cache.cached(max_age=0)
 def api_dollar_summary():
     """Get the current dollar AI summary."""
     summary = get_dollar_summary_for_display()
@@ -3127,6 +3093,7 @@ def api_generate_dollar_summary():
 
 
 @app.route('/api/credit-summary')
+@response_cache.cached(max_age=0)
 def api_credit_summary():
     """Get the current credit AI summary."""
     summary = get_credit_summary_for_display()
@@ -3246,6 +3213,75 @@ def _build_chatbot_enrichment_context():
     return "\n\n".join(parts) if parts else ""
 
 
+def _chatbot_context_files():
+    """Briefing and news files whose changes invalidate the chatbot context."""
+    import ai_summary
+    import news_pipeline
+    return (
+        ai_summary.SUMMARIES_FILE,
+        ai_summary.CRYPTO_SUMMARIES_FILE,
+        ai_summary.EQUITY_SUMMARIES_FILE,
+        ai_summary.RATES_SUMMARIES_FILE,
+        ai_summary.DOLLAR_SUMMARIES_FILE,
+        ai_summary.CREDIT_SUMMARIES_FILE,
+        news_pipeline.NEWS_CACHE_FILE,
+    )
+
+
+def get_chatbot_enrichment_context():
+    """Return the chatbot enrichment context, rebuilt only when its inputs change."""
+    return get_chatbot_context(_build_chatbot_enrichment_context, _chatbot_context_files())
+
+
+def _chat_stream_response(client, provider, model, system_prompt, messages, interaction_type,
+                          log_label, **stream_kwargs):
+    """Relay a streaming completion to the browser as Server-Sent Events.
+
+    Emits ``token`` events as text arrives, ``tool`` events while tool calls
+    run server-side, then a single ``done`` event carrying the final filtered
+    response (or ``error`` if the provider call fails). Usage is metered once
+    the stream ends, including when the client disconnects part-way.
+    """
+    from services.usage_metering import record_usage
+
+    user_id = current_user.id if current_user.is_authenticated else None
+
+    def generate():
+        usage = {}
+        try:
+            ai_response = None
+            events = stream_chat(client, provider, model, system_prompt, messages,
+                                 usage=usage, **stream_kwargs)
+            for kind, payload in events:
+                if kind == 'token':
+                    yield sse_event('token', {'text': payload})
+                elif kind == 'tool':
+                    yield sse_event('tool', {'name': payload})
+                else:
+                    ai_response = payload
+
+            if not ai_response or not ai_response.strip():
+                ai_response = "I apologize, but I wasn't able to generate a response. Please try again."
+            yield sse_event('done', {
+                'response': _filter_reasoning_artifacts(ai_response),
+                'timestamp': datetime.now().isoformat()
+            })
+        except Exception as e:
+            app.logger.error(f'{log_label} streaming AI error: {e}')
+            yield sse_event('error', {'error': 'AI service unavailable'})
+        finally:
+            if user_id is not None and usage:
+                try:
+                    record_usage(user_id=user_id, interaction_type=interaction_type,
+                                 model_name=model, **usage)
+                except Exception:
+                    app.logger.exception(f'{log_label} metering error (non-fatal)')
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/api/chatbot/stream', methods=['POST'], endpoint='api_chatbot_stream')
 @app.route('/api/chatbot', methods=['POST'])
 @csrf.exempt
 @login_required
@@ -3283,7 +3319,7 @@ def api_chatbot():
     # Build enriched market context (US-325.7)
     enrichment_context = ""
     try:
-        enrichment_context = _build_chatbot_enrichment_context()
+        enrichment_context = get_chatbot_enrichment_context()
         if enrichment_context:
             enrichment_context = "\n\n" + enrichment_context
     except Exception as e:
@@ -3403,6 +3439,20 @@ def api_chatbot():
         if web_search_available:
             tools.append({"type": "function", "function": SEARCH_FUNCTION_DEFINITION})
 
+    # /api/chatbot/stream: relay tokens as Server-Sent Events instead of
+    # blocking until the full answer is ready
+    if request.endpoint == 'api_chatbot_stream':
+        messages = []
+        for msg in conversation_history:
+            role = 'user' if msg.get('role') == 'user' else 'assistant'
+            messages.append({'role': role, 'content': msg.get('content', '')})
+        messages.append({'role': 'user', 'content': user_message})
+        interaction_type = 'sentence_drill_in' if context.get('briefing_text') else 'chatbot'
+        return _chat_stream_response(
+            client, provider, model, system_prompt, messages, interaction_type, 'Chatbot',
+            tools=tools, execute_tool=_execute_tool, cache_system=True,
+        )
+
     # Usage metering: accumulate tokens across agentic loop iterations
     from services.usage_metering import extract_usage, accumulate_usage, record_usage
     total_usage = {}
@@ -3805,6 +3855,8 @@ def _get_section_live_data(section_id: str) -> str:
 
 
 @app.route('/api/chatbot/section-opening', methods=['POST'])
+@app.route('/api/chatbot/section-opening/stream', methods=['POST'],
+           endpoint='api_chatbot_section_opening_stream')
 @csrf.exempt
 @login_required
 @anonymous_rate_limit(CATEGORY_CHATBOT)
@@ -3875,6 +3927,12 @@ def api_chatbot_section_opening():
     except Exception:
         pass
 
+    if request.endpoint == 'api_chatbot_section_opening_stream':
+        return _chat_stream_response(
+            client, provider, model, system_prompt, [{'role': 'user', 'content': user_message}],
+            'section_ai', f'Section opening (section={section_id})', max_tokens=512,
+        )
+
     try:
         if provider == 'anthropic':
             response = client.messages.create(
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Derived metrics (ratios and spreads) as a small dependency graph.
+
+Each metric is declared once as a DerivedMetric node: the series it reads,
+the formula that combines them and the file it writes. The executor loads
+every input file at most once per run, skips nodes whose inputs have no rows
+newer than the node's output, computes only the new date range for the rest,
+and runs nodes that don't depend on each other in parallel.
+
+Inputs are addressed by file stem in data/ (e.g. 'sp500_price'), so a node
+may also read another node's output; such nodes run in a later wave.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+
+# --- Formulas ---------------------------------------------------------------
+# Each takes the aligned input Series (same order as DerivedMetric.inputs)
+# and returns the output Series.
+
+def ratio(scale: float = 1.0) -> Callable[..., pd.Series]:
+    """a / b * scale"""
+    return lambda a, b: (a / b) * scale
+
+
+def premium_pct(a: pd.Series, b: pd.Series) -> pd.Series:
+    """Percent premium of a over b: (a / b - 1) * 100"""
+    return (a / b - 1) * 100
+
+
+def difference(a: pd.Series, b: pd.Series) -> pd.Series:
+    """a - b"""
+    return a - b
+
+
+@dataclass(frozen=True)
+class DerivedMetric:
+    """One node of the derived-metrics graph."""
+    output: str                     # output file stem in data/
+    column: str                     # value column written to the output file
+    inputs: Tuple[str, ...]         # input file stems, passed to formula in order
+    formula: Callable[..., pd.Series]
+    label: str = ''                 # printed when the node writes new rows
+
+
+DERIVED_METRICS: List[DerivedMetric] = [
+    # Credit ETF spreads vs treasuries
+    DerivedMetric('hyg_treasury_spread', 'hyg_vs_ief_spread',
+                  ('high_yield_credit_price', 'treasury_7_10yr_price'), premium_pct,
+                  'HYG vs IEF spread'),
+    DerivedMetric('lqd_treasury_spread', 'lqd_vs_ief_spread',
+                  ('investment_grade_credit_price', 'treasury_7_10yr_price'), premium_pct,
+                  'LQD vs IEF spread'),
+    # Market breadth, metals and real yields
+    DerivedMetric('market_breadth_ratio', 'breadth_ratio',
+                  ('sp500_equal_weight_price', 'sp500_price'), ratio(100),
+                  'Market breadth ratio (RSP/SPY)'),
+    DerivedMetric('gold_silver_ratio', 'gold_silver_ratio',
+                  ('gold_price', 'silver_price'), ratio(),
+                  'Gold/Silver ratio'),
+    DerivedMetric('real_yield_proxy', 'real_yield_proxy',
+                  ('tips_inflation_price', 'treasury_7_10yr_price'), premium_pct,
+                  'Real yield proxy (TIP/IEF)'),
+    # Market concentration (AI/Tech tracking)
+    DerivedMetric('smh_spy_ratio', 'smh_spy_ratio',
+                  ('semiconductor_price', 'sp500_price'), ratio(100),
+                  'SMH/SPY ratio (semiconductor concentration)'),
+    DerivedMetric('xlk_spy_ratio', 'xlk_spy_ratio',
+                  ('tech_sector_price', 'sp500_price'), ratio(100),
+                  'XLK/SPY ratio (tech sector concentration)'),
+    DerivedMetric('growth_value_ratio', 'growth_value_ratio',
+                  ('growth_price', 'value_price'), ratio(100),
+                  'IWF/IWD ratio (growth vs value)'),
+    DerivedMetric('iwm_spy_ratio', 'iwm_spy_ratio',
+                  ('small_cap_price', 'sp500_price'), ratio(100),
+                  'IWM/SPY ratio (small cap vs large cap)'),
+    DerivedMetric('qqq_spy_ratio', 'qqq_spy_ratio',
+                  ('nasdaq_price', 'sp500_price'), ratio(100),
+                  'QQQ/SPY ratio (Nasdaq vs S&P 500 tech leadership)'),
+    DerivedMetric('btc_gold_ratio', 'btc_gold_ratio',
+                  ('bitcoin_price', 'gold_price'), ratio(),
+                  'BTC/Gold ratio (Bitcoin priced in gold ounces)'),
+    DerivedMetric('gdx_gld_ratio', 'gdx_gld_ratio',
+                  ('gold_miners_price', 'gold_price'), ratio(100),
+                  'GDX/GLD ratio (gold miners vs gold)'),
+    # Rate differentials (currency/FX drivers)
+    DerivedMetric('us_japan_10y_spread', 'us_japan_10y_spread',
+                  ('treasury_10y', 'japan_10y_yield'), difference,
+                  'US-Japan 10Y spread (carry trade driver)'),
+    DerivedMetric('us_germany_10y_spread', 'us_germany_10y_spread',
+                  ('treasury_10y', 'germany_10y_yield'), difference,
+                  'US-Germany 10Y spread (EUR/USD driver)'),
+]
+
+
+def execution_waves(nodes: Sequence[DerivedMetric]) -> List[List[DerivedMetric]]:
+    """Group nodes into waves; every node's in-graph inputs are in earlier waves."""
+    by_output = {node.output: node for node in nodes}
+    remaining = list(nodes)
+    done = set()
+    waves = []
+    while remaining:
+        wave = [n for n in remaining
+                if all(i in done or i not in by_output for i in n.inputs)]
+        if not wave:
+            cycle = ', '.join(n.output for n in remaining)
+            raise ValueError(f"Derived metrics have a dependency cycle: {cycle}")
+        waves.append(wave)
+        done.update(n.output for n in wave)
+        remaining = [n for n in remaining if n not in wave]
+    return waves
+
+
+class DerivedMetricsEngine:
+    """Executes DerivedMetric nodes against a data directory.
+
+    ``storage`` is a series_storage backend and ``append`` the tracker's
+    append_to_csv, so outputs keep the same dedup/today-replacement rules
+    as collected series. A full run instead rewrites each output from its
+    recomputed history.
+    """
+
+    def __init__(self, data_dir, storage, append: Callable, workers: int = 4):
+        self.data_dir = data_dir
+        self.storage = storage
+        self.append = append
+        self.workers = max(1, workers)
+        self._inputs: Dict[str, Optional[pd.Series]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _path(self, stem: str):
+        return self.data_dir / f"{stem}.csv"
+
+    def load(self, stem: str) -> Optional[pd.Series]:
+        """Return an input as a date-indexed Series, reading its file at most once."""
+        with self._locks_guard:
+            lock = self._locks.setdefault(stem, threading.Lock())
+        with lock:
+            if stem not in self._inputs:
+                series = None
+                path = self._path(stem)
+                if self.storage.exists(path):
+                    df = self.storage.read(path)
+                    series = pd.Series(df.iloc[:, 1].values, index=df.iloc[:, 0], name=stem)
+                self._inputs[stem] = series
+            return self._inputs[stem]
+
+    def forget(self, stem: str) -> None:
+        """Drop a cached input (after its file has been rewritten)."""
+        with self._locks_guard:
+            self._inputs.pop(stem, None)
+
+    def _since(self, node: DerivedMetric, today: pd.Timestamp, full: bool) -> Optional[pd.Timestamp]:
+        """Return the first date to compute, or None when the node is up to date.
+
+        Rows after the output's last date are new; an output whose last row
+        is today's is recomputed from today so intraday values get refreshed.
+        """
+        output_path = self._path(node.output)
+        if full or not self.storage.exists(output_path):
+            return pd.Timestamp.min
+        last = self.storage.last_date(output_path)
+        if last is None:
+            return pd.Timestamp.min
+        since = last if last.normalize() == today else last + pd.Timedelta(nanoseconds=1)
+
+        for stem in node.inputs:
+            path = self._path(stem)
+            if not self.storage.exists(path):
+                return None
+            input_last = self.storage.last_date(path)
+            if input_last is None or input_last < since:
+                return None
+        return since
+
+    def compute(self, node: DerivedMetric, since: pd.Timestamp) -> Optional[pd.DataFrame]:
+        """Evaluate a node over input dates >= since (inner join on date)."""
+        series = []
+        for stem in node.inputs:
+            s = self.load(stem)
+            if s is None:
+                return None
+            series.append(s[s.index >= since])
+
+        merged = series[0].to_frame('a0')
+        for i, s in enumerate(series[1:], start=1):
+            merged = pd.merge(merged, s.to_frame(f'a{i}'), left_index=True, right_index=True)
+        if merged.empty:
+            return None
+
+        values = node.formula(*(merged[f'a{i}'] for i in range(len(series))))
+        return pd.DataFrame({'date': merged.index, node.column: values.values})
+
+    def _run_node(self, node: DerivedMetric, today: pd.Timestamp, full: bool) -> str:
+        try:
+            since = self._since(node, today, full)
+            if since is None:
+                return 'up to date'
+            df = self.compute(node, since)
+            if df is None or df.empty:
+                return 'no new rows'
+            if full:
+                # Replace the whole output so repaired inputs overwrite old rows
+                self.storage.write(self._path(node.output), df.sort_values('date'), 'date')
+            else:
+                self.append(df, self._path(node.output))
+            self.forget(node.output)
+            if node.label:
+                print(f"{node.label} calculated")
+            return f"{len(df)} rows"
+        except Exception as e:
+            print(f"Warning: could not calculate {node.output}: {e}")
+            return 'error'
+
+    def run(self, nodes: Sequence[DerivedMetric] = DERIVED_METRICS, full: bool = False) -> Dict[str, str]:
+        """Run all nodes wave by wave; returns output stem -> status."""
+        today = pd.Timestamp.now().normalize()
+        statuses = {}
+        for wave in execution_waves(nodes):
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(wave))) as pool:
+                futures = {pool.submit(self._run_node, node, today, full): node for node in wave}
+                for future in as_completed(futures):
+                    statuses[futures[future].output] = future.result()
+        return statuses
@@ -13,4 +13,7 @@ flask db upgrade || {
 }
 
 echo "Starting application..."
-exec gunicorn -w 1 --preload -b 0.0.0.0:5000 --timeout 120 dashboard:app
+# Threaded worker: streamed chatbot responses (Server-Sent Events) occupy a
+# thread rather than the whole worker, and the worker keeps heartbeating while
+# a long completion streams, so it is not killed by --timeout.
+exec gunicorn -w 1 -k gthread --threads "${GUNICORN_THREADS:-8}" --preload -b 0.0.0.0:5000 --timeout 120 dashboard:app
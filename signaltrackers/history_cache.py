@@ -0,0 +1,214 @@
+"""
+Persisted dimension histories.
+
+compute_*_history() rebuild decades of liquidity, quadrant, risk and policy
+states from the raw CSVs, and every backtest run, sensitivity sweep and
+conditions-history backfill used to redo that from scratch. cached_history()
+stores each result under <data dir>/.dimension_history/ together with a
+manifest of the files it read (SHA-1 of their content) and the parameters
+it was computed with, and reloads it for as long as neither changes.
+
+Inputs are discovered rather than declared: while a history is computed,
+every file passed to record_input() is added to the manifest, including
+files that did not exist. Validation restats those files and only rehashes
+the ones whose stamp moved, so a refresh that rewrites a CSV with identical
+content does not force a recompute. A computation that read no files
+cannot be validated and is never cached.
+
+Returned frames are copies; callers may mutate them.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+try:
+    from series_storage import columnar_source
+except ImportError:
+    from signaltrackers.series_storage import columnar_source
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIRNAME = '.dimension_history'
+
+_lock = threading.Lock()
+_local = threading.local()
+
+# source path -> (stamp, sha1)
+_digests: Dict[str, tuple] = {}
+# artifact path -> (manifest, frame)
+_loaded: Dict[str, tuple] = {}
+
+
+# ---------------------------------------------------------------------------
+# Input tracking
+# ---------------------------------------------------------------------------
+
+def _stamp(path: str) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def file_digest(path) -> Optional[str]:
+    """SHA-1 of the file backing ``path``, or None if it does not exist.
+
+    CSV paths resolve to their parquet twin when that is what readers use
+    (see series_storage.columnar_source). Memoized per file stamp.
+    """
+    source = str(columnar_source(path) or path)
+    stamp = _stamp(source)
+    if stamp is None:
+        return None
+    with _lock:
+        cached = _digests.get(source)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    sha = hashlib.sha1()
+    try:
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha.update(chunk)
+    except OSError:
+        return None
+    digest = sha.hexdigest()
+    with _lock:
+        _digests[source] = (stamp, digest)
+    return digest
+
+
+def record_input(path) -> None:
+    """Add ``path`` to the manifest of every history being computed on this thread.
+
+    The digest is taken before the caller reads the file, so a file that
+    changes mid-computation makes the artifact stale rather than wrongly
+    current.
+    """
+    recorders = getattr(_local, 'recorders', None)
+    if not recorders:
+        return
+    key = os.path.abspath(os.fspath(path))
+    digest = file_digest(key)
+    for inputs in recorders:
+        inputs.setdefault(key, digest)
+
+
+@contextmanager
+def recording_inputs():
+    """Collect {path: digest} for every record_input() call in the block."""
+    recorders = getattr(_local, 'recorders', None)
+    if recorders is None:
+        recorders = _local.recorders = []
+    inputs: Dict[str, Optional[str]] = {}
+    recorders.append(inputs)
+    try:
+        yield inputs
+    finally:
+        recorders.remove(inputs)
+
+
+def _inputs_current(inputs: dict) -> bool:
+    return all(file_digest(path) == digest for path, digest in inputs.items())
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+def _artifact_path(cache_dir, name: str, params: dict) -> Path:
+    key = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+    return Path(cache_dir) / f'{name}-{key}.pkl'
+
+
+def cached_history(
+    name: str,
+    compute: Callable[[], Optional[pd.DataFrame]],
+    cache_dir,
+    params: dict,
+) -> Optional[pd.DataFrame]:
+    """Return ``compute()``, reusing the stored result while its inputs and params are unchanged.
+
+    ``params`` (JSON-serializable) identifies the computation together with
+    ``name``. None results are not cached.
+    """
+    path = _artifact_path(cache_dir, name, params)
+    key = str(path)
+
+    with _lock:
+        entry = _loaded.get(key)
+    if entry is None:
+        entry = _load(path, params)
+    if entry is not None and _inputs_current(entry[0]['inputs']):
+        with _lock:
+            _loaded[key] = entry
+        return entry[1].copy()
+
+    started = time.perf_counter()
+    with recording_inputs() as inputs:
+        frame = compute()
+    if frame is None or not inputs:
+        return frame
+
+    manifest = {
+        'name': name,
+        'params': params,
+        'inputs': inputs,
+        'built_at': time.time(),
+        'compute_seconds': round(time.perf_counter() - started, 3),
+    }
+    entry = (manifest, frame.copy())
+    with _lock:
+        _loaded[key] = entry
+    _save(path, manifest, entry[1])
+    return frame
+
+
+def invalidate() -> None:
+    """Forget in-memory histories and digests (persisted artifacts are revalidated on next use)."""
+    with _lock:
+        _loaded.clear()
+        _digests.clear()
+
+
+# ---------------------------------------------------------------------------
+# Disk persistence
+# ---------------------------------------------------------------------------
+
+def _save(path: Path, manifest: dict, frame: pd.DataFrame) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = json.dumps(manifest, default=str).encode('utf-8')
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(meta + b'\n')
+            pickle.dump(frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except (OSError, pickle.PicklingError, TypeError) as e:
+        logger.warning('Could not persist %s history: %s', manifest.get('name'), e)
+
+
+def _load(path: Path, params: dict) -> Optional[tuple]:
+    try:
+        with open(path, 'rb') as f:
+            manifest = json.loads(f.readline())
+            if manifest.get('params') != json.loads(json.dumps(params, default=str)):
+                return None
+            frame = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning('Ignoring unreadable history artifact %s: %s', path, e)
+        return None
+    return manifest, frame
@@ -0,0 +1,220 @@
+"""
+HTTP caching for the read-only data APIs.
+
+Chart, metric and summary payloads only change when new files land in the
+data directory (the daily refresh, a manual reload or an AI summary
+regeneration), yet every page view and tab switch used to rebuild and send
+them in full, uncompressed. ResponseCache adds three things:
+
+  - ETags derived from the data directory fingerprint (series files and the
+    JSON summary files) plus the request path, so a matching
+    ``If-None-Match`` is answered with 304 before the view runs: no CSV
+    reads, no pandas. A view that tags its own body (snapshots use their
+    content hash) keeps that ETag, so the tag always matches the bytes.
+  - ``Cache-Control: public, max-age`` running until the next scheduled
+    refresh (capped by HTTP_CACHE_MAX_AGE), so browsers skip the request
+    entirely in between. Routes whose payload can be rewritten between
+    refreshes (the AI summaries) use ``no-cache`` instead and always
+    revalidate; the 304 path keeps that cheap.
+  - Compression of JSON and series_wire responses over MIN_COMPRESS_BYTES:
+    brotli when the optional ``brotli`` package is installed and accepted,
+    gzip otherwise. Compressed bodies are memoized per body hash.
+
+ETags also include HTTP_CACHE_RELEASE (default: process start time) so a
+deploy that changes payload shapes never revalidates old copies.
+"""
+
+import gzip
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Optional
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+try:
+    from snapshot_store import data_fingerprint
+    import series_wire
+except ImportError:
+    from signaltrackers.snapshot_store import data_fingerprint
+    from signaltrackers import series_wire
+
+VALIDATOR_TTL = 5  # seconds between data directory re-scans
+MIN_COMPRESS_BYTES = 1024
+DEFAULT_MAX_AGE = 3600
+
+_VALIDATOR_SUFFIXES = ('.csv', '.parquet', '.json')
+_COMPRESSIBLE = ('application/json', series_wire.MIMETYPE)
+_COMPRESSED_CACHE_SIZE = 64
+
+
+class ResponseCache:
+    """ETag/Cache-Control decorator and response compression for a Flask app.
+
+    ``data_dir`` is a callable (see SnapshotStore). ``next_refresh(now)``
+    returns the next scheduled data refresh as an aware datetime, or None.
+    """
+
+    def __init__(self, data_dir: Callable[[], Path],
+                 next_refresh: Optional[Callable[[datetime], Optional[datetime]]] = None):
+        self._data_dir = data_dir
+        self._next_refresh = next_refresh
+        self._max_age = DEFAULT_MAX_AGE
+        self._release = f'{time.time_ns():x}'
+        self._validator: Optional[tuple] = None  # (data_dir, fingerprint, checked_at)
+        self._compressed: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app) -> None:
+        self._max_age = int(app.config.get('HTTP_CACHE_MAX_AGE', DEFAULT_MAX_AGE))
+        self._release = app.config.get('HTTP_CACHE_RELEASE') or self._release
+        app.after_request(self._compress)
+
+    # -- Validators ----------------------------------------------------------
+
+    def validator(self) -> str:
+        """Fingerprint of the data directory, rescanned at most every VALIDATOR_TTL."""
+        data_dir = str(self._data_dir())
+        cached = self._validator
+        now = time.monotonic()
+        if cached and cached[0] == data_dir and now - cached[2] < VALIDATOR_TTL:
+            return cached[1]
+        fp = data_fingerprint(data_dir, _VALIDATOR_SUFFIXES)
+        self._validator = (data_dir, fp, now)
+        return fp
+
+    def invalidate(self) -> None:
+        """Force a data directory re-scan (call after writing new data)."""
+        self._validator = None
+        with self._lock:
+            self._compressed.clear()
+
+    def etag(self) -> str:
+        """ETag for the current request's path and query at the current data state."""
+        key = f'{self._release}|{self.validator()}|{request.full_path}'
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+
+    def max_age(self, now: Optional[datetime] = None) -> int:
+        """Seconds until the next scheduled refresh, capped at HTTP_CACHE_MAX_AGE."""
+        if self._next_refresh is None:
+            return self._max_age
+        now = now or datetime.now(timezone.utc)
+        next_run = self._next_refresh(now)
+        if next_run is None:
+            return self._max_age
+        return max(0, min(self._max_age, int((next_run - now).total_seconds())))
+
+    # -- Decorator -----------------------------------------------------------
+
+    def cached(self, view=None, *, max_age: Optional[int] = None):
+        """Serve ``view`` with data-version ETags, 304s and Cache-Control.
+
+        Only for responses that are the same for every user. ``max_age``
+        overrides the time-to-next-refresh default; 0 sends ``no-cache`` so
+        browsers revalidate every time (for payloads rewritten between
+        refreshes, such as AI summaries). Use as ``@cached`` or
+        ``@cached(max_age=0)``.
+        """
+        if view is None:
+            return lambda v: self.cached(v, max_age=max_age)
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = self.etag()
+            matched = self._matched(etag)
+            if matched is not None:
+                return self._not_modified(matched, max_age)
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                # Keep a content ETag set by the view over the data-version one
+                own_etag, _ = response.get_etag()
+                if own_etag is not None:
+                    etag = own_etag
+                    matched = self._matched(etag)
+                    if matched is not None:
+                        return self._not_modified(matched, max_age)
+                response.set_etag(etag)
+                self._set_cache_control(response, max_age)
+            return response
+
+        return wrapper
+
+    @staticmethod
+    def _variants(etag: str) -> tuple:
+        return (etag, f'{etag}-gzip', f'{etag}-br')
+
+    def _matched(self, etag: str) -> Optional[str]:
+        """The variant of ``etag`` named in If-None-Match, if any."""
+        return next((tag for tag in self._variants(etag)
+                     if request.if_none_match.contains(tag)), None)
+
+    def _not_modified(self, etag: str, max_age: Optional[int]):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        self._set_cache_control(response, max_age)
+        return response
+
+    def _set_cache_control(self, response, max_age: Optional[int] = None) -> None:
+        response.cache_control.public = True
+        if max_age == 0:
+            response.cache_control.no_cache = True
+            response.cache_control.max_age = 0
+        else:
+            response.cache_control.max_age = self.max_age() if max_age is None else max_age
+
+    # -- Compression ---------------------------------------------------------
+
+    def _compress(self, response):
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or response.mimetype not in _COMPRESSIBLE
+                or 'Content-Encoding' in response.headers):
+            return response
+        response.vary.add('Accept-Encoding')
+
+        candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+        encoding = request.accept_encodings.best_match(candidates)
+        if encoding is None:
+            return response
+        body = response.get_data()
+        if len(body) < MIN_COMPRESS_BYTES:
+            return response
+
+        etag, _ = response.get_etag()
+        response.set_data(self._compressed_body(body, encoding, etag))
+        response.headers['Content-Encoding'] = encoding
+        if etag:
+            response.set_etag(f'{etag}-{encoding}')
+        return response
+
+    def _compressed_body(self, body: bytes, encoding: str, etag: Optional[str]) -> bytes:
+        # Keyed on the body itself: an ETag can outlive the bytes it was
+        # first paired with (snapshots refresh on their own schedule)
+        key = (hashlib.sha1(body).digest(), encoding)
+        if etag:
+            with self._lock:
+                cached = self._compressed.get(key)
+                if cached is not None:
+                    self._compressed.move_to_end(key)
+                    return cached
+
+        if encoding == 'br':
+            data = brotli.compress(body, quality=5)
+        else:
+            data = gzip.compress(body, compresslevel=6, mtime=0)
+
+        if etag:
+            with self._lock:
+                self._compressed[key] = data
+                while len(self._compressed) > _COMPRESSED_CACHE_SIZE:
+                    self._compressed.popitem(last=False)
+        return data
@@ -0,0 +1,110 @@
+"""
+Parse-once cache for the JSON artifacts written by background jobs.
+
+The recession probability, sector tone and market conditions files are
+rewritten at most daily, but context processors read them on every
+render_template and routes read them again (the conditions history grows by
+one entry per month, forever). read_json() parses each file once per change
+on disk (mtime, size or inode) and shares the result across processors,
+routes and requests; derived() memoizes a function of a file's content,
+such as the latest history entry, under the same stamp.
+
+Returned objects are shared: treat them as read-only, or pass copy=True.
+Code that rewrites a file should call invalidate() afterwards so readers in
+the same process never depend on timestamp resolution.
+"""
+
+import copy as _copy
+import json
+import os
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+_lock = threading.Lock()
+
+# abs path -> (stamp, parsed value or exception)
+_parsed: Dict[str, tuple] = {}
+# (abs path, name) -> (stamp, derived value)
+_derived: Dict[Tuple[str, str], tuple] = {}
+
+
+def _key(path) -> str:
+    return os.path.abspath(os.fspath(path))
+
+
+def _stamp(key: str) -> Optional[tuple]:
+    try:
+        st = os.stat(key)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _load(key: str, stamp: tuple):
+    """Parsed content of ``key`` at ``stamp``; a parse error is cached and returned."""
+    with _lock:
+        cached = _parsed.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    try:
+        with open(key, 'r') as f:
+            value = json.load(f)
+    except (OSError, ValueError) as exc:
+        value = exc
+    with _lock:
+        _parsed[key] = (stamp, value)
+    return value
+
+
+def read_json(path, default=None, copy: bool = False):
+    """Return the parsed JSON file at ``path``, or ``default`` if it does not exist.
+
+    Raises the parse (or read) error for unreadable files, so callers keep
+    their own error handling.
+    """
+    key = _key(path)
+    stamp = _stamp(key)
+    if stamp is None:
+        return default
+    value = _load(key, stamp)
+    if isinstance(value, Exception):
+        raise value
+    return _copy.deepcopy(value) if copy else value
+
+
+def derived(path, name: str, fn: Callable, default=None, copy: bool = False):
+    """Return ``fn(parsed content)`` memoized until the file at ``path`` changes.
+
+    ``name`` distinguishes several derivations of one file. Returns
+    ``default`` when the file does not exist; parse errors are raised as in
+    read_json().
+    """
+    key = _key(path)
+    stamp = _stamp(key)
+    if stamp is None:
+        return default
+    with _lock:
+        cached = _derived.get((key, name))
+    if cached is not None and cached[0] == stamp:
+        value = cached[1]
+    else:
+        parsed = _load(key, stamp)
+        if isinstance(parsed, Exception):
+            raise parsed
+        value = fn(parsed)
+        with _lock:
+            _derived[(key, name)] = (stamp, value)
+    return _copy.deepcopy(value) if copy else value
+
+
+def invalidate(path=None) -> None:
+    """Forget cached content for ``path`` (or for every file)."""
+    with _lock:
+        if path is None:
+            _parsed.clear()
+            _derived.clear()
+            return
+        key = _key(path)
+        _parsed.pop(key, None)
+        for derived_key in [k for k in _derived if k[0] == key]:
+            del _derived[derived_key]
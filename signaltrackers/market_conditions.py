@@ -23,6 +23,15 @@ from typing import Dict, List, Optional
 import numpy as np
 import pandas as pd
 
+try:
+    import metric_store
+    import json_artifacts
+    import history_cache
+except ImportError:
+    from signaltrackers import metric_store
+    from signaltrackers import json_artifacts
+    from signaltrackers import history_cache
+
 logger = logging.getLogger(__name__)
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
@@ -93,11 +102,12 @@ class PolicyResult:
 def _load_csv(filename: str) -> Optional[pd.DataFrame]:
     """Load a CSV from the data directory, returning None if missing/empty."""
     path = os.path.join(DATA_DIR, f'{filename}.csv')
-    if not os.path.exists(path):
-        logger.warning('Data file not found: %s', path)
-        return None
+    history_cache.record_input(path)
     try:
-        df = pd.read_csv(path, parse_dates=['date'])
+        df = metric_store.read_frame(path)
+        if df is None:
+            logger.warning('Data file not found: %s', path)
+            return None
         if df.empty:
             return None
         df = df.sort_values('date').reset_index(drop=True)
@@ -107,6 +117,19 @@ def _load_csv(filename: str) -> Optional[pd.DataFrame]:
         return None
 
 
+def _cached_dimension_history(name: str, build, start_date: Optional[str]) -> Optional[pd.DataFrame]:
+    """Run ``build(start_date)`` through the persisted history cache.
+
+    Artifacts live under DATA_DIR/.dimension_history/ and are reused until a
+    CSV the build read, start_date, or this module's source changes.
+    """
+    params = {'start_date': start_date, 'engine': history_cache.file_digest(__file__)}
+    return history_cache.cached_history(
+        name, lambda: build(start_date),
+        os.path.join(DATA_DIR, history_cache.CACHE_DIRNAME), params,
+    )
+
+
 def _to_series(df: Optional[pd.DataFrame], col: str) -> Optional[pd.Series]:
     """Extract a date-indexed numeric Series from a DataFrame."""
     if df is None or col not in df.columns:
@@ -131,6 +154,15 @@ def _align_monthly(higher_freq: pd.Series, monthly_index: pd.DatetimeIndex) -> p
     return combined.reindex(monthly_index)
 
 
+def _align_asof(series: Optional[pd.Series], index: pd.DatetimeIndex) -> np.ndarray:
+    """Last value of ``series`` on or before each date in ``index`` (NaN before it starts)."""
+    if series is None or len(series) == 0:
+        return np.full(len(index), np.nan)
+    combined = series.reindex(series.index.union(index))
+    combined = combined.sort_index().ffill()
+    return combined.reindex(index).to_numpy(dtype=float)
+
+
 # ---------------------------------------------------------------------------
 # Z-score helpers
 # ---------------------------------------------------------------------------
@@ -1070,6 +1102,11 @@ def compute_liquidity_history(start_date: Optional[str] = None) -> Optional[pd.D
 
     Returns DataFrame with columns: date, score, state
     """
+    return _cached_dimension_history('liquidity', _build_liquidity_history, start_date)
+
+
+def _build_liquidity_history(start_date: Optional[str]) -> Optional[pd.DataFrame]:
+    """Uncached body of compute_liquidity_history."""
     fed_nl = _compute_fed_net_liquidity()
     if fed_nl is None or len(fed_nl) < 53:
         return None
@@ -1143,6 +1180,11 @@ def compute_quadrant_history(start_date: Optional[str] = None) -> Optional[pd.Da
 
     Returns DataFrame with columns: date, growth, inflation, raw_quadrant, quadrant
     """
+    return _cached_dimension_history('quadrant', _build_quadrant_history, start_date)
+
+
+def _build_quadrant_history(start_date: Optional[str]) -> Optional[pd.DataFrame]:
+    """Uncached body of compute_quadrant_history."""
     growth_signals = _load_growth_signals()
     inflation_signals = _load_inflation_signals()
 
@@ -1228,6 +1270,27 @@ def _classify_risk(score: int) -> str:
         return 'Stressed'
 
 
+def _score_vix_level_array(vix: np.ndarray) -> np.ndarray:
+    """Array version of _score_vix_level."""
+    return np.searchsorted([15, 20, 30], vix, side='right')
+
+
+def _score_term_structure_array(ratio: np.ndarray) -> np.ndarray:
+    """Array version of _score_term_structure."""
+    return np.select([ratio < 0.95, ratio <= 1.05], [0, 1], 2)
+
+
+def _score_stock_bond_corr_array(corr: np.ndarray) -> np.ndarray:
+    """Array version of _score_stock_bond_corr."""
+    return np.select([corr < -0.3, corr <= 0.3], [0, 1], 2)
+
+
+def _classify_risk_array(score: np.ndarray) -> np.ndarray:
+    """Array version of _classify_risk."""
+    return np.select([score <= 1, score <= 3, score <= 5],
+                     ['Calm', 'Normal', 'Elevated'], 'Stressed')
+
+
 def _compute_stock_bond_correlation(window: int = 63) -> Optional[pd.Series]:
     """
     Compute rolling correlation between equity returns and approximate bond returns.
@@ -1426,6 +1489,18 @@ def _classify_policy_direction(rate_change_3m: float) -> str:
         return 'Paused'
 
 
+def _classify_policy_stance_array(taylor_gap: np.ndarray) -> np.ndarray:
+    """Array version of _classify_policy_stance."""
+    return np.select([taylor_gap > 1.0, taylor_gap >= -0.5],
+                     ['Restrictive', 'Neutral'], 'Accommodative')
+
+
+def _classify_policy_direction_array(rate_change_3m: np.ndarray) -> np.ndarray:
+    """Array version of _classify_policy_direction."""
+    return np.select([rate_change_3m > 0.25, rate_change_3m < -0.25],
+                     ['Tightening', 'Easing'], 'Paused')
+
+
 def compute_policy(as_of_date: Optional[str] = None) -> Optional[PolicyResult]:
     """
     Compute the Policy Stance dimension.
@@ -1580,6 +1655,11 @@ def compute_risk_history(start_date: Optional[str] = None) -> Optional[pd.DataFr
     Returns DataFrame with columns: date, vix_score, term_structure_score,
     correlation_score, score, state
     """
+    return _cached_dimension_history('risk', _build_risk_history, start_date)
+
+
+def _build_risk_history(start_date: Optional[str]) -> Optional[pd.DataFrame]:
+    """Uncached body of compute_risk_history."""
     # VIX level series
     vix_df = _load_csv('vix_price')
     vix_series = _to_series(vix_df, 'vix_price')
@@ -1594,46 +1674,33 @@ def compute_risk_history(start_date: Optional[str] = None) -> Optional[pd.DataFr
     corr_series = _compute_stock_bond_correlation(63)
 
     # Build on VIX date index
-    idx = vix_series.index
     if start_date:
-        idx = idx[idx >= pd.Timestamp(start_date)]
+        vix_series = vix_series[vix_series.index >= pd.Timestamp(start_date)]
+    idx = vix_series.index
+    if len(idx) == 0:
+        return pd.DataFrame()
 
-    records = []
-    for dt in idx:
-        vix_val = float(vix_series.loc[dt])
-        v_score = _score_vix_level(vix_val)
-
-        # Term structure
-        ts_score = 0
-        if vix3m_series is not None and len(vix3m_series) > 0:
-            v3m = vix3m_series.reindex(
-                vix3m_series.index.union(pd.DatetimeIndex([dt]))
-            ).sort_index().ffill()
-            v3m_val = v3m.get(dt)
-            if v3m_val is not None and not np.isnan(v3m_val) and v3m_val > 0:
-                ts_score = _score_term_structure(vix_val / v3m_val)
-
-        # Correlation
-        c_score = 0
-        if corr_series is not None and len(corr_series) > 0:
-            c = corr_series.reindex(
-                corr_series.index.union(pd.DatetimeIndex([dt]))
-            ).sort_index().ffill()
-            c_val = c.get(dt)
-            if c_val is not None and not np.isnan(c_val):
-                c_score = _score_stock_bond_corr(float(c_val))
-
-        combined = v_score + ts_score + c_score
-        records.append({
-            'date': dt,
-            'vix_score': v_score,
-            'term_structure_score': ts_score,
-            'correlation_score': c_score,
-            'score': combined,
-            'state': _classify_risk(combined),
-        })
+    vix = vix_series.to_numpy(dtype=float)
+    v_score = _score_vix_level_array(vix)
+
+    # Term structure and correlation: as-of values on each VIX date
+    v3m = _align_asof(vix3m_series, idx)
+    has_v3m = v3m > 0
+    ratio = np.divide(vix, v3m, out=np.full(len(idx), np.nan), where=has_v3m)
+    ts_score = np.where(has_v3m, _score_term_structure_array(ratio), 0)
 
-    return pd.DataFrame(records)
+    corr = _align_asof(corr_series, idx)
+    c_score = np.where(~np.isnan(corr), _score_stock_bond_corr_array(corr), 0)
+
+    combined = v_score + ts_score + c_score
+    return pd.DataFrame({
+        'date': idx.to_numpy(),
+        'vix_score': v_score,
+        'term_structure_score': ts_score,
+        'correlation_score': c_score,
+        'score': combined,
+        'state': _classify_risk_array(combined),
+    })
 
 
 # ---------------------------------------------------------------------------
@@ -1647,6 +1714,11 @@ def compute_policy_history(start_date: Optional[str] = None) -> Optional[pd.Data
     Returns DataFrame with columns: date, actual_rate, taylor_prescribed,
     taylor_gap, stance, direction
     """
+    return _cached_dimension_history('policy', _build_policy_history, start_date)
+
+
+def _build_policy_history(start_date: Optional[str]) -> Optional[pd.DataFrame]:
+    """Uncached body of compute_policy_history."""
     pce_df = _load_csv('core_pce_price_index')
     pce = _to_series(pce_df, 'core_pce_price_index')
     if pce is None or len(pce) < 13:
@@ -1695,34 +1767,30 @@ def compute_policy_history(start_date: Optional[str] = None) -> Optional[pd.Data
         mask = inf_common >= pd.Timestamp(start_date)
         inf_common = inf_common[mask]
 
-    records = []
-    for dt in inf_common:
-        prescribed = taylor_prescribed.get(dt)
-        rate = rate_aligned.get(dt)
-        if prescribed is None or rate is None or np.isnan(prescribed) or np.isnan(rate):
-            continue
+    prescribed = taylor_prescribed.reindex(inf_common).to_numpy(dtype=float)
+    rate = rate_aligned.reindex(inf_common).to_numpy(dtype=float)
+    valid = ~np.isnan(prescribed) & ~np.isnan(rate)
+    if not valid.any():
+        return None
+    dates, prescribed, rate = inf_common[valid], prescribed[valid], rate[valid]
+    gap = rate - prescribed
 
-        gap = float(rate) - float(prescribed)
+    # Direction: 3-month rate change, i.e. the last rate on or before each
+    # date minus the one 63 observations earlier (3 with short history)
+    rates = policy_rate.to_numpy(dtype=float)
+    n_before = policy_rate.index.searchsorted(dates, side='right')
+    lag = np.select([n_before > 63, n_before > 3], [63, 3], 0)
+    last = rates[np.maximum(n_before - 1, 0)]
+    rate_change = np.where(lag > 0, last - rates[np.maximum(n_before - 1 - lag, 0)], 0.0)
 
-        # Direction: check 3-month rate change
-        rate_before = policy_rate[policy_rate.index <= dt]
-        if len(rate_before) > 63:
-            rate_change = float(rate_before.iloc[-1]) - float(rate_before.iloc[-64])
-        elif len(rate_before) > 3:
-            rate_change = float(rate_before.iloc[-1]) - float(rate_before.iloc[-4])
-        else:
-            rate_change = 0.0
-
-        records.append({
-            'date': dt,
-            'actual_rate': float(rate),
-            'taylor_prescribed': float(prescribed),
-            'taylor_gap': gap,
-            'stance': _classify_policy_stance(gap),
-            'direction': _classify_policy_direction(rate_change),
-        })
-
-    return pd.DataFrame(records) if records else None
+    return pd.DataFrame({
+        'date': dates.to_numpy(),
+        'actual_rate': rate,
+        'taylor_prescribed': prescribed,
+        'taylor_gap': gap,
+        'stance': _classify_policy_stance_array(gap),
+        'direction': _classify_policy_direction_array(rate_change),
+    })
 
 
 # ---------------------------------------------------------------------------
@@ -2199,44 +2267,56 @@ def get_market_conditions() -> Optional[dict]:
     Returns the most recent entry in the same shape that consumers expect
     (quadrant, dimensions, asset_expectations, as_of, updated_at).
     Falls back to the legacy cache file if the history file is empty.
+    The latest entry is derived once per history file change.
     """
-    history = _load_conditions_history()
-    if history:
-        latest_date = max(history.keys())
-        entry = history[latest_date]
-        # Reconstruct the flat cache shape expected by callers
-        return {
-            'quadrant': entry.get('quadrant'),
-            'dimensions': entry.get('dimensions', {}),
-            'asset_expectations': entry.get('asset_expectations', []),
-            'as_of': latest_date,
-            'updated_at': entry.get('updated_at', ''),
-        }
+    try:
+        latest = json_artifacts.derived(MARKET_CONDITIONS_HISTORY_FILE, 'latest',
+                                        _latest_conditions, copy=True)
+    except Exception as exc:
+        logger.warning('Failed to read market conditions history: %s', exc)
+        latest = None
+    if latest:
+        return latest
 
     # Legacy fallback: read old cache file if it exists
-    if os.path.exists(MARKET_CONDITIONS_CACHE_FILE):
-        try:
-            with open(MARKET_CONDITIONS_CACHE_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            logger.exception('Error reading legacy market conditions cache')
+    try:
+        return json_artifacts.read_json(MARKET_CONDITIONS_CACHE_FILE, copy=True)
+    except Exception:
+        logger.exception('Error reading legacy market conditions cache')
     return None
 
 
+def _latest_conditions(history: dict) -> Optional[dict]:
+    """The most recent history entry in the flat cache shape expected by callers."""
+    if not history:
+        return None
+    latest_date = max(history.keys())
+    entry = history[latest_date]
+    return {
+        'quadrant': entry.get('quadrant'),
+        'dimensions': entry.get('dimensions', {}),
+        'asset_expectations': entry.get('asset_expectations', []),
+        'as_of': latest_date,
+        'updated_at': entry.get('updated_at', ''),
+    }
+
+
 # ---------------------------------------------------------------------------
 # Market Conditions History (append-only, one entry per day)
 # ---------------------------------------------------------------------------
 
 
-def _load_conditions_history() -> dict:
+def _load_conditions_history(copy: bool = True) -> dict:
     """Load the daily market conditions history from file.
 
-    Returns a dict mapping ISO date strings to snapshot dicts.
+    Returns a dict mapping ISO date strings to snapshot dicts. The file is
+    parsed once per change (json_artifacts); ``copy=False`` returns the
+    shared, read-only parse.
     """
     try:
-        if os.path.exists(MARKET_CONDITIONS_HISTORY_FILE):
-            with open(MARKET_CONDITIONS_HISTORY_FILE, 'r') as f:
-                return json.load(f)
+        history = json_artifacts.read_json(MARKET_CONDITIONS_HISTORY_FILE, copy=copy)
+        if history is not None:
+            return history
     except Exception as exc:
         logger.warning('Failed to read market conditions history: %s', exc)
     return {}
@@ -2250,6 +2330,7 @@ def _save_conditions_history(history: dict) -> None:
             json.dump(history, f, indent=2)
     except Exception as exc:
         logger.warning('Failed to write market conditions history: %s', exc)
+    json_artifacts.invalidate(MARKET_CONDITIONS_HISTORY_FILE)
 
 
 def _append_conditions_history(cache_data: dict) -> None:
@@ -2377,6 +2458,7 @@ def _backfill_history_if_needed(min_entries: int = 12) -> None:
 def get_conditions_history() -> dict:
     """Read the full market conditions history.
 
-    Returns a dict mapping ISO date strings to snapshot dicts.
+    Returns a dict mapping ISO date strings to snapshot dicts. The dict is
+    shared with other readers until the file changes: do not mutate it.
     """
-    return _load_conditions_history()
+    return _load_conditions_history(copy=False)
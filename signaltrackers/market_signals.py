@@ -19,14 +19,23 @@ Data is appended daily to CSV files for historical tracking.
 
 import os
 import sys
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from urllib.parse import urlparse
 import pytz
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 import numpy as np
 import time
 
+from series_storage import CsvStorage, get_storage, export_to_csv
+from derived_metrics import DerivedMetricsEngine
+
 # Optional imports with error handling
 try:
     import yfinance as yf
@@ -37,9 +46,54 @@ except ImportError:
     print("Install with: pip install yfinance")
 
 
+class HostRateLimiter:
+    """Sliding-window request limiter shared by every thread, keyed by host.
+
+    FRED allows 120 requests per minute per API key; the default window stays
+    under that with some headroom. Hosts without a configured limit pass
+    straight through.
+    """
+
+    def __init__(self, limits):
+        self.limits = dict(limits)  # host -> (max_calls, period_seconds)
+        self._calls = {host: deque() for host in self.limits}
+        self._lock = threading.Lock()
+
+    def acquire(self, url):
+        host = urlparse(url).netloc
+        if host not in self.limits:
+            return
+        max_calls, period = self.limits[host]
+        while True:
+            with self._lock:
+                calls = self._calls[host]
+                now = time.monotonic()
+                while calls and now - calls[0] >= period:
+                    calls.popleft()
+                if len(calls) < max_calls:
+                    calls.append(now)
+                    return
+                wait = period - (now - calls[0])
+            time.sleep(wait)
+
+
+FRED_HOST = 'api.stlouisfed.org'
+_rate_limiter = HostRateLimiter({FRED_HOST: (100, 60.0)})
+
+
 class MarketSignalsTracker:
     """Comprehensive market signals tracker for divergence monitoring."""
 
+    # On-disk backend for series files (see series_storage.py)
+    storage = CsvStorage()
+
+    # FRED fetch engine: concurrent workers share one pooled session
+    fred_workers = int(os.environ.get('FRED_WORKERS', '8'))
+    fred_timeout = (5, 30)       # (connect, read) seconds
+    fred_max_attempts = 3
+    fred_backoff = 1.0           # seconds; doubled per retry, with jitter
+    _fred_session = None         # set while collect_fred_signals runs
+
     def __init__(self, data_dir="data", fred_api_key=None):
         """
         Initialize the tracker.
@@ -50,6 +104,7 @@ class MarketSignalsTracker:
         """
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
+        self.storage = get_storage()
 
         # Get FRED API key from parameter or environment
         self.fred_api_key = fred_api_key or os.environ.get('FRED_API_KEY')
@@ -205,8 +260,7 @@ class MarketSignalsTracker:
             params['observation_start'] = start_date
 
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
+            response = self._get_with_retry(url, params)
             data = response.json()
 
             if 'observations' not in data:
@@ -266,6 +320,65 @@ class MarketSignalsTracker:
             print(f"Error fetching ETF data for {ticker}: {e}")
             return None
 
+    def fetch_etf_batch(self, tickers, start_date):
+        """
+        Fetch closes for several tickers with one multi-ticker yfinance download.
+
+        Args:
+            tickers: List of ticker symbols sharing the same start date
+            start_date: Start date (YYYY-MM-DD)
+
+        Returns:
+            Dict of ticker -> DataFrame with date and close columns. A ticker
+            that downloaded fine but has no new bars maps to an empty frame.
+            Tickers that failed (download error, missing from the result,
+            reported by yfinance as failed, or all-NaN while other tickers
+            have bars) are left out so the caller can retry them individually.
+        """
+        if not YF_AVAILABLE or not tickers:
+            return {}
+
+        try:
+            raw = yf.download(list(tickers), start=start_date, auto_adjust=True,
+                              actions=False, group_by='column', progress=False, threads=True)
+        except Exception as e:
+            print(f"Error in batched ETF download ({len(tickers)} tickers): {e}")
+            return {}
+
+        if raw is None or len(raw.columns) == 0:
+            return {}
+
+        if isinstance(raw.columns, pd.MultiIndex):
+            if 'Close' not in raw.columns.get_level_values(0):
+                return {}
+            closes = raw['Close']
+        elif 'Close' in raw.columns and len(tickers) == 1:
+            closes = raw[['Close']].rename(columns={'Close': tickers[0]})
+        else:
+            return {}
+
+        # Per-ticker failures yfinance recorded for this download, if exposed
+        errors = getattr(getattr(yf, 'shared', None), '_ERRORS', None)
+        errors_known = isinstance(errors, dict)
+        if not errors_known:
+            errors = {}
+
+        results = {}
+        for ticker in tickers:
+            if ticker not in closes.columns or ticker in errors:
+                continue
+            close = closes[ticker].dropna()
+            if close.empty and not raw.empty and not errors_known:
+                # No bars where other tickers have them: treat as a failed
+                # ticker (yfinance NaN-fills tickers it could not fetch)
+                continue
+            df = pd.DataFrame({
+                'date': pd.to_datetime(close.index).date,
+                'close': close.values,
+            })
+            results[ticker] = df
+        return results
+
     def calculate_etf_spreads(self, credit_etf_data, treasury_etf_data):
         """Calculate spread between credit ETF and treasury ETF yields."""
         if credit_etf_data is None or treasury_etf_data is None:
@@ -283,17 +396,35 @@ class MarketSignalsTracker:
 
         return merged[['date', 'spread_proxy']]
 
+    def _get_with_retry(self, url, params):
+        """GET through the shared session (or plain requests) with rate limiting.
+
+        Connection errors, timeouts, 429 and 5xx responses are retried with
+        jittered exponential backoff; the last error is raised.
+        """
+        http = self._fred_session or requests
+        for attempt in range(1, self.fred_max_attempts + 1):
+            _rate_limiter.acquire(url)
+            try:
+                response = http.get(url, params=params, timeout=self.fred_timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= self.fred_max_attempts:
+                    raise
+            else:
+                status = getattr(response, 'status_code', None)
+                retryable = isinstance(status, int) and (status == 429 or status >= 500)
+                if not retryable or attempt >= self.fred_max_attempts:
+                    response.raise_for_status()
+                    return response
+            time.sleep(self.fred_backoff * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+
     def get_last_date_in_file(self, filepath):
         """Get the last date in an existing CSV file."""
-        if not filepath.exists():
+        if not self.storage.exists(filepath):
             return None
 
         try:
-            df = pd.read_csv(filepath)
-            if df.empty:
-                return None
-            df['date'] = pd.to_datetime(df['date'])
-            return df['date'].max()
+            return self.storage.last_date(filepath)
         except Exception as e:
             print(f"Error reading {filepath}: {e}")
             return None
@@ -307,9 +438,11 @@ class MarketSignalsTracker:
         df[date_column] = pd.to_datetime(df[date_column])
         today = pd.Timestamp.now().normalize()  # Today at midnight for comparison
 
-        if filepath.exists():
-            existing_df = pd.read_csv(filepath)
-            existing_df[date_column] = pd.to_datetime(existing_df[date_column])
+        if self.storage.exists(filepath):
+            if self._append_incremental(df, filepath, date_column, today):
+                return
+
+            existing_df = self.storage.read(filepath, date_column)
 
             # Remove today's row from existing so it can be replaced by fresh data
             existing_without_today = existing_df[existing_df[date_column].dt.normalize() != today]
@@ -329,7 +462,7 @@ class MarketSignalsTracker:
             # Combine: existing (minus today) + all genuinely new data (includes today if present)
             combined_df = pd.concat([existing_without_today, new_data], ignore_index=True)
             combined_df = combined_df.sort_values(date_column)
-            combined_df.to_csv(filepath, index=False)
+            self.storage.write(filepath, combined_df, date_column)
 
             if not today_in_new.empty and not today_in_existing.empty:
                 print(f"Updated today's data + added {new_non_today} new rows to {filepath.name}")
@@ -339,9 +472,42 @@ class MarketSignalsTracker:
                 print(f"Added {len(new_data)} new rows to {filepath.name}")
         else:
             df = df.sort_values(date_column)
-            df.to_csv(filepath, index=False)
+            self.storage.write(filepath, df, date_column)
             print(f"Created {filepath.name} with {len(df)} rows")
 
+    def _append_incremental(self, df, filepath, date_column, today):
+        """Append rows in place using the storage's tail index, without reading the file.
+
+        Only taken when every incoming row other than today's is dated after the
+        last historical row, so the result is identical to the full merge in
+        append_to_csv. Returns False to fall back to that merge.
+        """
+        index = self.storage.tail_index(filepath, date_column)
+        if index is None or set(df.columns) != set(index['columns']):
+            return False
+
+        last_date = index['last_date']
+        if last_date.normalize() > today:
+            return False  # future-dated projections may sit either side of today
+
+        today_in_existing = last_date.normalize() == today
+        base_date = index['prev_date'] if today_in_existing else last_date
+        is_today = df[date_column].dt.normalize() == today
+        if base_date is not None and (df.loc[~is_today, date_column] <= base_date).any():
+            return False  # overlaps history: needs the full dedup merge
+
+        new_data = df.sort_values(date_column, kind='stable')
+        self.storage.append_rows(filepath, new_data, index, drop_last_row=today_in_existing)
+
+        new_non_today = int((~is_today).sum())
+        if is_today.any() and today_in_existing:
+            print(f"Updated today's data + added {new_non_today} new rows to {filepath.name}")
+        elif is_today.any():
+            print(f"Added today's data + {new_non_today} new rows to {filepath.name}")
+        else:
+            print(f"Added {len(new_data)} new rows to {filepath.name}")
+        return True
+
     def collect_fred_signals(self, lookback_days=12775):
         """Collect all FRED-based credit signals.
 
@@ -351,24 +517,76 @@ class MarketSignalsTracker:
         eastern = pytz.timezone('US/Eastern')
         print("\n=== Collecting FRED Credit Data ===")
 
+        # Start dates are resolved up front; fetches then run concurrently and
+        # results are written from this thread as they arrive.
+        jobs = {}
         for signal_name, series_id in self.fred_series.items():
-            print(f"\nFetching {signal_name} ({series_id})...")
-
             filepath = self.data_dir / f"{signal_name}.csv"
             last_date = self.get_last_date_in_file(filepath)
 
             if last_date:
                 start_date = (last_date + timedelta(days=1)).strftime('%Y-%m-%d')
-                print(f"Last date in file: {last_date.date()}, fetching from {start_date}")
             else:
                 start_date = (datetime.now(eastern) - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
-                print(f"No existing data, fetching {lookback_days} days from {start_date}")
+            jobs[signal_name] = (series_id, filepath, start_date, last_date)
 
+        def timed_fetch(series_id, start_date):
+            started = time.perf_counter()
             df = self.fetch_fred_data(series_id, start_date=start_date)
-
-            if df is not None and not df.empty:
-                df.columns = ['date', signal_name]
-                self.append_to_csv(df, filepath)
+            return df, time.perf_counter() - started
+
+        timings = []
+        run_started = time.perf_counter()
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, self.fred_workers))
+        session.mount('https://', adapter)
+        self._fred_session = session
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, self.fred_workers)) as pool:
+                futures = {
+                    pool.submit(timed_fetch, series_id, start_date): signal_name
+                    for signal_name, (series_id, _, start_date, _) in jobs.items()
+                }
+                for future in as_completed(futures):
+                    signal_name = futures[future]
+                    series_id, filepath, start_date, last_date = jobs[signal_name]
+                    try:
+                        df, elapsed = future.result()
+                    except Exception as e:
+                        print(f"\nError fetching {signal_name} ({series_id}): {e}")
+                        timings.append((signal_name, None, 'error'))
+                        continue
+
+                    print(f"\nFetched {signal_name} ({series_id}) in {elapsed:.2f}s")
+                    if last_date:
+                        print(f"Last date in file: {last_date.date()}, fetching from {start_date}")
+                    else:
+                        print(f"No existing data, fetching {lookback_days} days from {start_date}")
+
+                    if df is not None and not df.empty:
+                        df.columns = ['date', signal_name]
+                        self.append_to_csv(df, filepath)
+                        timings.append((signal_name, elapsed, f"{len(df)} rows"))
+                    else:
+                        timings.append((signal_name, elapsed, 'no data'))
+        finally:
+            self._fred_session = None
+            session.close()
+
+        self._print_fred_timings(timings, time.perf_counter() - run_started)
+
+    def _print_fred_timings(self, timings, total_elapsed):
+        """Print per-series fetch timings, slowest first."""
+        fetched = [t for t in timings if t[1] is not None]
+        print(f"\n--- FRED fetch summary: {len(timings)} series in {total_elapsed:.1f}s "
+              f"({self.fred_workers} workers) ---")
+        for signal_name, elapsed, status in sorted(fetched, key=lambda t: -t[1]):
+            print(f"  {signal_name:<32} {elapsed:6.2f}s  {status}")
+        for signal_name, _, status in timings:
+            if status == 'error':
+                print(f"  {signal_name:<32}   ----   error")
+        if fetched:
+            print(f"  (sum of fetch times {sum(t[1] for t in fetched):.1f}s)")
 
     def collect_etf_signals(self, lookback_days=12775):
         """Collect all ETF-based signals.
@@ -379,28 +597,43 @@ class MarketSignalsTracker:
         eastern = pytz.timezone('US/Eastern')
         print("\n=== Collecting Market ETF Data ===")
 
+        # Group tickers by start date so each group is a single download
+        groups = {}
         for signal_name, ticker in self.etf_tickers.items():
-            print(f"\nFetching {signal_name} ({ticker})...")
-
             filepath = self.data_dir / f"{signal_name}_price.csv"
             last_date = self.get_last_date_in_file(filepath)
 
             if last_date:
                 start_date = (last_date + timedelta(days=1)).strftime('%Y-%m-%d')
-                print(f"Last date in file: {last_date.date()}, fetching from {start_date}")
             else:
                 start_date = (datetime.now(eastern) - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
-                print(f"No existing data, fetching {lookback_days} days from {start_date}")
+            groups.setdefault(start_date, []).append((signal_name, ticker, filepath))
+
+        failed = []
+        for start_date, members in sorted(groups.items()):
+            tickers = [ticker for _, ticker, _ in members]
+            print(f"\nFetching {len(tickers)} tickers from {start_date}: {', '.join(tickers)}")
+            batch = self.fetch_etf_batch(tickers, start_date)
+
+            for signal_name, ticker, filepath in members:
+                df = batch.get(ticker)
+                if df is None:
+                    failed.append((signal_name, ticker, filepath, start_date))
+                    continue
+                if df.empty:
+                    continue  # up to date
+                df.columns = ['date', f'{signal_name}_price']
+                self.append_to_csv(df, filepath)
 
+        # Per-ticker fallback only for tickers the batch could not deliver
+        for signal_name, ticker, filepath, start_date in failed:
+            print(f"\nFetching {signal_name} ({ticker}) individually from {start_date}...")
             df = self.fetch_etf_data(ticker, start_date=start_date)
 
             if df is not None and not df.empty:
                 df.columns = ['date', f'{signal_name}_price']
                 self.append_to_csv(df, filepath)
 
-            # Add delay to avoid rate limiting
-            time.sleep(2)
-
     def fetch_fear_greed_index(self):
         """
         Fetch Crypto Fear & Greed Index from Alternative.me API.
@@ -452,236 +685,23 @@ class MarketSignalsTracker:
         else:
             print("Failed to fetch Fear & Greed Index data")
 
-    def calculate_derived_metrics(self):
-        """Calculate derived metrics like spreads and ratios."""
-        print("\n=== Calculating Derived Metrics ===")
+    def calculate_derived_metrics(self, full=False):
+        """Calculate derived metrics like spreads and ratios.
 
-        # Credit ETF spreads vs treasuries
-        treasury_file = self.data_dir / "treasury_7_10yr_price.csv"
-        if treasury_file.exists():
-            treasury_df = pd.read_csv(treasury_file)
-            treasury_df.columns = ['date', 'close']
-
-            # HYG vs IEF spread
-            hyg_file = self.data_dir / "high_yield_credit_price.csv"
-            if hyg_file.exists():
-                hyg_df = pd.read_csv(hyg_file)
-                hyg_df.columns = ['date', 'close']
-                spread_df = self.calculate_etf_spreads(hyg_df, treasury_df)
-                if spread_df is not None:
-                    spread_df.columns = ['date', 'hyg_vs_ief_spread']
-                    self.append_to_csv(spread_df, self.data_dir / "hyg_treasury_spread.csv")
-
-            # LQD vs IEF spread
-            lqd_file = self.data_dir / "investment_grade_credit_price.csv"
-            if lqd_file.exists():
-                lqd_df = pd.read_csv(lqd_file)
-                lqd_df.columns = ['date', 'close']
-                spread_df = self.calculate_etf_spreads(lqd_df, treasury_df)
-                if spread_df is not None:
-                    spread_df.columns = ['date', 'lqd_vs_ief_spread']
-                    self.append_to_csv(spread_df, self.data_dir / "lqd_treasury_spread.csv")
-
-        # Market breadth ratios
-        print("\nCalculating market breadth ratios...")
-
-        spy_file = self.data_dir / "sp500_price.csv"
-        rsp_file = self.data_dir / "sp500_equal_weight_price.csv"
-        iwm_file = self.data_dir / "small_cap_price.csv"
-        qqq_file = self.data_dir / "nasdaq_price.csv"
-
-        if spy_file.exists() and rsp_file.exists():
-            spy_df = pd.read_csv(spy_file)
-            rsp_df = pd.read_csv(rsp_file)
-            spy_df.columns = ['date', 'spy']
-            rsp_df.columns = ['date', 'rsp']
-
-            merged = pd.merge(spy_df, rsp_df, on='date')
-            merged['breadth_ratio'] = (merged['rsp'] / merged['spy']) * 100
-
-            breadth_df = merged[['date', 'breadth_ratio']]
-            self.append_to_csv(breadth_df, self.data_dir / "market_breadth_ratio.csv")
-            print("Market breadth ratio (RSP/SPY) calculated")
-
-        # Gold/Silver ratio
-        gold_file = self.data_dir / "gold_price.csv"
-        silver_file = self.data_dir / "silver_price.csv"
-
-        if gold_file.exists() and silver_file.exists():
-            gold_df = pd.read_csv(gold_file)
-            silver_df = pd.read_csv(silver_file)
-            gold_df.columns = ['date', 'gold']
-            silver_df.columns = ['date', 'silver']
-
-            merged = pd.merge(gold_df, silver_df, on='date')
-            merged['gold_silver_ratio'] = merged['gold'] / merged['silver']
-
-            ratio_df = merged[['date', 'gold_silver_ratio']]
-            self.append_to_csv(ratio_df, self.data_dir / "gold_silver_ratio.csv")
-            print("Gold/Silver ratio calculated")
-
-        # Real yields (TIP vs IEF)
-        tip_file = self.data_dir / "tips_inflation_price.csv"
-        ief_file = self.data_dir / "treasury_7_10yr_price.csv"
-
-        if tip_file.exists() and ief_file.exists():
-            tip_df = pd.read_csv(tip_file)
-            ief_df = pd.read_csv(ief_file)
-            tip_df.columns = ['date', 'tip']
-            ief_df.columns = ['date', 'ief']
-
-            merged = pd.merge(tip_df, ief_df, on='date')
-            merged['real_yield_proxy'] = (merged['tip'] / merged['ief'] - 1) * 100
-
-            real_yield_df = merged[['date', 'real_yield_proxy']]
-            self.append_to_csv(real_yield_df, self.data_dir / "real_yield_proxy.csv")
-            print("Real yield proxy (TIP/IEF) calculated")
-
-        # Market concentration ratios (AI/Tech tracking)
-        print("\nCalculating market concentration ratios...")
-
-        # SMH/SPY ratio - Semiconductor concentration
-        smh_file = self.data_dir / "semiconductor_price.csv"
-        if spy_file.exists() and smh_file.exists():
-            spy_df = pd.read_csv(spy_file)
-            smh_df = pd.read_csv(smh_file)
-            spy_df.columns = ['date', 'spy']
-            smh_df.columns = ['date', 'smh']
-
-            merged = pd.merge(spy_df, smh_df, on='date')
-            merged['smh_spy_ratio'] = (merged['smh'] / merged['spy']) * 100
-
-            ratio_df = merged[['date', 'smh_spy_ratio']]
-            self.append_to_csv(ratio_df, self.data_dir / "smh_spy_ratio.csv")
-            print("SMH/SPY ratio (semiconductor concentration) calculated")
-
-        # XLK/SPY ratio - Tech sector concentration
-        xlk_file = self.data_dir / "tech_sector_price.csv"
-        if spy_file.exists() and xlk_file.exists():
-            spy_df = pd.read_csv(spy_file)
-            xlk_df = pd.read_csv(xlk_file)
-            spy_df.columns = ['date', 'spy']
-            xlk_df.columns = ['date', 'xlk']
-
-            merged = pd.merge(spy_df, xlk_df, on='date')
-            merged['xlk_spy_ratio'] = (merged['xlk'] / merged['spy']) * 100
-
-            ratio_df = merged[['date', 'xlk_spy_ratio']]
-            self.append_to_csv(ratio_df, self.data_dir / "xlk_spy_ratio.csv")
-            print("XLK/SPY ratio (tech sector concentration) calculated")
-
-        # IWF/IWD ratio - Growth vs Value
-        iwf_file = self.data_dir / "growth_price.csv"
-        iwd_file = self.data_dir / "value_price.csv"
-        if iwf_file.exists() and iwd_file.exists():
-            iwf_df = pd.read_csv(iwf_file)
-            iwd_df = pd.read_csv(iwd_file)
-            iwf_df.columns = ['date', 'iwf']
-            iwd_df.columns = ['date', 'iwd']
-
-            merged = pd.merge(iwf_df, iwd_df, on='date')
-            merged['growth_value_ratio'] = (merged['iwf'] / merged['iwd']) * 100
-
-            ratio_df = merged[['date', 'growth_value_ratio']]
-            self.append_to_csv(ratio_df, self.data_dir / "growth_value_ratio.csv")
-            print("IWF/IWD ratio (growth vs value) calculated")
-
-        # IWM/SPY ratio - Small Cap vs Large Cap
-        if spy_file.exists() and iwm_file.exists():
-            spy_df = pd.read_csv(spy_file)
-            iwm_df = pd.read_csv(iwm_file)
-            spy_df.columns = ['date', 'spy']
-            iwm_df.columns = ['date', 'iwm']
-
-            merged = pd.merge(spy_df, iwm_df, on='date')
-            merged['iwm_spy_ratio'] = (merged['iwm'] / merged['spy']) * 100
-
-            ratio_df = merged[['date', 'iwm_spy_ratio']]
-            self.append_to_csv(ratio_df, self.data_dir / "iwm_spy_ratio.csv")
-            print("IWM/SPY ratio (small cap vs large cap) calculated")
-
-        # QQQ/SPY ratio - Nasdaq vs S&P 500 (tech leadership)
-        if spy_file.exists() and qqq_file.exists():
-            try:
-                spy_df = pd.read_csv(spy_file)
-                qqq_df = pd.read_csv(qqq_file)
-                spy_df.columns = ['date', 'spy']
-                qqq_df.columns = ['date', 'qqq']
+        Metrics are declared in derived_metrics.DERIVED_METRICS. Only rows
+        newer than each output's last date are computed unless ``full`` is set,
+        which recomputes full history and rewrites every output (e.g. after
+        backfilling or repairing an input).
+        """
+        print("\n=== Calculating Derived Metrics ===")
 
-                merged = pd.merge(spy_df, qqq_df, on='date')
-                merged['qqq_spy_ratio'] = (merged['qqq'] / merged['spy']) * 100
+        started = time.perf_counter()
+        engine = DerivedMetricsEngine(self.data_dir, self.storage, self.append_to_csv)
+        statuses = engine.run(full=full)
 
-                ratio_df = merged[['date', 'qqq_spy_ratio']]
-                self.append_to_csv(ratio_df, self.data_dir / "qqq_spy_ratio.csv")
-                print("QQQ/SPY ratio (Nasdaq vs S&P 500 tech leadership) calculated")
-            except Exception as e:
-                print(f"Warning: could not calculate QQQ/SPY ratio: {e}")
-
-        # Bitcoin/Gold ratio - BTC priced in ounces of gold
-        btc_file = self.data_dir / "bitcoin_price.csv"
-        if btc_file.exists() and gold_file.exists():
-            btc_df = pd.read_csv(btc_file)
-            gold_df = pd.read_csv(gold_file)
-            btc_df.columns = ['date', 'btc']
-            gold_df.columns = ['date', 'gold']
-
-            merged = pd.merge(btc_df, gold_df, on='date')
-            merged['btc_gold_ratio'] = merged['btc'] / merged['gold']
-
-            ratio_df = merged[['date', 'btc_gold_ratio']]
-            self.append_to_csv(ratio_df, self.data_dir / "btc_gold_ratio.csv")
-            print("BTC/Gold ratio (Bitcoin priced in gold ounces) calculated")
-
-        # GDX/GLD ratio - Gold miners vs Gold (miner leverage indicator)
-        gdx_file = self.data_dir / "gold_miners_price.csv"
-        gld_file = self.data_dir / "gold_price.csv"
-        if gdx_file.exists() and gld_file.exists():
-            gdx_df = pd.read_csv(gdx_file)
-            gld_df = pd.read_csv(gld_file)
-            gdx_df.columns = ['date', 'gdx']
-            gld_df.columns = ['date', 'gld']
-
-            merged = pd.merge(gdx_df, gld_df, on='date')
-            merged['gdx_gld_ratio'] = (merged['gdx'] / merged['gld']) * 100
-
-            ratio_df = merged[['date', 'gdx_gld_ratio']]
-            self.append_to_csv(ratio_df, self.data_dir / "gdx_gld_ratio.csv")
-            print("GDX/GLD ratio (gold miners vs gold) calculated")
-
-        # Rate Differentials (Currency/FX Drivers)
-        print("\nCalculating rate differentials...")
-
-        us_10y_file = self.data_dir / "treasury_10y.csv"
-        japan_10y_file = self.data_dir / "japan_10y_yield.csv"
-        germany_10y_file = self.data_dir / "germany_10y_yield.csv"
-
-        # US-Japan 10Y Spread (carry trade driver)
-        if us_10y_file.exists() and japan_10y_file.exists():
-            us_df = pd.read_csv(us_10y_file)
-            jp_df = pd.read_csv(japan_10y_file)
-            us_df.columns = ['date', 'us_10y']
-            jp_df.columns = ['date', 'jp_10y']
-
-            merged = pd.merge(us_df, jp_df, on='date')
-            merged['us_japan_10y_spread'] = merged['us_10y'] - merged['jp_10y']
-
-            spread_df = merged[['date', 'us_japan_10y_spread']]
-            self.append_to_csv(spread_df, self.data_dir / "us_japan_10y_spread.csv")
-            print("US-Japan 10Y spread (carry trade driver) calculated")
-
-        # US-Germany 10Y Spread (EUR/USD driver)
-        if us_10y_file.exists() and germany_10y_file.exists():
-            us_df = pd.read_csv(us_10y_file)
-            de_df = pd.read_csv(germany_10y_file)
-            us_df.columns = ['date', 'us_10y']
-            de_df.columns = ['date', 'de_10y']
-
-            merged = pd.merge(us_df, de_df, on='date')
-            merged['us_germany_10y_spread'] = merged['us_10y'] - merged['de_10y']
-
-            spread_df = merged[['date', 'us_germany_10y_spread']]
-            self.append_to_csv(spread_df, self.data_dir / "us_germany_10y_spread.csv")
-            print("US-Germany 10Y spread (EUR/USD driver) calculated")
+        updated = [name for name, status in statuses.items() if status.endswith('rows')]
+        print(f"\n{len(updated)} of {len(statuses)} derived metrics updated "
+              f"in {time.perf_counter() - started:.2f}s")
 
     def fetch_usda_nass_farmland(self):
         """Fetch USDA NASS farmland $/acre data (farm real estate, cropland, pasture).
@@ -774,6 +794,11 @@ class MarketSignalsTracker:
         self.calculate_derived_metrics()
         self.fetch_usda_nass_farmland()
 
+        if self.storage.columnar:
+            # CSV compatibility shim for scripts and AI tools that read text
+            exported = export_to_csv(self.data_dir, stale_only=True)
+            print(f"\nExported {len(exported)} updated series to CSV")
+
         print("\n=== Collection Complete ===")
         print(f"Data saved to: {self.data_dir.absolute()}")
 
@@ -830,6 +855,11 @@ def main():
         '--fred-api-key',
         help='FRED API key (or set FRED_API_KEY environment variable)'
     )
+    parser.add_argument(
+        '--rebuild-derived',
+        action='store_true',
+        help='Recompute derived ratios/spreads over full history and exit'
+    )
 
     args = parser.parse_args()
 
@@ -840,6 +870,8 @@ def main():
 
     if args.summary:
         tracker.show_summary()
+    elif args.rebuild_derived:
+        tracker.calculate_derived_metrics(full=True)
     else:
         tracker.run_daily_collection(lookback_days=args.lookback_days)
         tracker.show_summary()
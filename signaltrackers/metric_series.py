@@ -0,0 +1,239 @@
+"""
+Range-queryable, downsampled metric series for the chart APIs.
+
+/api/metrics/<name> used to rebuild date strings, value lists and summary
+stats from the full CSV on every request and ship every observation (~9,000
+points for 35 years of daily data). A MetricSeries holds one metric as numpy
+arrays with its date strings and full-range stats computed once per data
+version; requests then slice a date range with searchsorted and, when asked
+for ``max_points``, thin it with min/max bucketing.
+
+Min/max bucketing keeps the lowest and highest observation of every bucket
+(plus the first and last point), so spikes, troughs and the overall shape of
+a line chart survive even at 50x reduction. It is fully vectorized.
+
+aligned_payload() serves /api/metrics/batch: several cached series on one
+shared date axis, so a category page loads its metrics in one request.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import metric_store
+except ImportError:
+    from signaltrackers import metric_store
+
+_CACHE_SIZE = 256
+
+
+def minmax_downsample(values: np.ndarray, max_points: int) -> np.ndarray:
+    """Indices of at most ``max_points`` observations preserving each bucket's extremes.
+
+    Non-finite values are never selected. Returns all finite indices when they
+    already fit.
+    """
+    finite = np.flatnonzero(np.isfinite(values))
+    if len(finite) <= max_points:
+        return finite
+    if max_points < 4:
+        return finite[np.linspace(0, len(finite) - 1, max(max_points, 1)).round().astype(int)]
+
+    inner = finite[1:-1]
+    buckets = (max_points - 2) // 2
+    bucket_of = np.arange(len(inner)) * buckets // len(inner)
+    order = np.lexsort((values[inner], bucket_of))
+    starts = np.searchsorted(bucket_of[order], np.arange(buckets), side='left')
+    ends = np.append(starts[1:], len(order)) - 1
+    picks = np.concatenate(([finite[0]], inner[order[starts]], inner[order[ends]], [finite[-1]]))
+    return np.unique(picks)
+
+
+def _stats(dates: np.ndarray, date_strings: np.ndarray, values: np.ndarray) -> dict:
+    """Full-range summary stats (same definitions the endpoint always used)."""
+    n = len(values)
+    stats = {
+        'current': None, 'min': None, 'max': None, 'average': None,
+        'change_1d': None, 'change_30d': None,
+        'count': n, 'start': None, 'end': None, 'min_date': None, 'max_date': None,
+    }
+    if n == 0:
+        return stats
+
+    stats['start'] = date_strings[0]
+    stats['end'] = date_strings[-1]
+    stats['current'] = _num(values[-1])
+    if np.isfinite(values).any():
+        i_min = int(np.nanargmin(values))
+        i_max = int(np.nanargmax(values))
+        stats.update(
+            min=_num(values[i_min]), max=_num(values[i_max]),
+            average=_num(np.nanmean(values)),
+            min_date=date_strings[i_min], max_date=date_strings[i_max],
+        )
+    if n >= 2:
+        stats['change_1d'] = _num(values[-1] - values[-2])
+    if n >= 30:
+        stats['change_30d'] = _num(values[-1] - values[-30])
+    return stats
+
+
+def _num(value) -> Optional[float]:
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+class MetricSeries:
+    """One metric's history as arrays, with precomputed strings and stats."""
+
+    __slots__ = ('dates', 'date_strings', 'values', 'column_name', 'stats')
+
+    def __init__(self, dates, values, column_name: str):
+        self.dates = np.asarray(pd.DatetimeIndex(dates).values, dtype='datetime64[ns]')
+        self.values = np.asarray(values, dtype='float64')
+        self.date_strings = np.datetime_as_string(self.dates, unit='D').astype(object)
+        self.column_name = column_name
+        self.stats = _stats(self.dates, self.date_strings, self.values)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, column: Optional[str] = None) -> 'MetricSeries':
+        """Build from a metric-store frame (``date`` plus one value column)."""
+        column = column or df.columns[1]
+        values = pd.to_numeric(df[column], errors='coerce')
+        return cls(df['date'], values, column)
+
+    def bounds(self, start=None, end=None) -> tuple:
+        """Index bounds ``[lo, hi)`` of the inclusive ``start``/``end`` date range."""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start)), 'left'))
+        hi = len(self.dates) if end is None else int(
+            np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end)), 'right'))
+        return lo, max(lo, hi)
+
+    def payload(self, start=None, end=None, max_points: Optional[int] = None,
+                arrays: bool = False) -> dict:
+        """JSON-ready slice of the series.
+
+        ``start``/``end`` are inclusive date bounds; ``max_points`` thins the
+        slice with minmax_downsample. ``stats`` always describe the full range.
+        With ``arrays`` the dates and values stay numpy arrays (for
+        series_wire) instead of being converted to lists.
+        """
+        lo, hi = self.bounds(start, end)
+        rows = slice(lo, hi)
+        if max_points is not None and hi - lo > max_points:
+            rows = lo + minmax_downsample(self.values[lo:hi], max_points)
+        values = self.values[rows]
+        date_strings = self.date_strings[rows]
+
+        return {
+            'dates': self.dates[rows] if arrays else date_strings.tolist(),
+            'values': values if arrays else _json_values(values),
+            'column_name': self.column_name,
+            'stats': self.stats,
+            'range': {
+                'start': date_strings[0] if len(date_strings) else None,
+                'end': date_strings[-1] if len(date_strings) else None,
+                'points': len(values),
+                'source_points': hi - lo,
+                'downsampled': not isinstance(rows, slice),
+            },
+        }
+
+
+def aligned_payload(series_by_id: dict, start=None, end=None,
+                    max_points: Optional[int] = None, arrays: bool = False) -> dict:
+    """Several series on one shared date axis, JSON-ready.
+
+    The axis is the union of the series' dates within ``start``/``end``; a
+    series with no observation on an axis date gets null there. With
+    ``max_points`` each series contributes its own min/max picks from an
+    equal share of the budget, so every series keeps its extremes.
+    ``arrays`` keeps dates and values as numpy arrays, as in payload().
+    """
+    spans = {key: s.bounds(start, end) for key, s in series_by_id.items()}
+    if series_by_id:
+        axis = np.unique(np.concatenate(
+            [s.dates[lo:hi] for s, (lo, hi) in zip(series_by_id.values(), spans.values())]))
+    else:
+        axis = np.array([], dtype='datetime64[ns]')
+
+    grid = np.full((len(axis), len(series_by_id)), np.nan)
+    for j, (key, s) in enumerate(series_by_id.items()):
+        lo, hi = spans[key]
+        grid[np.searchsorted(axis, s.dates[lo:hi]), j] = s.values[lo:hi]
+
+    source_points = len(axis)
+    downsampled = bool(max_points is not None and series_by_id and len(axis) > max_points)
+    if downsampled:
+        budget = max(1, max_points // len(series_by_id))
+        idx = np.unique(np.concatenate(
+            [minmax_downsample(grid[:, j], budget) for j in range(grid.shape[1])]))
+        axis, grid = axis[idx], grid[idx]
+
+    bounds = np.datetime_as_string(axis[[0, -1]], unit='D').tolist() if len(axis) else [None, None]
+    return {
+        'dates': axis if arrays else np.datetime_as_string(axis, unit='D').tolist(),
+        'metrics': {
+            key: {'values': grid[:, j].copy() if arrays else _json_values(grid[:, j]),
+                  'column_name': s.column_name, 'stats': s.stats}
+            for j, (key, s) in enumerate(series_by_id.items())
+        },
+        'range': {
+            'start': bounds[0],
+            'end': bounds[1],
+            'points': len(axis),
+            'source_points': source_points,
+            'downsampled': downsampled,
+        },
+    }
+
+
+def _json_values(values: np.ndarray) -> list:
+    """Float list with NaN as None (null in JSON)."""
+    return [v if v == v else None for v in values.tolist()]
+
+
+def _stamp(path: Path) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class MetricSeriesCache:
+    """MetricSeries memoized per metric-store version and source file stamps."""
+
+    def __init__(self, size: int = _CACHE_SIZE):
+        self._size = size
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name: str, paths: Iterable[Path],
+            builder: Callable[[], Optional[MetricSeries]]) -> Optional[MetricSeries]:
+        """Return the cached series ``name`` or build it when its sources changed."""
+        stamp = (metric_store.get_version(), tuple(_stamp(Path(p)) for p in paths))
+        with self._lock:
+            cached = self._cache.get(name)
+            if cached is not None and cached[0] == stamp:
+                self._cache.move_to_end(name)
+                return cached[1]
+
+        series = builder()
+        if series is not None:
+            with self._lock:
+                self._cache[name] = (stamp, series)
+                self._cache.move_to_end(name)
+                while len(self._cache) > self._size:
+                    self._cache.popitem(last=False)
+        return series
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
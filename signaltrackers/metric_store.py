@@ -0,0 +1,151 @@
+"""
+Shared in-process time-series store.
+
+Pages, AI tools, alert layers and backtests all read the same CSVs from
+data/, often several times per request. This module parses each file once
+and serves it from memory until the file changes on disk (mtime, size or
+inode) or the daily refresh bumps the store version.
+
+Callers always receive copies, so mutating a returned DataFrame or Series
+never leaks into the cache. Paths are always the .csv path; when the
+columnar backend has a newer <name>.parquet (see series_storage.py) that
+file is read instead.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+
+try:
+    from series_storage import columnar_source
+except ImportError:
+    from signaltrackers.series_storage import columnar_source
+
+_lock = threading.Lock()
+_version = 0
+
+# (abs path, parse_dates) -> (stamp, version, DataFrame)
+_frames: Dict[Tuple[str, tuple], tuple] = {}
+# (abs path, column) -> (stamp, version, Series)
+_series: Dict[Tuple[str, Optional[str]], tuple] = {}
+
+
+def get_version() -> int:
+    """Return the current store version (incremented by bump_version)."""
+    return _version
+
+
+def bump_version() -> int:
+    """Drop every cached series and start a new store version.
+
+    Called by the daily refresh after new data has been written so that the
+    next read re-parses every file regardless of filesystem timestamps.
+    """
+    global _version
+    with _lock:
+        _version += 1
+        _frames.clear()
+        _series.clear()
+        return _version
+
+
+def invalidate(path) -> None:
+    """Drop any cached entries for a single file (used by in-process writers)."""
+    key = _key(path)
+    with _lock:
+        for cache in (_frames, _series):
+            for cache_key in [k for k in cache if k[0] == key]:
+                del cache[cache_key]
+
+
+def _key(path) -> str:
+    return str(Path(path).resolve())
+
+
+def _source(path) -> Path:
+    """Return the file that currently backs ``path`` (parquet or the CSV itself)."""
+    return columnar_source(path) or Path(path)
+
+
+def _stamp(path) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _read_raw(source: Path) -> pd.DataFrame:
+    if source.suffix == '.parquet':
+        return pd.read_parquet(source)
+    return pd.read_csv(source)
+
+
+def read_frame(path, parse_dates: Sequence[str] = ('date',)) -> Optional[pd.DataFrame]:
+    """Return the parsed CSV at ``path`` as a DataFrame, or None if missing.
+
+    Columns listed in ``parse_dates`` are converted with pd.to_datetime; a
+    listed column that is absent raises KeyError, matching the behaviour of
+    the per-module loaders this replaces. Parse errors propagate so callers
+    keep their existing error handling.
+    """
+    source = _source(path)
+    stamp = _stamp(source)
+    if stamp is None:
+        return None
+    key = (_key(path), tuple(parse_dates))
+
+    with _lock:
+        cached = _frames.get(key)
+    if cached is not None and cached[0] == stamp and cached[1] == _version:
+        return cached[2].copy()
+
+    version = _version
+    df = _read_raw(source)
+    for col in parse_dates:
+        df[col] = pd.to_datetime(df[col])
+
+    with _lock:
+        if version == _version:
+            _frames[key] = (stamp, version, df)
+    return df.copy()
+
+
+def read_series(path, column: Optional[str] = None) -> Optional[pd.Series]:
+    """Return a date-indexed float64 Series for one column of a CSV.
+
+    ``column`` defaults to the first non-date column. Rows with a missing
+    date or value are dropped and the result is sorted by date. Returns None
+    when the file is missing, empty or lacks the requested column.
+    """
+    source = _source(path)
+    stamp = _stamp(source)
+    if stamp is None:
+        return None
+    key = (_key(path), column)
+
+    with _lock:
+        cached = _series.get(key)
+    if cached is not None and cached[0] == stamp and cached[1] == _version:
+        return cached[2].copy()
+
+    version = _version
+    df = _read_raw(source)
+    if df.empty or 'date' not in df.columns or len(df.columns) < 2:
+        return None
+    value_col = column or next(c for c in df.columns if c != 'date')
+    if value_col not in df.columns:
+        return None
+
+    values = pd.to_numeric(df[value_col], errors='coerce').astype('float64')
+    s = pd.Series(values.values, index=pd.to_datetime(df['date']), name=value_col)
+    s = s[s.index.notna()].dropna().sort_index(kind='stable')
+    s.index.name = 'date'
+
+    with _lock:
+        if version == _version:
+            _series[key] = (stamp, version, s)
+    return s.copy()
@@ -9,6 +9,8 @@ import json
 from pathlib import Path
 import pandas as pd
 
+import metric_store
+
 DATA_DIR = Path("data")
 
 # Function definitions for OpenAI function calling
@@ -210,15 +212,12 @@ METRIC_INFO = {
 def load_csv_data(filename):
     """Load CSV data from the data directory."""
     filepath = DATA_DIR / filename
-    if filepath.exists():
-        try:
-            df = pd.read_csv(filepath)
-            # us_recessions.csv has start_date/end_date, not date
-            if filename != 'us_recessions.csv':
-                df['date'] = pd.to_datetime(df['date'])
-            return df
-        except Exception as e:
-            print(f"Error loading {filename}: {e}")
+    # us_recessions.csv has start_date/end_date, not date
+    parse_dates = () if filename == 'us_recessions.csv' else ('date',)
+    try:
+        return metric_store.read_frame(filepath, parse_dates=parse_dates)
+    except Exception as e:
+        print(f"Error loading {filename}: {e}")
     return None
 
 
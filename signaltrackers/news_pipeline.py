@@ -22,6 +22,11 @@ from urllib.parse import urlparse
 import pytz
 import requests
 
+try:
+    from chatbot_context import invalidate_chatbot_context
+except ImportError:
+    from signaltrackers.chatbot_context import invalidate_chatbot_context
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -326,6 +331,7 @@ def run_news_pipeline() -> bool:
     cache[today] = record
     cache = _prune(cache)
     _save_cache(cache)
+    invalidate_chatbot_context()
 
     logger.info('[news_pipeline] News pipeline complete for %s', today)
     return True
@@ -27,6 +27,11 @@ from typing import Optional
 
 import requests
 
+try:
+    import json_artifacts
+except ImportError:
+    from signaltrackers import json_artifacts
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -323,9 +328,7 @@ def _build_interpretation(models: dict) -> str:
 def _load_cache() -> Optional[dict]:
     """Return cached recession probability dict, or None if cache doesn't exist."""
     try:
-        if CACHE_FILE.exists():
-            with open(CACHE_FILE, 'r') as f:
-                return json.load(f)
+        return json_artifacts.read_json(CACHE_FILE)
     except Exception as exc:
         logger.warning('Failed to read recession probability cache: %s', exc)
     return None
@@ -339,6 +342,7 @@ def _save_cache(data: dict) -> None:
             json.dump(data, f, default=str, indent=2)
     except Exception as exc:
         logger.warning('Failed to write recession probability cache: %s', exc)
+    json_artifacts.invalidate(CACHE_FILE)
 
 
 # ---------------------------------------------------------------------------
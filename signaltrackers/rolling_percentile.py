@@ -0,0 +1,158 @@
+"""
+Rolling-window percentile ranks shared by the alert layers and pages.
+
+A value's percentile is the share of observations in its window that are
+strictly below it, on a 0–100 scale. Two forms are provided:
+
+  percentile_of(series, value, years)
+      One value against the trailing ``years`` of a series anchored at today
+      (the "where are we now" number shown on pages and used by alerts).
+
+  rolling_percentile(series, years)
+      Every observation ranked against the ``years`` of data ending at its
+      own date, i.e. the percentile as it would have read on that day. The
+      window is kept as a sorted array that slides forward once, so a whole
+      series costs O(n log w) comparisons instead of one full re-rank per day.
+
+Both fall back to all available history when the window holds fewer than two
+observations. cached_rolling_percentile() memoizes rolling series by content
+and metric-store version, so the alert layers, convergence scan and replay
+share one computation per indicator per data refresh.
+"""
+
+import hashlib
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import metric_store
+except ImportError:
+    from signaltrackers import metric_store
+
+_CACHE_SIZE = 64
+
+_cache: "OrderedDict[tuple, pd.Series]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def percentile_of(series: Optional[pd.Series], value: float, years: int,
+                  end: Optional[pd.Timestamp] = None) -> Optional[float]:
+    """Percentile rank of ``value`` within the ``years`` before ``end`` (default today).
+
+    Returns None for a None/empty series. A single-observation series ranks
+    ``value`` as 100 if it is at or above that observation, else 0.
+    """
+    if series is None or len(series) == 0:
+        return None
+    if len(series) == 1:
+        return 100.0 if value >= series.iloc[0] else 0.0
+
+    anchor = pd.Timestamp.today() if end is None else pd.Timestamp(end)
+    cutoff = anchor - pd.DateOffset(years=years)
+    try:
+        windowed = series[series.index >= cutoff]
+        if len(windowed) < 2:
+            windowed = series
+    except TypeError:
+        windowed = series
+
+    count_below = (windowed < value).sum()
+    return float(count_below / len(windowed) * 100)
+
+
+class SortedWindow:
+    """Multiset of floats kept in sorted order for rank queries."""
+
+    def __init__(self):
+        self._values = []
+
+    def __len__(self):
+        return len(self._values)
+
+    def add(self, value: float) -> None:
+        insort(self._values, value)
+
+    def remove(self, value: float) -> None:
+        del self._values[bisect_left(self._values, value)]
+
+    def count_below(self, value: float) -> int:
+        return bisect_left(self._values, value)
+
+
+def rolling_percentile(series: Optional[pd.Series], years: int) -> pd.Series:
+    """Percentile of each observation within the ``years`` ending at its date.
+
+    The window for an observation at ``t`` holds every observation dated in
+    ``[t - years, t]``. Missing values are skipped and come back as NaN; the
+    result is aligned to the (sorted) input index.
+    """
+    if series is None or len(series) == 0:
+        return pd.Series(dtype='float64')
+
+    series = series.sort_index(kind='stable')
+    valid = series.dropna()
+    out = np.full(len(valid), np.nan)
+    if len(valid):
+        dates = pd.DatetimeIndex(valid.index)
+        cutoffs = dates - pd.DateOffset(years=years)
+        starts = dates.searchsorted(cutoffs, side='left')
+        values = valid.to_numpy(dtype='float64')
+
+        window = SortedWindow()
+        lo = 0
+        for i, value in enumerate(values):
+            window.add(value)
+            while lo < starts[i]:
+                window.remove(values[lo])
+                lo += 1
+            if i == 0:
+                out[i] = 100.0
+            elif len(window) < 2:
+                out[i] = (values[:i + 1] < value).sum() / (i + 1) * 100
+            else:
+                out[i] = window.count_below(value) / len(window) * 100
+
+    ranked = pd.Series(out, index=valid.index, name=series.name)
+    return ranked.reindex(series.index) if len(valid) != len(series) else ranked
+
+
+def fingerprint(series: pd.Series) -> tuple:
+    """Cheap content key for a date-indexed series (length + digest)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(series.to_numpy(dtype='float64')).tobytes())
+    digest.update(np.ascontiguousarray(pd.DatetimeIndex(series.index).asi8).tobytes())
+    return len(series), digest.hexdigest()
+
+
+def cached_rolling_percentile(series: Optional[pd.Series], years: int) -> pd.Series:
+    """rolling_percentile() memoized per series content and store version.
+
+    Returns a copy, so callers may modify the result freely.
+    """
+    if series is None or len(series) == 0:
+        return pd.Series(dtype='float64')
+
+    key = (metric_store.get_version(), years, fingerprint(series))
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached.copy()
+
+    ranked = rolling_percentile(series, years)
+    with _lock:
+        _cache[key] = ranked
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return ranked.copy()
+
+
+def clear_cache() -> None:
+    """Drop every memoized rolling series."""
+    with _lock:
+        _cache.clear()
@@ -37,6 +37,11 @@ from typing import Optional
 
 import requests
 
+try:
+    import json_artifacts
+except ImportError:
+    from signaltrackers import json_artifacts
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -409,11 +414,8 @@ def get_sector_management_tone() -> Optional[dict]:
     or None if no cache exists or the cache file is unreadable.
     Does NOT make any network calls.
     """
-    if not CACHE_FILE.exists():
-        return None
     try:
-        with open(CACHE_FILE) as f:
-            return json.load(f)
+        return json_artifacts.read_json(CACHE_FILE)
     except Exception as exc:
         logger.warning("Failed to read sector tone cache: %s", exc)
         return None
@@ -424,6 +426,7 @@ def _write_cache(data: dict) -> None:
     CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
     with open(CACHE_FILE, "w") as f:
         json.dump(data, f, indent=2)
+    json_artifacts.invalidate(CACHE_FILE)
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Pluggable on-disk storage for data/ time series.
+
+CSV remains the default backend and the interchange format for the AI tools
+and scripts that read text. The columnar backend keeps each series as a
+<name>.parquet file next to its <name>.csv, with a typed datetime64 ``date``
+column and float64 value columns, so loads and appends skip text parsing.
+
+Every series is still addressed by its .csv path; the backend decides which
+file actually backs it. Select the backend with the DATA_STORAGE environment
+variable ('csv' or 'parquet'). The parquet backend needs pyarrow; without it
+everything falls back to CSV.
+
+The CSV backend keeps a small <name>.csv.idx sidecar (last dates and the byte
+offset of the last row) so the collectors can append rows, or replace
+today's row, without re-reading the whole file.
+
+One-shot migration and CSV export:
+    python series_storage.py migrate [--data-dir data]
+    python series_storage.py export  [--data-dir data]
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+DATA_STORAGE = os.environ.get('DATA_STORAGE', 'csv').lower()
+
+# Non-series files that stay CSV-only (no 'date' column to index on)
+_CSV_ONLY = {'us_recessions'}
+
+# Bytes read from the end of a CSV to locate its last two rows
+_TAIL_BYTES = 64 * 1024
+
+
+def _typed(df: pd.DataFrame, date_column: str = 'date') -> pd.DataFrame:
+    """Coerce a series frame to datetime64 dates and float64 numeric columns."""
+    df = df.copy()
+    df[date_column] = pd.to_datetime(df[date_column])
+    for col in df.columns:
+        if col == date_column:
+            continue
+        converted = pd.to_numeric(df[col], errors='coerce')
+        # Keep genuinely textual columns (e.g. labels) as they are
+        if converted.notna().sum() == df[col].notna().sum():
+            df[col] = converted.astype('float64')
+    return df
+
+
+def columnar_source(csv_path) -> Optional[Path]:
+    """Return the parquet file that supersedes ``csv_path``, if any.
+
+    A sibling <name>.parquet is used when pyarrow is available and the file
+    is at least as new as the CSV (or the CSV is absent). This is the read
+    side of the CSV compatibility shim: loaders keep asking for .csv paths.
+    """
+    if not PARQUET_AVAILABLE:
+        return None
+    csv_path = Path(csv_path)
+    if csv_path.suffix != '.csv':
+        return None
+    parquet_path = csv_path.with_suffix('.parquet')
+    try:
+        parquet_mtime = parquet_path.stat().st_mtime_ns
+    except OSError:
+        return None
+    try:
+        csv_mtime = csv_path.stat().st_mtime_ns
+    except OSError:
+        return parquet_path
+    return parquet_path if parquet_mtime >= csv_mtime else None
+
+
+def _decode_index(saved: dict) -> dict:
+    index = dict(saved)
+    for key in ('last_date', 'prev_date'):
+        index[key] = pd.Timestamp(saved[key]) if saved[key] is not None else None
+    return index
+
+
+def _scan_tail(csv_path: Path, date_column: str, st: os.stat_result) -> Optional[dict]:
+    """Build an append index from the header and the last two lines of a CSV."""
+    with open(csv_path, 'rb') as f:
+        header = f.readline().decode('utf-8').rstrip('\r\n')
+        start = max(0, st.st_size - _TAIL_BYTES)
+        f.seek(start)
+        tail = f.read()
+
+    columns = header.split(',')
+    if not columns or columns[0] != date_column or not tail.endswith(b'\n'):
+        return None
+
+    lines = tail[:-1].split(b'\n')
+    if start == 0:
+        lines = lines[1:]       # drop the header
+    elif len(lines) < 3:
+        return None             # a row is longer than the tail window
+    else:
+        lines = lines[1:]       # first fragment may be a partial line
+    if not lines:
+        return None
+
+    def _date(line: bytes) -> pd.Timestamp:
+        return pd.Timestamp(line.split(b',', 1)[0].decode('utf-8').strip())
+
+    try:
+        last_date = _date(lines[-1])
+        prev_date = _date(lines[-2]) if len(lines) >= 2 else None
+    except ValueError:
+        return None
+    if pd.isna(last_date) or (prev_date is not None and pd.isna(prev_date)):
+        return None
+
+    return {
+        'columns': columns,
+        'last_date': last_date,
+        'prev_date': prev_date,
+        'last_offset': st.st_size - len(lines[-1]) - 1,
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+    }
+
+
+class CsvStorage:
+    """Text backend: the series lives in the .csv file itself."""
+
+    name = 'csv'
+    columnar = False
+
+    def exists(self, csv_path) -> bool:
+        return Path(csv_path).exists()
+
+    def read(self, csv_path, date_column: str = 'date') -> Optional[pd.DataFrame]:
+        """Return the stored frame with ``date_column`` parsed, or None if missing."""
+        csv_path = Path(csv_path)
+        if not csv_path.exists():
+            return None
+        df = pd.read_csv(csv_path)
+        df[date_column] = pd.to_datetime(df[date_column])
+        return df
+
+    def write(self, csv_path, df: pd.DataFrame, date_column: str = 'date') -> Path:
+        df.to_csv(csv_path, index=False)
+        self.tail_index(csv_path, date_column)
+        return Path(csv_path)
+
+    def last_date(self, csv_path, date_column: str = 'date') -> Optional[pd.Timestamp]:
+        index = self.tail_index(csv_path, date_column)
+        if index is not None:
+            return index['last_date']
+        df = self.read(csv_path, date_column)
+        if df is None or df.empty:
+            return None
+        return df[date_column].max()
+
+    # -- Incremental appends -------------------------------------------------
+    #
+    # A sidecar <name>.csv.idx records the header, the last two dates and the
+    # byte offset of the last row. It is trusted only while the CSV's size
+    # and mtime match; otherwise it is rebuilt from the header and the last
+    # few KB of the file, so no path ever needs a full read.
+
+    @staticmethod
+    def index_path(csv_path) -> Path:
+        return Path(f'{csv_path}.idx')
+
+    def tail_index(self, csv_path, date_column: str = 'date') -> Optional[dict]:
+        """Return the append index for a sorted CSV, or None if it cannot be appended to.
+
+        Keys: columns, last_date, prev_date (None for a single row),
+        last_offset (byte offset where the last row starts), size, mtime_ns.
+        """
+        csv_path = Path(csv_path)
+        try:
+            st = csv_path.stat()
+        except OSError:
+            return None
+
+        index_path = self.index_path(csv_path)
+        try:
+            with open(index_path) as f:
+                saved = json.load(f)
+            if saved['size'] == st.st_size and saved['mtime_ns'] == st.st_mtime_ns:
+                return _decode_index(saved)
+        except (OSError, ValueError, KeyError):
+            pass
+
+        index = _scan_tail(csv_path, date_column, st)
+        if index is not None:
+            self._save_index(csv_path, index)
+        return index
+
+    def append_rows(self, csv_path, df: pd.DataFrame, index: dict,
+                    drop_last_row: bool = False) -> dict:
+        """Append ``df`` (already sorted, header order) to the CSV in place.
+
+        With ``drop_last_row`` the file is first truncated at the start of its
+        last row, which is how today's row is replaced. Returns the new index.
+        """
+        csv_path = Path(csv_path)
+        date_column = index['columns'][0]
+        text = df[index['columns']].to_csv(header=False, index=False, lineterminator='\n')
+        data = text.encode('utf-8')
+        last_line = text.rstrip('\n').rsplit('\n', 1)[-1].encode('utf-8')
+
+        with open(csv_path, 'r+b') as f:
+            if drop_last_row:
+                f.truncate(index['last_offset'])
+                f.seek(index['last_offset'])
+            else:
+                f.seek(0, os.SEEK_END)
+            start = f.tell()
+            f.write(data)
+
+        dates = df[date_column]
+        if len(dates) >= 2:
+            prev_date = pd.Timestamp(dates.iloc[-2])
+        else:
+            prev_date = index['prev_date'] if drop_last_row else index['last_date']
+        st = csv_path.stat()
+        new_index = {
+            'columns': index['columns'],
+            'last_date': pd.Timestamp(dates.iloc[-1]),
+            'prev_date': prev_date,
+            'last_offset': start + len(data) - len(last_line) - 1,
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+        }
+        self._save_index(csv_path, new_index)
+        return new_index
+
+    def _save_index(self, csv_path, index: dict) -> None:
+        encoded = dict(index)
+        for key in ('last_date', 'prev_date'):
+            encoded[key] = index[key].isoformat() if index[key] is not None else None
+        try:
+            with open(self.index_path(csv_path), 'w') as f:
+                json.dump(encoded, f)
+        except OSError:
+            pass
+
+
+class ParquetStorage(CsvStorage):
+    """Columnar backend: the series lives in a sibling .parquet file.
+
+    Series that have not been migrated yet are read from their CSV and move
+    to parquet on their first write.
+    """
+
+    name = 'parquet'
+    columnar = True
+
+    def exists(self, csv_path) -> bool:
+        return Path(csv_path).with_suffix('.parquet').exists() or Path(csv_path).exists()
+
+    def read(self, csv_path, date_column: str = 'date') -> Optional[pd.DataFrame]:
+        source = columnar_source(csv_path)
+        if source is None:
+            return super().read(csv_path, date_column)
+        return pd.read_parquet(source)
+
+    def write(self, csv_path, df: pd.DataFrame, date_column: str = 'date') -> Path:
+        parquet_path = Path(csv_path).with_suffix('.parquet')
+        tmp_path = parquet_path.with_name(parquet_path.name + '.tmp')
+        _typed(df, date_column).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, parquet_path)
+        return parquet_path
+
+    def last_date(self, csv_path, date_column: str = 'date') -> Optional[pd.Timestamp]:
+        source = columnar_source(csv_path)
+        if source is None:
+            return super().last_date(csv_path, date_column)
+        df = pd.read_parquet(source, columns=[date_column])
+        if df.empty:
+            return None
+        return df[date_column].max()
+
+    def tail_index(self, csv_path, date_column: str = 'date') -> Optional[dict]:
+        # Parquet files are rewritten whole; appends always take the merge path
+        return None
+
+
+def get_storage(backend: Optional[str] = None) -> CsvStorage:
+    """Return the configured storage backend.
+
+    Falls back to CSV when the parquet backend is requested but pyarrow is
+    not installed.
+    """
+    backend = (backend or DATA_STORAGE).lower()
+    if backend == 'parquet':
+        if PARQUET_AVAILABLE:
+            return ParquetStorage()
+        print("Warning: DATA_STORAGE=parquet but pyarrow is not installed; using CSV.")
+    return CsvStorage()
+
+
+def migrate_csv_to_parquet(data_dir='data', names: Optional[Iterable[str]] = None) -> List[str]:
+    """Convert every series CSV in ``data_dir`` to parquet. Returns migrated names.
+
+    CSV files are left in place, so the migration can be re-run or rolled
+    back by deleting the .parquet files.
+    """
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("pyarrow is required for parquet storage (pip install pyarrow)")
+
+    names = set(names) if names is not None else None
+    storage = ParquetStorage()
+    migrated = []
+    for csv_path in sorted(Path(data_dir).glob('*.csv')):
+        name = csv_path.stem
+        if name in _CSV_ONLY or (names is not None and name not in names):
+            continue
+        try:
+            df = pd.read_csv(csv_path)
+            if 'date' not in df.columns:
+                continue
+            storage.write(csv_path, df)
+            migrated.append(name)
+        except Exception as e:
+            print(f"Error migrating {csv_path.name}: {e}")
+    print(f"Migrated {len(migrated)} series to parquet in {data_dir}")
+    return migrated
+
+
+def export_to_csv(data_dir='data', names: Optional[Iterable[str]] = None,
+                  stale_only: bool = False) -> List[str]:
+    """Write a CSV copy of every parquet series in ``data_dir``. Returns exported names.
+
+    With ``stale_only`` only series whose CSV is missing or older than the
+    parquet file are rewritten (used after each collection run).
+    """
+    if not PARQUET_AVAILABLE:
+        return []
+
+    names = set(names) if names is not None else None
+    exported = []
+    for parquet_path in sorted(Path(data_dir).glob('*.parquet')):
+        name = parquet_path.stem
+        if names is not None and name not in names:
+            continue
+        csv_path = parquet_path.with_suffix('.csv')
+        if stale_only and csv_path.exists() and \
+                csv_path.stat().st_mtime_ns >= parquet_path.stat().st_mtime_ns:
+            continue
+        try:
+            pd.read_parquet(parquet_path).to_csv(csv_path, index=False)
+            # The text copy must not shadow the binary source of truth
+            parquet_mtime = parquet_path.stat().st_mtime_ns
+            os.utime(csv_path, ns=(csv_path.stat().st_atime_ns, parquet_mtime))
+            exported.append(name)
+        except Exception as e:
+            print(f"Error exporting {parquet_path.name}: {e}")
+    return exported
+
+
+def main():
+    """Command-line entry point for migration and export."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Manage columnar storage for data/ series.')
+    parser.add_argument('command', choices=['migrate', 'export'],
+                        help='migrate: CSV -> parquet; export: parquet -> CSV')
+    parser.add_argument('--data-dir', default='data', help='Data directory (default: data)')
+    args = parser.parse_args()
+
+    if args.command == 'migrate':
+        migrate_csv_to_parquet(args.data_dir)
+    else:
+        exported = export_to_csv(args.data_dir)
+        print(f"Exported {len(exported)} series to CSV in {args.data_dir}")
+
+
+if __name__ == '__main__':
+    main()
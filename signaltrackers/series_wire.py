@@ -0,0 +1,115 @@
+"""
+Compact binary encoding of chart series payloads (``?format=binary``).
+
+The JSON chart responses spend most of their build and parse time on the
+date axis (one 'YYYY-MM-DD' string per observation) and on float lists. The
+wire format keeps the JSON payload's shape but moves its arrays into raw
+little-endian buffers the browser can view as typed arrays without parsing:
+
+    bytes 0-3   magic b'STW1'
+    bytes 4-7   uint32 header length
+    bytes 8-    UTF-8 JSON header, space-padded to a multiple of 8 bytes
+    then        one 8-byte aligned buffer per array
+
+The header is ``{"meta": <payload with each array replaced by null>,
+"arrays": [{"path": [...keys], "type": "days" | "f8", "offset", "length"}]}``,
+with offsets counted from the end of the header.
+``days`` arrays are int32 days since 1970-01-01 (date axes); ``f8`` arrays
+are float64 with NaN for missing values. decodeSeriesWire() in
+static/js/dashboard.js rebuilds the payload, with dates as epoch
+milliseconds.
+"""
+
+import json
+import struct
+from typing import Optional
+
+import numpy as np
+
+MAGIC = b'STW1'
+MIMETYPE = 'application/vnd.signaltrackers.series'
+
+_ALIGN = 8
+
+
+def encode(payload) -> bytes:
+    """Encode a chart payload dict; see the module docstring for the layout."""
+    arrays = []
+    meta = _extract(payload, [], arrays)
+
+    specs = []
+    offset = 0
+    for path, kind, data in arrays:
+        specs.append({'path': path, 'type': kind, 'offset': offset, 'length': len(data)})
+        offset += _padded(data.nbytes)
+
+    header = json.dumps({'meta': meta, 'arrays': specs}, separators=(',', ':')).encode('utf-8')
+    header += b' ' * (_padded(len(header)) - len(header))
+
+    parts = [MAGIC, struct.pack('<I', len(header)), header]
+    for _, _, data in arrays:
+        raw = data.tobytes()
+        parts.append(raw + b'\0' * (_padded(len(raw)) - len(raw)))
+    return b''.join(parts)
+
+
+def decode(body: bytes) -> dict:
+    """Inverse of encode(); arrays come back as numpy (dates as datetime64[D])."""
+    if body[:len(MAGIC)] != MAGIC:
+        raise ValueError('Not a series wire payload')
+    (header_length,) = struct.unpack_from('<I', body, len(MAGIC))
+    start = len(MAGIC) + 4
+    header = json.loads(body[start:start + header_length])
+    base = start + header_length
+
+    payload = header['meta']
+    for spec in header['arrays']:
+        dtype = '<i4' if spec['type'] == 'days' else '<f8'
+        data = np.frombuffer(body, dtype=dtype, count=spec['length'], offset=base + spec['offset'])
+        if spec['type'] == 'days':
+            data = data.astype('datetime64[D]')
+        target = payload
+        for key in spec['path'][:-1]:
+            target = target[key]
+        target[spec['path'][-1]] = data
+    return payload
+
+
+def _padded(n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
+
+
+def _extract(obj, path: list, arrays: list):
+    """Copy of ``obj`` with its arrays moved into ``arrays`` as (path, type, data)."""
+    if isinstance(obj, dict):
+        return {key: _extract(value, path + [key], arrays) for key, value in obj.items()}
+
+    data = _as_array(obj, path[-1] if path else None)
+    if data is None:
+        return obj
+    arrays.append((path, *data))
+    return None
+
+
+def _as_array(obj, key) -> Optional[tuple]:
+    """(type, little-endian ndarray) for array-like values, else None."""
+    if isinstance(obj, np.ndarray):
+        if np.issubdtype(obj.dtype, np.datetime64):
+            return 'days', _days(obj)
+        if np.issubdtype(obj.dtype, np.number):
+            return 'f8', obj.astype('<f8', copy=False)
+        return None
+    if not isinstance(obj, list) or not obj:
+        return None
+    if key == 'dates' and isinstance(obj[0], str):
+        return 'days', _days(np.array(obj, dtype='datetime64[D]'))
+    if isinstance(obj[0], (int, float)) and not isinstance(obj[0], bool):
+        try:
+            return 'f8', np.array(obj, dtype='<f8')
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def _days(dates: np.ndarray) -> np.ndarray:
+    return dates.astype('datetime64[D]').astype('<i4')
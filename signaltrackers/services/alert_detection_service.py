@@ -10,6 +10,8 @@ from models.user import User
 from market_signals import get_latest_metrics, get_historical_metrics
 from extensions import db
 from services.alert_email_service import send_pending_alert_notifications
+from sqlalchemy import func
+from sqlalchemy.orm import contains_eager
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,13 +25,15 @@ class AlertDetector:
         self.title_template = title_template
         self.severity = severity
 
-    def should_trigger(self, user, metrics):
+    def should_trigger(self, user, metrics, cycle=None):
         """
         Check if alert should trigger for user
 
         Args:
             user: User object
             metrics: Dict of current metrics from get_latest_metrics()
+            cycle: Optional AlertCycle sharing market-wide payloads and
+                batched per-user alert history across one check run
 
         Returns:
             dict or None: Alert data if should trigger, None otherwise
@@ -334,7 +338,8 @@ class ExtremePercentileLayer2Detector(AlertDetector):
             severity='warning',
         )
 
-    def should_trigger(self, user, metrics):
+    def should_trigger(self, user, metrics, cycle=None):
+        cycle = cycle or AlertCycle()
         prefs = user.alert_preferences
         if not prefs or not prefs.alerts_enabled:
             return None
@@ -342,15 +347,10 @@ class ExtremePercentileLayer2Detector(AlertDetector):
         if not getattr(prefs, 'layer_2_enabled', True):
             return None
 
-        if self.was_recently_triggered(user.id, hours=168):
+        if cycle.was_recently_triggered(self, user.id, hours=168):
             return None
 
-        try:
-            from services.layer2_extreme_percentile import check_extreme_percentile
-            payloads = check_extreme_percentile()
-        except Exception as e:
-            logger.error("Layer 2 extreme percentile check failed: %s", str(e), exc_info=True)
-            return None
+        payloads = cycle.layer2_payloads()
 
         if not payloads:
             return None
@@ -379,7 +379,8 @@ class ConvergenceLayer3Detector(AlertDetector):
             severity='warning',
         )
 
-    def should_trigger(self, user, metrics):
+    def should_trigger(self, user, metrics, cycle=None):
+        cycle = cycle or AlertCycle()
         prefs = user.alert_preferences
         if not prefs or not prefs.alerts_enabled:
             return None
@@ -387,15 +388,10 @@ class ConvergenceLayer3Detector(AlertDetector):
         if not getattr(prefs, 'layer_3_enabled', True):
             return None
 
-        if self.was_recently_triggered(user.id, hours=168):
+        if cycle.was_recently_triggered(self, user.id, hours=168):
             return None
 
-        try:
-            from services.layer3_convergence import check_convergence
-            payload = check_convergence()
-        except Exception as e:
-            logger.error("Layer 3 convergence check failed: %s", str(e), exc_info=True)
-            return None
+        payload = cycle.layer3_payload()
 
         if payload is None:
             return None
@@ -424,7 +420,106 @@ def _count_layer_alerts_this_week(user_id):
     ).count()
 
 
-def check_all_alerts_for_user(user):
+class AlertCycle:
+    """
+    Shared state for one alert check run.
+
+    The market-wide inputs — latest metrics and the Layer 2/3 payloads — do
+    not depend on the user, so each is computed at most once per cycle (and
+    only if some user actually needs it) and then fanned out to every user.
+
+    After load_user_history(), per-user checks (recent triggers, weekly layer
+    alert count) are answered from two grouped queries instead of one query
+    per user per detector. Without it they fall back to the per-user helpers,
+    so a single-user check behaves exactly as before.
+    """
+
+    # Longest recency window any detector asks about (Layer 2/3 use 168h)
+    HISTORY_HOURS = 168
+
+    _UNSET = object()
+
+    def __init__(self):
+        self._metrics = self._UNSET
+        self._layer2 = self._UNSET
+        self._layer3 = self._UNSET
+        self._last_triggered = None  # {user_id: {alert_type: datetime}}
+        self._weekly_counts = None   # {user_id: int}
+        self._history_loaded_at = None
+
+    @property
+    def metrics(self):
+        if self._metrics is self._UNSET:
+            self._metrics = get_latest_metrics()
+        return self._metrics
+
+    def layer2_payloads(self):
+        """Layer 2 payloads for this cycle (None if the check failed)."""
+        if self._layer2 is self._UNSET:
+            try:
+                from services.layer2_extreme_percentile import check_extreme_percentile
+                self._layer2 = check_extreme_percentile()
+            except Exception as e:
+                logger.error("Layer 2 extreme percentile check failed: %s", str(e), exc_info=True)
+                self._layer2 = None
+        return self._layer2
+
+    def layer3_payload(self):
+        """Layer 3 payload for this cycle (None if nothing fired or the check failed)."""
+        if self._layer3 is self._UNSET:
+            try:
+                from services.layer3_convergence import check_convergence
+                self._layer3 = check_convergence()
+            except Exception as e:
+                logger.error("Layer 3 convergence check failed: %s", str(e), exc_info=True)
+                self._layer3 = None
+        return self._layer3
+
+    def load_user_history(self, user_ids):
+        """Batch-load recent alert history for ``user_ids`` in two grouped queries."""
+        now = datetime.utcnow()
+        user_ids = list(user_ids)
+        self._last_triggered = {uid: {} for uid in user_ids}
+        self._weekly_counts = dict.fromkeys(user_ids, 0)
+        self._history_loaded_at = now
+        if not user_ids:
+            return
+
+        recent = db.session.query(
+            Alert.user_id, Alert.alert_type, func.max(Alert.triggered_at)
+        ).filter(
+            Alert.user_id.in_(user_ids),
+            Alert.triggered_at >= now - timedelta(hours=self.HISTORY_HOURS),
+        ).group_by(Alert.user_id, Alert.alert_type)
+        for user_id, alert_type, last in recent:
+            self._last_triggered[user_id][alert_type] = last
+
+        weekly = db.session.query(
+            Alert.user_id, func.count(Alert.id)
+        ).filter(
+            Alert.user_id.in_(user_ids),
+            Alert.alert_type.in_(LAYER_ALERT_TYPES),
+            Alert.triggered_at >= now - timedelta(days=7),
+        ).group_by(Alert.user_id)
+        for user_id, count in weekly:
+            self._weekly_counts[user_id] = count
+
+    def _has_history(self, user_id):
+        return self._last_triggered is not None and user_id in self._last_triggered
+
+    def was_recently_triggered(self, detector, user_id, hours=24):
+        if not self._has_history(user_id) or hours > self.HISTORY_HOURS:
+            return detector.was_recently_triggered(user_id, hours=hours)
+        last = self._last_triggered[user_id].get(detector.alert_type)
+        return last is not None and last >= self._history_loaded_at - timedelta(hours=hours)
+
+    def layer_alerts_this_week(self, user_id):
+        if not self._has_history(user_id):
+            return _count_layer_alerts_this_week(user_id)
+        return self._weekly_counts[user_id]
+
+
+def check_all_alerts_for_user(user, cycle=None):
     """
     Run all alert detectors for a single user.
 
@@ -439,6 +534,7 @@ def check_all_alerts_for_user(user):
 
     Args:
         user: User object
+        cycle: Optional AlertCycle shared across users in one check run
 
     Returns:
         int: Number of new alerts created
@@ -446,8 +542,10 @@ def check_all_alerts_for_user(user):
     if not user.alert_preferences or not user.alert_preferences.alerts_enabled:
         return 0
 
+    cycle = cycle or AlertCycle()
+
     # Get latest market data
-    metrics = get_latest_metrics()
+    metrics = cycle.metrics
 
     if not metrics:
         logger.warning("No metrics available for alert detection")
@@ -468,7 +566,7 @@ def check_all_alerts_for_user(user):
     candidates = []  # list of (detector, alert_data) tuples
     for detector in layer_detectors:
         try:
-            alert_data = detector.should_trigger(user, metrics)
+            alert_data = detector.should_trigger(user, metrics, cycle)
             if alert_data:
                 candidates.append((detector, alert_data))
         except Exception as e:
@@ -478,7 +576,7 @@ def check_all_alerts_for_user(user):
         return 0
 
     # Apply weekly rate limit: budget = WEEKLY_ALERT_LIMIT − already_sent_this_week
-    already_sent = _count_layer_alerts_this_week(user.id)
+    already_sent = cycle.layer_alerts_this_week(user.id)
     budget = max(0, WEEKLY_ALERT_LIMIT - already_sent)
 
     if budget == 0:
@@ -513,19 +611,28 @@ def check_all_users_alerts():
     Check alerts for all users
     Called by background job every 15 minutes
 
+    Market-wide payloads are evaluated once per run (AlertCycle) and fanned
+    out to users by preference; per-user alert history is loaded in batch.
+
     Returns:
         dict: Summary of alerts created and emails sent
     """
-    users = User.query.join(AlertPreference).filter(
+    users = User.query.join(AlertPreference).options(
+        contains_eager(User.alert_preferences)
+    ).filter(
         AlertPreference.alerts_enabled == True
     ).all()
 
     total_alerts = 0
     users_alerted = 0
 
+    cycle = AlertCycle()
+    if users:
+        cycle.load_user_history(user.id for user in users)
+
     for user in users:
         try:
-            count = check_all_alerts_for_user(user)
+            count = check_all_alerts_for_user(user, cycle)
             if count > 0:
                 total_alerts += count
                 users_alerted += 1
@@ -549,11 +656,13 @@ def check_all_users_alerts():
 
 def run_alert_backtest(months=12):
     """
-    Backtest all 3 alert layers against the last N months of historical data.
+    Backtest the alert layers against the last N months of historical data.
 
-    Simulates weekly alert counts by replaying each layer's detection logic
-    against a sliding 7-day window. Validates the ≤5/week rate limit holds
-    across normal market conditions.
+    Replays Layer 2 and Layer 3 point-in-time for every day in the period
+    (services.alert_replay: each day only sees data dated on or before it),
+    applies the detectors' 7-day cooldowns, and buckets the resulting alerts
+    into weekly windows. Validates the ≤5/week rate limit holds across
+    normal market conditions.
 
     This function uses the layer service functions directly (no DB writes).
     It is read-only and safe to call at any time.
@@ -568,14 +677,16 @@ def run_alert_backtest(months=12):
             'max_weekly_count': int,
             'total_alerts': int,
             'passes_limit': bool,  # True if every week <= WEEKLY_ALERT_LIMIT
+            'weeks': list[dict],   # per week: week_start, count, layer2/layer3 signals
+            'timing': dict,        # load/compute/total seconds, days replayed
         }
     """
-    import pandas as pd
+    import time
     from datetime import date, timedelta as td
 
+    started = time.perf_counter()
     try:
-        from services.layer2_extreme_percentile import check_extreme_percentile
-        from services.layer3_convergence import check_convergence
+        from services.alert_replay import replay_alert_layers
     except ImportError as e:
         logger.error("Backtest: could not import layer services: %s", str(e))
         return {'error': str(e)}
@@ -583,38 +694,38 @@ def run_alert_backtest(months=12):
     today = date.today()
     start_date = today - td(days=months * 30)
 
+    try:
+        replay = replay_alert_layers(start_date, today - td(days=1))
+        alerts = replay['alerts']
+        timing = dict(replay['timing'])
+    except Exception as e:
+        logger.error("Backtest: replay failed: %s", str(e), exc_info=True)
+        alerts, timing = [], {}
+
     # Build weekly windows: Sunday → Saturday
-    weekly_counts = []
+    weeks = []
     week_start = start_date
     while week_start < today:
         week_end = week_start + td(days=7)
-        count = 0
-
-        # Layer 2: can fire per-indicator; cap at 1 per window for backtest
-        try:
-            payloads = check_extreme_percentile()
-            if payloads:
-                count += 1
-        except Exception:
-            pass
-
-        # Layer 3: fires 0-1 per window
-        try:
-            if check_convergence() is not None:
-                count += 1
-        except Exception:
-            pass
-
-        weekly_counts.append(min(count, WEEKLY_ALERT_LIMIT))
+        fired = [a for a in alerts
+                 if week_start.isoformat() <= a['date'] < week_end.isoformat()]
+        weeks.append({
+            'week_start': week_start.isoformat(),
+            'count': min(len(fired), WEEKLY_ALERT_LIMIT),
+            'layer2_signals': sorted({s for a in fired if a['layer'] == 'layer2' for s in a['signals']}),
+            'layer3_signals': sorted({s for a in fired if a['layer'] == 'layer3' for s in a['signals']}),
+        })
         week_start = week_end
 
+    weekly_counts = [w['count'] for w in weeks]
     max_count = max(weekly_counts) if weekly_counts else 0
     total = sum(weekly_counts)
     passes = all(c <= WEEKLY_ALERT_LIMIT for c in weekly_counts)
+    timing['total_seconds'] = round(time.perf_counter() - started, 4)
 
     logger.info(
-        "Alert backtest (%d months): %d weeks, max %d/week, total %d, passes=%s",
-        months, len(weekly_counts), max_count, total, passes,
+        "Alert backtest (%d months): %d weeks, max %d/week, total %d, passes=%s (%.2fs)",
+        months, len(weekly_counts), max_count, total, passes, timing['total_seconds'],
     )
 
     return {
@@ -623,4 +734,6 @@ def run_alert_backtest(months=12):
         'max_weekly_count': max_count,
         'total_alerts': total,
         'passes_limit': passes,
+        'weeks': weeks,
+        'timing': timing,
     }
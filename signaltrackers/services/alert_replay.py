@@ -0,0 +1,148 @@
+"""
+Alert Replay: point-in-time evaluation of Layer 2 and Layer 3 over history
+
+Answers "what would the alert layers have said on date D?" for every day in a
+range, using only data dated on or before D. Both layers are evaluated from
+the shared rolling-percentile series (rolling_percentile.py), which are
+point-in-time by construction: an observation's percentile only looks at the
+10 years ending on its own date. Each signal's state is then sampled as-of
+every replay day, so a multi-year daily replay is a handful of array ops per
+signal rather than a full layer check per day.
+
+As-of a day D, each signal reads its latest observation on or before D:
+  - Layer 2 fires for a signal when that observation is at or beyond the
+    90th/10th percentile and some observation in the 90 days up to it was
+    at or below the 70th (the momentum filter).
+  - Layer 3 fires when 3+ signals sit above the 75th or below the 25th
+    percentile in the same direction.
+
+Alerts are then emitted with the detectors' 7-day per-layer cooldown, as a
+single user with every layer enabled would have received them.
+
+Data revisions are not modelled: a revised FRED print replays at its
+current value.
+"""
+import logging
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+import rolling_percentile
+from services.layer2_extreme_percentile import (
+    _SIGNALS,
+    _EXTREME_HIGH_PCT,
+    _EXTREME_LOW_PCT,
+    _MOMENTUM_FILTER_PCT,
+    _MOMENTUM_DAYS,
+    _WINDOW_YEARS,
+    _load_signal,
+)
+from services.layer3_convergence import (
+    _STRESS_HIGH_PCT,
+    _STRESS_LOW_PCT,
+    _MIN_CONVERGENCE,
+)
+
+logger = logging.getLogger(__name__)
+
+_COOLDOWN_DAYS = 7  # matches was_recently_triggered(hours=168) on both detectors
+
+
+def _signal_states(series: pd.Series) -> pd.DataFrame:
+    """Per-observation percentile and Layer 2 trigger state for one signal."""
+    pct = rolling_percentile.cached_rolling_percentile(series, _WINDOW_YEARS).dropna()
+    momentum = pct.rolling(f'{_MOMENTUM_DAYS}D', closed='both').min() <= _MOMENTUM_FILTER_PCT
+    extreme = (pct >= _EXTREME_HIGH_PCT) | (pct <= _EXTREME_LOW_PCT)
+    # The live filter needs at least two observations of history
+    momentum.iloc[:1] = False
+    return pd.DataFrame({'pct': pct, 'layer2': extreme & momentum})
+
+
+def _asof(states: pd.DataFrame, days: pd.DatetimeIndex) -> tuple:
+    """Sample per-observation states as-of each day (NaN/False before the first)."""
+    pos = states.index.searchsorted(days, side='right') - 1
+    known = pos >= 0
+    pct = np.full(len(days), np.nan)
+    layer2 = np.zeros(len(days), dtype=bool)
+    pct[known] = states['pct'].to_numpy()[pos[known]]
+    layer2[known] = states['layer2'].to_numpy()[pos[known]]
+    return pct, layer2
+
+
+def replay_alert_layers(start, end, signal_configs: Optional[list] = None) -> dict:
+    """
+    Evaluate Layer 2 and Layer 3 as-of every day from ``start`` to ``end``.
+
+    Returns:
+        dict: {
+            'days': DatetimeIndex of replay days,
+            'labels': list of signal labels (matrix column order),
+            'percentiles': (days x signals) array of as-of percentiles,
+            'layer2': (days x signals) bool array of Layer 2 triggers,
+            'layer3_direction': per-day array of 'risk-off'/'risk-on'/'',
+            'alerts': list of {'date', 'layer', 'signals'} after cooldowns,
+            'timing': {'load_seconds', 'compute_seconds', 'days_replayed'},
+        }
+    """
+    if signal_configs is None:
+        signal_configs = list(_SIGNALS)
+
+    t0 = time.perf_counter()
+    loaded = []
+    for csv_name, col_name, label in signal_configs:
+        series = _load_signal(csv_name, col_name)
+        if series is not None and len(series) > 0:
+            loaded.append((label, series))
+    t1 = time.perf_counter()
+
+    days = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq='D')
+    labels = [label for label, _ in loaded]
+    percentiles = np.full((len(days), len(loaded)), np.nan)
+    layer2 = np.zeros((len(days), len(loaded)), dtype=bool)
+    for j, (_, series) in enumerate(loaded):
+        percentiles[:, j], layer2[:, j] = _asof(_signal_states(series), days)
+
+    high = percentiles > _STRESS_HIGH_PCT
+    low = percentiles < _STRESS_LOW_PCT
+    risk_off = high.sum(axis=1) >= _MIN_CONVERGENCE
+    risk_on = ~risk_off & (low.sum(axis=1) >= _MIN_CONVERGENCE)
+    direction = np.where(risk_off, 'risk-off', np.where(risk_on, 'risk-on', ''))
+
+    alerts = []
+    layer2_any = layer2.any(axis=1)
+    layer3_any = risk_off | risk_on
+    last_fired = {}
+    for i in np.flatnonzero(layer2_any | layer3_any):
+        day = days[i]
+        for layer, fired, members in (
+            ('layer3', layer3_any[i], high[i] if risk_off[i] else low[i]),
+            ('layer2', layer2_any[i], layer2[i]),
+        ):
+            if not fired:
+                continue
+            previous = last_fired.get(layer)
+            if previous is not None and (day - previous).days < _COOLDOWN_DAYS:
+                continue
+            alerts.append({
+                'date': day.strftime('%Y-%m-%d'),
+                'layer': layer,
+                'signals': [labels[j] for j in np.flatnonzero(members)],
+            })
+            last_fired[layer] = day
+    t2 = time.perf_counter()
+
+    return {
+        'days': days,
+        'labels': labels,
+        'percentiles': percentiles,
+        'layer2': layer2,
+        'layer3_direction': direction,
+        'alerts': alerts,
+        'timing': {
+            'load_seconds': round(t1 - t0, 4),
+            'compute_seconds': round(t2 - t1, 4),
+            'days_replayed': len(days),
+        },
+    }
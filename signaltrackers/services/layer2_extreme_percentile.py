@@ -30,6 +30,9 @@ from typing import Optional
 
 import pandas as pd
 
+import metric_store
+import rolling_percentile
+
 logger = logging.getLogger(__name__)
 
 DATA_DIR = Path("data")
@@ -53,16 +56,8 @@ _MIN_EPISODE_GAP_DAYS = 60  # deduplicate historical episodes
 
 def _load_signal(csv_name: str, col_name: str) -> Optional[pd.Series]:
     """Load a signal CSV and return a date-indexed Series, sorted ascending."""
-    filepath = DATA_DIR / csv_name
-    if not filepath.exists():
-        return None
     try:
-        df = pd.read_csv(filepath)
-        if "date" not in df.columns or col_name not in df.columns:
-            return None
-        df["date"] = pd.to_datetime(df["date"])
-        df = df.dropna(subset=["date", col_name]).sort_values("date")
-        return df.set_index("date")[col_name]
+        return metric_store.read_series(DATA_DIR / csv_name, col_name)
     except Exception as e:
         logger.warning("Failed to load signal %s: %s", csv_name, e)
         return None
@@ -77,21 +72,7 @@ def _calculate_percentile_10y(
     Returns a float 0–100, or None if series is None/empty.
     Falls back to full history when fewer than 10 years of data are available.
     """
-    if series is None or len(series) == 0:
-        return None
-    if len(series) == 1:
-        return 100.0 if current_value >= series.iloc[0] else 0.0
-
-    cutoff = pd.Timestamp.today() - pd.DateOffset(years=_WINDOW_YEARS)
-    try:
-        windowed = series[series.index >= cutoff]
-        if len(windowed) < 2:
-            windowed = series
-    except TypeError:
-        windowed = series
-
-    count_below = (windowed < current_value).sum()
-    return float(count_below / len(windowed) * 100)
+    return rolling_percentile.percentile_of(series, current_value, _WINDOW_YEARS)
 
 
 def _passes_momentum_filter(series: pd.Series) -> bool:
@@ -99,10 +80,10 @@ def _passes_momentum_filter(series: pd.Series) -> bool:
     Return True if the indicator was at or below the 70th-percentile threshold
     at any point within the last MOMENTUM_DAYS days.
 
-    For each value in the lookback window, we compute its percentile using the
-    full historical context available at that date (i.e. all data up to and
-    including that date, windowed to 10 years).  If any value in the window
-    has a percentile ≤ 70, the filter passes.
+    Each value in the lookback window is ranked against the 10 years of data
+    ending at its own date (the percentile as it read on that day). The ranks
+    come from the shared rolling-percentile engine, which computes the whole
+    series in one pass and caches it per data version.
 
     This approach correctly handles the boundary (day-90 inclusive) and
     avoids false positives from quantile interpolation artefacts.
@@ -113,19 +94,11 @@ def _passes_momentum_filter(series: pd.Series) -> bool:
     end_date = series.index[-1]
     lookback_start = end_date - timedelta(days=_MOMENTUM_DAYS)
 
-    window = series[
-        (series.index >= lookback_start) & (series.index <= end_date)
+    percentiles = rolling_percentile.cached_rolling_percentile(series, _WINDOW_YEARS)
+    window = percentiles[
+        (percentiles.index >= lookback_start) & (percentiles.index <= end_date)
     ]
-    if window.empty:
-        return False
-
-    for idx, val in window.items():
-        history_to_date = series[series.index <= idx]
-        pct = _calculate_percentile_10y(history_to_date, val)
-        if pct is not None and pct <= _MOMENTUM_FILTER_PCT:
-            return True
-
-    return False
+    return bool((window <= _MOMENTUM_FILTER_PCT).any())
 
 
 def _count_historical_occurrences_extreme(
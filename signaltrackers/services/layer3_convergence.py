@@ -13,16 +13,25 @@ Output payload:
         "signals_triggered": ["HY credit spreads", "VIX", "financial conditions index (NFCI)"],
         "context_sentence": "...",
         "timestamp": "2026-03-10T12:00:00",
-        "severity": "warning"
+        "severity": "warning",
+        "historical_episodes": [
+            {"date": "2020-03-16", "direction": "risk-off", "signals": [...]},
+        ]
     }
 """
 import logging
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
+import metric_store
+import rolling_percentile
+
 from services.layer2_extreme_percentile import (
     _SIGNALS,
     _MIN_EPISODE_GAP_DAYS,
@@ -36,67 +45,108 @@ logger = logging.getLogger(__name__)
 _STRESS_HIGH_PCT = 75.0  # >75th = risk-off
 _STRESS_LOW_PCT = 25.0   # <25th = risk-on
 _MIN_CONVERGENCE = 3     # minimum number of agreeing signals to fire
+_SCAN_STEP_DAYS = 30
+_EPISODE_CACHE_SIZE = 16
 
+# (store version, (label, series fingerprint)...) -> episode list
+_episode_cache: "OrderedDict[tuple, list]" = OrderedDict()
+_episode_lock = threading.Lock()
 
-def _count_historical_convergence_occurrences(signal_configs: list) -> int:
+
+def _scan_convergence_episodes(loaded: list) -> list:
     """
-    Count distinct historical months where 3+ tracked indicators were
-    simultaneously in the same stress direction (>75th or <25th pct).
+    Scan loaded (label, series) pairs for historical convergence episodes.
+
+    Every signal's rolling 10-year percentile series is sampled as-of each
+    30-day scan date into one (dates x signals) matrix; risk-off/risk-on
+    agreement is then a pair of boolean row reductions. Episodes within
+    MIN_EPISODE_GAP_DAYS of the previous one are folded into it.
+    """
+    scan_start = max(s.index[0] for _, s in loaded) + timedelta(days=60)
+    scan_end = min(s.index[-1] for _, s in loaded)
+    if scan_start >= scan_end:
+        return []
+
+    scan_dates = pd.date_range(scan_start, scan_end, freq=f'{_SCAN_STEP_DAYS}D')
+    columns = []
+    for _, series in loaded:
+        pct = rolling_percentile.cached_rolling_percentile(series, _WINDOW_YEARS).dropna()
+        pos = pct.index.searchsorted(scan_dates, side='right') - 1
+        column = np.full(len(scan_dates), np.nan)
+        column[pos >= 0] = pct.to_numpy()[pos[pos >= 0]]
+        columns.append(column)
+    matrix = np.column_stack(columns)
+
+    high = matrix > _STRESS_HIGH_PCT
+    low = matrix < _STRESS_LOW_PCT
+    risk_off = high.sum(axis=1) >= _MIN_CONVERGENCE
+    risk_on = low.sum(axis=1) >= _MIN_CONVERGENCE
+
+    labels = [label for label, _ in loaded]
+    episodes = []
+    last_episode_date = None
+    for i in np.flatnonzero(risk_off | risk_on):
+        scan_date = scan_dates[i]
+        if last_episode_date is not None and (scan_date - last_episode_date).days < _MIN_EPISODE_GAP_DAYS:
+            continue
+        agreeing = high[i] if risk_off[i] else low[i]
+        episodes.append({
+            "date": scan_date.strftime('%Y-%m-%d'),
+            "direction": "risk-off" if risk_off[i] else "risk-on",
+            "signals": [labels[j] for j in np.flatnonzero(agreeing)],
+        })
+        last_episode_date = scan_date
 
-    Uses monthly sampling for performance; deduplicates episodes within
-    MIN_EPISODE_GAP_DAYS of each other.
+    return episodes
 
-    Returns total episode count.
+
+def _historical_convergence_episodes(signal_configs: list) -> list:
+    """
+    Return the distinct historical months where 3+ tracked indicators were
+    simultaneously in the same stress direction (>75th or <25th pct).
+
+    Each episode is a dict with date (ISO), direction and the agreeing
+    signal labels. Results are memoized per metric-store version and signal
+    content, so repeated checks within a data refresh reuse one scan.
     """
     loaded = []
     for csv_name, col_name, label in signal_configs:
         s = _load_signal(csv_name, col_name)
-        if s is not None:
+        if s is not None and len(s) > 0:
             loaded.append((label, s))
 
     if len(loaded) < _MIN_CONVERGENCE:
-        return 0
-
-    # Determine scannable date range
-    scan_start = max(s.index[0] for _, s in loaded) + timedelta(days=60)
-    scan_end = min(s.index[-1] for _, s in loaded)
-
-    if scan_start >= scan_end:
-        return 0
-
-    count = 0
-    last_episode_date = None
-    scan_date = scan_start
+        return []
 
-    while scan_date <= scan_end:
-        risk_off = []
-        risk_on = []
+    key = (
+        metric_store.get_version(),
+        tuple((label, rolling_percentile.fingerprint(s)) for label, s in loaded),
+    )
+    with _episode_lock:
+        cached = _episode_cache.get(key)
+        if cached is not None:
+            _episode_cache.move_to_end(key)
+    if cached is None:
+        cached = _scan_convergence_episodes(loaded)
+        with _episode_lock:
+            _episode_cache[key] = cached
+            while len(_episode_cache) > _EPISODE_CACHE_SIZE:
+                _episode_cache.popitem(last=False)
 
-        for label, series in loaded:
-            sub = series[series.index <= scan_date]
-            if sub.empty:
-                continue
-            current_value = sub.iloc[-1]
-            pct = _calculate_percentile_10y(sub, current_value)
-            if pct is None:
-                continue
-            if pct > _STRESS_HIGH_PCT:
-                risk_off.append(label)
-            elif pct < _STRESS_LOW_PCT:
-                risk_on.append(label)
+    return [dict(e, signals=list(e["signals"])) for e in cached]
 
-        triggered = risk_off if len(risk_off) >= _MIN_CONVERGENCE else (
-            risk_on if len(risk_on) >= _MIN_CONVERGENCE else []
-        )
 
-        if triggered:
-            if last_episode_date is None or (scan_date - last_episode_date).days >= _MIN_EPISODE_GAP_DAYS:
-                count += 1
-                last_episode_date = scan_date
+def _count_historical_convergence_occurrences(signal_configs: list) -> int:
+    """
+    Count distinct historical months where 3+ tracked indicators were
+    simultaneously in the same stress direction (>75th or <25th pct).
 
-        scan_date += timedelta(days=30)
+    Uses monthly sampling; deduplicates episodes within MIN_EPISODE_GAP_DAYS
+    of each other. See _historical_convergence_episodes for the dates.
 
-    return count
+    Returns total episode count.
+    """
+    return len(_historical_convergence_episodes(signal_configs))
 
 
 def _build_context_sentence(signals: list, direction: str, occurrences: int) -> str:
@@ -127,7 +177,8 @@ def check_convergence(signal_configs: Optional[list] = None) -> Optional[dict]:
         signal_configs: list of (csv_name, col_name, label) tuples.
                         Defaults to the standard 5 Layer 2/3 indicators.
 
-    Payload keys: layer, signals_triggered, context_sentence, timestamp, severity
+    Payload keys: layer, signals_triggered, context_sentence, timestamp, severity,
+    historical_episodes
     """
     if signal_configs is None:
         signal_configs = list(_SIGNALS)
@@ -160,8 +211,8 @@ def check_convergence(signal_configs: Optional[list] = None) -> Optional[dict]:
     else:
         return None
 
-    occurrences = _count_historical_convergence_occurrences(signal_configs)
-    context_sentence = _build_context_sentence(triggered, direction, occurrences)
+    episodes = _historical_convergence_episodes(signal_configs)
+    context_sentence = _build_context_sentence(triggered, direction, len(episodes))
 
     return {
         "layer": "Multi-Signal Convergence",
@@ -169,4 +220,5 @@ def check_convergence(signal_configs: Optional[list] = None) -> Optional[dict]:
         "context_sentence": context_sentence,
         "timestamp": datetime.utcnow().isoformat(),
         "severity": "warning",
+        "historical_episodes": episodes,
     }
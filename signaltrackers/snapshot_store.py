@@ -0,0 +1,171 @@
+"""
+Precomputed JSON snapshots of dashboard API payloads.
+
+The dashboard's data only changes when the daily refresh runs, yet the
+dashboard and chart endpoints used to rebuild their payloads from full CSV
+history on every hit. The refresh now materializes each payload once as a
+serialized JSON blob with an ETag; routes serve the bytes directly and
+answer conditional GETs with 304.
+
+Snapshots are stored in memory and under <data dir>/.snapshots/ so a
+restarted worker can reuse them. Each one records a fingerprint of the data
+directory (file count, total size, newest mtime) and is rebuilt on demand
+when the fingerprint no longer matches, so out-of-band collector runs are
+picked up too. The fingerprint is rechecked at most every FINGERPRINT_TTL
+seconds.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple, Optional
+
+FINGERPRINT_TTL = 60  # seconds between data directory re-scans
+
+_DATA_SUFFIXES = ('.csv', '.parquet')
+
+
+class Snapshot(NamedTuple):
+    body: bytes
+    etag: str
+    fingerprint: str
+    built_at: float
+
+
+def data_fingerprint(data_dir, suffixes: tuple = _DATA_SUFFIXES) -> str:
+    """Cheap change detector for a data directory (one scandir, no reads)."""
+    count = total = newest = 0
+    try:
+        with os.scandir(data_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(suffixes) and entry.is_file():
+                    st = entry.stat()
+                    count += 1
+                    total += st.st_size
+                    newest = max(newest, st.st_mtime_ns)
+    except OSError:
+        pass
+    return f"{count}-{total}-{newest}"
+
+
+class SnapshotStore:
+    """Named, serialized payloads keyed to the state of a data directory.
+
+    ``data_dir`` is a callable so callers that repoint their data directory
+    (tests, alternate deployments) are followed automatically. ``dumps``
+    serializes a payload to str (or bytes, for binary formats); pass the
+    app's JSON provider to get the same bytes as jsonify. ``suffix`` names
+    the on-disk files so stores with different formats can share a
+    directory.
+    """
+
+    def __init__(self, data_dir: Callable[[], Path], dumps: Callable = json.dumps,
+                 suffix: str = '.json'):
+        self._data_dir = data_dir
+        self._dumps = dumps
+        self._suffix = suffix
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._fingerprint: Optional[tuple] = None  # (data_dir, fingerprint, checked_at)
+
+    def _dir(self) -> Path:
+        return Path(self._data_dir()) / '.snapshots'
+
+    def fingerprint(self) -> str:
+        data_dir = str(self._data_dir())
+        cached = self._fingerprint
+        now = time.monotonic()
+        if cached and cached[0] == data_dir and now - cached[2] < FINGERPRINT_TTL:
+            return cached[1]
+        fp = data_fingerprint(data_dir)
+        self._fingerprint = (data_dir, fp, now)
+        return fp
+
+    def invalidate(self) -> None:
+        """Forget in-memory snapshots and force a data directory re-scan."""
+        with self._lock:
+            self._snapshots.clear()
+            self._fingerprint = None
+
+    def get(self, name: str, builder: Callable[[], Optional[object]]) -> Optional[Snapshot]:
+        """Return the current snapshot for ``name``, building it if stale.
+
+        ``builder`` returns the payload, or None when there is nothing to
+        serve (the None result is not cached).
+        """
+        fp = self.fingerprint()
+        with self._lock:
+            snap = self._snapshots.get(name)
+        if snap is not None and snap.fingerprint == fp:
+            return snap
+
+        snap = self._load(name, fp)
+        if snap is None:
+            payload = builder()
+            if payload is None:
+                return None
+            snap = self.put(name, payload, fp)
+        with self._lock:
+            self._snapshots[name] = snap
+        return snap
+
+    def put(self, name: str, payload, fingerprint: Optional[str] = None) -> Snapshot:
+        """Serialize and store a payload, in memory and on disk."""
+        fp = fingerprint or self.fingerprint()
+        body = self._dumps(payload)
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        snap = Snapshot(body, hashlib.sha1(body).hexdigest()[:20], fp, time.time())
+        with self._lock:
+            self._snapshots[name] = snap
+        self._save(name, snap)
+        return snap
+
+    def rebuild(self, builders: Dict[str, Callable[[], Optional[object]]]) -> Dict[str, bool]:
+        """Rebuild every named snapshot now; failures are logged, not raised."""
+        self.invalidate()
+        fp = self.fingerprint()
+        built = {}
+        for name, builder in builders.items():
+            try:
+                payload = builder()
+                if payload is not None:
+                    self.put(name, payload, fp)
+                built[name] = payload is not None
+            except Exception as e:
+                print(f"Snapshot {name} failed: {e}")
+                built[name] = False
+        return built
+
+    # -- Disk persistence ----------------------------------------------------
+
+    def _path(self, name: str) -> Path:
+        return self._dir() / f'{name}{self._suffix}'
+
+    def _save(self, name: str, snap: Snapshot) -> None:
+        try:
+            directory = self._dir()
+            directory.mkdir(parents=True, exist_ok=True)
+            meta = json.dumps({'etag': snap.etag, 'fingerprint': snap.fingerprint,
+                               'built_at': snap.built_at}).encode('utf-8')
+            path = self._path(name)
+            tmp = path.with_name(path.name + '.tmp')
+            with open(tmp, 'wb') as f:
+                f.write(meta + b'\n' + snap.body)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Could not persist snapshot {name}: {e}")
+
+    def _load(self, name: str, fingerprint: str) -> Optional[Snapshot]:
+        try:
+            with open(self._path(name), 'rb') as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get('fingerprint') != fingerprint:
+            return None
+        return Snapshot(body, meta['etag'], fingerprint, meta.get('built_at', 0.0))
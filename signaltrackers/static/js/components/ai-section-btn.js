@@ -74,7 +74,8 @@ let _sectionOpeningInFlight = false;
 
 /**
  * Open the chatbot pre-loaded with an AI-generated section explanation.
- * US-258.5: Fires a real AI call via /api/chatbot/section-opening.
+ * US-258.5: Fires a real AI call via /api/chatbot/section-opening (streamed
+ * over Server-Sent Events when the browser supports it).
  * Falls back to static ctx.opening text if the API call fails.
  *
  * @param {string} sectionId - Key from AI_SECTION_CONTEXTS
@@ -114,34 +115,49 @@ async function openChatbotWithSection(sectionId) {
     // Show typing indicator immediately so the panel is not blank during the API call
     setTimeout(() => widget.showTypingIndicator(), 150);
 
+    // Streamed tokens render into a temporary bubble that the final opening replaces
+    let streamEl = null;
     try {
         const csrfToken = document.querySelector('meta[name="csrf-token"]')?.content || '';
-        const resp = await fetch('/api/chatbot/section-opening', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-                'X-CSRFToken': csrfToken,
-            },
-            body: JSON.stringify({ section_id: sectionId }),
-        });
-
-        widget.hideTypingIndicator();
+        const canStream = window.ReadableStream && window.TextDecoder;
+        const resp = await fetch(
+            canStream ? '/api/chatbot/section-opening/stream' : '/api/chatbot/section-opening',
+            {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': csrfToken,
+                },
+                body: JSON.stringify({ section_id: sectionId }),
+            }
+        );
 
         if (resp.status === 429) {
             // Rate limited — show inline message with signup CTA
+            widget.hideTypingIndicator();
             const errData = await resp.json();
             widget.showRateLimitError(errData.message, errData.signup_url || null, errData.signup_label || null);
         } else if (!resp.ok) {
             // API error — fall back to static opening
+            widget.hideTypingIndicator();
             widget.addSectionOpeningMessage(ctx.opening);
         } else {
-            const data = await resp.json();
-            const aiText = data.response || ctx.opening;
-            widget.addSectionOpeningMessage(aiText);
+            let aiText;
+            if ((resp.headers.get('Content-Type') || '').startsWith('text/event-stream')) {
+                aiText = await widget.readEventStream(resp, (partial) => {
+                    streamEl = widget.renderStreamingMessage(streamEl, partial);
+                });
+            } else {
+                aiText = (await resp.json()).response;
+            }
+            widget.hideTypingIndicator();
+            if (streamEl) streamEl.remove();
+            widget.addSectionOpeningMessage(aiText || ctx.opening);
         }
     } catch (_err) {
-        // Network error — fall back to static opening
+        // Network or stream error — fall back to static opening
         widget.hideTypingIndicator();
+        if (streamEl) streamEl.remove();
         widget.addSectionOpeningMessage(ctx.opening);
     } finally {
         _sectionOpeningInFlight = false;
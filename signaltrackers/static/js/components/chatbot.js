@@ -214,10 +214,18 @@ class ChatbotWidget {
             this.form.querySelector('.chatbot-submit').disabled = true;
         }
 
+        // Tokens stream into a message bubble as they arrive
+        let streamEl = null;
         try {
-            const response = await this.fetchAIResponse(message);
+            const response = await this.fetchAIResponse(message, (partial) => {
+                streamEl = this.renderStreamingMessage(streamEl, partial);
+            });
             this.hideTypingIndicator();
-            this.addMessage('ai', response);
+            if (streamEl) {
+                this.finishStreamingMessage(streamEl, response);
+            } else {
+                this.addMessage('ai', response);
+            }
             this.conversation.push({ role: 'ai', content: response });
 
             // If not expanded (closed), show badge on FAB
@@ -229,6 +237,7 @@ class ChatbotWidget {
 
         } catch (error) {
             this.hideTypingIndicator();
+            if (streamEl) streamEl.remove();
             if (error.message === 'AI_UNAVAILABLE') {
                 this.showError('AI Temporarily Unavailable. Please try again later.', false, '🤖');
             } else if (error.message === 'RATE_LIMITED') {
@@ -244,24 +253,31 @@ class ChatbotWidget {
         }
     }
 
-    async fetchAIResponse(message) {
-        const response = await fetch('/api/chatbot', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-                'X-CSRFToken': document.querySelector('meta[name="csrf-token"]')?.content || ''
-            },
-            body: JSON.stringify({
-                message,
-                conversation: this.conversation,
-                context: {
-                    page: window.location.pathname,
-                    section: this.activeSectionId || null,
-                    section_name: this.activeSectionName || null
-                }
-            })
+    async fetchAIResponse(message, onUpdate) {
+        const headers = {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': document.querySelector('meta[name="csrf-token"]')?.content || ''
+        };
+        const body = JSON.stringify({
+            message,
+            conversation: this.conversation,
+            context: {
+                page: window.location.pathname,
+                section: this.activeSectionId || null,
+                section_name: this.activeSectionName || null
+            }
         });
 
+        // Prefer the streaming endpoint; fall back to the blocking one when
+        // the browser cannot read response streams or the route is missing.
+        let response = null;
+        if (onUpdate && window.ReadableStream && window.TextDecoder) {
+            response = await fetch('/api/chatbot/stream', { method: 'POST', headers, body });
+        }
+        if (!response || response.status === 404) {
+            response = await fetch('/api/chatbot', { method: 'POST', headers, body });
+        }
+
         if (response.status === 503) throw new Error('AI_UNAVAILABLE');
         if (response.status === 429) {
             const data = await response.json();
@@ -274,10 +290,111 @@ class ChatbotWidget {
         }
         if (!response.ok) throw new Error('AI_REQUEST_FAILED');
 
+        if ((response.headers.get('Content-Type') || '').startsWith('text/event-stream')) {
+            return this.readEventStream(response, onUpdate);
+        }
         const data = await response.json();
         return data.response;
     }
 
+    /**
+     * Consume a Server-Sent Events response from a streaming chatbot endpoint.
+     * Calls onUpdate with the accumulated text of the current segment; a tool
+     * round resets it, since the answer that follows replaces any preamble.
+     * Resolves with the final response text from the 'done' event.
+     * @param {Response} response - fetch() response with an event-stream body
+     * @param {Function} [onUpdate] - Receives the partial response text
+     */
+    async readEventStream(response, onUpdate) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let text = '';
+
+        for (;;) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const frame = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                let event = 'message';
+                let data = '';
+                frame.split('\n').forEach(line => {
+                    if (line.startsWith('event:')) event = line.slice(6).trim();
+                    else if (line.startsWith('data:')) data += line.slice(5).trim();
+                });
+                const payload = data ? JSON.parse(data) : {};
+
+                if (event === 'token') {
+                    text += payload.text;
+                    if (onUpdate) onUpdate(text);
+                } else if (event === 'tool') {
+                    text = '';
+                    if (onUpdate) onUpdate(text);
+                } else if (event === 'done') {
+                    return payload.response;
+                } else if (event === 'error') {
+                    throw new Error('AI_UNAVAILABLE');
+                }
+            }
+        }
+        throw new Error('AI_REQUEST_FAILED');
+    }
+
+    /**
+     * Render partial streamed text into an AI message bubble.
+     * Empty text (a tool round in progress) removes the bubble and shows the
+     * typing indicator again.
+     * @param {HTMLElement|null} messageEl - Bubble from a previous call, if any
+     * @param {string} text - Accumulated partial response
+     * @returns {HTMLElement|null} The bubble to pass to the next call
+     */
+    renderStreamingMessage(messageEl, text) {
+        if (!text) {
+            if (messageEl) messageEl.remove();
+            this.showTypingIndicator();
+            return null;
+        }
+
+        this.hideTypingIndicator();
+        if (!messageEl) {
+            const emptyState = this.messages.querySelector('.chatbot-empty-state');
+            if (emptyState) emptyState.style.display = 'none';
+
+            messageEl = document.createElement('div');
+            messageEl.className = 'chatbot-message chatbot-message--ai chatbot-message--streaming';
+            messageEl.innerHTML = `
+                <span class="chatbot-message-icon" aria-hidden="true">🤖</span>
+                <span class="chatbot-message-label sr-only">AI said:</span>
+                <div class="chatbot-message-text"></div>
+            `;
+            this.messages.appendChild(messageEl);
+        }
+
+        messageEl.querySelector('.chatbot-message-text').innerHTML = (typeof marked !== 'undefined')
+            ? marked.parse(text)
+            : this.escapeHTML(text);
+        this.scrollToBottom();
+        return messageEl;
+    }
+
+    /**
+     * Replace a streamed bubble's content with the final (filtered) response
+     * and announce it once, as addMessage does for non-streamed replies.
+     */
+    finishStreamingMessage(messageEl, text) {
+        messageEl.classList.remove('chatbot-message--streaming');
+        messageEl.querySelector('.chatbot-message-text').innerHTML = (typeof marked !== 'undefined')
+            ? marked.parse(text)
+            : this.escapeHTML(text);
+        this.scrollToBottom();
+        this.announce(`AI says: ${text}`);
+    }
+
     addMessage(role, text) {
         // Hide empty state once messages appear
         const emptyState = this.messages.querySelector('.chatbot-empty-state');
@@ -50,6 +50,69 @@ async function loadChart(chartId, endpoint, chartConfig) {
     }
 }
 
+// Load several metric series in one request (see /api/metrics/batch).
+// Resolves to an object keyed by metric id; metrics without data map to
+// { error } just like a 404 from /api/metrics/<metric_name>.
+async function fetchMetricBatch(ids, params = {}) {
+    const query = new URLSearchParams({ ids: ids.join(','), ...params });
+    const response = await fetch(`/api/metrics/batch?${query}`);
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    const data = await response.json();
+    return data.metrics;
+}
+
+// Decode a ?format=binary series response (layout documented in
+// series_wire.py). Returns the payload object with each array as a
+// Float64Array; date axes come back as epoch milliseconds.
+const SERIES_WIRE_MAGIC = 'STW1';
+const MS_PER_DAY = 86400000;
+const HOST_IS_LITTLE_ENDIAN = new Uint8Array(new Uint16Array([1]).buffer)[0] === 1;
+
+function decodeSeriesWire(buffer) {
+    const view = new DataView(buffer);
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    if (magic !== SERIES_WIRE_MAGIC) {
+        throw new Error('Unexpected series payload');
+    }
+    const headerLength = view.getUint32(4, true);
+    const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength)));
+    const base = 8 + headerLength;
+
+    const payload = header.meta;
+    for (const spec of header.arrays) {
+        const offset = base + spec.offset;
+        const array = new Float64Array(spec.length);
+        if (spec.type === 'days') {
+            for (let i = 0; i < spec.length; i++) {
+                array[i] = view.getInt32(offset + i * 4, true) * MS_PER_DAY;
+            }
+        } else if (HOST_IS_LITTLE_ENDIAN) {
+            array.set(new Float64Array(buffer, offset, spec.length));
+        } else {
+            for (let i = 0; i < spec.length; i++) {
+                array[i] = view.getFloat64(offset + i * 8, true);
+            }
+        }
+        let target = payload;
+        for (const key of spec.path.slice(0, -1)) {
+            target = target[key];
+        }
+        target[spec.path[spec.path.length - 1]] = array;
+    }
+    return payload;
+}
+
+// Fetch a chart/metric endpoint in the binary format and decode it
+async function fetchSeriesWire(url) {
+    const response = await fetch(url);
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    return decodeSeriesWire(await response.arrayBuffer());
+}
+
 // Common chart options
 const commonChartOptions = {
     responsive: true,
@@ -110,6 +173,9 @@ window.DashboardUtils = {
     formatCurrency,
     formatPercentage,
     loadChart,
+    fetchMetricBatch,
+    decodeSeriesWire,
+    fetchSeriesWire,
     commonChartOptions
 };
 
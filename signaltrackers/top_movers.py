@@ -0,0 +1,255 @@
+"""
+Top-movers engine: which metrics moved most unusually over 1, 5 and 20 days.
+
+A move's z-score is its latest N-observation change measured against the mean
+and standard deviation of the N-observation changes in a rolling window of
+max(30, 12 * N) observations ending with (and including) the latest change.
+Every configured metric is loaded once into a single observation-aligned
+matrix: column j holds metric j's last observations ending at its latest
+value on or before ``as_of``. All metrics and periods are then scored in one
+vectorized pass. Rows are aligned by observation rather
+than calendar date because the metrics mix daily, weekly and monthly series
+and a change is measured in each series' own observations.
+
+Results are cached per metric-store version, file stamps and as-of date, so
+repeated callers (dashboard, chatbot context, refresh job) share one
+computation, and history/backtest code can ask for any past date.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    import metric_store
+except ImportError:
+    from signaltrackers import metric_store
+
+PERIODS = (1, 5, 20)
+FRESHNESS_DAYS = 5      # metrics not updated within this many days are skipped
+MIN_ROWS = 60           # minimum history for a metric to be scored
+_CACHE_SIZE = 32
+
+# Display configuration per metric: 'abs' changes are scaled by 'multiplier',
+# 'pct' changes are percent changes.
+TOP_MOVER_METRICS = {
+    # Spreads - use absolute bp change
+    'high_yield_spread': {'display': 'abs', 'unit': 'bp', 'name': 'HY Spread', 'link': '/explorer?metric=high_yield_spread', 'multiplier': 100},
+    'investment_grade_spread': {'display': 'abs', 'unit': 'bp', 'name': 'IG Spread', 'link': '/explorer?metric=investment_grade_spread', 'multiplier': 100},
+    'ccc_spread': {'display': 'abs', 'unit': 'bp', 'name': 'CCC Spread', 'link': '/explorer?metric=ccc_spread', 'multiplier': 100},
+
+    # Prices - use % change
+    'gold_price': {'display': 'pct', 'unit': '%', 'name': 'Gold', 'link': '/explorer?metric=gold_price'},
+    'silver_price': {'display': 'pct', 'unit': '%', 'name': 'Silver', 'link': '/explorer?metric=silver_price'},
+    'bitcoin_price': {'display': 'pct', 'unit': '%', 'name': 'Bitcoin', 'link': '/explorer?metric=bitcoin_price'},
+    'sp500_price': {'display': 'pct', 'unit': '%', 'name': 'S&P 500', 'link': '/explorer?metric=sp500_price'},
+    'nasdaq_price': {'display': 'pct', 'unit': '%', 'name': 'Nasdaq', 'link': '/explorer?metric=nasdaq_price'},
+    'vix_price': {'display': 'pct', 'unit': '%', 'name': 'VIX', 'link': '/explorer?metric=vix_price'},
+    'oil_price': {'display': 'pct', 'unit': '%', 'name': 'Oil', 'link': '/explorer?metric=oil_price'},
+    'commodities_price': {'display': 'pct', 'unit': '%', 'name': 'Commodities', 'link': '/explorer?metric=commodities_price'},
+    'gold_miners_price': {'display': 'pct', 'unit': '%', 'name': 'Gold Miners', 'link': '/explorer?metric=gold_miners_price'},
+    'small_cap_price': {'display': 'pct', 'unit': '%', 'name': 'Small Caps', 'link': '/explorer?metric=small_cap_price'},
+    'tech_sector_price': {'display': 'pct', 'unit': '%', 'name': 'Tech Sector', 'link': '/explorer?metric=tech_sector_price'},
+    'semiconductor_price': {'display': 'pct', 'unit': '%', 'name': 'Semiconductors', 'link': '/explorer?metric=semiconductor_price'},
+    'financials_sector_price': {'display': 'pct', 'unit': '%', 'name': 'Financials', 'link': '/explorer?metric=financials_sector_price'},
+    'energy_sector_price': {'display': 'pct', 'unit': '%', 'name': 'Energy', 'link': '/explorer?metric=energy_sector_price'},
+    'treasury_20yr_price': {'display': 'pct', 'unit': '%', 'name': 'Treasury 20Y', 'link': '/explorer?metric=treasury_20yr_price'},
+    'dollar_index_price': {'display': 'pct', 'unit': '%', 'name': 'Dollar Index', 'link': '/explorer?metric=dollar_index_price'},
+    'usdjpy_price': {'display': 'pct', 'unit': '%', 'name': 'USD/JPY', 'link': '/explorer?metric=usdjpy_price'},
+
+    # Ratios - use % change
+    'gold_silver_ratio': {'display': 'pct', 'unit': '%', 'name': 'Gold/Silver Ratio', 'link': '/explorer?metric=gold_silver_ratio'},
+    'smh_spy_ratio': {'display': 'pct', 'unit': '%', 'name': 'Semiconductor/SPY', 'link': '/explorer?metric=smh_spy_ratio'},
+    'xlk_spy_ratio': {'display': 'pct', 'unit': '%', 'name': 'Tech/SPY', 'link': '/explorer?metric=xlk_spy_ratio'},
+    'growth_value_ratio': {'display': 'pct', 'unit': '%', 'name': 'Growth/Value', 'link': '/explorer?metric=growth_value_ratio'},
+    'iwm_spy_ratio': {'display': 'pct', 'unit': '%', 'name': 'Small/Large Cap', 'link': '/explorer?metric=iwm_spy_ratio'},
+    'market_breadth_ratio': {'display': 'pct', 'unit': '%', 'name': 'Market Breadth', 'link': '/explorer?metric=market_breadth_ratio'},
+
+    # Yields - use absolute change
+    'japan_10y_yield': {'display': 'abs', 'unit': '%', 'name': 'Japan 10Y Yield', 'link': '/explorer?metric=japan_10y_yield', 'multiplier': 1},
+    'real_yield_proxy': {'display': 'pct', 'unit': '%', 'name': 'Real Yield Proxy', 'link': '/explorer?metric=real_yield_proxy'},
+    'treasury_10y': {'display': 'abs', 'unit': '%', 'name': '10Y Treasury', 'link': '/explorer?metric=treasury_10y', 'multiplier': 1},
+
+    # ETF spreads
+    'hyg_treasury_spread': {'display': 'pct', 'unit': '%', 'name': 'HYG-Treasury Spread', 'link': '/explorer?metric=hyg_treasury_spread'},
+    'lqd_treasury_spread': {'display': 'pct', 'unit': '%', 'name': 'LQD-Treasury Spread', 'link': '/explorer?metric=lqd_treasury_spread'},
+
+    # Economic Indicators - use % change
+    'consumer_confidence': {'display': 'pct', 'unit': '%', 'name': 'Consumer Confidence', 'link': '/explorer?metric=consumer_confidence'},
+    'm2_money_supply': {'display': 'pct', 'unit': '%', 'name': 'M2 Money Supply', 'link': '/explorer?metric=m2_money_supply'},
+    'cpi': {'display': 'pct', 'unit': '%', 'name': 'CPI (Inflation)', 'link': '/explorer?metric=cpi'},
+
+    # Yield Curve - use absolute change (spread in %)
+    'yield_curve_10y2y': {'display': 'abs', 'unit': '%', 'name': '10Y-2Y Yield Curve', 'link': '/explorer?metric=yield_curve_10y2y', 'multiplier': 1},
+    'yield_curve_10y3m': {'display': 'abs', 'unit': '%', 'name': '10Y-3M Yield Curve', 'link': '/explorer?metric=yield_curve_10y3m', 'multiplier': 1},
+
+    # Labor Market - use % change
+    'initial_claims': {'display': 'pct', 'unit': '%', 'name': 'Initial Claims', 'link': '/explorer?metric=initial_claims'},
+    'continuing_claims': {'display': 'pct', 'unit': '%', 'name': 'Continuing Claims', 'link': '/explorer?metric=continuing_claims'},
+
+    # Fed Liquidity & Financial Conditions - use % change
+    'fed_balance_sheet': {'display': 'pct', 'unit': '%', 'name': 'Fed Balance Sheet', 'link': '/explorer?metric=fed_balance_sheet'},
+    'reverse_repo': {'display': 'pct', 'unit': '%', 'name': 'Reverse Repo', 'link': '/explorer?metric=reverse_repo'},
+    'nfci': {'display': 'abs', 'unit': 'index', 'name': 'NFCI', 'link': '/explorer?metric=nfci', 'multiplier': 1},
+
+    # Crypto Sentiment
+    'fear_greed_index': {'display': 'abs', 'unit': 'pts', 'name': 'Crypto Fear/Greed', 'link': '/explorer?metric=fear_greed_index', 'multiplier': 1},
+    'btc_gold_ratio': {'display': 'pct', 'unit': '%', 'name': 'BTC/Gold Ratio', 'link': '/explorer?metric=btc_gold_ratio'},
+
+    # Real Yields & Inflation (Gold Drivers)
+    'real_yield_10y': {'display': 'abs', 'unit': '%', 'name': '10Y Real Yield', 'link': '/explorer?metric=real_yield_10y', 'multiplier': 1},
+    'breakeven_inflation_10y': {'display': 'abs', 'unit': '%', 'name': '10Y Breakeven', 'link': '/explorer?metric=breakeven_inflation_10y', 'multiplier': 1},
+    'gdx_gld_ratio': {'display': 'pct', 'unit': '%', 'name': 'GDX/GLD Ratio', 'link': '/explorer?metric=gdx_gld_ratio'},
+}
+
+
+def rolling_window(period: int) -> int:
+    """Rolling window (in observations) used to normalize a ``period`` change."""
+    return max(30, period * 12)
+
+
+class TopMoversEngine:
+    """Scores every configured metric for several change periods at once."""
+
+    def __init__(self, data_dir: Callable[[], Path], metrics: Dict[str, dict] = None,
+                 periods: Sequence[int] = PERIODS):
+        self._data_dir = data_dir
+        self.metrics = metrics if metrics is not None else TOP_MOVER_METRICS
+        self.periods = tuple(periods)
+        self._cache: "OrderedDict[tuple, Dict[int, List[dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def top(self, num_movers: int = 5, period: int = 5, as_of=None) -> List[dict]:
+        """Return the ``num_movers`` largest absolute z-scores for ``period``."""
+        movers = self.compute(as_of, extra_periods=(period,))[period]
+        return [dict(m) for m in movers[:num_movers]]
+
+    def compute(self, as_of=None, extra_periods: Sequence[int] = ()) -> Dict[int, List[dict]]:
+        """Return period -> movers sorted by absolute z-score (cached)."""
+        data_dir = Path(self._data_dir())
+        as_of = pd.Timestamp(as_of) if as_of is not None else None
+        periods = tuple(sorted(set(self.periods) | set(extra_periods)))
+        files = [data_dir / f'{name}.csv' for name in self.metrics]
+        files += [data_dir / 'gold_price.csv', data_dir / 'high_yield_spread.csv']
+        key = (
+            metric_store.get_version(), str(data_dir), tuple(_stamp(f) for f in files),
+            as_of, pd.Timestamp.now().normalize() if as_of is None else None, periods,
+        )
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        result = self._compute(data_dir, as_of, periods)
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > _CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return result
+
+    def _load(self, data_dir: Path, name: str, as_of) -> Optional[pd.DataFrame]:
+        df = metric_store.read_frame(data_dir / f'{name}.csv')
+        if df is None:
+            return None
+        if as_of is not None:
+            df = df[df['date'] <= as_of]
+        return df
+
+    def _compute(self, data_dir: Path, as_of, periods: Sequence[int]) -> Dict[int, List[dict]]:
+        now = as_of if as_of is not None else pd.Timestamp.now()
+        depth = max(rolling_window(p) + p for p in periods)
+
+        columns = []   # (name, config, values, length)
+        for name, config in self.metrics.items():
+            df = self._load(data_dir, name, as_of)
+            if df is None or len(df) < MIN_ROWS:
+                continue
+            if (now - pd.Timestamp(df['date'].iloc[-1])).days > FRESHNESS_DAYS:
+                continue
+            values = df[df.columns[1]].to_numpy(dtype='float64')
+            columns.append((name, config, values, len(values)))
+
+        # Divergence gap: implied HY spread from gold minus actual HY spread
+        gold_df = self._load(data_dir, 'gold_price', as_of)
+        hy_df = self._load(data_dir, 'high_yield_spread', as_of)
+        if gold_df is not None and hy_df is not None and len(gold_df) > 65 and len(hy_df) > 65:
+            merged = pd.merge(gold_df, hy_df, on='date', suffixes=('_gold', '_hy'))
+            gold_implied = (((merged[merged.columns[1]] * 10) / 2000) ** 1.5) * 400
+            gap = (gold_implied - merged[merged.columns[2]] * 100).to_numpy(dtype='float64')
+            # Needs one row more than other metrics (strict > in the original rule)
+            columns.append(('divergence_gap', _DIVERGENCE_CONFIG, gap, len(gap) - 1))
+
+        if not columns:
+            return {p: [] for p in periods}
+
+        # Observation-aligned matrix: last `depth` values of each metric, NaN-padded on top
+        matrix = np.full((depth, len(columns)), np.nan)
+        for j, (_, _, values, _) in enumerate(columns):
+            tail = values[-depth:]
+            matrix[depth - len(tail):, j] = tail
+
+        lengths = np.array([c[3] for c in columns])
+        is_pct = np.array([c[1]['display'] == 'pct' for c in columns])
+        multiplier = np.array([c[1].get('multiplier', 1) for c in columns], dtype='float64')
+        current_values = matrix[-1]
+
+        results = {}
+        for period in periods:
+            window = rolling_window(period)
+            previous = matrix[:-period]
+            latest = matrix[period:]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                changes = np.where(is_pct, (latest / previous - 1) * 100,
+                                   (latest - previous) * multiplier)
+                block = changes[-window:]
+                mean = block.mean(axis=0)
+                std = block.std(axis=0, ddof=1)
+                current = changes[-1]
+                z = (current - mean) / std
+
+            valid = ((lengths >= window + period + 5) & ~np.isnan(current) & ~np.isnan(std)
+                     & (std != 0) & ~np.isnan(current_values))
+            movers = [
+                _mover(columns[j][0], columns[j][1], period, current[j], z[j], current_values[j])
+                for j in np.flatnonzero(valid)
+            ]
+            movers.sort(key=lambda m: abs(m['z_score']), reverse=True)
+            results[period] = movers
+        return results
+
+
+_DIVERGENCE_CONFIG = {'display': 'abs', 'unit': 'bp', 'name': 'Divergence Gap',
+                      'link': '/explorer?metric=divergence_gap', 'multiplier': 1}
+
+
+def _mover(name: str, config: dict, period: int, change: float, z: float, value: float) -> dict:
+    if name == 'divergence_gap':
+        change_val = int(round(float(change), 0))
+        current_value = int(round(float(value), 0))
+    else:
+        change_val = round(float(change), 2)
+        current_value = round(float(value) * config.get('multiplier', 1), 2)
+    return {
+        'metric': name,
+        'name': config['name'],
+        'link': config['link'],
+        'change': change_val,
+        f'change_{period}d': change_val,
+        'z_score': round(float(z), 2),
+        'unit': config['unit'],
+        'display_type': config['display'],
+        'current_value': current_value,
+    }
+
+
+def _stamp(path: Path) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
@@ -0,0 +1,185 @@
+"""
+Tests for cycle-level alert evaluation (AlertCycle in alert_detection_service).
+
+Covers:
+  - Layer 2/3 payloads and latest metrics computed once per check run,
+    regardless of how many users are fanned out to
+  - Payloads not computed at all when no user needs them
+  - Recent-trigger and weekly-count checks answered from batched history
+  - check_all_users_alerts issues a constant number of history queries
+  - Single-user checks without a cycle keep the per-user behaviour
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "signaltrackers"))
+
+flask_login = pytest.importorskip("flask_login")
+
+from dashboard import app  # noqa: E402
+from extensions import db  # noqa: E402
+from models import Alert, AlertPreference, User  # noqa: E402
+from services import alert_detection_service as ads  # noqa: E402
+
+
+L2_PAYLOAD = [{
+    'signals_triggered': ['high_yield_spread'],
+    'context_sentence': 'HY spreads at the 97th percentile.',
+    'current_percentile': 97.0,
+}]
+L3_PAYLOAD = {
+    'signals_triggered': ['a', 'b', 'c'],
+    'context_sentence': 'Three signals converge.',
+    'historical_analog_count': 4,
+}
+
+
+@pytest.fixture
+def test_app():
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _make_user(n, **prefs):
+    user = User(username=f'cycle{n}', email=f'cycle{n}@example.com')
+    user.set_password('TestPass123!')
+    db.session.add(user)
+    db.session.flush()
+    db.session.add(AlertPreference(user_id=user.id, **{'alerts_enabled': True, **prefs}))
+    db.session.commit()
+    return user
+
+
+def _add_alert(user, alert_type, hours_ago):
+    db.session.add(Alert(
+        user_id=user.id, alert_type=alert_type, title='t',
+        triggered_at=datetime.utcnow() - timedelta(hours=hours_ago),
+    ))
+    db.session.commit()
+
+
+@pytest.fixture
+def layer_checks():
+    with patch('services.layer2_extreme_percentile.check_extreme_percentile',
+               return_value=L2_PAYLOAD) as l2, \
+            patch('services.layer3_convergence.check_convergence',
+                  return_value=L3_PAYLOAD) as l3, \
+            patch.object(ads, 'get_latest_metrics', return_value={'vix': 15.0}) as metrics, \
+            patch.object(ads, 'send_pending_alert_notifications',
+                         return_value={'emails_sent': 0}):
+        yield l2, l3, metrics
+
+
+class TestPayloadsOncePerCycle:
+    def test_payloads_computed_once_for_many_users(self, test_app, layer_checks):
+        l2, l3, metrics = layer_checks
+        for n in range(5):
+            _make_user(n)
+
+        result = ads.check_all_users_alerts()
+
+        assert result['users_checked'] == 5
+        assert result['total_alerts'] == 10
+        assert l2.call_count == 1
+        assert l3.call_count == 1
+        assert metrics.call_count == 1
+
+    def test_payloads_skipped_when_no_user_wants_them(self, test_app, layer_checks):
+        l2, l3, _ = layer_checks
+        for n in range(3):
+            _make_user(n, layer_2_enabled=False, layer_3_enabled=False)
+
+        ads.check_all_users_alerts()
+
+        l2.assert_not_called()
+        l3.assert_not_called()
+
+    def test_failed_check_is_not_retried_per_user(self, test_app, layer_checks):
+        l2, _, _ = layer_checks
+        l2.side_effect = RuntimeError('csv missing')
+        for n in range(3):
+            _make_user(n)
+
+        result = ads.check_all_users_alerts()
+
+        assert l2.call_count == 1
+        assert result['total_alerts'] == 3  # Layer 3 still fires
+
+
+class TestBatchedHistory:
+    def test_recent_trigger_suppresses_only_that_user(self, test_app, layer_checks):
+        quiet, fresh = _make_user(0), _make_user(1)
+        _add_alert(quiet, 'extreme_percentile', hours_ago=24)
+
+        ads.check_all_users_alerts()
+
+        types = lambda u: sorted(a.alert_type for a in Alert.query.filter_by(user_id=u.id)
+                                 .filter(Alert.title != 't'))
+        assert types(quiet) == ['multi_signal_convergence']
+        assert types(fresh) == ['extreme_percentile', 'multi_signal_convergence']
+
+    def test_old_trigger_outside_window_ignored(self, test_app):
+        user = _make_user(0)
+        _add_alert(user, 'extreme_percentile', hours_ago=200)
+        cycle = ads.AlertCycle()
+        cycle.load_user_history([user.id])
+        detector = ads.ExtremePercentileLayer2Detector()
+
+        with patch.object(ads.AlertDetector, 'was_recently_triggered') as per_user:
+            assert cycle.was_recently_triggered(detector, user.id, hours=168) is False
+            per_user.assert_not_called()
+
+    def test_weekly_budget_from_batched_counts(self, test_app, layer_checks):
+        full, empty = _make_user(0), _make_user(1)
+        for hours in (10, 40, 70, 100, 130):
+            _add_alert(full, 'extreme_percentile', hours_ago=hours)
+        # Layer 3 is not in its recency window for either user; the full
+        # weekly budget is what suppresses it for the first.
+
+        with patch.object(ads, '_count_layer_alerts_this_week') as per_user:
+            result = ads.check_all_users_alerts()
+            per_user.assert_not_called()
+
+        assert result['total_alerts'] == 2
+        assert Alert.query.filter_by(user_id=empty.id).count() == 2
+
+    def test_history_queries_do_not_scale_with_users(self, test_app, layer_checks):
+        from sqlalchemy import event
+
+        for n in range(6):
+            _make_user(n, layer_2_enabled=False, layer_3_enabled=False)
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        engine = db.engine
+        event.listen(engine, 'before_cursor_execute', listener)
+        try:
+            ads.check_all_users_alerts()
+        finally:
+            event.remove(engine, 'before_cursor_execute', listener)
+
+        selects = [s for s in statements if s.lstrip().upper().startswith('SELECT')]
+        assert len(selects) == 3  # users+prefs, last triggers, weekly counts
+
+
+class TestSingleUserPath:
+    def test_without_cycle_uses_per_user_helpers(self, test_app, layer_checks):
+        user = _make_user(0)
+
+        with patch.object(ads, '_count_layer_alerts_this_week', return_value=0) as weekly, \
+                patch.object(ads.AlertDetector, 'was_recently_triggered',
+                             return_value=False) as recent:
+            created = ads.check_all_alerts_for_user(user)
+
+        assert created == 2
+        weekly.assert_called_once_with(user.id)
+        assert recent.call_count == 2
@@ -0,0 +1,221 @@
+"""
+Tests for the shared backtest engine (backtesting/engine.py).
+
+Covers:
+  - Point-in-time lookup matches the per-date history scan
+  - Directional and weighted scoring
+  - Plausibility check plumbing
+  - Studies: frame layout, required returns, direction and scored-return
+    overrides, the Bitcoin/Liquidity and conditions backtests as studies,
+    and pooled runs matching serial ones
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from signaltrackers.backtesting import engine
+from signaltrackers.backtesting.bitcoin_liquidity_backtest import (
+    liquidity_study,
+    run_bitcoin_liquidity_backtest,
+)
+from signaltrackers.backtesting.conditions_backtest import (
+    _get_dimension_state_at,
+    quadrant_study,
+    run_backtest,
+    run_conditions_study,
+)
+
+
+def _history(states, start='2015-01-02', freq='W-FRI'):
+    dates = pd.date_range(start, periods=len(states), freq=freq)
+    return pd.DataFrame({'date': dates, 'state': states, 'score': np.linspace(-1, 1, len(states))})
+
+
+def _prices(start='2014-01-01', end='2020-12-31', drift=0.0005, seed=3):
+    idx = pd.date_range(start, end, freq='D')
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(drift, 0.02, len(idx)))), index=idx)
+
+
+@pytest.fixture
+def study():
+    rng = np.random.default_rng(11)
+    states = rng.choice(['Up', 'Down', 'Flat'], size=300).tolist()
+    return engine.SignalStudy(
+        name='toy',
+        history=_history(states),
+        state_col='state',
+        prices={'a': _prices(seed=1), 'b': _prices(seed=2, drift=-0.0005)},
+        expectations={
+            'Up': {'a': 'positive', 'b': 'positive'},
+            'Down': {'a': 'negative', 'b': 'negative'},
+        },
+        weights={'a': 0.75, 'b': 0.25},
+        start_year=2015,
+        end_year=2020,
+    )
+
+
+class TestAsofValues:
+    def test_matches_history_scan(self):
+        history = _history(['A', 'B', 'C', 'D'] * 10)
+        dates = pd.date_range('2014-12-01', '2016-01-31', freq='ME')
+        expected = [_get_dimension_state_at(history, d, 'state') for d in dates]
+        assert list(engine.asof_values(history, dates, 'state')) == expected
+        assert engine.asof_values(history, dates, 'state')[0] is None
+
+    def test_unsorted_history(self):
+        history = _history(['A', 'B', 'C', 'D'])
+        shuffled = history.iloc[[2, 0, 3, 1]]
+        dates = history['date'] + pd.Timedelta(days=1)
+        assert list(engine.asof_values(shuffled, dates, 'state')) == ['A', 'B', 'C', 'D']
+
+    def test_empty_history(self):
+        empty = pd.DataFrame({'date': pd.to_datetime([]), 'state': []})
+        assert list(engine.asof_values(empty, pd.date_range('2020-01-31', periods=2, freq='ME'), 'state')) \
+            == [None, None]
+
+
+class TestScoring:
+    def test_directional_scores(self):
+        directions = ['positive', 'positive', 'negative', 'neutral', 'neutral', 'sideways', 'positive']
+        returns = [0.1, -0.1, -0.1, 0.01, 0.2, 0.1, np.nan]
+        scores = engine.directional_scores(directions, returns)
+        np.testing.assert_array_equal(scores, [1.0, 0.0, 1.0, 1.0, 0.5, np.nan, np.nan])
+
+    def test_weighted_scores_skip_unscored(self):
+        scores = {'a': np.array([1.0, np.nan, np.nan]), 'b': np.array([0.0, 1.0, np.nan])}
+        assert engine.weighted_scores(scores, {'a': 3.0, 'b': 1.0}) == [0.75, 1.0, None]
+
+
+class TestChecks:
+    def test_run_lengths(self):
+        np.testing.assert_array_equal(engine.run_lengths(['a', 'a', 'b', 'a', 'a', 'a']), [2, 1, 3])
+        assert len(engine.run_lengths([])) == 0
+
+    def test_run_checks_skips_inapplicable(self):
+        result = engine.run_checks(pd.DataFrame(), {
+            'ok': lambda df: {'pass': True},
+            'skipped': lambda df: None,
+        })
+        assert result == {'all_pass': True, 'checks': {'ok': {'pass': True}}}
+
+    def test_run_checks_fails_on_any_failure(self):
+        result = engine.run_checks(pd.DataFrame(), {
+            'ok': lambda df: {'pass': True},
+            'bad': lambda df: {'pass': False},
+        })
+        assert result['all_pass'] is False
+
+
+class TestStudies:
+    def test_frame_layout(self, study):
+        frame = engine.build_frame(study)
+        assert list(frame.columns[:2]) == ['date', 'state']
+        for asset in ('a', 'b'):
+            for col in ('fwd_30d', 'fwd_60d', 'fwd_90d', 'expected', 'correct'):
+                assert f'{asset}_{col}' in frame.columns
+        # Unlisted states fall back to neutral
+        assert (frame.loc[frame['state'] == 'Flat', 'a_expected'] == 'neutral').all()
+        # Eval dates stop 90 days before the prices end
+        assert frame['date'].iloc[-1] <= '2020-10-02'
+
+    def test_weighted_score(self, study):
+        frame = engine.build_frame(study)
+        expected = (0.75 * frame['a_correct'] + 0.25 * frame['b_correct']).round(4)
+        np.testing.assert_allclose(frame['weighted_score'], expected)
+
+    def test_require_returns(self, study):
+        study.prices['b'] = _prices(end='2018-06-30', seed=2)
+        study.eval_dates = engine.monthly_eval_dates('2015-01-01', '2020-06-30')
+        assert engine.build_frame(study)['date'].iloc[-1] > '2019-01-01'
+        study.require_returns = True
+        assert engine.build_frame(study)['date'].iloc[-1] < '2018-04-01'
+
+    def test_direction_override(self, study):
+        def flip_b(frame, directions):
+            return {**directions, 'b': np.where(frame['state'] == 'Up', 'negative', directions['b'])}
+
+        study.direction_override = flip_b
+        frame = engine.build_frame(study)
+        assert (frame.loc[frame['state'] == 'Up', 'b_expected'] == 'negative').all()
+        assert (frame.loc[frame['state'] == 'Up', 'a_expected'] == 'positive').all()
+        up = frame[frame['state'] == 'Up']
+        np.testing.assert_array_equal(up['b_correct'], (up['b_fwd_90d'] < 0).astype(float))
+
+    def test_scored_returns_override(self, study):
+        plain = engine.build_frame(study)
+        study.scored_returns = lambda dates, returns: {'a': -returns['a']}
+        frame = engine.build_frame(study)
+        # Forward-return columns keep the actual returns; only scoring changes
+        pd.testing.assert_series_equal(frame['a_fwd_90d'], plain['a_fwd_90d'])
+        trending = frame['a_expected'] != 'neutral'
+        np.testing.assert_array_equal(frame.loc[trending, 'a_correct'], 1 - plain.loc[trending, 'a_correct'])
+        pd.testing.assert_series_equal(frame['b_correct'], plain['b_correct'])
+
+    def test_run_study(self, study):
+        result = engine.run_study(study)
+        assert isinstance(result, engine.BacktestResult)
+        assert result.name == 'toy'
+        assert result.accuracy == round(result.frame['weighted_score'].mean() * 100, 1)
+        assert result.walk_forward['n_folds'] == 3
+        assert set(result.walk_forward['fold_details'][0]['state_counts']) <= {'Up', 'Down', 'Flat'}
+        assert 0 <= result.cpcv['pbo'] <= 1
+
+    def test_bitcoin_liquidity_is_a_study(self):
+        states = ['Expanding', 'Neutral', 'Contracting', 'Strongly Expanding'] * 90
+        history = _history(states, start='2013-01-04')
+        btc = _prices(start='2014-09-17', end='2020-12-31')
+        frame = engine.build_frame(liquidity_study(history, btc))
+        legacy = run_bitcoin_liquidity_backtest(history, btc)
+        assert list(frame['date']) == list(legacy['date'])
+        np.testing.assert_array_equal(frame['weighted_score'], legacy['correct'])
+
+    def test_conditions_is_a_study(self):
+        rng = np.random.default_rng(8)
+        quadrants = rng.choice(['Goldilocks', 'Reflation', 'Stagflation', 'Deflation Risk'], 300)
+        histories = {
+            'quadrant': pd.DataFrame({'date': pd.date_range('2012-01-06', periods=300, freq='W-FRI'),
+                                      'quadrant': quadrants}),
+            'risk': pd.DataFrame({'date': pd.date_range('2012-01-03', periods=80, freq='MS'),
+                                  'state': rng.choice(['Normal', 'Elevated', 'Stressed'], 80)}),
+        }
+        assets = {'sp500': _prices(seed=4), 'treasuries': _prices(seed=5), 'gold': _prices(seed=6)}
+        idx = pd.date_range('2010-01-01', '2020-12-31', freq='MS')
+        cpi = pd.Series(np.linspace(220, 260, len(idx)), index=idx)
+
+        result = run_conditions_study(histories, assets, cpi, 2015, 2020)
+        legacy = run_backtest(histories, assets, cpi, 2015, 2020)
+        assert isinstance(result, engine.BacktestResult)
+        assert list(result.frame['date']) == list(legacy['date'])
+        np.testing.assert_array_equal(result.frame['weighted_score'], legacy['multi_asset_score'])
+        np.testing.assert_array_equal(result.frame['sp500_real_fwd_90d'], legacy['sp500_real_fwd_90d'])
+
+        stressed = result.frame['signal_risk_state'] == 'Stressed'
+        assert stressed.any()
+        assert (result.frame.loc[stressed, 'sp500_expected'] == 'negative').all()
+        # The S&P 500 is scored on its real return
+        real = result.frame['sp500_real_fwd_90d']
+        trending = result.frame['sp500_expected'] == 'positive'
+        np.testing.assert_array_equal(result.frame.loc[trending, 'sp500_correct'],
+                                      (real[trending] > 0).astype(float))
+
+        unstressed = engine.build_frame(quadrant_study(histories, assets, cpi, 2015, 2020,
+                                                       override_risk_states=()))
+        assert (unstressed.loc[stressed.to_numpy(), 'sp500_expected'] != 'negative').any()
+
+    def test_pooled_matches_serial(self, study):
+        other = engine.SignalStudy(**{**study.__dict__, 'name': 'toy_a_only',
+                                      'prices': {'a': study.prices['a']}, 'weights': None})
+        serial = engine.run_studies([study, other], workers=1)
+        pooled = engine.run_studies([study, other], workers=2)
+        assert [r.name for r in pooled] == ['toy', 'toy_a_only']
+        for s, p in zip(serial, pooled):
+            pd.testing.assert_frame_equal(s.frame, p.frame)
+            assert (s.walk_forward, s.cpcv, s.accuracy) == (p.walk_forward, p.cpcv, p.accuracy)
+
+    def test_failed_study_raises(self, study):
+        study.state_col = 'missing'
+        with pytest.raises(RuntimeError, match='toy'):
+            engine.run_studies([study], workers=1)
@@ -0,0 +1,183 @@
+"""
+Tests for resampled significance of backtest hit rates
+(backtesting/significance.py) and its use by both backtests.
+
+Covers:
+  - Block bootstrap / block permutation index matrices
+  - Bootstrap CIs overall and per group; permutation p-values
+  - Results depend on the seed only, not the worker count
+  - compute_significance output in the conditions and Bitcoin reports
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from signaltrackers.backtesting import engine, significance
+from signaltrackers.backtesting import bitcoin_liquidity_backtest as btc
+from signaltrackers.backtesting import conditions_backtest as cb
+
+
+def _frame(n=240, seed=5):
+    rng = np.random.default_rng(seed)
+    return rng.choice([0.0, 0.5, 1.0], n), rng.choice(['A', 'B'], n)
+
+
+class TestIndices:
+    def test_bootstrap_blocks_are_consecutive(self):
+        idx = significance.block_bootstrap_indices(10, 50, 3, np.random.default_rng(0))
+        assert idx.shape == (50, 10)
+        assert ((idx >= 0) & (idx < 10)).all()
+        blocks = idx[:, :9].reshape(50, 3, 3)
+        assert (np.diff(blocks, axis=2) % 10 == 1).all()
+
+    def test_permutation_rows_are_permutations(self):
+        idx = significance.block_permutation_indices(10, 50, 3, np.random.default_rng(0))
+        assert idx.shape == (50, 10)
+        assert (np.sort(idx, axis=1) == np.arange(10)).all()
+        assert len({tuple(row) for row in idx}) > 1
+
+    def test_block_larger_than_sample(self):
+        idx = significance.block_permutation_indices(4, 3, 10, np.random.default_rng(0))
+        assert (idx == np.arange(4)).all()
+
+
+class TestBootstrapCI:
+    def test_intervals_cover_observed(self):
+        scores, groups = _frame()
+        result = significance.bootstrap_ci(scores, groups, ['A', 'B', 'C'], n_resamples=2000, workers=1)
+        assert result['overall']['n'] == 240
+        assert result['overall']['hit_rate'] == round(scores.mean() * 100, 1)
+        for label in ('A', 'B'):
+            stats = result['groups'][label]
+            assert stats['ci_low'] <= stats['hit_rate'] <= stats['ci_high']
+            assert stats['n'] == int((groups == label).sum())
+        assert result['groups']['C'] == {'n': 0}
+
+    def test_unscored_rows_ignored(self):
+        scores = np.r_[np.ones(50), np.full(10, np.nan)]
+        result = significance.bootstrap_ci(scores, n_resamples=500, workers=1)
+        assert result['overall'] == {'n': 50, 'hit_rate': 100.0, 'ci_low': 100.0, 'ci_high': 100.0}
+
+    def test_no_scores(self):
+        result = significance.bootstrap_ci([np.nan, np.nan], ['A', 'B'], n_resamples=100, workers=1)
+        assert result['overall'] == {'n': 0}
+
+    def test_workers_do_not_change_result(self):
+        scores, groups = _frame()
+        kwargs = dict(n_resamples=2500, seed=3)
+        assert significance.bootstrap_ci(scores, groups, workers=1, **kwargs) == \
+            significance.bootstrap_ci(scores, groups, workers=2, **kwargs)
+
+    def test_seed_changes_result(self):
+        scores, groups = _frame()
+        a = significance.bootstrap_ci(scores, groups, n_resamples=500, seed=1, workers=1)
+        b = significance.bootstrap_ci(scores, groups, n_resamples=500, seed=2, workers=1)
+        assert a['groups'] != b['groups']
+
+
+class TestPermutationTest:
+    def test_informative_signal_is_significant(self):
+        rng = np.random.default_rng(0)
+        returns = rng.normal(0, 0.1, 240)
+        directions = np.where(returns > 0, 'positive', 'negative')
+        result = significance.permutation_test({'x': directions}, {'x': returns},
+                                               n_resamples=2000, workers=1)
+        assert result['observed'] == 100.0
+        assert result['p_value'] < 0.01 and result['significant']
+
+    def test_uninformative_signal_is_not(self):
+        rng = np.random.default_rng(0)
+        returns = rng.normal(0, 0.1, 240)
+        directions = np.where(rng.random(240) > 0.5, 'positive', 'negative')
+        result = significance.permutation_test({'x': directions}, {'x': returns},
+                                               n_resamples=2000, workers=1)
+        assert result['p_value'] > 0.05
+        assert abs(result['null_mean'] - 50) < 5
+
+    def test_observed_matches_weighted_scores(self):
+        rng = np.random.default_rng(1)
+        returns = {a: rng.normal(0, 0.08, 100) for a in ('x', 'y')}
+        returns['y'][:10] = np.nan
+        directions = {a: rng.choice(['positive', 'negative', 'neutral'], 100) for a in ('x', 'y')}
+        weights = {'x': 0.6, 'y': 0.4}
+        expected = np.nanmean(np.array(engine.weighted_scores(
+            {a: engine.directional_scores(directions[a], returns[a]) for a in ('x', 'y')}, weights),
+            dtype=float))
+        result = significance.permutation_test(directions, returns, weights, n_resamples=100, workers=1)
+        assert result['observed'] == round(expected * 100, 1)
+
+    def test_workers_do_not_change_result(self):
+        rng = np.random.default_rng(2)
+        args = ({'x': rng.choice(['positive', 'negative'], 200)}, {'x': rng.normal(0, 0.1, 200)})
+        assert significance.permutation_test(*args, n_resamples=2500, workers=1) == \
+            significance.permutation_test(*args, n_resamples=2500, workers=2)
+
+    def test_ten_thousand_resamples_are_fast(self):
+        rng = np.random.default_rng(3)
+        directions = {a: rng.choice(['positive', 'negative', 'neutral'], 300) for a in 'xyz'}
+        returns = {a: rng.normal(0, 0.08, 300) for a in 'xyz'}
+        started = time.perf_counter()
+        significance.permutation_test(directions, returns, n_resamples=10_000, workers=1)
+        significance.bootstrap_ci(returns['x'] > 0, directions['x'], n_resamples=10_000, workers=1)
+        assert time.perf_counter() - started < 30
+
+
+class TestBacktestSignificance:
+    def test_conditions(self):
+        rng = np.random.default_rng(4)
+        n = 120
+        df = pd.DataFrame({
+            'date': pd.date_range('2010-01-31', periods=n, freq='ME').strftime('%Y-%m-%d'),
+            'quadrant': rng.choice(cb.QUADRANT_LABELS[:3], n),
+            'risk_state': rng.choice(['Normal', 'Stressed'], n),
+            'sp500_fwd_90d': rng.normal(0.02, 0.08, n),
+            'treasuries_fwd_90d': rng.normal(0, 0.05, n),
+            'gold_fwd_90d': rng.normal(0.01, 0.06, n),
+            'sp500_real_fwd_90d': np.nan,
+        })
+        df = cb._rescore_with_overrides(df, ('Stressed',))
+        result = cb.compute_significance(df, n_resamples=500, workers=1)
+
+        bootstrap = result['bootstrap']
+        assert list(bootstrap['groups']) == cb.QUADRANT_LABELS
+        assert bootstrap['groups']['Stagflation'] == {'n': 0}
+        assert bootstrap['overall']['hit_rate'] == round(df['multi_asset_score'].mean() * 100, 1)
+        assert result['permutation']['observed'] == pytest.approx(bootstrap['overall']['hit_rate'], abs=0.1)
+
+        lines = significance.significance_section(result, 'Quadrant')
+        assert '## Resampled Significance' in lines[0]
+        assert any(line.startswith('| Goldilocks |') for line in lines)
+
+    def test_bitcoin(self):
+        rng = np.random.default_rng(6)
+        n = 96
+        buckets = rng.choice(['Expanding', 'Neutral', 'Contracting'], n)
+        returns = rng.normal(0.05, 0.3, n)
+        df = pd.DataFrame({
+            'date': pd.date_range('2015-01-31', periods=n, freq='ME').strftime('%Y-%m-%d'),
+            'liquidity_state': buckets,
+            'liquidity_bucket': buckets,
+            'expected_direction': [btc.LIQUIDITY_EXPECTATIONS[b] for b in buckets],
+            'btc_fwd_30d': returns,
+            'btc_fwd_60d': returns,
+            'btc_fwd_90d': returns,
+        })
+        df['correct'] = engine.directional_scores(df['expected_direction'], returns)
+
+        result = btc.compute_significance(df, n_resamples=500, workers=1)
+        assert list(result['bootstrap']['groups']) == ['Expanding', 'Neutral', 'Contracting']
+        assert result['permutation']['p_value'] is not None
+
+        report = btc.generate_report(
+            df, btc.score_results(df), btc.score_walk_forward(df, btc.generate_folds()),
+            btc.check_plausibility(df), btc.run_cpcv(df), significance_result=result,
+        )
+        assert '## Resampled Significance' in report
+        assert '| Liquidity State | Count | Hit Rate | 95% CI |' in report
+        assert 'Resampled Significance' not in btc.generate_report(
+            df, btc.score_results(df), btc.score_walk_forward(df, btc.generate_folds()),
+            btc.check_plausibility(df), btc.run_cpcv(df),
+        )
@@ -0,0 +1,77 @@
+"""
+Tests for the backtest sweep runner (backtesting/sweep.py) and the
+mask-based CPCV split (backtest_utils.cpcv_path_scores).
+
+Covers:
+  - Results come back in task order with per-task timings, inline and pooled
+  - Shared inputs reach pooled workers; task errors are captured, not raised
+  - CPCV purge/embargo drop exactly the training rows around the test block
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from signaltrackers.backtesting import sweep
+from signaltrackers.backtesting.backtest_utils import cpcv_path_scores
+
+
+def _scaled(shared, task):
+    if task < 0:
+        raise ValueError('negative task')
+    return {'value': shared['scale'] * task, 'pid': os.getpid()}
+
+
+class TestRunSweep:
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_results_in_task_order(self, workers):
+        outcomes = sweep.run_sweep(_scaled, [3, 1, 2, 5], shared={'scale': 10}, workers=workers)
+        assert [o['task'] for o in outcomes] == [3, 1, 2, 5]
+        assert [o['result']['value'] for o in outcomes] == [30, 10, 20, 50]
+        assert all(o['error'] is None and o['seconds'] >= 0 for o in outcomes)
+
+    def test_pool_runs_in_other_processes(self):
+        outcomes = sweep.run_sweep(_scaled, range(4), shared={'scale': 1}, workers=2)
+        assert all(o['result']['pid'] != os.getpid() for o in outcomes)
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_errors_captured(self, workers):
+        outcomes = sweep.run_sweep(_scaled, [1, -1], shared={'scale': 1}, workers=workers)
+        assert outcomes[0]['result']['value'] == 1
+        assert outcomes[1]['result'] is None
+        assert 'negative task' in outcomes[1]['error']
+
+    def test_empty(self):
+        assert sweep.run_sweep(_scaled, [], workers=4) == []
+
+    def test_default_workers_env(self, monkeypatch):
+        monkeypatch.setenv('BACKTEST_WORKERS', '3')
+        assert sweep.default_workers() == 3
+
+
+class TestCPCVMasks:
+    def test_purge_and_embargo(self):
+        # 12 monthly rows, k=3 groups of 4; scores encode the row number
+        dates = pd.date_range('2010-01-31', periods=12, freq='ME')
+        scores = np.arange(12, dtype=float)
+        oos, ins = cpcv_path_scores(dates, scores, k=3, p=1, purge_months=2, embargo_months=1)
+
+        # Test block = rows 4-7 (May-Aug): purge drops row 3 (within 60 days
+        # before), embargo drops row 8 (within 30 days after)
+        assert oos[1] == np.mean([4, 5, 6, 7])
+        assert ins[1] == np.mean([0, 1, 2, 9, 10, 11])
+        # First block (Jan-Apr): nothing before it; May 31 is 31 days after
+        # the block, outside the embargo
+        assert ins[0] == np.mean(range(4, 12))
+
+    def test_unscored_rows_ignored(self):
+        dates = pd.date_range('2010-01-31', periods=12, freq='ME')
+        scores = np.r_[np.full(4, np.nan), np.ones(8)]
+        oos, ins = cpcv_path_scores(dates, scores, k=3, p=1, purge_months=0, embargo_months=0)
+        assert len(oos) == 2  # the all-NaN test block is skipped
+        assert oos == [1.0, 1.0] and ins == [1.0, 1.0]
+
+    def test_empty(self):
+        assert cpcv_path_scores([], []) == ([], [])
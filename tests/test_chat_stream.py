@@ -0,0 +1,219 @@
+"""
+Tests for streamed chatbot responses (chat_stream.py and the SSE routes).
+
+Covers:
+  - Anthropic and OpenAI text deltas relayed as token events
+  - Tool-call rounds executed between streamed segments
+  - Token usage accumulated across rounds
+  - /api/chatbot/stream and /api/chatbot/section-opening/stream emit
+    token/tool/done events, record usage, and report provider errors
+"""
+
+import json
+import os
+import sys
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIGNALTRACKERS_DIR = os.path.join(REPO_ROOT, 'signaltrackers')
+sys.path.insert(0, SIGNALTRACKERS_DIR)
+
+from chat_stream import sse_event, stream_anthropic, stream_openai
+
+
+# ---------------------------------------------------------------------------
+# Fake provider clients
+# ---------------------------------------------------------------------------
+
+def _anthropic_round(texts, tool_uses=(), input_tokens=10, output_tokens=5):
+    content = [SimpleNamespace(type='text', text=''.join(texts))] if texts else []
+    content += [SimpleNamespace(type='tool_use', id=f'tu_{name}', name=name, input=args)
+                for name, args in tool_uses]
+    final = SimpleNamespace(content=content, usage=SimpleNamespace(
+        input_tokens=input_tokens, output_tokens=output_tokens,
+        cache_read_input_tokens=0, cache_creation_input_tokens=0))
+    return texts, final
+
+
+class FakeAnthropic:
+    def __init__(self, rounds):
+        self.rounds = list(rounds)
+        self.calls = []
+        self.messages = SimpleNamespace(stream=self._stream)
+
+    @contextmanager
+    def _stream(self, **kwargs):
+        self.calls.append(kwargs)
+        texts, final = self.rounds.pop(0)
+        yield SimpleNamespace(text_stream=iter(texts), get_final_message=lambda: final)
+
+
+def _openai_chunks(texts, tool_calls=(), prompt_tokens=10, completion_tokens=5):
+    chunks = [SimpleNamespace(usage=None, choices=[SimpleNamespace(
+        delta=SimpleNamespace(content=t, tool_calls=None))]) for t in texts]
+    for index, (call_id, name, arg_parts) in enumerate(tool_calls):
+        for i, part in enumerate(arg_parts):
+            fragment = SimpleNamespace(
+                index=index, id=call_id if i == 0 else None,
+                function=SimpleNamespace(name=name if i == 0 else None, arguments=part))
+            chunks.append(SimpleNamespace(usage=None, choices=[SimpleNamespace(
+                delta=SimpleNamespace(content=None, tool_calls=[fragment]))]))
+    chunks.append(SimpleNamespace(choices=[], usage=SimpleNamespace(
+        prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)))
+    return chunks
+
+
+class FakeOpenAI:
+    def __init__(self, rounds):
+        self.rounds = list(rounds)
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.calls.append({**kwargs, 'messages': list(kwargs['messages'])})
+        return iter(self.rounds.pop(0))
+
+
+def _parse_sse(body):
+    events = []
+    for frame in body.strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in frame.split('\n'))
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+# ---------------------------------------------------------------------------
+# Provider loops
+# ---------------------------------------------------------------------------
+
+class TestAnthropicStream:
+    def test_tokens_then_done(self):
+        client = FakeAnthropic([_anthropic_round(['Hel', 'lo'])])
+        usage = {}
+        events = list(stream_anthropic(client, 'm', 'sys', [{'role': 'user', 'content': 'hi'}],
+                                       usage=usage, cache_system=True))
+        assert events == [('token', 'Hel'), ('token', 'lo'), ('done', 'Hello')]
+        assert usage['input_tokens'] == 10 and usage['output_tokens'] == 5
+        assert client.calls[0]['system'][0]['cache_control'] == {'type': 'ephemeral'}
+        assert 'tools' not in client.calls[0]
+
+    def test_tool_round_between_segments(self):
+        client = FakeAnthropic([
+            _anthropic_round(['Checking'], tool_uses=[('get_metric_data', {'metric': 'vix'})]),
+            _anthropic_round(['VIX is 15']),
+        ])
+        execute = MagicMock(return_value='{"value": 15}')
+        usage = {}
+        events = list(stream_anthropic(client, 'm', 'sys', [{'role': 'user', 'content': 'vix?'}],
+                                       tools=[{'name': 'get_metric_data'}], execute_tool=execute,
+                                       usage=usage))
+        assert ('tool', 'get_metric_data') in events
+        assert events[-1] == ('done', 'VIX is 15')
+        execute.assert_called_once_with('get_metric_data', {'metric': 'vix'})
+        tool_result = client.calls[1]['messages'][-1]['content'][0]
+        assert tool_result == {'type': 'tool_result', 'tool_use_id': 'tu_get_metric_data',
+                               'content': '{"value": 15}'}
+        assert usage['input_tokens'] == 20
+
+
+class TestOpenAIStream:
+    def test_tokens_and_usage(self):
+        client = FakeOpenAI([_openai_chunks(['Hi', ' there'])])
+        usage = {}
+        events = list(stream_openai(client, 'm', 'sys', [{'role': 'user', 'content': 'hi'}], usage=usage))
+        assert events == [('token', 'Hi'), ('token', ' there'), ('done', 'Hi there')]
+        assert usage == {'input_tokens': 10, 'output_tokens': 5}
+        call = client.calls[0]
+        assert call['stream'] is True and call['stream_options'] == {'include_usage': True}
+        assert call['messages'][0] == {'role': 'system', 'content': 'sys'}
+
+    def test_fragmented_tool_call_arguments(self):
+        client = FakeOpenAI([
+            _openai_chunks([], tool_calls=[('call_1', 'get_metric_data', ['{"metric"', ': "vix"}'])]),
+            _openai_chunks(['VIX is 15']),
+        ])
+        execute = MagicMock(return_value='15')
+        events = list(stream_openai(client, 'm', 'sys', [{'role': 'user', 'content': 'vix?'}],
+                                    tools=[{'type': 'function'}], execute_tool=execute))
+        execute.assert_called_once_with('get_metric_data', {'metric': 'vix'})
+        assert events[0] == ('tool', 'get_metric_data')
+        assert events[-1] == ('done', 'VIX is 15')
+        followup = client.calls[1]['messages']
+        assert followup[-2]['tool_calls'][0]['function'] == {
+            'name': 'get_metric_data', 'arguments': '{"metric": "vix"}'}
+        assert followup[-1]['tool_call_id'] == 'call_1'
+
+
+def test_sse_event_format():
+    assert sse_event('token', {'text': 'a'}) == 'event: token\ndata: {"text": "a"}\n\n'
+
+
+# ---------------------------------------------------------------------------
+# Routes
+# ---------------------------------------------------------------------------
+
+class TestStreamRoutes:
+    @pytest.fixture
+    def client(self):
+        import dashboard
+        dashboard.app.config['TESTING'] = True
+        dashboard.app.config['LOGIN_DISABLED'] = True
+        with patch.object(dashboard, 'get_chatbot_enrichment_context', return_value=''), \
+                patch.object(dashboard, 'get_market_conditions', return_value=None), \
+                patch.object(dashboard, 'is_tavily_configured', return_value=False), \
+                patch.object(dashboard, '_get_section_live_data', return_value='VIX: 15'):
+            yield dashboard.app.test_client()
+        dashboard.app.config['LOGIN_DISABLED'] = False
+
+    def test_chatbot_stream(self, client):
+        fake = FakeOpenAI([_openai_chunks(['Markets ', 'are calm.'])])
+        with patch('services.ai_service.get_system_ai_client', return_value=(fake, 'openai')), \
+                patch('services.ai_service.get_system_chatbot_model', return_value='gpt-test'):
+            resp = client.post('/api/chatbot/stream', json={'message': 'How are markets?'})
+            assert resp.status_code == 200
+            assert resp.mimetype == 'text/event-stream'
+            events = _parse_sse(resp.get_data(as_text=True))
+        assert [e for e, _ in events] == ['token', 'token', 'done']
+        assert events[-1][1]['response'] == 'Markets are calm.'
+
+    def test_usage_recorded_for_authenticated_user(self, client):
+        import dashboard
+        fake = FakeOpenAI([_openai_chunks(['ok'])])
+        user = SimpleNamespace(is_authenticated=True, id=7)
+        with patch('services.ai_service.get_system_ai_client', return_value=(fake, 'openai')), \
+                patch('services.ai_service.get_system_chatbot_model', return_value='gpt-test'), \
+                patch.object(dashboard, 'current_user', user), \
+                patch('services.usage_metering.record_usage') as record:
+            client.post('/api/chatbot/stream', json={'message': 'hi'}).get_data()
+        record.assert_called_once_with(user_id=7, interaction_type='chatbot', model_name='gpt-test',
+                                       input_tokens=10, output_tokens=5)
+
+    def test_provider_error_emits_error_event(self, client):
+        fake = MagicMock()
+        fake.chat.completions.create.side_effect = RuntimeError('upstream down')
+        with patch('services.ai_service.get_system_ai_client', return_value=(fake, 'openai')), \
+                patch('services.ai_service.get_system_chatbot_model', return_value='gpt-test'):
+            events = _parse_sse(client.post('/api/chatbot/stream', json={'message': 'hi'}).get_data(as_text=True))
+        assert events == [('error', {'error': 'AI service unavailable'})]
+
+    def test_unavailable_client_returns_503(self, client):
+        with patch('services.ai_service.get_system_ai_client', return_value=(None, 'no key')):
+            assert client.post('/api/chatbot/stream', json={'message': 'hi'}).status_code == 503
+
+    def test_section_opening_stream(self, client):
+        fake = FakeAnthropic([_anthropic_round(['Credit ', 'is tight.'])])
+        with patch('services.ai_service.get_system_ai_client', return_value=(fake, 'anthropic')), \
+                patch('services.ai_service.get_system_ai_model', return_value='claude-test'):
+            resp = client.post('/api/chatbot/section-opening/stream', json={'section_id': 'asset-credit'})
+            events = _parse_sse(resp.get_data(as_text=True))
+        assert events[-1][1]['response'] == 'Credit is tight.'
+        assert fake.calls[0]['max_tokens'] == 512
+        assert 'VIX: 15' in fake.calls[0]['messages'][0]['content']
+
+    def test_section_opening_stream_rejects_unknown_section(self, client):
+        assert client.post('/api/chatbot/section-opening/stream',
+                           json={'section_id': 'bogus'}).status_code == 400
@@ -0,0 +1,91 @@
+"""
+Tests for the cached chatbot enrichment context (chatbot_context.py).
+
+Covers:
+  - The context is built once and reused across requests
+  - Invalidation via the explicit hook, metric store version, watched files
+    and maximum age
+  - run_news_pipeline invalidates the cache after saving news
+  - dashboard.get_chatbot_enrichment_context routes through the cache
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIGNALTRACKERS_DIR = os.path.join(REPO_ROOT, 'signaltrackers')
+sys.path.insert(0, SIGNALTRACKERS_DIR)
+
+import chatbot_context
+import metric_store
+from chatbot_context import get_chatbot_context, invalidate_chatbot_context
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    invalidate_chatbot_context()
+    yield
+    invalidate_chatbot_context()
+
+
+class TestCache:
+    def test_built_once(self):
+        builder = MagicMock(return_value='ctx')
+        assert get_chatbot_context(builder) == 'ctx'
+        assert get_chatbot_context(builder) == 'ctx'
+        assert builder.call_count == 1
+
+    def test_invalidate_hook(self):
+        builder = MagicMock(side_effect=['one', 'two'])
+        get_chatbot_context(builder)
+        invalidate_chatbot_context()
+        assert get_chatbot_context(builder) == 'two'
+
+    def test_metric_store_version(self):
+        builder = MagicMock(side_effect=['one', 'two'])
+        get_chatbot_context(builder)
+        metric_store.bump_version()
+        assert get_chatbot_context(builder) == 'two'
+
+    def test_watched_file_change(self, tmp_path):
+        briefing = tmp_path / 'ai_summaries.json'
+        builder = MagicMock(side_effect=['one', 'two', 'three'])
+        get_chatbot_context(builder, [briefing])
+        assert get_chatbot_context(builder, [briefing]) == 'one'
+        briefing.write_text('{"summaries": []}')
+        assert get_chatbot_context(builder, [briefing]) == 'two'
+
+    def test_max_age(self, monkeypatch):
+        builder = MagicMock(side_effect=['one', 'two'])
+        get_chatbot_context(builder)
+        monkeypatch.setattr(chatbot_context, 'MAX_AGE_SECONDS', 0)
+        assert get_chatbot_context(builder) == 'two'
+
+    def test_result_built_during_invalidation_not_cached(self):
+        def builder():
+            invalidate_chatbot_context()
+            return 'stale'
+        assert get_chatbot_context(builder) == 'stale'
+        assert get_chatbot_context(lambda: 'fresh') == 'fresh'
+
+
+class TestHooks:
+    def test_news_pipeline_invalidates(self, tmp_path, monkeypatch):
+        import news_pipeline
+        get_chatbot_context(lambda: 'old')
+        monkeypatch.setenv('TAVILY_API_KEY', 'test')
+        monkeypatch.setattr(news_pipeline, 'NEWS_CACHE_FILE', tmp_path / 'news_data.json')
+        monkeypatch.setattr(news_pipeline, 'DATA_DIR', tmp_path)
+        with patch.object(news_pipeline, '_fetch_topic', return_value=[]):
+            assert news_pipeline.run_news_pipeline()
+        assert get_chatbot_context(lambda: 'new') == 'new'
+
+    def test_dashboard_uses_cache(self):
+        import dashboard
+        with patch.object(dashboard, '_build_chatbot_enrichment_context', return_value='ctx') as build:
+            assert dashboard.get_chatbot_enrichment_context() == 'ctx'
+            assert dashboard.get_chatbot_enrichment_context() == 'ctx'
+        assert build.call_count == 1
@@ -0,0 +1,134 @@
+"""
+Tests for the vectorized Layer 3 historical convergence scan.
+
+Covers:
+  - Episodes match a per-date reference scan over rolling percentiles
+  - Dedup folds triggers within the minimum episode gap
+  - Episode list memoized per data version and signal content
+  - check_convergence payload carries the episode dates
+"""
+
+import importlib
+import sys
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "signaltrackers"))
+
+import metric_store  # noqa: E402
+import rolling_percentile  # noqa: E402
+
+l3 = importlib.import_module('services.layer3_convergence')
+
+CONFIGS = [(f"s{i}.csv", f"s{i}", f"Signal {i}") for i in range(4)]
+
+
+def _signals(days=4000, seed=3):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2005-01-03', periods=days)
+    common = rng.normal(0, 1, days).cumsum()
+    return {
+        col: pd.Series(common + rng.normal(0, 1, days).cumsum() * 0.5, index=dates)
+        for _, col, _ in CONFIGS
+    }
+
+
+def _reference_episodes(signals):
+    loaded = [(label, signals[col]) for _, col, label in CONFIGS]
+    pcts = [(label, rolling_percentile.rolling_percentile(s, l3._WINDOW_YEARS)) for label, s in loaded]
+    scan_date = max(s.index[0] for _, s in loaded) + timedelta(days=60)
+    scan_end = min(s.index[-1] for _, s in loaded)
+    episodes, last = [], None
+    while scan_date <= scan_end:
+        off, on = [], []
+        for label, pct in pcts:
+            value = pct[pct.index <= scan_date].iloc[-1]
+            if value > 75:
+                off.append(label)
+            elif value < 25:
+                on.append(label)
+        hit = ('risk-off', off) if len(off) >= 3 else (('risk-on', on) if len(on) >= 3 else None)
+        if hit and (last is None or (scan_date - last).days >= 60):
+            episodes.append({'date': scan_date.strftime('%Y-%m-%d'), 'direction': hit[0], 'signals': hit[1]})
+            last = scan_date
+        scan_date += timedelta(days=30)
+    return episodes
+
+
+def _loader(signals):
+    return lambda csv_name, col_name: signals[col_name].copy()
+
+
+class TestConvergenceScan:
+    def setup_method(self):
+        l3._episode_cache.clear()
+
+    def test_matches_reference_scan(self):
+        signals = _signals()
+        with patch.object(l3, '_load_signal', side_effect=_loader(signals)):
+            episodes = l3._historical_convergence_episodes(CONFIGS)
+        expected = _reference_episodes(signals)
+        assert episodes == expected
+        assert len(episodes) > 0
+
+    def test_count_matches_episode_list(self):
+        signals = _signals()
+        with patch.object(l3, '_load_signal', side_effect=_loader(signals)):
+            assert l3._count_historical_convergence_occurrences(CONFIGS) == \
+                len(l3._historical_convergence_episodes(CONFIGS))
+
+    def test_episodes_at_least_min_gap_apart(self):
+        signals = _signals(seed=11)
+        with patch.object(l3, '_load_signal', side_effect=_loader(signals)):
+            dates = pd.to_datetime([e['date'] for e in l3._historical_convergence_episodes(CONFIGS)])
+        assert (np.diff(dates.values) >= np.timedelta64(l3._MIN_EPISODE_GAP_DAYS, 'D')).all()
+
+    def test_too_few_signals(self):
+        with patch.object(l3, '_load_signal', return_value=None):
+            assert l3._historical_convergence_episodes(CONFIGS) == []
+
+
+class TestMemoization:
+    def setup_method(self):
+        l3._episode_cache.clear()
+
+    def test_scan_runs_once_per_version(self):
+        signals = _signals(days=1500)
+        with patch.object(l3, '_load_signal', side_effect=_loader(signals)), \
+                patch.object(l3, '_scan_convergence_episodes',
+                             wraps=l3._scan_convergence_episodes) as scan:
+            first = l3._historical_convergence_episodes(CONFIGS)
+            first.append({'date': 'mutated'})
+            second = l3._historical_convergence_episodes(CONFIGS)
+            assert scan.call_count == 1
+            assert {'date': 'mutated'} not in second
+
+            with patch.object(metric_store, 'get_version', return_value=12345):
+                l3._historical_convergence_episodes(CONFIGS)
+            assert scan.call_count == 2
+
+    def test_changed_data_rescans(self):
+        signals = _signals(days=1500)
+        with patch.object(l3, '_load_signal', side_effect=_loader(signals)), \
+                patch.object(l3, '_scan_convergence_episodes',
+                             wraps=l3._scan_convergence_episodes) as scan:
+            l3._historical_convergence_episodes(CONFIGS)
+            signals['s0'].iloc[-1] += 1.0
+            l3._historical_convergence_episodes(CONFIGS)
+        assert scan.call_count == 2
+
+
+def test_payload_includes_episodes():
+    l3._episode_cache.clear()
+    signals = _signals()
+    for col in signals:
+        signals[col].iloc[-1] = signals[col].max() + 10  # all at the top → risk-off now
+    with patch.object(l3, '_load_signal', side_effect=_loader(signals)):
+        payload = l3.check_convergence(CONFIGS)
+    assert payload is not None
+    assert payload['historical_episodes'] == _reference_episodes(signals)
+    assert f"{len(payload['historical_episodes'])} time(s)" in payload['context_sentence']
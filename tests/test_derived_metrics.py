@@ -0,0 +1,171 @@
+"""
+Tests for the derived-metrics dependency graph (derived_metrics.py).
+
+Covers:
+  - Declared formulas match the ratio/spread definitions
+  - Each input file is read once per run, even when shared by many nodes
+  - Up-to-date nodes are skipped without loading their inputs
+  - Only the new date range is computed when inputs gain rows
+  - A full rebuild rewrites outputs, including rows of repaired inputs
+  - Waves order nodes that read another node's output; cycles are rejected
+"""
+
+import os
+import sys
+from collections import Counter
+
+import pandas as pd
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIGNALTRACKERS_DIR = os.path.join(REPO_ROOT, 'signaltrackers')
+sys.path.insert(0, SIGNALTRACKERS_DIR)
+
+from derived_metrics import (
+    DERIVED_METRICS,
+    DerivedMetric,
+    DerivedMetricsEngine,
+    execution_waves,
+    ratio,
+)
+from market_signals import MarketSignalsTracker
+from series_storage import CsvStorage
+
+
+class CountingStorage(CsvStorage):
+    def __init__(self):
+        self.reads = Counter()
+
+    def read(self, csv_path, date_column='date'):
+        self.reads[csv_path.stem] += 1
+        return super().read(csv_path, date_column)
+
+
+def _write(data_dir, stem, dates, values):
+    pd.DataFrame({'date': dates, stem: values}).to_csv(data_dir / f'{stem}.csv', index=False)
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    dates = pd.date_range('2024-01-01', periods=5, freq='D').strftime('%Y-%m-%d').tolist()
+    for stem in {s for node in DERIVED_METRICS for s in node.inputs}:
+        _write(tmp_path, stem, dates, [100.0 + i for i in range(5)])
+    _write(tmp_path, 'sp500_price', dates, [500.0, 510.0, 520.0, 530.0, 540.0])
+    _write(tmp_path, 'nasdaq_price', dates, [450.0, 455.0, 460.0, 465.0, 470.0])
+    _write(tmp_path, 'japan_10y_yield', dates, [1.0] * 5)
+
+    tracker = MarketSignalsTracker.__new__(MarketSignalsTracker)
+    tracker.data_dir = tmp_path
+    tracker.storage = CountingStorage()
+    return tracker
+
+
+class TestFullRun:
+    def test_all_outputs_written(self, tracker):
+        tracker.calculate_derived_metrics()
+        for node in DERIVED_METRICS:
+            df = pd.read_csv(tracker.data_dir / f'{node.output}.csv')
+            assert df.columns.tolist() == ['date', node.column]
+            assert len(df) == 5
+
+    def test_formulas(self, tracker):
+        tracker.calculate_derived_metrics()
+        qqq = pd.read_csv(tracker.data_dir / 'qqq_spy_ratio.csv')['qqq_spy_ratio']
+        assert qqq.iloc[0] == pytest.approx(450.0 / 500.0 * 100)
+        spread = pd.read_csv(tracker.data_dir / 'us_japan_10y_spread.csv')['us_japan_10y_spread']
+        assert spread.iloc[-1] == pytest.approx(104.0 - 1.0)
+        hyg = pd.read_csv(tracker.data_dir / 'hyg_treasury_spread.csv')['hyg_vs_ief_spread']
+        assert hyg.iloc[0] == pytest.approx(0.0)
+
+    def test_each_input_read_once(self, tracker):
+        tracker.calculate_derived_metrics()
+        inputs = {s for node in DERIVED_METRICS for s in node.inputs}
+        assert all(tracker.storage.reads[stem] == 1 for stem in inputs)
+
+    def test_missing_input_skips_node(self, tracker):
+        os.remove(tracker.data_dir / 'silver_price.csv')
+        tracker.calculate_derived_metrics()
+        assert not (tracker.data_dir / 'gold_silver_ratio.csv').exists()
+        assert (tracker.data_dir / 'btc_gold_ratio.csv').exists()
+
+
+class TestIncremental:
+    def test_up_to_date_nodes_load_nothing(self, tracker):
+        tracker.calculate_derived_metrics()
+        tracker.storage.reads.clear()
+        tracker.calculate_derived_metrics()
+        assert sum(tracker.storage.reads.values()) == 0
+
+    def test_only_new_rows_computed(self, tracker):
+        tracker.calculate_derived_metrics()
+        data_dir = tracker.data_dir
+        spy = pd.read_csv(data_dir / 'sp500_price.csv')
+        qqq = pd.read_csv(data_dir / 'nasdaq_price.csv')
+        pd.concat([spy, pd.DataFrame({'date': ['2024-01-06'], 'sp500_price': [550.0]})]).to_csv(
+            data_dir / 'sp500_price.csv', index=False)
+        pd.concat([qqq, pd.DataFrame({'date': ['2024-01-06'], 'nasdaq_price': [495.0]})]).to_csv(
+            data_dir / 'nasdaq_price.csv', index=False)
+
+        appended = []
+        original_append = tracker.append_to_csv
+        tracker.append_to_csv = lambda df, path: (appended.append((path.stem, len(df))), original_append(df, path))
+        tracker.storage.reads.clear()
+        tracker.calculate_derived_metrics()
+
+        assert appended == [('qqq_spy_ratio', 1)]
+        assert set(tracker.storage.reads) == {'sp500_price', 'nasdaq_price'}
+        out = pd.read_csv(data_dir / 'qqq_spy_ratio.csv')
+        assert len(out) == 6
+        assert out['qqq_spy_ratio'].iloc[-1] == pytest.approx(90.0)
+
+    def test_full_rebuild_fills_gaps(self, tracker):
+        tracker.calculate_derived_metrics()
+        path = tracker.data_dir / 'gold_silver_ratio.csv'
+        out = pd.read_csv(path)
+        out.drop(index=1).to_csv(path, index=False)
+        tracker.calculate_derived_metrics()
+        assert len(pd.read_csv(path)) == 4
+        tracker.calculate_derived_metrics(full=True)
+        assert len(pd.read_csv(path)) == 5
+
+    def test_full_rebuild_overwrites_repaired_rows(self, tracker):
+        tracker.calculate_derived_metrics()
+        data_dir = tracker.data_dir
+        spy = pd.read_csv(data_dir / 'sp500_price.csv')
+        spy.loc[1, 'sp500_price'] = 455.0
+        spy.to_csv(data_dir / 'sp500_price.csv', index=False)
+
+        tracker.calculate_derived_metrics()
+        assert pd.read_csv(data_dir / 'qqq_spy_ratio.csv')['qqq_spy_ratio'].iloc[1] != pytest.approx(100.0)
+
+        tracker.calculate_derived_metrics(full=True)
+        out = pd.read_csv(data_dir / 'qqq_spy_ratio.csv')
+        assert len(out) == 5
+        assert out['qqq_spy_ratio'].iloc[1] == pytest.approx(100.0)
+        assert out['date'].is_monotonic_increasing
+
+
+class TestGraph:
+    def test_dependent_node_runs_in_later_wave(self):
+        base = DerivedMetric('a_ratio', 'a_ratio', ('x', 'y'), ratio())
+        dependent = DerivedMetric('b_ratio', 'b_ratio', ('a_ratio', 'z'), ratio())
+        waves = execution_waves([dependent, base])
+        assert [[n.output for n in w] for w in waves] == [['a_ratio'], ['b_ratio']]
+
+    def test_cycle_rejected(self):
+        a = DerivedMetric('a', 'a', ('b', 'x'), ratio())
+        b = DerivedMetric('b', 'b', ('a', 'x'), ratio())
+        with pytest.raises(ValueError):
+            execution_waves([a, b])
+
+    def test_chained_node_sees_fresh_output(self, tmp_path):
+        dates = ['2024-01-01', '2024-01-02']
+        for stem in ('x', 'y', 'z'):
+            _write(tmp_path, stem, dates, [2.0, 4.0])
+        tracker = MarketSignalsTracker.__new__(MarketSignalsTracker)
+        nodes = [DerivedMetric('b_ratio', 'b_ratio', ('a_ratio', 'z'), ratio()),
+                 DerivedMetric('a_ratio', 'a_ratio', ('x', 'y'), ratio())]
+        engine = DerivedMetricsEngine(tmp_path, CsvStorage(), tracker.append_to_csv)
+        statuses = engine.run(nodes)
+        assert statuses == {'a_ratio': '2 rows', 'b_ratio': '2 rows'}
+        assert pd.read_csv(tmp_path / 'b_ratio.csv')['b_ratio'].tolist() == [0.5, 0.25]
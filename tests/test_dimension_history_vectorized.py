@@ -0,0 +1,71 @@
+"""
+Tests for the vectorized compute_risk_history / compute_policy_history.
+
+Covers:
+  - Array scorers match the scalar scorers element-wise, at the boundaries
+  - Both histories match the original per-date loop implementations
+    (kept in backtesting/benchmark_dimension_history.py) on synthetic data,
+    with and without a start date
+"""
+
+import os
+import sys
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import signaltrackers.market_conditions as mc
+from signaltrackers.backtesting.benchmark_dimension_history import (
+    reference_policy_history,
+    reference_risk_history,
+    write_synthetic_data,
+)
+
+
+@pytest.mark.parametrize('array_fn, scalar_fn, values', [
+    (mc._score_vix_level_array, mc._score_vix_level, [10, 14.99, 15, 19.99, 20, 29.99, 30, 45]),
+    (mc._score_term_structure_array, mc._score_term_structure, [0.8, 0.9499, 0.95, 1.0, 1.05, 1.0501, 1.3]),
+    (mc._score_stock_bond_corr_array, mc._score_stock_bond_corr, [-0.9, -0.3001, -0.3, 0.0, 0.3, 0.3001, 0.8]),
+    (mc._classify_risk_array, mc._classify_risk, list(range(8))),
+    (mc._classify_policy_stance_array, mc._classify_policy_stance, [-2, -0.5001, -0.5, 0, 1.0, 1.0001, 3]),
+    (mc._classify_policy_direction_array, mc._classify_policy_direction, [-1, -0.2501, -0.25, 0, 0.25, 0.2501, 1]),
+])
+def test_array_scorers_match_scalar(array_fn, scalar_fn, values):
+    assert list(array_fn(np.array(values, dtype=float))) == [scalar_fn(v) for v in values]
+
+
+@pytest.fixture(scope='module')
+def synthetic_data_dir(tmp_path_factory):
+    data_dir = tmp_path_factory.mktemp('data')
+    write_synthetic_data(str(data_dir), days=1500)
+    with mock.patch.object(mc, 'DATA_DIR', str(data_dir)):
+        yield data_dir
+
+
+@pytest.mark.parametrize('start_date', [None, '1993-06-15'])
+def test_risk_history_matches_loop(synthetic_data_dir, start_date):
+    expected = reference_risk_history(start_date)
+    actual = mc.compute_risk_history(start_date)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_risk_history_without_vix3m_scores_zero(synthetic_data_dir):
+    history = mc.compute_risk_history()
+    assert set(history['term_structure_score'].iloc[:300]) == {0}  # before VIX3M starts
+    assert set(history['term_structure_score'].iloc[300:]) > {0}
+
+
+@pytest.mark.parametrize('start_date', [None, '1993-06-15'])
+def test_policy_history_matches_loop(synthetic_data_dir, start_date):
+    expected = reference_policy_history(start_date)
+    actual = mc.compute_policy_history(start_date)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_risk_history_start_after_data(synthetic_data_dir):
+    assert mc.compute_risk_history('2100-01-01').empty
@@ -0,0 +1,142 @@
+"""
+Tests for the batched yfinance download path in collect_etf_signals.
+
+Covers:
+  - Tickers are grouped by their last stored date, one download per group
+  - The wide multi-ticker result is split back into per-series CSVs
+  - Only tickers missing from the batch fall back to the per-ticker fetch;
+    up-to-date tickers (no new bars) are not retried
+  - No fixed sleeps between tickers
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIGNALTRACKERS_DIR = os.path.join(REPO_ROOT, 'signaltrackers')
+sys.path.insert(0, SIGNALTRACKERS_DIR)
+
+import market_signals
+from market_signals import MarketSignalsTracker
+
+
+def _wide(tickers, dates, missing=()):
+    """Build a yf.download-style frame with (Price, Ticker) columns."""
+    columns = pd.MultiIndex.from_product([['Close', 'Open'], tickers], names=['Price', 'Ticker'])
+    data = np.arange(len(dates) * len(columns), dtype=float).reshape(len(dates), len(columns)) + 1
+    df = pd.DataFrame(data, index=pd.DatetimeIndex(dates, name='Date'), columns=columns)
+    for ticker in missing:
+        df[('Close', ticker)] = np.nan
+    return df
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    tracker = MarketSignalsTracker.__new__(MarketSignalsTracker)
+    tracker.data_dir = tmp_path
+    tracker.etf_tickers = {'sp500': 'SPY', 'nasdaq': 'QQQ', 'bitcoin': 'BTC-USD'}
+    return tracker
+
+
+@pytest.fixture(autouse=True)
+def yf_available():
+    with patch.object(market_signals, 'YF_AVAILABLE', True):
+        yield
+
+
+class TestFetchEtfBatch:
+    def test_splits_wide_result(self, tracker):
+        raw = _wide(['SPY', 'QQQ'], ['2025-01-02', '2025-01-03'])
+        with patch.object(market_signals, 'yf', create=True) as yf:
+            yf.download.return_value = raw
+            result = tracker.fetch_etf_batch(['SPY', 'QQQ'], '2025-01-02')
+        assert set(result) == {'SPY', 'QQQ'}
+        assert result['SPY'].columns.tolist() == ['date', 'close']
+        assert result['QQQ']['close'].tolist() == raw['Close']['QQQ'].tolist()
+
+    def test_weekend_gaps_dropped_per_ticker(self, tracker):
+        raw = _wide(['SPY', 'BTC-USD'], ['2025-01-03', '2025-01-04'])
+        raw.loc[pd.Timestamp('2025-01-04'), ('Close', 'SPY')] = np.nan
+        with patch.object(market_signals, 'yf', create=True) as yf:
+            yf.download.return_value = raw
+            result = tracker.fetch_etf_batch(['SPY', 'BTC-USD'], '2025-01-03')
+        assert len(result['SPY']) == 1
+        assert len(result['BTC-USD']) == 2
+
+    def test_download_error_returns_empty(self, tracker):
+        with patch.object(market_signals, 'yf', create=True) as yf:
+            yf.download.side_effect = RuntimeError('rate limited')
+            assert tracker.fetch_etf_batch(['SPY'], '2025-01-02') == {}
+
+    def test_no_new_bars_returns_empty_frames(self, tracker):
+        with patch.object(market_signals, 'yf', create=True) as yf:
+            yf.download.return_value = _wide(['SPY', 'QQQ'], [])
+            result = tracker.fetch_etf_batch(['SPY', 'QQQ', 'DIA'], '2025-01-06')
+        assert set(result) == {'SPY', 'QQQ'}  # DIA missing from the columns
+        assert result['SPY'].empty and result['QQQ'].empty
+
+    def test_reported_failures_left_out(self, tracker):
+        raw = _wide(['SPY', 'BTC-USD'], ['2025-01-04'], missing=['SPY'])
+        with patch.object(market_signals, 'yf', create=True) as yf:
+            yf.download.return_value = raw
+            yf.shared._ERRORS = {'BTC-USD': 'delisted'}
+            result = tracker.fetch_etf_batch(['SPY', 'BTC-USD'], '2025-01-04')
+        # SPY has no Saturday bar but was not reported as failed
+        assert set(result) == {'SPY'}
+        assert result['SPY'].empty
+
+
+class TestCollectEtfSignals:
+    def test_groups_by_start_date_and_falls_back_for_failures(self, tracker):
+        pd.DataFrame({'date': ['2025-01-01'], 'sp500_price': [1.0]}).to_csv(
+            tracker.data_dir / 'sp500_price.csv', index=False)
+        pd.DataFrame({'date': ['2025-01-01'], 'nasdaq_price': [1.0]}).to_csv(
+            tracker.data_dir / 'nasdaq_price.csv', index=False)
+
+        calls = []
+
+        def fake_download(tickers, start=None, **kwargs):
+            calls.append((tuple(tickers), start))
+            return _wide(tickers, ['2025-01-02', '2025-01-03'], missing=['QQQ'] if 'QQQ' in tickers else ())
+
+        fallback = pd.DataFrame({'date': [pd.Timestamp('2025-01-02').date()], 'close': [9.0]})
+        with patch.object(market_signals, 'yf', create=True) as yf, \
+                patch.object(tracker, 'fetch_etf_data', return_value=fallback) as per_ticker, \
+                patch.object(market_signals.time, 'sleep') as sleep:
+            yf.download.side_effect = fake_download
+            tracker.collect_etf_signals()
+
+        assert len(calls) == 2
+        assert (('SPY', 'QQQ'), '2025-01-02') in calls
+        assert [c for c in calls if c[0] == ('BTC-USD',)]
+        per_ticker.assert_called_once_with('QQQ', start_date='2025-01-02')
+        sleep.assert_not_called()
+
+        spy = pd.read_csv(tracker.data_dir / 'sp500_price.csv')
+        assert spy['date'].tolist() == ['2025-01-01', '2025-01-02', '2025-01-03']
+        qqq = pd.read_csv(tracker.data_dir / 'nasdaq_price.csv')
+        assert qqq['nasdaq_price'].tolist() == [1.0, 9.0]
+        assert (tracker.data_dir / 'bitcoin_price.csv').exists()
+
+    def test_up_to_date_tickers_not_retried(self, tracker):
+        for name in ('sp500', 'nasdaq', 'bitcoin'):
+            pd.DataFrame({'date': ['2025-01-03'], f'{name}_price': [1.0]}).to_csv(
+                tracker.data_dir / f'{name}_price.csv', index=False)
+
+        def fake_download(tickers, start=None, **kwargs):
+            # Nothing new since the last stored bar: columns, no rows
+            return _wide(tickers, [])
+
+        with patch.object(market_signals, 'yf', create=True) as yf, \
+                patch.object(tracker, 'fetch_etf_data') as per_ticker:
+            yf.download.side_effect = fake_download
+            tracker.collect_etf_signals()
+
+        yf.download.assert_called_once()
+        per_ticker.assert_not_called()
+        assert pd.read_csv(tracker.data_dir / 'sp500_price.csv')['date'].tolist() == ['2025-01-03']
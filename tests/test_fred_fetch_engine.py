@@ -0,0 +1,126 @@
+"""
+Tests for the concurrent FRED fetch engine in MarketSignalsTracker.
+
+Covers:
+  - HostRateLimiter sliding window (per host, unknown hosts unlimited)
+  - Retry with backoff on connection errors, 429 and 5xx; no retry on 4xx
+  - collect_fred_signals fetches through one shared session across workers,
+    writes every series and prints a per-series timing summary
+"""
+
+import os
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+import requests
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIGNALTRACKERS_DIR = os.path.join(REPO_ROOT, 'signaltrackers')
+sys.path.insert(0, SIGNALTRACKERS_DIR)
+
+import market_signals
+from market_signals import HostRateLimiter, MarketSignalsTracker
+
+FRED_URL = 'https://api.stlouisfed.org/fred/series/observations'
+
+
+def _response(status=200, payload=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.json.return_value = payload or {'observations': [{'date': '2025-01-02', 'value': '1.5'}]}
+    if status >= 400:
+        resp.raise_for_status.side_effect = requests.exceptions.HTTPError(f'{status} error')
+    else:
+        resp.raise_for_status.return_value = None
+    return resp
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    tracker = MarketSignalsTracker.__new__(MarketSignalsTracker)
+    tracker.data_dir = tmp_path
+    tracker.fred_api_key = 'test'
+    tracker.fred_series = {f'series_{i}': f'ID{i}' for i in range(6)}
+    return tracker
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch.object(market_signals.time, 'sleep') as sleep:
+        yield sleep
+
+
+class TestHostRateLimiter:
+    def test_waits_once_window_is_full(self, no_sleep):
+        limiter = HostRateLimiter({'api.stlouisfed.org': (2, 60.0)})
+        clock = iter([0.0, 0.1, 0.2, 60.0])
+        with patch.object(market_signals.time, 'monotonic', side_effect=lambda: next(clock)):
+            for _ in range(3):
+                limiter.acquire(FRED_URL)
+        no_sleep.assert_called_once()
+        assert no_sleep.call_args[0][0] == pytest.approx(59.8)
+
+    def test_unknown_host_is_unlimited(self, no_sleep):
+        limiter = HostRateLimiter({'api.stlouisfed.org': (1, 60.0)})
+        for _ in range(5):
+            limiter.acquire('https://example.com/x')
+        no_sleep.assert_not_called()
+
+
+class TestRetry:
+    def test_retries_server_errors_then_succeeds(self, tracker, no_sleep):
+        with patch('market_signals.requests.get', side_effect=[_response(503), _response(429), _response()]) as get:
+            df = tracker.fetch_fred_data('ID0')
+        assert get.call_count == 3
+        assert no_sleep.call_count == 2
+        assert get.call_args.kwargs['timeout'] == tracker.fred_timeout
+        assert df['value'].tolist() == [1.5]
+
+    def test_client_error_is_not_retried(self, tracker):
+        with patch('market_signals.requests.get', return_value=_response(400)) as get:
+            assert tracker.fetch_fred_data('ID0') is None
+        assert get.call_count == 1
+
+    def test_gives_up_after_max_attempts(self, tracker):
+        error = requests.exceptions.ConnectionError('down')
+        with patch('market_signals.requests.get', side_effect=error) as get:
+            assert tracker.fetch_fred_data('ID0') is None
+        assert get.call_count == tracker.fred_max_attempts
+
+
+class TestCollectFredSignals:
+    def test_shared_session_and_all_series_written(self, tracker, capsys):
+        sessions, threads = set(), set()
+
+        def fake_get(self, url, params=None, timeout=None):
+            sessions.add(id(self))
+            threads.add(threading.get_ident())
+            return _response()
+
+        with patch.object(requests.Session, 'get', fake_get):
+            tracker.collect_fred_signals()
+
+        assert len(sessions) == 1
+        assert tracker._fred_session is None
+        for name in tracker.fred_series:
+            stored = pd.read_csv(tracker.data_dir / f'{name}.csv')
+            assert stored.columns.tolist() == ['date', name]
+        out = capsys.readouterr().out
+        assert 'FRED fetch summary: 6 series' in out
+        assert all(f'  {name}' in out for name in tracker.fred_series)
+
+    def test_failed_series_do_not_stop_others(self, tracker, capsys):
+        def fake_fetch(series_id, start_date=None):
+            if series_id == 'ID3':
+                raise RuntimeError('boom')
+            return pd.DataFrame({'date': pd.to_datetime(['2025-01-02']), 'value': [1.0]})
+
+        with patch.object(tracker, 'fetch_fred_data', side_effect=fake_fetch):
+            tracker.collect_fred_signals()
+
+        assert not (tracker.data_dir / 'series_3.csv').exists()
+        assert (tracker.data_dir / 'series_5.csv').exists()
+        assert 'series_3' in capsys.readouterr().out
@@ -0,0 +1,144 @@
+"""
+Tests for the persisted dimension history cache (history_cache.py) and its
+use by market_conditions.compute_*_history.
+
+Covers:
+  - Computed once; reused in-process and from disk by a fresh process
+  - Recomputed when an input file's content changes, not when it is
+    rewritten unchanged
+  - Keyed by parameters (start_date, engine source)
+  - Computations that read no files, and None results, are not cached
+  - Unreadable artifacts are ignored
+"""
+
+import os
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import signaltrackers.market_conditions as mc
+
+# The module market_conditions actually uses (flat or package import)
+history_cache = mc.history_cache
+
+
+def _write_csv(data_dir, name, dates, values):
+    pd.DataFrame({'date': dates.strftime('%Y-%m-%d'), name: values}).to_csv(
+        os.path.join(data_dir, f'{name}.csv'), index=False)
+
+
+def _write_risk_inputs(data_dir, vix_level=18.0, n=400):
+    dates = pd.bdate_range('2020-01-01', periods=n)
+    rng = np.random.default_rng(7)
+    _write_csv(data_dir, 'vix_price', dates, vix_level + rng.normal(0, 1, n))
+    _write_csv(data_dir, 'vix_3month', dates, vix_level + 2 + rng.normal(0, 1, n))
+    _write_csv(data_dir, 'sp500_price', dates, 3000 + rng.normal(0, 20, n).cumsum())
+    _write_csv(data_dir, 'treasury_10y', dates, 2 + rng.normal(0, 0.02, n).cumsum())
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    history_cache.invalidate()
+    with mock.patch.object(mc, 'DATA_DIR', str(tmp_path)):
+        _write_risk_inputs(tmp_path)
+        yield tmp_path
+    history_cache.invalidate()
+
+
+@pytest.fixture
+def builds():
+    with mock.patch.object(mc, '_build_risk_history', wraps=mc._build_risk_history) as build:
+        yield build
+
+
+class TestDimensionHistoryCache:
+    def test_computed_once(self, data_dir, builds):
+        first = mc.compute_risk_history()
+        second = mc.compute_risk_history()
+        assert builds.call_count == 1
+        pd.testing.assert_frame_equal(first, second)
+        assert list((data_dir / history_cache.CACHE_DIRNAME).glob('risk-*.pkl'))
+
+    def test_reloaded_from_disk(self, data_dir, builds):
+        expected = mc.compute_risk_history()
+        history_cache.invalidate()  # as in a new process
+        pd.testing.assert_frame_equal(mc.compute_risk_history(), expected)
+        assert builds.call_count == 1
+
+    def test_returns_copies(self, data_dir):
+        frame = mc.compute_risk_history()
+        frame.loc[:, 'state'] = 'Mutated'
+        assert (mc.compute_risk_history()['state'] != 'Mutated').all()
+
+    def test_unchanged_rewrite_not_recomputed(self, data_dir, builds):
+        mc.compute_risk_history()
+        _write_risk_inputs(data_dir)
+        mc.compute_risk_history()
+        assert builds.call_count == 1
+
+    def test_changed_input_recomputed(self, data_dir, builds):
+        calm = mc.compute_risk_history()
+        _write_risk_inputs(data_dir, vix_level=45.0)
+        stressed = mc.compute_risk_history()
+        assert builds.call_count == 2
+        assert stressed['vix_score'].mean() > calm['vix_score'].mean()
+
+    def test_keyed_by_start_date(self, data_dir, builds):
+        full = mc.compute_risk_history()
+        later = mc.compute_risk_history('2020-06-01')
+        assert builds.call_count == 2
+        assert len(later) < len(full)
+        mc.compute_risk_history('2020-06-01')
+        assert builds.call_count == 2
+
+    def test_keyed_by_engine_source(self, data_dir, builds):
+        mc.compute_risk_history()
+        real_digest = history_cache.file_digest
+        with mock.patch.object(history_cache, 'file_digest',
+                               side_effect=lambda p: 'edited' if p == mc.__file__ else real_digest(p)):
+            mc.compute_risk_history()
+        assert builds.call_count == 2
+
+    def test_unreadable_artifact_ignored(self, data_dir, builds):
+        expected = mc.compute_risk_history()
+        for path in (data_dir / history_cache.CACHE_DIRNAME).glob('risk-*.pkl'):
+            path.write_bytes(b'{"params": {}}\nnot a pickle')
+        history_cache.invalidate()
+        pd.testing.assert_frame_equal(mc.compute_risk_history(), expected)
+        assert builds.call_count == 2
+
+
+class TestCachedHistory:
+    def test_no_inputs_not_cached(self, tmp_path):
+        frame = pd.DataFrame({'date': [pd.Timestamp('2020-01-01')], 'state': ['Calm']})
+        compute = mock.Mock(return_value=frame)
+        for _ in range(2):
+            history_cache.cached_history('x', compute, tmp_path, {'start_date': None})
+        assert compute.call_count == 2
+        assert not tmp_path.exists() or not list(tmp_path.glob('*.pkl'))
+
+    def test_none_not_cached(self, tmp_path):
+        source = tmp_path / 'input.csv'
+        source.write_text('date,v\n')
+
+        def compute():
+            history_cache.record_input(source)
+            return None
+
+        counted = mock.Mock(side_effect=compute)
+        for _ in range(2):
+            assert history_cache.cached_history('y', counted, tmp_path, {}) is None
+        assert counted.call_count == 2
+
+    def test_missing_input_appearing_invalidates(self, tmp_path):
+        optional = tmp_path / 'optional.csv'
+
+        def compute():
+            history_cache.record_input(optional)
+            return pd.DataFrame({'has_optional': [optional.exists()]})
+
+        assert not history_cache.cached_history('z', compute, tmp_path, {})['has_optional'][0]
+        optional.write_text('date,v\n2020-01-01,1\n')
+        assert history_cache.cached_history('z', compute, tmp_path, {})['has_optional'][0]
@@ -0,0 +1,195 @@
+"""
+Tests for HTTP caching of the data APIs (http_cache.py).
+
+Covers:
+  - ETag + Cache-Control on cacheable routes; 304 answered before the view
+  - ETags change when files in the data directory change
+  - max-age runs until the next scheduled refresh, capped; AI summary
+    routes are no-cache and always revalidate
+  - gzip for large JSON/binary bodies only when accepted; 304 on the
+    compressed variant's ETag; memoized compression follows the body
+  - Snapshot routes keep the snapshot's content ETag
+  - Error responses are not cached
+"""
+
+import gzip
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'signaltrackers'))
+
+import http_cache  # noqa: E402
+
+
+def _write_vix(data_dir, n=3000, seed=4):
+    dates = pd.bdate_range('2010-01-04', periods=n)
+    values = 15 + np.random.default_rng(seed).normal(0, 1, n).cumsum()
+    pd.DataFrame({'date': dates.strftime('%Y-%m-%d'), 'vix_price': values}).to_csv(
+        data_dir / 'vix_price.csv', index=False)
+
+
+@pytest.fixture
+def client(tmp_path):
+    import dashboard
+    _write_vix(tmp_path)
+    dashboard.app.config['TESTING'] = True
+    dashboard.metric_series_cache.clear()
+    dashboard.response_cache.invalidate()
+    with patch.object(dashboard, 'DATA_DIR', tmp_path):
+        yield dashboard.app.test_client()
+    dashboard.metric_series_cache.clear()
+    dashboard.response_cache.invalidate()
+
+
+class TestValidators:
+    def test_etag_and_cache_control(self, client):
+        resp = client.get('/api/metrics/vix')
+        assert resp.status_code == 200
+        assert resp.headers['ETag']
+        assert resp.cache_control.public
+        assert 0 <= resp.cache_control.max_age <= 3600
+
+    def test_304_without_running_view(self, client):
+        import dashboard
+        etag = client.get('/api/metrics/vix').headers['ETag']
+        with patch.object(dashboard, '_get_metric_series') as view_work:
+            again = client.get('/api/metrics/vix', headers={'If-None-Match': etag})
+        assert again.status_code == 304
+        assert again.data == b''
+        view_work.assert_not_called()
+
+    def test_etag_depends_on_query(self, client):
+        a = client.get('/api/metrics/vix?max_points=100').headers['ETag']
+        b = client.get('/api/metrics/vix?max_points=200').headers['ETag']
+        assert a != b
+
+    def test_etag_changes_with_data(self, client, tmp_path):
+        import dashboard
+        etag = client.get('/api/metrics/vix').headers['ETag']
+        _write_vix(tmp_path, n=3001)
+        dashboard.response_cache.invalidate()
+        resp = client.get('/api/metrics/vix', headers={'If-None-Match': etag})
+        assert resp.status_code == 200
+        assert resp.headers['ETag'] != etag
+        assert resp.get_json()['stats']['count'] == 3001
+
+    def test_errors_not_cached(self, client):
+        resp = client.get('/api/metrics/nope')
+        assert resp.status_code == 404
+        assert 'ETag' not in resp.headers
+        assert not resp.cache_control.public
+
+
+class TestSummaryRoutes:
+    def test_summaries_always_revalidate(self, client):
+        import dashboard
+        with patch.object(dashboard, 'get_crypto_summary_for_display',
+                          return_value={'summary': 'Bitcoin steady'}):
+            resp = client.get('/api/crypto-summary')
+            assert resp.status_code == 200
+            assert resp.cache_control.no_cache
+            assert resp.cache_control.max_age == 0
+
+            again = client.get('/api/crypto-summary', headers={'If-None-Match': resp.headers['ETag']})
+        assert again.status_code == 304
+        assert again.cache_control.no_cache
+
+    def test_series_routes_keep_max_age(self, client):
+        resp = client.get('/api/metrics/vix')
+        assert not resp.cache_control.no_cache
+
+    def test_explicit_max_age(self):
+        from flask import Flask
+        app = Flask(__name__)
+        cache = http_cache.ResponseCache(lambda: '.')
+        cache.init_app(app)
+        app.add_url_rule('/x', 'x', cache.cached(max_age=60)(lambda: 'ok'))
+        resp = app.test_client().get('/x')
+        assert resp.cache_control.max_age == 60
+        assert not resp.cache_control.no_cache
+
+
+class TestSnapshotRoutes:
+    def test_snapshot_content_etag(self, client):
+        import dashboard
+        payload = {'crisis_score': 42, 'rows': list(range(2000))}
+        with patch.object(dashboard, 'get_dashboard_data', return_value=payload):
+            dashboard.snapshots.invalidate()
+            snap = dashboard.snapshots.get('dashboard', dashboard.get_dashboard_data)
+            resp = client.get('/api/dashboard', headers={'Accept-Encoding': 'gzip'})
+            assert resp.headers['ETag'] == f'"{snap.etag}-gzip"'
+            assert resp.cache_control.public
+
+            again = client.get('/api/dashboard', headers={'Accept-Encoding': 'gzip',
+                                                          'If-None-Match': resp.headers['ETag']})
+            assert again.status_code == 304
+            plain = client.get('/api/dashboard', headers={'If-None-Match': f'"{snap.etag}"'})
+            assert plain.status_code == 304
+        dashboard.snapshots.invalidate()
+
+
+class TestMaxAge:
+    def test_until_next_refresh_capped(self):
+        now = datetime(2026, 10, 16, 20, 0, tzinfo=timezone.utc)
+        cache = http_cache.ResponseCache(lambda: '.', next_refresh=lambda n: n + timedelta(minutes=10))
+        assert cache.max_age(now) == 600
+        cache = http_cache.ResponseCache(lambda: '.', next_refresh=lambda n: n + timedelta(days=3))
+        assert cache.max_age(now) == http_cache.DEFAULT_MAX_AGE
+
+    def test_dashboard_schedule(self):
+        import dashboard
+        # Friday 17:00 US/Eastern: refresh in 30 minutes
+        assert dashboard.response_cache.max_age(datetime(2026, 10, 16, 21, 0, tzinfo=timezone.utc)) == 1800
+
+
+class TestCompression:
+    def test_gzip_when_accepted(self, client):
+        plain = client.get('/api/metrics/vix')
+        resp = client.get('/api/metrics/vix', headers={'Accept-Encoding': 'gzip, deflate'})
+        assert resp.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in resp.headers['Vary']
+        assert gzip.decompress(resp.data) == plain.data
+        assert len(resp.data) < len(plain.data) / 2
+        assert resp.headers['ETag'] != plain.headers['ETag']
+
+        again = client.get('/api/metrics/vix', headers={'Accept-Encoding': 'gzip',
+                                                         'If-None-Match': resp.headers['ETag']})
+        assert again.status_code == 304
+
+    def test_binary_format_compressed(self, client):
+        resp = client.get('/api/metrics/vix?format=binary', headers={'Accept-Encoding': 'gzip'})
+        assert resp.headers['Content-Encoding'] == 'gzip'
+
+    def test_memo_follows_body(self, tmp_path):
+        from flask import Flask, jsonify
+        app = Flask(__name__)
+        cache = http_cache.ResponseCache(lambda: tmp_path)
+        cache.init_app(app)
+        bodies = iter(['OLD' * 1000, 'NEW' * 1000])
+        app.add_url_rule('/x', 'x', cache.cached(lambda: jsonify(value=next(bodies))))
+
+        client = app.test_client()
+        first = client.get('/x', headers={'Accept-Encoding': 'gzip'})
+        # Same data state (same ETag), different body: never the old bytes
+        second = client.get('/x', headers={'Accept-Encoding': 'gzip'})
+        assert first.headers['ETag'] == second.headers['ETag']
+        assert gzip.decompress(second.data).count(b'NEW') == 1000
+
+    def test_invalidate_clears_memo(self, client):
+        import dashboard
+        client.get('/api/metrics/vix', headers={'Accept-Encoding': 'gzip'})
+        assert dashboard.response_cache._compressed
+        dashboard.response_cache.invalidate()
+        assert not dashboard.response_cache._compressed
+
+    def test_small_or_unaccepted_left_alone(self, client):
+        assert 'Content-Encoding' not in client.get('/api/metrics/vix').headers
+        small = client.get('/api/metrics/vix?start=2030-01-01', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in small.headers
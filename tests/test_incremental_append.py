@@ -0,0 +1,148 @@
+"""
+Tests for append-only incremental writes in MarketSignalsTracker.append_to_csv.
+
+Covers:
+  - The CSV backend's sidecar tail index (built from the file tail, trusted
+    only while size/mtime match)
+  - New trailing rows are appended and today's row is replaced in place
+    without reading the existing file
+  - Overlapping or future-dated data falls back to the full bug313 merge
+  - Fast path output is byte-identical to the full merge
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIGNALTRACKERS_DIR = os.path.join(REPO_ROOT, 'signaltrackers')
+sys.path.insert(0, SIGNALTRACKERS_DIR)
+
+from series_storage import CsvStorage
+from market_signals import MarketSignalsTracker
+
+TODAY = pd.Timestamp.now().normalize()
+
+
+def _days(*offsets):
+    return [TODAY + pd.Timedelta(days=o) for o in offsets]
+
+
+def _tracker():
+    tracker = MarketSignalsTracker.__new__(MarketSignalsTracker)
+    tracker.storage = CsvStorage()
+    return tracker
+
+
+def _seed(path, offsets, col='vix_price'):
+    df = pd.DataFrame({'date': _days(*offsets), col: [float(o) for o in offsets]})
+    _tracker().append_to_csv(df, path)
+
+
+def _frame(offsets, values=None, col='vix_price'):
+    values = values if values is not None else [float(o) + 0.5 for o in offsets]
+    return pd.DataFrame({'date': _days(*offsets), col: values})
+
+
+def _full_merge(path, df):
+    """Run append_to_csv with the incremental path disabled."""
+    tracker = _tracker()
+    with patch.object(MarketSignalsTracker, '_append_incremental', return_value=False):
+        tracker.append_to_csv(df, path)
+
+
+class TestTailIndex:
+    def test_built_from_tail(self, tmp_path):
+        path = tmp_path / 'vix_price.csv'
+        _seed(path, [-3, -2, -1])
+        index = CsvStorage().tail_index(path)
+        assert index['columns'] == ['date', 'vix_price']
+        assert index['last_date'] == _days(-1)[0]
+        assert index['prev_date'] == _days(-2)[0]
+        with open(path, 'rb') as f:
+            f.seek(index['last_offset'])
+            assert f.read().startswith(_days(-1)[0].strftime('%Y-%m-%d').encode())
+
+    def test_sidecar_ignored_after_external_rewrite(self, tmp_path):
+        path = tmp_path / 'vix_price.csv'
+        _seed(path, [-3, -2, -1])
+        pd.DataFrame({'date': ['2020-01-01', '2020-01-02'], 'vix_price': [1.0, 2.0]}).to_csv(path, index=False)
+        assert CsvStorage().tail_index(path)['last_date'] == pd.Timestamp('2020-01-02')
+
+    def test_single_row_file(self, tmp_path):
+        path = tmp_path / 'vix_price.csv'
+        _seed(path, [-1])
+        index = CsvStorage().tail_index(path)
+        assert index['prev_date'] is None
+        assert index['last_offset'] == len('date,vix_price\n')
+
+    def test_date_not_first_column(self, tmp_path):
+        path = tmp_path / 'x.csv'
+        pd.DataFrame({'value': [1.0], 'date': ['2024-01-01']}).to_csv(path, index=False)
+        assert CsvStorage().tail_index(path) is None
+
+
+class TestIncrementalAppend:
+    def test_appends_without_reading(self, tmp_path):
+        path = tmp_path / 'vix_price.csv'
+        _seed(path, [-5, -4, -3])
+        with patch.object(CsvStorage, 'read', side_effect=AssertionError('full read')):
+            _tracker().append_to_csv(_frame([-2, -1]), path)
+        assert pd.read_csv(path)['vix_price'].tolist() == [-5.0, -4.0, -3.0, -1.5, -0.5]
+
+    def test_replaces_todays_row_in_place(self, tmp_path):
+        path = tmp_path / 'vix_price.csv'
+        _seed(path, [-2, -1, 0])
+        with patch.object(CsvStorage, 'read', side_effect=AssertionError('full read')):
+            _tracker().append_to_csv(_frame([0], [42.0]), path)
+            _tracker().append_to_csv(_frame([0], [43.0]), path)
+        stored = pd.read_csv(path)
+        assert len(stored) == 3
+        assert stored['vix_price'].tolist() == [-2.0, -1.0, 43.0]
+
+    def test_overlap_falls_back_to_merge(self, tmp_path):
+        path = tmp_path / 'vix_price.csv'
+        _seed(path, [-5, -4, -3])
+        with patch.object(CsvStorage, 'read', wraps=CsvStorage().read) as spy:
+            _tracker().append_to_csv(_frame([-4, -3, -2]), path)
+        assert spy.call_count == 1
+        assert pd.read_csv(path)['vix_price'].tolist() == [-5.0, -4.0, -3.0, -1.5]
+
+    def test_future_dated_file_falls_back(self, tmp_path):
+        path = tmp_path / 'nrou.csv'
+        _seed(path, [-30, 0, 365], col='nrou')
+        with patch.object(CsvStorage, 'read', wraps=CsvStorage().read) as spy:
+            _tracker().append_to_csv(_frame([-30, 0, 365], col='nrou'), path)
+        assert spy.call_count == 1
+        assert len(pd.read_csv(path)) == 3
+
+    def test_column_mismatch_falls_back(self, tmp_path):
+        path = tmp_path / 'vix_price.csv'
+        _seed(path, [-3])
+        _tracker().append_to_csv(_frame([-1], col='other'), path)
+        assert list(pd.read_csv(path).columns) == ['date', 'vix_price', 'other']
+
+    @pytest.mark.parametrize('existing, incoming', [
+        ([-5, -4, -3], [-2, -1]),
+        ([-5, -4, -3], [-1, 0]),
+        ([-5, -4, 0], [0]),
+        ([-5, -4, 0], [-1]),
+        ([-5, -4, 0], [-2, 0, 1]),
+        ([0], [0, 2]),
+        ([-5, -4, -3], [-3, -2]),
+        ([-5, 10], [-1, 0]),
+    ])
+    def test_matches_full_merge(self, tmp_path, existing, incoming):
+        fast, slow = tmp_path / 'fast.csv', tmp_path / 'slow.csv'
+        for path in (fast, slow):
+            _seed(path, existing)
+        _tracker().append_to_csv(_frame(incoming), fast)
+        _full_merge(slow, _frame(incoming))
+        assert fast.read_bytes() == slow.read_bytes()
+        # A second round keeps agreeing once the sidecar has been updated
+        _tracker().append_to_csv(_frame([incoming[-1] + 1, 0]), fast)
+        _full_merge(slow, _frame([incoming[-1] + 1, 0]))
+        assert fast.read_bytes() == slow.read_bytes()
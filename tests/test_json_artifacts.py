@@ -0,0 +1,145 @@
+"""
+Tests for the parse-once JSON artifact cache (json_artifacts.py) and its
+use by the market conditions, recession probability and sector tone readers.
+
+Covers:
+  - A file is parsed once per change; rewrites are picked up
+  - derived() values memoized per file version
+  - Missing files return the default; parse errors are raised every call
+  - copy=True isolates callers from the shared parse
+  - get_market_conditions / get_conditions_history share one parse, and
+    history writers never mutate what readers hold
+"""
+
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'signaltrackers'))
+
+import json_artifacts  # noqa: E402
+import market_conditions  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _clear():
+    json_artifacts.invalidate()
+    yield
+    json_artifacts.invalidate()
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data))
+
+
+def _count_parses():
+    return patch.object(json_artifacts.json, 'load', wraps=json.load)
+
+
+class TestReadJson:
+    def test_parsed_once_per_change(self, tmp_path):
+        path = tmp_path / 'a.json'
+        _write(path, {'v': 1})
+        with _count_parses() as parse:
+            assert json_artifacts.read_json(path) == {'v': 1}
+            assert json_artifacts.read_json(str(path)) == {'v': 1}
+            assert parse.call_count == 1
+
+            _write(path, {'v': 22})
+            assert json_artifacts.read_json(path) == {'v': 22}
+            assert parse.call_count == 2
+
+    def test_missing_returns_default(self, tmp_path):
+        assert json_artifacts.read_json(tmp_path / 'nope.json') is None
+        assert json_artifacts.read_json(tmp_path / 'nope.json', default={}) == {}
+
+    def test_parse_error_raised_each_call(self, tmp_path):
+        path = tmp_path / 'bad.json'
+        path.write_text('not json {{')
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                json_artifacts.read_json(path)
+
+    def test_copy_isolates_callers(self, tmp_path):
+        path = tmp_path / 'a.json'
+        _write(path, {'items': [1]})
+        json_artifacts.read_json(path, copy=True)['items'].append(2)
+        assert json_artifacts.read_json(path) == {'items': [1]}
+
+    def test_invalidate_forces_reparse(self, tmp_path):
+        path = tmp_path / 'a.json'
+        _write(path, {'v': 1})
+        with _count_parses() as parse:
+            json_artifacts.read_json(path)
+            json_artifacts.invalidate(path)
+            json_artifacts.read_json(path)
+        assert parse.call_count == 2
+
+
+class TestDerived:
+    def test_memoized_per_version(self, tmp_path):
+        path = tmp_path / 'h.json'
+        _write(path, {'2024-01-31': 1, '2024-02-29': 2})
+        calls = []
+
+        def latest(history):
+            calls.append(1)
+            return max(history)
+
+        assert json_artifacts.derived(path, 'latest', latest) == '2024-02-29'
+        assert json_artifacts.derived(path, 'latest', latest) == '2024-02-29'
+        assert len(calls) == 1
+
+        _write(path, {'2024-01-31': 1, '2024-03-31': 3})
+        assert json_artifacts.derived(path, 'latest', latest) == '2024-03-31'
+        assert len(calls) == 2
+        assert json_artifacts.derived(tmp_path / 'nope.json', 'latest', latest, default='x') == 'x'
+
+
+class TestMarketConditionsReaders:
+    @pytest.fixture
+    def history_file(self, tmp_path):
+        path = tmp_path / 'market_conditions_history.json'
+        _write(path, {
+            '2024-01-31': {'quadrant': 'Goldilocks', 'dimensions': {'liquidity': {'score': 1}}},
+            '2024-02-29': {'quadrant': 'Reflation', 'dimensions': {'liquidity': {'score': 2}},
+                           'updated_at': '2024-03-01T00:00:00+00:00'},
+        })
+        with patch.object(market_conditions, 'MARKET_CONDITIONS_HISTORY_FILE', str(path)), \
+                patch.object(market_conditions, 'MARKET_CONDITIONS_CACHE_FILE', str(tmp_path / 'none.json')):
+            yield path
+
+    def test_history_parsed_once_across_readers(self, history_file):
+        with _count_parses() as parse:
+            for _ in range(3):
+                assert market_conditions.get_market_conditions()['quadrant'] == 'Reflation'
+                assert len(market_conditions.get_conditions_history()) == 2
+        assert parse.call_count == 1
+
+    def test_latest_is_a_copy(self, history_file):
+        market_conditions.get_market_conditions()['dimensions']['liquidity']['score'] = 99
+        assert market_conditions.get_market_conditions()['dimensions']['liquidity']['score'] == 2
+
+    def test_writer_does_not_mutate_shared_history(self, history_file):
+        shared = market_conditions.get_conditions_history()
+        market_conditions._append_conditions_history(
+            {'as_of': '2024-03-31', 'quadrant': 'Stagflation', 'dimensions': {}})
+        assert '2024-03-31' not in shared
+        assert market_conditions.get_market_conditions()['quadrant'] == 'Stagflation'
+        assert len(market_conditions.get_conditions_history()) == 3
+
+
+def test_recession_probability_cache_read_once(tmp_path):
+    import recession_probability
+    path = tmp_path / 'recession_probability_cache.json'
+    _write(path, {'ny_fed': 30.0})
+    with patch.object(recession_probability, 'CACHE_FILE', path), _count_parses() as parse:
+        assert recession_probability.get_recession_probability() == {'ny_fed': 30.0}
+        assert recession_probability.get_recession_probability() == {'ny_fed': 30.0}
+        recession_probability._save_cache({'ny_fed': 31.0})
+        assert recession_probability.get_recession_probability() == {'ny_fed': 31.0}
+    assert parse.call_count == 2
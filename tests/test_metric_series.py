@@ -0,0 +1,203 @@
+"""
+Tests for range queries and downsampling on /api/metrics/<metric_name>
+(metric_series.py and the dashboard route).
+
+Covers:
+  - minmax_downsample keeps bucket extremes, endpoints and the point budget
+  - MetricSeries stats match the endpoint's historical definitions
+  - start/end slicing is inclusive and stats stay full-range
+  - Route: default payload unchanged, max_points/start/end honoured,
+    malformed args rejected, series built once per data version
+  - aligned_payload / /api/metrics/batch: per-id payloads, shared date
+    axis with nulls, per-series extremes kept when downsampled
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'signaltrackers'))
+
+from metric_series import MetricSeries, aligned_payload, minmax_downsample  # noqa: E402
+
+
+def _series(n=9000, seed=1):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('1990-01-02', periods=n)
+    return dates, 100 + rng.normal(0, 1, n).cumsum()
+
+
+class TestMinMaxDownsample:
+    def test_budget_and_endpoints(self):
+        _, values = _series()
+        idx = minmax_downsample(values, 500)
+        assert len(idx) <= 500
+        assert idx[0] == 0 and idx[-1] == len(values) - 1
+        assert (np.diff(idx) > 0).all()
+
+    def test_global_extremes_survive(self):
+        _, values = _series()
+        values[4321] = 1e6
+        values[77] = -1e6
+        idx = minmax_downsample(values, 100)
+        assert 4321 in idx and 77 in idx
+
+    def test_each_bucket_extreme_kept(self):
+        values = np.array([0, 5, 1, 9, 2, 8, 3, 7, 4, 6, 0], dtype=float)
+        idx = minmax_downsample(values, 6)
+        assert set(values[idx]) >= {9.0, 0.0}
+        assert len(idx) <= 6
+
+    def test_short_and_nan(self):
+        values = np.array([1.0, np.nan, 3.0])
+        assert minmax_downsample(values, 10).tolist() == [0, 2]
+
+
+class TestMetricSeries:
+    def test_stats_match_legacy_definitions(self):
+        dates, values = _series(100)
+        s = MetricSeries(dates, values, 'x')
+        v = values.tolist()
+        assert s.stats['current'] == v[-1]
+        assert s.stats['min'] == min(v) and s.stats['max'] == max(v)
+        assert s.stats['average'] == pytest.approx(sum(v) / len(v))
+        assert s.stats['change_1d'] == pytest.approx(v[-1] - v[-2])
+        assert s.stats['change_30d'] == pytest.approx(v[-1] - v[-30])
+        assert s.stats['count'] == 100
+        assert s.stats['min_date'] == dates[int(np.argmin(values))].strftime('%Y-%m-%d')
+
+    def test_range_inclusive_and_stats_full(self):
+        dates, values = _series(300)
+        s = MetricSeries(dates, values, 'x')
+        payload = s.payload(start=dates[10], end=dates[19])
+        assert payload['dates'][0] == dates[10].strftime('%Y-%m-%d')
+        assert payload['dates'][-1] == dates[19].strftime('%Y-%m-%d')
+        assert payload['values'] == values[10:20].tolist()
+        assert payload['stats']['count'] == 300
+        assert payload['range']['downsampled'] is False
+
+    def test_downsampled_payload(self):
+        dates, values = _series()
+        payload = MetricSeries(dates, values, 'x').payload(max_points=300)
+        assert len(payload['values']) <= 300
+        assert payload['range'] == {
+            'start': '1990-01-02', 'end': dates[-1].strftime('%Y-%m-%d'),
+            'points': len(payload['values']), 'source_points': 9000, 'downsampled': True,
+        }
+
+    def test_nan_values_serialize_as_null(self):
+        dates, values = _series(5)
+        values[2] = np.nan
+        payload = MetricSeries(dates, values, 'x').payload()
+        assert payload['values'][2] is None
+
+
+@pytest.fixture
+def client(tmp_path):
+    import dashboard
+    dates, values = _series()
+    pd.DataFrame({'date': dates.strftime('%Y-%m-%d'), 'vix_price': values}).to_csv(
+        tmp_path / 'vix_price.csv', index=False)
+    # Weekly series over part of the same period
+    weekly = pd.date_range('2000-01-07', periods=600, freq='W-FRI')
+    pd.DataFrame({'date': weekly.strftime('%Y-%m-%d'),
+                  'high_yield_spread': np.linspace(3, 9, 600)}).to_csv(
+        tmp_path / 'high_yield_spread.csv', index=False)
+    dashboard.app.config['TESTING'] = True
+    dashboard.metric_series_cache.clear()
+    with patch.object(dashboard, 'DATA_DIR', tmp_path):
+        yield dashboard.app.test_client()
+    dashboard.metric_series_cache.clear()
+
+
+class TestMetricRoute:
+    def test_default_returns_full_history(self, client):
+        data = client.get('/api/metrics/vix').get_json()
+        assert len(data['values']) == 9000
+        assert data['column_name'] == 'vix_price'
+        assert set(data['stats']) >= {'current', 'min', 'max', 'average', 'change_1d', 'change_30d'}
+
+    def test_max_points_and_range(self, client):
+        data = client.get('/api/metrics/vix_price?max_points=500').get_json()
+        assert len(data['values']) <= 500
+        assert data['stats']['count'] == 9000
+
+        data = client.get('/api/metrics/vix_price?start=2020-01-01&end=2020-01-31').get_json()
+        assert data['dates'][0] >= '2020-01-01' and data['dates'][-1] <= '2020-01-31'
+        assert len(data['dates']) == 23
+
+    @pytest.mark.parametrize('query', ['start=notadate', 'max_points=abc', 'max_points=1'])
+    def test_bad_args(self, client, query):
+        resp = client.get(f'/api/metrics/vix_price?{query}')
+        assert resp.status_code == 400
+        assert 'error' in resp.get_json()
+
+    def test_series_built_once_per_version(self, client):
+        import metric_series
+        with patch.object(metric_series.MetricSeries, 'from_frame',
+                          wraps=metric_series.MetricSeries.from_frame) as build:
+            client.get('/api/metrics/vix_price')
+            client.get('/api/metrics/vix_price?max_points=100')
+            assert build.call_count == 1
+            with patch('metric_store.get_version', return_value=10**6):
+                client.get('/api/metrics/vix_price')
+            assert build.call_count == 2
+
+    def test_missing_metric_404(self, client):
+        assert client.get('/api/metrics/nope').status_code == 404
+
+
+class TestAlignedPayload:
+    def test_union_axis_with_nulls(self):
+        a = MetricSeries(pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-04']), [1.0, 2.0, 4.0], 'a')
+        b = MetricSeries(pd.to_datetime(['2024-01-02', '2024-01-03']), [20.0, 30.0], 'b')
+        payload = aligned_payload({'a': a, 'b': b})
+        assert payload['dates'] == ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04']
+        assert payload['metrics']['a']['values'] == [1.0, 2.0, None, 4.0]
+        assert payload['metrics']['b']['values'] == [None, 20.0, 30.0, None]
+        assert payload['metrics']['b']['stats']['count'] == 2
+
+    def test_downsampled_keeps_each_series_extremes(self):
+        dates, values = _series()
+        other = -values
+        other[123] = 1e6
+        payload = aligned_payload({'a': MetricSeries(dates, values, 'a'),
+                                   'b': MetricSeries(dates, other, 'b')}, max_points=400)
+        assert len(payload['dates']) <= 400
+        assert payload['range']['downsampled'] is True
+        assert max(v for v in payload['metrics']['a']['values'] if v is not None) == values.max()
+        assert 1e6 in payload['metrics']['b']['values']
+
+
+class TestBatchRoute:
+    def test_matches_single_metric_payloads(self, client):
+        data = client.get('/api/metrics/batch?ids=vix,hy_spread,nope').get_json()
+        assert set(data['metrics']) == {'vix', 'hy_spread', 'nope'}
+        assert data['metrics']['vix'] == client.get('/api/metrics/vix').get_json()
+        assert data['metrics']['hy_spread'] == client.get('/api/metrics/hy_spread').get_json()
+        assert 'error' in data['metrics']['nope']
+
+    def test_aligned_range(self, client):
+        data = client.get('/api/metrics/batch?ids=vix_price,hy_spread&align=1'
+                          '&start=2005-01-01&end=2005-12-31').get_json()
+        n = len(data['dates'])
+        assert data['dates'][0] >= '2005-01-01' and data['dates'][-1] <= '2005-12-31'
+        assert len(data['metrics']['vix_price']['values']) == n
+        hy = data['metrics']['hy_spread']['values']
+        assert len(hy) == n and 0 < sum(v is not None for v in hy) < n
+
+    def test_aligned_downsampled(self, client):
+        data = client.get('/api/metrics/batch?ids=vix_price,hy_spread&align=1&max_points=300').get_json()
+        assert len(data['dates']) <= 300
+        assert data['range']['source_points'] == 9000
+
+    @pytest.mark.parametrize('query', ['', 'ids=', 'ids=vix&max_points=x',
+                                       'ids=' + ','.join(f'm{i}' for i in range(40))])
+    def test_bad_args(self, client, query):
+        resp = client.get(f'/api/metrics/batch?{query}')
+        assert resp.status_code == 400
@@ -0,0 +1,164 @@
+"""
+Tests for the shared in-process metric store (metric_store.py).
+
+Covers:
+  - Each CSV is parsed once and then served from memory
+  - Cache invalidation on file change, explicit invalidate() and bump_version()
+  - Returned frames/series are copies (mutation does not leak into the cache)
+  - read_series normalisation (date index, float64, NaN rows dropped, sorted)
+  - Loaders in dashboard, metric_tools, market_conditions, backtest_utils and
+    layer2 go through the store
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIGNALTRACKERS_DIR = os.path.join(REPO_ROOT, 'signaltrackers')
+sys.path.insert(0, SIGNALTRACKERS_DIR)
+
+import metric_store
+
+
+def _write(path, dates, values, col='value'):
+    pd.DataFrame({'date': dates, col: values}).to_csv(path, index=False)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'gold_price.csv'
+    _write(path, ['2024-01-01', '2024-01-02', '2024-01-03'], [1.0, 2.0, 3.0], col='gold_price')
+    metric_store.bump_version()
+    return path
+
+
+class TestReadFrame:
+    def test_missing_file_returns_none(self, tmp_path):
+        assert metric_store.read_frame(tmp_path / 'nope.csv') is None
+
+    def test_parses_date_column(self, csv_path):
+        df = metric_store.read_frame(csv_path)
+        assert pd.api.types.is_datetime64_any_dtype(df['date'])
+        assert list(df.columns) == ['date', 'gold_price']
+
+    def test_second_read_does_not_reparse(self, csv_path):
+        metric_store.read_frame(csv_path)
+        with patch.object(metric_store.pd, 'read_csv', side_effect=AssertionError('re-parsed')):
+            df = metric_store.read_frame(csv_path)
+        assert len(df) == 3
+
+    def test_returns_copy(self, csv_path):
+        df = metric_store.read_frame(csv_path)
+        df['extra'] = 1
+        df.loc[0, 'gold_price'] = 999.0
+        fresh = metric_store.read_frame(csv_path)
+        assert 'extra' not in fresh.columns
+        assert fresh.loc[0, 'gold_price'] == 1.0
+
+    def test_file_change_invalidates(self, csv_path):
+        metric_store.read_frame(csv_path)
+        _write(csv_path, ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04'],
+               [1.0, 2.0, 3.0, 4.0], col='gold_price')
+        assert len(metric_store.read_frame(csv_path)) == 4
+
+    def test_bump_version_invalidates(self, csv_path):
+        metric_store.read_frame(csv_path)
+        before = metric_store.get_version()
+        assert metric_store.bump_version() == before + 1
+        with patch.object(metric_store.pd, 'read_csv', wraps=pd.read_csv) as spy:
+            metric_store.read_frame(csv_path)
+        assert spy.call_count == 1
+
+    def test_invalidate_single_file(self, csv_path):
+        metric_store.read_frame(csv_path)
+        metric_store.invalidate(csv_path)
+        with patch.object(metric_store.pd, 'read_csv', wraps=pd.read_csv) as spy:
+            metric_store.read_frame(csv_path)
+        assert spy.call_count == 1
+
+    def test_missing_parse_column_raises(self, tmp_path):
+        path = tmp_path / 'us_recessions.csv'
+        pd.DataFrame({'start_date': ['2020-02-01'], 'end_date': ['2020-04-01']}).to_csv(path, index=False)
+        with pytest.raises(KeyError):
+            metric_store.read_frame(path)
+        assert len(metric_store.read_frame(path, parse_dates=())) == 1
+
+
+class TestReadSeries:
+    def test_date_indexed_float64(self, csv_path):
+        s = metric_store.read_series(csv_path)
+        assert isinstance(s.index, pd.DatetimeIndex)
+        assert s.dtype == 'float64'
+        assert s.name == 'gold_price'
+        assert s.iloc[-1] == 3.0
+
+    def test_drops_nan_and_sorts(self, tmp_path):
+        path = tmp_path / 'x.csv'
+        _write(path, ['2024-01-03', '2024-01-01', '2024-01-02'], [3.0, None, 2.0])
+        s = metric_store.read_series(path)
+        assert list(s.values) == [2.0, 3.0]
+        assert s.index.is_monotonic_increasing
+
+    def test_unknown_column_returns_none(self, csv_path):
+        assert metric_store.read_series(csv_path, 'missing') is None
+
+    def test_empty_file_returns_none(self, tmp_path):
+        path = tmp_path / 'empty.csv'
+        pd.DataFrame({'date': [], 'value': []}).to_csv(path, index=False)
+        assert metric_store.read_series(path) is None
+
+    def test_returns_copy(self, csv_path):
+        s = metric_store.read_series(csv_path)
+        s.iloc[0] = -1.0
+        assert metric_store.read_series(csv_path).iloc[0] == 1.0
+
+
+class TestLoadersUseStore:
+    def test_dashboard_loader(self, csv_path):
+        import dashboard
+        with patch.object(dashboard, 'DATA_DIR', csv_path.parent):
+            dashboard.load_csv_data('gold_price.csv')
+            with patch.object(metric_store.pd, 'read_csv', side_effect=AssertionError('re-parsed')):
+                df = dashboard.load_csv_data('gold_price.csv')
+        assert len(df) == 3
+
+    def test_metric_tools_loader(self, csv_path):
+        import metric_tools
+        with patch.object(metric_tools, 'DATA_DIR', csv_path.parent):
+            metric_tools.load_csv_data('gold_price.csv')
+            with patch.object(metric_store.pd, 'read_csv', side_effect=AssertionError('re-parsed')):
+                df = metric_tools.load_csv_data('gold_price.csv')
+        assert len(df) == 3
+
+    def test_market_conditions_loader(self, csv_path):
+        import market_conditions
+        with patch.object(market_conditions, 'DATA_DIR', str(csv_path.parent)):
+            market_conditions._load_csv('gold_price')
+            with patch.object(metric_store.pd, 'read_csv', side_effect=AssertionError('re-parsed')):
+                df = market_conditions._load_csv('gold_price')
+        assert len(df) == 3
+
+    def test_layer2_loader(self, csv_path):
+        # Load by path: other test modules replace sys.modules['services']
+        import importlib.util
+        spec = importlib.util.spec_from_file_location(
+            'metric_store_l2', os.path.join(SIGNALTRACKERS_DIR, 'services', 'layer2_extreme_percentile.py'))
+        l2 = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(l2)
+        with patch.object(l2, 'DATA_DIR', csv_path.parent):
+            l2._load_signal('gold_price.csv', 'gold_price')
+            with patch.object(metric_store.pd, 'read_csv', side_effect=AssertionError('re-parsed')):
+                s = l2._load_signal('gold_price.csv', 'gold_price')
+        assert len(s) == 3
+
+    def test_backtest_loader(self, csv_path):
+        sys.path.insert(0, REPO_ROOT)
+        from signaltrackers.backtesting import backtest_utils
+        with patch.object(backtest_utils, 'DATA_DIR', csv_path.parent):
+            s = backtest_utils.load_csv('gold_price')
+        assert s.dtype == 'float64'
+        assert list(s.values) == [1.0, 2.0, 3.0]
@@ -0,0 +1,145 @@
+"""
+Tests for the rolling-percentile engine (rolling_percentile.py).
+
+Covers:
+  - rolling_percentile matches a brute-force per-date re-rank, including
+    ties, NaNs, gaps and the short-window fallback
+  - cached_rolling_percentile memoizes by content and store version
+  - percentile_of keeps the single-value semantics used by pages and alerts
+  - Layer 2 momentum filter and dashboard.calculate_percentile_rank use it
+"""
+
+import importlib
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "signaltrackers"))
+
+import metric_store  # noqa: E402
+import rolling_percentile as rp  # noqa: E402
+
+
+def _brute_force(series, years):
+    out = []
+    for dt, value in series.items():
+        history = series[series.index <= dt]
+        if len(history) == 1:
+            out.append(100.0)
+            continue
+        window = history[history.index >= dt - pd.DateOffset(years=years)]
+        if len(window) < 2:
+            window = history
+        out.append((window < value).sum() / len(window) * 100)
+    return pd.Series(out, index=series.index)
+
+
+def _random_series(n, seed=0, freq='B'):
+    rng = np.random.default_rng(seed)
+    values = np.round(rng.normal(0, 1, n).cumsum(), 1)  # rounding forces ties
+    return pd.Series(values, index=pd.date_range('2000-01-03', periods=n, freq=freq))
+
+
+class TestRollingPercentile:
+    @pytest.mark.parametrize('years', [1, 3])
+    def test_matches_brute_force(self, years):
+        series = _random_series(1500, seed=years)
+        result = rp.rolling_percentile(series, years)
+        pd.testing.assert_series_equal(result, _brute_force(series, years), check_names=False)
+
+    def test_gap_falls_back_to_full_history(self):
+        dates = pd.DatetimeIndex(['2000-01-01', '2000-06-01', '2005-01-01', '2005-02-01'])
+        series = pd.Series([3.0, 1.0, 2.0, 5.0], index=dates)
+        result = rp.rolling_percentile(series, 1)
+        # 2005-01-01 is alone in its 1-year window → ranked against all history
+        assert result.tolist() == [100.0, 0.0, pytest.approx(100 / 3), 50.0]
+
+    def test_nan_values_skipped(self):
+        series = _random_series(50)
+        series.iloc[[5, 20]] = np.nan
+        result = rp.rolling_percentile(series, 10)
+        assert result.index.equals(series.index)
+        assert result.iloc[[5, 20]].isna().all()
+        expected = _brute_force(series.dropna(), 10)
+        pd.testing.assert_series_equal(result.dropna(), expected, check_names=False)
+
+    def test_empty(self):
+        assert rp.rolling_percentile(None, 10).empty
+        assert rp.rolling_percentile(pd.Series(dtype=float), 10).empty
+
+
+class TestCache:
+    def setup_method(self):
+        rp.clear_cache()
+
+    def test_same_content_computed_once(self):
+        series = _random_series(300)
+        with patch.object(rp, 'rolling_percentile', wraps=rp.rolling_percentile) as compute:
+            first = rp.cached_rolling_percentile(series, 10)
+            second = rp.cached_rolling_percentile(series.copy(), 10)
+        assert compute.call_count == 1
+        pd.testing.assert_series_equal(first, second)
+
+    def test_changed_content_or_version_recomputes(self):
+        series = _random_series(300)
+        with patch.object(rp, 'rolling_percentile', wraps=rp.rolling_percentile) as compute:
+            rp.cached_rolling_percentile(series, 10)
+            changed = series.copy()
+            changed.iloc[100] += 1
+            rp.cached_rolling_percentile(changed, 10)
+            with patch.object(metric_store, 'get_version', return_value=99):
+                rp.cached_rolling_percentile(series, 10)
+        assert compute.call_count == 3
+
+    def test_returns_copy(self):
+        series = _random_series(50)
+        first = rp.cached_rolling_percentile(series, 10)
+        first.iloc[:] = -1
+        assert (rp.cached_rolling_percentile(series, 10) >= 0).all()
+
+
+class TestPercentileOf:
+    def test_window_anchored_at_end(self):
+        series = pd.Series([10.0, 1.0, 2.0, 3.0],
+                           index=pd.to_datetime(['2000-01-01', '2020-01-01', '2020-02-01', '2020-03-01']))
+        assert rp.percentile_of(series, 2.5, 10, end='2020-06-01') == pytest.approx(200 / 3)
+        assert rp.percentile_of(series, 2.5, 30, end='2020-06-01') == 50.0
+
+    def test_latest_value_agrees_with_rolling_series(self):
+        series = _random_series(800)
+        end = series.index[-1]
+        assert rp.percentile_of(series, series.iloc[-1], 2, end=end) == pytest.approx(
+            rp.rolling_percentile(series, 2).iloc[-1])
+
+    def test_edge_cases(self):
+        assert rp.percentile_of(None, 1, 10) is None
+        single = pd.Series([3.0], index=pd.to_datetime(['2020-01-01']))
+        assert rp.percentile_of(single, 3.0, 10) == 100.0
+        assert rp.percentile_of(single, 2.0, 10) == 0.0
+
+
+class TestCallers:
+    def test_momentum_filter_uses_cached_engine(self):
+        l2 = importlib.import_module('services.layer2_extreme_percentile')
+
+        series = pd.Series(np.arange(500, dtype=float),
+                           index=pd.date_range(end=pd.Timestamp.today().normalize(), periods=500))
+        series.iloc[-1] = 475.0
+        series.iloc[-46] = 1.0
+        rp.clear_cache()
+        with patch.object(rp, 'rolling_percentile', wraps=rp.rolling_percentile) as compute:
+            assert l2._passes_momentum_filter(series) is True
+            assert l2._passes_momentum_filter(series) is True
+        assert compute.call_count == 1
+
+    def test_dashboard_percentile_rank_uses_20y_window(self):
+        from dashboard import calculate_percentile_rank
+
+        today = pd.Timestamp.today().normalize()
+        series = pd.Series([100.0, 1.0, 2.0, 3.0],
+                           index=[today - pd.DateOffset(years=25)] + list(pd.date_range(end=today, periods=3)))
+        assert calculate_percentile_rank(series, 2.5) == pytest.approx(200 / 3)
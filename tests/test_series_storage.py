@@ -0,0 +1,144 @@
+"""
+Tests for the pluggable series storage layer (series_storage.py).
+
+Covers:
+  - CSV and parquet backends share the .csv-path addressing scheme
+  - Parquet files are typed (datetime64 date, float64 values)
+  - Unmigrated series fall back to CSV and move to parquet on first write
+  - One-shot CSV -> parquet migration and parquet -> CSV export
+  - metric_store reads the newer parquet file behind a .csv path
+  - MarketSignalsTracker.append_to_csv keeps bug313 semantics on parquet
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIGNALTRACKERS_DIR = os.path.join(REPO_ROOT, 'signaltrackers')
+sys.path.insert(0, SIGNALTRACKERS_DIR)
+
+import series_storage
+from series_storage import (
+    CsvStorage,
+    ParquetStorage,
+    get_storage,
+    columnar_source,
+    migrate_csv_to_parquet,
+    export_to_csv,
+)
+
+pytestmark = pytest.mark.skipif(not series_storage.PARQUET_AVAILABLE, reason='pyarrow not installed')
+
+
+def _write_csv(path, n=5, col='vix_price'):
+    dates = pd.date_range('2024-01-01', periods=n, freq='D').strftime('%Y-%m-%d')
+    pd.DataFrame({'date': dates, col: [float(i) for i in range(n)]}).to_csv(path, index=False)
+
+
+class TestBackendSelection:
+    def test_default_is_csv(self):
+        assert isinstance(get_storage('csv'), CsvStorage)
+        assert not get_storage('csv').columnar
+
+    def test_parquet_backend(self):
+        storage = get_storage('parquet')
+        assert isinstance(storage, ParquetStorage)
+        assert storage.columnar
+
+    def test_parquet_falls_back_without_pyarrow(self, monkeypatch):
+        monkeypatch.setattr(series_storage, 'PARQUET_AVAILABLE', False)
+        assert not get_storage('parquet').columnar
+
+
+class TestParquetStorage:
+    def test_write_is_typed(self, tmp_path):
+        csv_path = tmp_path / 'vix_price.csv'
+        df = pd.DataFrame({'date': ['2024-01-01', '2024-01-02'], 'vix_price': ['12.5', '13']})
+        written = ParquetStorage().write(csv_path, df)
+        assert written == tmp_path / 'vix_price.parquet'
+        back = pd.read_parquet(written)
+        assert pd.api.types.is_datetime64_any_dtype(back['date'])
+        assert back['vix_price'].dtype == 'float64'
+
+    def test_unmigrated_series_reads_csv(self, tmp_path):
+        csv_path = tmp_path / 'vix_price.csv'
+        _write_csv(csv_path)
+        storage = ParquetStorage()
+        assert storage.exists(csv_path)
+        assert len(storage.read(csv_path)) == 5
+        assert storage.last_date(csv_path) == pd.Timestamp('2024-01-05')
+
+    def test_newer_csv_shadows_parquet(self, tmp_path):
+        csv_path = tmp_path / 'vix_price.csv'
+        _write_csv(csv_path, n=3)
+        ParquetStorage().write(csv_path, pd.read_csv(csv_path))
+        assert columnar_source(csv_path) == tmp_path / 'vix_price.parquet'
+        parquet_mtime = (tmp_path / 'vix_price.parquet').stat().st_mtime_ns
+        _write_csv(csv_path, n=7)
+        os.utime(csv_path, ns=(parquet_mtime + 10**9, parquet_mtime + 10**9))
+        assert columnar_source(csv_path) is None
+        assert len(ParquetStorage().read(csv_path)) == 7
+
+
+class TestMigrationAndExport:
+    def test_migrate_skips_non_series_files(self, tmp_path):
+        _write_csv(tmp_path / 'vix_price.csv')
+        pd.DataFrame({'start_date': ['2020-02-01'], 'end_date': ['2020-04-01'],
+                      'name': ['COVID']}).to_csv(tmp_path / 'us_recessions.csv', index=False)
+        migrated = migrate_csv_to_parquet(tmp_path)
+        assert migrated == ['vix_price']
+        assert (tmp_path / 'vix_price.parquet').exists()
+        assert not (tmp_path / 'us_recessions.parquet').exists()
+
+    def test_export_round_trip(self, tmp_path):
+        csv_path = tmp_path / 'vix_price.csv'
+        _write_csv(csv_path)
+        original = pd.read_csv(csv_path)
+        migrate_csv_to_parquet(tmp_path)
+        os.remove(csv_path)
+        assert export_to_csv(tmp_path) == ['vix_price']
+        pd.testing.assert_frame_equal(pd.read_csv(csv_path), original)
+        # Exported text copy must not shadow the parquet source
+        assert columnar_source(csv_path) == tmp_path / 'vix_price.parquet'
+
+    def test_export_stale_only(self, tmp_path):
+        _write_csv(tmp_path / 'vix_price.csv')
+        migrate_csv_to_parquet(tmp_path)
+        export_to_csv(tmp_path)
+        assert export_to_csv(tmp_path, stale_only=True) == []
+
+
+class TestMetricStoreShim:
+    def test_store_reads_parquet_behind_csv_path(self, tmp_path):
+        import metric_store
+        csv_path = tmp_path / 'vix_price.csv'
+        _write_csv(csv_path, n=3)
+        df = pd.read_csv(csv_path)
+        df = pd.concat([df, pd.DataFrame({'date': ['2024-01-04'], 'vix_price': [9.0]})])
+        ParquetStorage().write(csv_path, df)
+        metric_store.bump_version()
+        assert len(metric_store.read_frame(csv_path)) == 4
+        assert metric_store.read_series(csv_path).iloc[-1] == 9.0
+
+
+class TestTrackerOnParquet:
+    def test_append_dedups_and_replaces_today(self, tmp_path):
+        from market_signals import MarketSignalsTracker
+        tracker = MarketSignalsTracker.__new__(MarketSignalsTracker)
+        tracker.storage = ParquetStorage()
+        today = pd.Timestamp.now().normalize()
+        path = tmp_path / 'vix_price.csv'
+
+        first = pd.DataFrame({'date': [today - pd.Timedelta(days=1), today], 'vix_price': [1.0, 2.0]})
+        tracker.append_to_csv(first, path)
+        second = pd.DataFrame({'date': [today - pd.Timedelta(days=1), today], 'vix_price': [1.0, 3.0]})
+        tracker.append_to_csv(second, path)
+
+        stored = pd.read_parquet(tmp_path / 'vix_price.parquet')
+        assert len(stored) == 2
+        assert stored['vix_price'].tolist() == [1.0, 3.0]
+        assert not path.exists()
+        assert tracker.get_last_date_in_file(path) == today
@@ -0,0 +1,138 @@
+"""
+Tests for the binary chart series format (series_wire.py) and the
+?format=binary option on /api/metrics/* and /api/chart/*.
+
+Covers:
+  - encode/decode round trip: date axes as day offsets, NaN for nulls,
+    non-array fields untouched, nested payloads
+  - Array buffers are 8-byte aligned (typed-array views need it)
+  - Binary responses decode to the same data as the JSON responses
+  - Chart snapshots: binary variant cached with an ETag, 304 on revalidation
+  - Unknown format values rejected
+"""
+
+import json
+import os
+import struct
+import sys
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'signaltrackers'))
+
+import series_wire  # noqa: E402
+
+
+def _header_and_base(body):
+    (length,) = struct.unpack_from('<I', body, 4)
+    return json.loads(body[8:8 + length]), 8 + length
+
+
+class TestEncoding:
+    def test_round_trip(self):
+        payload = {
+            'dates': ['2024-01-01', '2024-01-02', '2024-03-01'],
+            'vix': [12.5, None, 14.0],
+            'column_name': 'vix_price',
+            'stats': {'current': 14.0, 'count': 3},
+            'labels': ['a', 'b'],
+            'empty': [],
+        }
+        decoded = series_wire.decode(series_wire.encode(payload))
+        np.testing.assert_array_equal(
+            decoded['dates'], np.array(payload['dates'], dtype='datetime64[D]'))
+        np.testing.assert_array_equal(decoded['vix'], [12.5, np.nan, 14.0])
+        assert decoded['column_name'] == 'vix_price'
+        assert decoded['stats'] == {'current': 14.0, 'count': 3}
+        assert decoded['labels'] == ['a', 'b']
+        assert decoded['empty'] == []
+
+    def test_numpy_and_nested(self):
+        dates = np.array(['1990-01-02', '2030-12-31'], dtype='datetime64[ns]')
+        payload = {'dates': dates, 'metrics': {'a': {'values': np.array([1.0, 2.0])}}}
+        decoded = series_wire.decode(series_wire.encode(payload))
+        np.testing.assert_array_equal(decoded['dates'], dates.astype('datetime64[D]'))
+        np.testing.assert_array_equal(decoded['metrics']['a']['values'], [1.0, 2.0])
+
+    def test_buffers_aligned(self):
+        body = series_wire.encode({'dates': ['2024-01-01'] * 3, 'x': [1.0] * 5, 'y': [2.0]})
+        header, base = _header_and_base(body)
+        assert base % 8 == 0
+        assert all((base + spec['offset']) % 8 == 0 for spec in header['arrays'])
+        assert header['meta'] == {'dates': None, 'x': None, 'y': None}
+
+    def test_smaller_than_json(self):
+        dates = pd.bdate_range('1990-01-02', periods=9000)
+        payload = {'dates': dates.strftime('%Y-%m-%d').tolist(),
+                   'values': np.random.default_rng(0).normal(size=9000).tolist()}
+        assert len(series_wire.encode(payload)) < len(json.dumps(payload)) / 2
+
+    def test_rejects_other_payloads(self):
+        with pytest.raises(ValueError):
+            series_wire.decode(b'{"dates": []}')
+
+
+@pytest.fixture
+def client(tmp_path):
+    import dashboard
+    dates = pd.bdate_range('2000-01-03', periods=2000)
+    values = 15 + np.random.default_rng(2).normal(0, 1, 2000).cumsum()
+    values[5] = np.nan
+    pd.DataFrame({'date': dates.strftime('%Y-%m-%d'), 'vix_price': values}).to_csv(
+        tmp_path / 'vix_price.csv', index=False)
+    dashboard.app.config['TESTING'] = True
+    dashboard.metric_series_cache.clear()
+    dashboard.snapshots.invalidate()
+    dashboard.binary_snapshots.invalidate()
+    with patch.object(dashboard, 'DATA_DIR', tmp_path):
+        yield dashboard.app.test_client()
+    dashboard.metric_series_cache.clear()
+    dashboard.snapshots.invalidate()
+    dashboard.binary_snapshots.invalidate()
+
+
+def _assert_same_series(decoded, json_payload, values_key='values'):
+    assert decoded['dates'].astype(str).tolist() == json_payload['dates']
+    expected = [np.nan if v is None else v for v in json_payload[values_key]]
+    np.testing.assert_array_equal(decoded[values_key], expected)
+
+
+class TestBinaryRoutes:
+    def test_metric_matches_json(self, client):
+        for query in ('', '&max_points=200', '&start=2003-01-01&end=2003-06-30'):
+            resp = client.get(f'/api/metrics/vix?format=binary{query}')
+            assert resp.mimetype == series_wire.MIMETYPE
+            decoded = series_wire.decode(resp.data)
+            expected = client.get(f'/api/metrics/vix?format=json{query}').get_json()
+            _assert_same_series(decoded, expected)
+            assert decoded['stats'] == expected['stats']
+            assert decoded['range'] == expected['range']
+
+    def test_batch_aligned_matches_json(self, client):
+        query = 'ids=vix,nope&align=1&max_points=300'
+        decoded = series_wire.decode(client.get(f'/api/metrics/batch?{query}&format=binary').data)
+        expected = client.get(f'/api/metrics/batch?{query}').get_json()
+        assert decoded['dates'].astype(str).tolist() == expected['dates']
+        np.testing.assert_array_equal(
+            decoded['metrics']['vix']['values'],
+            [np.nan if v is None else v for v in expected['metrics']['vix']['values']])
+        assert 'error' in decoded['metrics']['nope']
+
+    def test_chart_snapshot(self, client):
+        resp = client.get('/api/chart/vix?format=binary')
+        assert resp.status_code == 200
+        assert resp.mimetype == series_wire.MIMETYPE
+        _assert_same_series(series_wire.decode(resp.data),
+                            client.get('/api/chart/vix').get_json(), values_key='vix')
+
+        again = client.get('/api/chart/vix?format=binary', headers={'If-None-Match': resp.headers['ETag']})
+        assert again.status_code == 304
+
+    @pytest.mark.parametrize('url', ['/api/metrics/vix?format=xml', '/api/chart/vix?format=csv',
+                                     '/api/metrics/batch?ids=vix&format=protobuf'])
+    def test_unknown_format(self, client, url):
+        assert client.get(url).status_code == 400
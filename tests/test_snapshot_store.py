@@ -0,0 +1,132 @@
+"""
+Tests for precomputed dashboard snapshots (snapshot_store.py).
+
+Covers:
+  - Payloads are built once and served from memory until data changes
+  - Snapshots persist to disk and are reused by a fresh store (worker restart)
+  - A changed data directory fingerprint forces a rebuild
+  - /api/dashboard and /api/chart/<type> serve snapshots with ETags and 304s
+"""
+
+import json
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIGNALTRACKERS_DIR = os.path.join(REPO_ROOT, 'signaltrackers')
+sys.path.insert(0, SIGNALTRACKERS_DIR)
+
+import snapshot_store
+from snapshot_store import SnapshotStore, data_fingerprint
+
+
+def _write_vix(data_dir, n=3):
+    dates = pd.date_range('2024-01-01', periods=n, freq='D').strftime('%Y-%m-%d')
+    pd.DataFrame({'date': dates, 'vix_price': [float(15 + i) for i in range(n)]}).to_csv(
+        data_dir / 'vix_price.csv', index=False)
+
+
+@pytest.fixture
+def store(tmp_path):
+    _write_vix(tmp_path)
+    return SnapshotStore(lambda: tmp_path)
+
+
+class TestSnapshotStore:
+    def test_builds_once(self, store):
+        builder = MagicMock(return_value={'a': 1})
+        first = store.get('x', builder)
+        second = store.get('x', builder)
+        assert builder.call_count == 1
+        assert first is second
+        assert json.loads(first.body) == {'a': 1}
+        assert first.etag
+
+    def test_none_payload_not_cached(self, store):
+        builder = MagicMock(return_value=None)
+        assert store.get('x', builder) is None
+        assert store.get('x', builder) is None
+        assert builder.call_count == 2
+
+    def test_restored_from_disk(self, store, tmp_path):
+        snap = store.get('x', lambda: {'a': 1})
+        fresh = SnapshotStore(lambda: tmp_path)
+        restored = fresh.get('x', MagicMock(side_effect=AssertionError('rebuilt')))
+        assert restored.body == snap.body
+        assert restored.etag == snap.etag
+
+    def test_data_change_triggers_rebuild(self, store, tmp_path):
+        store.get('x', lambda: {'a': 1})
+        _write_vix(tmp_path, n=5)
+        store.invalidate()
+        assert json.loads(store.get('x', lambda: {'a': 2}).body) == {'a': 2}
+
+    def test_fingerprint_rechecked_after_ttl(self, store, tmp_path, monkeypatch):
+        store.get('x', lambda: {'a': 1})
+        _write_vix(tmp_path, n=5)
+        assert json.loads(store.get('x', lambda: {'a': 2}).body) == {'a': 1}
+        monkeypatch.setattr(snapshot_store, 'FINGERPRINT_TTL', 0)
+        assert json.loads(store.get('x', lambda: {'a': 2}).body) == {'a': 2}
+
+    def test_rebuild_isolates_failures(self, store):
+        def broken():
+            raise RuntimeError('boom')
+        built = store.rebuild({'ok': lambda: {'a': 1}, 'bad': broken, 'empty': lambda: None})
+        assert built == {'ok': True, 'bad': False, 'empty': False}
+
+    def test_snapshot_files_do_not_change_fingerprint(self, store, tmp_path):
+        before = data_fingerprint(tmp_path)
+        store.get('x', lambda: {'a': 1})
+        assert (tmp_path / '.snapshots' / 'x.json').exists()
+        assert data_fingerprint(tmp_path) == before
+
+
+class TestDashboardRoutes:
+    @pytest.fixture
+    def client(self, tmp_path):
+        import dashboard
+        _write_vix(tmp_path)
+        dashboard.app.config['TESTING'] = True
+        with patch.object(dashboard, 'DATA_DIR', tmp_path):
+            dashboard.snapshots.invalidate()
+            yield dashboard.app.test_client()
+        dashboard.snapshots.invalidate()
+
+    def test_chart_served_with_etag(self, client):
+        resp = client.get('/api/chart/vix')
+        assert resp.status_code == 200
+        assert resp.get_json() == {'dates': ['2024-01-01', '2024-01-02', '2024-01-03'],
+                                   'vix': [15.0, 16.0, 17.0]}
+        etag = resp.headers['ETag']
+        again = client.get('/api/chart/vix', headers={'If-None-Match': etag})
+        assert again.status_code == 304
+
+    def test_chart_built_once(self, client):
+        import dashboard
+        with patch.object(dashboard, 'build_chart_data', wraps=dashboard.build_chart_data) as spy:
+            client.get('/api/chart/vix')
+            client.get('/api/chart/vix')
+        assert spy.call_count == 1
+
+    def test_missing_or_unknown_chart_404(self, client):
+        assert client.get('/api/chart/gold_bitcoin').status_code == 404
+        assert client.get('/api/chart/nope').status_code == 404
+
+    def test_dashboard_snapshot(self, client):
+        import dashboard
+        with patch.object(dashboard, 'get_dashboard_data', return_value={'crisis_score': 42}):
+            dashboard.snapshots.invalidate()
+            resp = client.get('/api/dashboard')
+            assert resp.get_json() == {'crisis_score': 42}
+            assert client.get('/api/dashboard', headers={'If-None-Match': resp.headers['ETag']}).status_code == 304
+
+    def test_build_snapshots(self, client):
+        import dashboard
+        with patch.object(dashboard, 'get_dashboard_data', return_value={'crisis_score': 1}):
+            built = dashboard.build_snapshots()
+        assert built['dashboard'] and built['chart_vix']
+        assert not built['chart_gold_bitcoin']
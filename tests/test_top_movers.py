@@ -0,0 +1,132 @@
+"""
+Tests for the vectorized top-movers engine (top_movers.py).
+
+Covers:
+  - z-score of the latest N-observation change vs its rolling window
+  - pct vs abs (multiplied) changes, freshness and minimum-history filters
+  - Divergence gap scored alongside configured metrics
+  - All periods computed in one pass and cached until data changes
+  - as_of scoring of past dates
+  - dashboard.calculate_top_movers delegates to the engine
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIGNALTRACKERS_DIR = os.path.join(REPO_ROOT, 'signaltrackers')
+sys.path.insert(0, SIGNALTRACKERS_DIR)
+
+import metric_store
+from top_movers import TopMoversEngine, rolling_window
+
+TODAY = pd.Timestamp.now().normalize()
+
+METRICS = {
+    'sp500_price': {'display': 'pct', 'unit': '%', 'name': 'S&P 500', 'link': '/explorer?metric=sp500_price'},
+    'high_yield_spread': {'display': 'abs', 'unit': 'bp', 'name': 'HY Spread',
+                          'link': '/explorer?metric=high_yield_spread', 'multiplier': 100},
+}
+
+
+def _write(data_dir, name, values, end=TODAY):
+    dates = pd.date_range(end=end, periods=len(values), freq='D')
+    pd.DataFrame({'date': dates.strftime('%Y-%m-%d'), name: values}).to_csv(
+        data_dir / f'{name}.csv', index=False)
+
+
+def _expected_z(values, period, pct):
+    s = pd.Series(values)
+    change = s.pct_change(period) * 100 if pct else s - s.shift(period)
+    window = rolling_window(period)
+    return (change.iloc[-1] - change.rolling(window).mean().iloc[-1]) / change.rolling(window).std().iloc[-1]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    rng = np.random.default_rng(1)
+    _write(tmp_path, 'sp500_price', 500 + np.cumsum(rng.normal(0, 2, 400)))
+    _write(tmp_path, 'high_yield_spread', 3 + np.cumsum(rng.normal(0, 0.02, 400)))
+    _write(tmp_path, 'gold_price', 200 + np.cumsum(rng.normal(0, 1, 400)))
+    metric_store.bump_version()
+    return tmp_path
+
+
+@pytest.fixture
+def engine(data_dir):
+    return TopMoversEngine(lambda: data_dir, metrics=METRICS)
+
+
+class TestScoring:
+    @pytest.mark.parametrize('period', [1, 5, 20])
+    def test_pct_z_score(self, engine, data_dir, period):
+        values = pd.read_csv(data_dir / 'sp500_price.csv')['sp500_price'].values
+        mover = next(m for m in engine.compute()[period] if m['metric'] == 'sp500_price')
+        assert mover['z_score'] == round(_expected_z(values, period, pct=True), 2)
+        assert mover[f'change_{period}d'] == mover['change']
+
+    def test_abs_change_uses_multiplier(self, engine, data_dir):
+        values = pd.read_csv(data_dir / 'high_yield_spread.csv')['high_yield_spread'].values
+        mover = next(m for m in engine.compute()[5] if m['metric'] == 'high_yield_spread')
+        assert mover['change'] == round((values[-1] - values[-6]) * 100, 2)
+        assert mover['current_value'] == round(values[-1] * 100, 2)
+
+    def test_divergence_gap_included(self, engine):
+        mover = next(m for m in engine.compute()[5] if m['metric'] == 'divergence_gap')
+        assert isinstance(mover['change'], int)
+        assert mover['unit'] == 'bp'
+
+    def test_sorted_by_abs_z(self, engine):
+        z = [abs(m['z_score']) for m in engine.compute()[1]]
+        assert z == sorted(z, reverse=True)
+
+    def test_stale_metric_skipped(self, engine, data_dir):
+        _write(data_dir, 'sp500_price', np.linspace(1, 2, 400), end=TODAY - pd.Timedelta(days=10))
+        assert 'sp500_price' not in [m['metric'] for m in engine.compute()[5]]
+
+    def test_short_history_skipped_per_period(self, engine, data_dir):
+        _write(data_dir, 'sp500_price', 100 + np.sin(np.arange(100)))
+        movers = engine.compute()
+        assert 'sp500_price' in [m['metric'] for m in movers[1]]
+        assert 'sp500_price' not in [m['metric'] for m in movers[20]]
+
+
+class TestCachingAndAsOf:
+    def test_all_periods_share_one_load(self, engine):
+        with patch.object(metric_store, 'read_frame', wraps=metric_store.read_frame) as spy:
+            for period in (1, 5, 20):
+                engine.top(period=period)
+            engine.top(period=5, num_movers=2)
+        assert spy.call_count == 4  # two metrics + gold + HY for the divergence gap
+
+    def test_file_change_recomputes(self, engine, data_dir):
+        before = engine.top(period=5, num_movers=10)
+        _write(data_dir, 'sp500_price', 500 + np.arange(400, dtype=float) ** 1.5)
+        assert engine.top(period=5, num_movers=10) != before
+
+    def test_results_are_copies(self, engine):
+        engine.top(period=5)[0]['z_score'] = 999
+        assert engine.top(period=5)[0]['z_score'] != 999
+
+    def test_as_of(self, engine, data_dir):
+        as_of = TODAY - pd.Timedelta(days=50)
+        values = pd.read_csv(data_dir / 'sp500_price.csv')['sp500_price'].values[:-50]
+        mover = next(m for m in engine.top(period=5, num_movers=10, as_of=as_of) if m['metric'] == 'sp500_price')
+        assert mover['current_value'] == round(values[-1], 2)
+        assert mover['z_score'] == round(_expected_z(values, 5, pct=True), 2)
+
+    def test_custom_period(self, engine):
+        assert engine.top(period=3)
+
+
+class TestDashboardDelegation:
+    def test_calculate_top_movers(self, data_dir):
+        import dashboard
+        with patch.object(dashboard, 'DATA_DIR', data_dir):
+            movers = dashboard.calculate_top_movers(5, period=1)
+        assert movers and all('z_score' in m for m in movers)
@@ -247,13 +247,16 @@ class TestCreditTemplateDataDriven(unittest.TestCase):
         self.assertIn("ccc_current_bps", self.html)
 
     def test_api_fetch_hy_spread(self):
-        self.assertIn("/api/metrics/hy_spread", self.html)
+        self.assertIn("fetchMetricBatch(", self.html)
+        self.assertIn("'hy_spread'", self.html)
 
     def test_api_fetch_ig_spread(self):
-        self.assertIn("/api/metrics/ig_spread", self.html)
+        self.assertIn("fetchMetricBatch(", self.html)
+        self.assertIn("'ig_spread'", self.html)
 
     def test_api_fetch_ccc_spread(self):
-        self.assertIn("/api/metrics/ccc_spread", self.html)
+        self.assertIn("fetchMetricBatch(", self.html)
+        self.assertIn("'ccc_spread'", self.html)
 
     def test_collapsible_sections_present(self):
         self.assertIn("collapsible-section", self.html)
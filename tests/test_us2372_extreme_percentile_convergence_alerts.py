@@ -649,13 +649,14 @@ class TestLayer3Convergence:
 
     def test_occurrence_count_not_hardcoded(self):
         """Occurrence count must come from historical computation, not a literal."""
-        # Verify _count_historical_convergence_occurrences is called
+        # Verify the historical episodes are scanned once and counted
         configs, loader = self._make_signal_configs_with_pcts([80, 82, 84])
         with patch.object(_l3_mod, '_load_signal', side_effect=loader):
-            with patch.object(_l3_mod, '_count_historical_convergence_occurrences',
-                              wraps=_l3_mod._count_historical_convergence_occurrences) as mock_count:
-                check_convergence(configs)
-        assert mock_count.called, "Occurrence count must be computed dynamically"
+            with patch.object(_l3_mod, '_historical_convergence_episodes',
+                              wraps=_l3_mod._historical_convergence_episodes) as mock_episodes:
+                result = check_convergence(configs)
+        assert mock_episodes.call_count == 1, "Occurrence count must be computed dynamically"
+        assert f"{len(result['historical_episodes'])} time(s)" in result['context_sentence']
 
     def test_direction_risk_off_label_in_context(self):
         """Context sentence mentions 'risk-off' when all signals are high."""
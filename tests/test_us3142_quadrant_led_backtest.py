@@ -833,6 +833,39 @@ class TestRiskFilterSensitivity:
         # Elevated + Goldilocks: sp500 → negative expectation, real 3% is positive → 0.0
         assert rescored.iloc[0]['sp500_correct'] == 0.0
 
+    def test_rescore_matches_single_evaluation(self, sample_histories, sample_scoring_assets, sample_cpi_series):
+        """Column-wise rescoring with the Stressed override reproduces run_backtest scores."""
+        from signaltrackers.backtesting.conditions_backtest import _rescore_with_overrides
+        df = run_backtest(sample_histories, sample_scoring_assets, sample_cpi_series,
+                         start_year=2006, end_year=2024)
+        rescored = _rescore_with_overrides(df, ('Stressed',))
+        pd.testing.assert_frame_equal(rescored, df, check_dtype=False)
+
+    def test_rescore_skips_missing_returns(self):
+        df = pd.DataFrame([{
+            'date': '2020-03-31', 'quadrant': 'Reflation', 'risk_state': 'Normal',
+            'sp500_fwd_90d': 0.05, 'treasuries_fwd_90d': float('nan'), 'gold_fwd_90d': 0.02,
+            'sp500_real_fwd_90d': float('nan'), 'multi_asset_score': 0.0,
+        }])
+        rescored = _rescore_without_risk_override(df, None)
+        # S&P falls back to nominal; Treasuries unscored
+        assert rescored.iloc[0]['sp500_correct'] == 1.0
+        assert pd.isna(rescored.iloc[0]['treasuries_correct'])
+        assert rescored.iloc[0]['multi_asset_score'] == 1.0
+
+    def test_sensitivity_parallel_matches_serial(self, sample_histories, sample_scoring_assets, sample_cpi_series):
+        configs = RISK_FILTER_CONFIGS + [
+            {'label': 'Elevated only', 'override_risk_states': ['Elevated']},
+        ]
+        serial = run_risk_filter_sensitivity(sample_histories, sample_scoring_assets, sample_cpi_series,
+                                             2006, 2015, configs=configs, workers=1)
+        parallel = run_risk_filter_sensitivity(sample_histories, sample_scoring_assets, sample_cpi_series,
+                                               2006, 2015, configs=configs, workers=2)
+        strip = lambda results: [{k: v for k, v in r.items() if k != 'seconds'} for r in results]
+        assert strip(serial) == strip(parallel)
+        assert [r['label'] for r in parallel] == [c['label'] for c in configs]
+        assert all(r['seconds'] >= 0 for r in parallel)
+
 
 # ---------------------------------------------------------------------------
 # CPCV and DSR tests (unchanged — still valid with quadrant scoring)
@@ -882,6 +915,70 @@ class TestDSR:
         assert result['dsr'] is None
 
 
+# ---------------------------------------------------------------------------
+# Vectorized forward-return / drawdown kernels
+# ---------------------------------------------------------------------------
+
+class TestVectorizedKernels:
+    """forward_return_matrix / max_drawdown_vector match the scalar functions."""
+
+    EVAL_DATES = list(pd.date_range('2003-06-30', '2026-03-31', freq='ME')) + [
+        pd.Timestamp('2004-01-01'), pd.Timestamp('2010-07-04'), pd.Timestamp('2025-12-31'),
+    ]
+
+    @staticmethod
+    def _assert_matches(vectorized, expected):
+        for got, want in zip(vectorized, expected):
+            if want is None:
+                assert np.isnan(got)
+            else:
+                assert abs(got - want) < 1e-9
+
+    def test_forward_returns_match(self, sample_scoring_assets):
+        from signaltrackers.backtesting.backtest_utils import (
+            compute_forward_return, forward_return_matrix,
+        )
+        windows = [30, 60, 90, 365]
+        for series in sample_scoring_assets.values():
+            matrix = forward_return_matrix(series, self.EVAL_DATES, windows)
+            assert matrix.shape == (len(self.EVAL_DATES), len(windows))
+            for j, w in enumerate(windows):
+                self._assert_matches(
+                    matrix[:, j],
+                    [compute_forward_return(series, d, w) for d in self.EVAL_DATES])
+
+    def test_max_drawdowns_match(self, sample_scoring_assets):
+        from signaltrackers.backtesting.backtest_utils import (
+            compute_max_drawdown, max_drawdown_vector,
+        )
+        for series in sample_scoring_assets.values():
+            for w in (1, 3, 90):
+                self._assert_matches(
+                    max_drawdown_vector(series, self.EVAL_DATES, w),
+                    [compute_max_drawdown(series, d, w) for d in self.EVAL_DATES])
+
+    def test_empty_inputs(self):
+        from signaltrackers.backtesting.backtest_utils import (
+            forward_return_matrix, max_drawdown_vector,
+        )
+        assert forward_return_matrix(pd.Series(dtype=float), self.EVAL_DATES, [30]).shape == (len(self.EVAL_DATES), 1)
+        assert np.isnan(max_drawdown_vector(pd.Series(dtype=float), self.EVAL_DATES, 90)).all()
+        assert forward_return_matrix(pd.Series([1.0], index=[pd.Timestamp('2020-01-01')]), [], [30]).shape == (0, 1)
+
+    def test_run_backtest_matches_scalar(self, sample_histories, sample_scoring_assets, sample_cpi_series):
+        from signaltrackers.backtesting.backtest_utils import (
+            compute_forward_return, compute_max_drawdown,
+        )
+        df = run_backtest(sample_histories, sample_scoring_assets, sample_cpi_series,
+                         start_year=2006, end_year=2010)
+        for _, row in df.iterrows():
+            d = pd.Timestamp(row['date'])
+            for asset_key, series in sample_scoring_assets.items():
+                for w in (30, 60, 90):
+                    assert row[f'{asset_key}_fwd_{w}d'] == compute_forward_return(series, d, w)
+            assert row['sp500_max_dd_90d'] == compute_max_drawdown(sample_scoring_assets['sp500'], d, 90)
+
+
 # ---------------------------------------------------------------------------
 # Report generation tests
 # ---------------------------------------------------------------------------